@@ -1,20 +1,35 @@
 # backend/app/__init__.py
 import os
 import logging
-from logging.handlers import RotatingFileHandler
+import sqlite3
 from flask import Flask, jsonify, send_from_directory # send_from_directory 추가
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from werkzeug.exceptions import HTTPException
+from werkzeug.middleware.proxy_fix import ProxyFix
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from .services import ai_service # services 폴더가 app 폴더 내에 있다고 가정
 from . import errors # errors.py (또는 errors 폴더)가 app 폴더 내에 있다고 가정
+from .utils import metrics, tracing
+from .utils.logging_pipeline import configure_logging
+from .utils.sql_instrumentation import sql_instrumentation
 
 db = SQLAlchemy()
 migrate = Migrate()
 jwt = JWTManager()
 
+@event.listens_for(Engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    # SQLite: WAL 모드에서는 읽기 트랜잭션이 열려 있어도 별도 커넥션의 쓰기(KEK 에폭 생성 등)가 커밋될 수 있음
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.close()
+
 # config.py가 app 폴더 내에 있다고 가정
 from .config import Config # config.py 임포트
 
@@ -34,27 +49,16 @@ def create_app(config_class=Config):
                )
     app.config.from_object(config_class)
 
-    # --- 로깅 설정 ---
-    if not app.debug and not app.testing:
-        log_dir = os.path.join(app.instance_path)
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir, exist_ok=True) # exist_ok=True 추가
-        log_file_path = app.config.get('LOG_FILE_PATH', os.path.join(log_dir, 'production.log'))
-        file_handler = RotatingFileHandler(
-            log_file_path, maxBytes=1024 * 1024 * 10, backupCount=5
-        )
-        log_formatter = logging.Formatter(
-            '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
-        )
-        file_handler.setFormatter(log_formatter)
-        file_handler.setLevel(app.config.get('LOG_LEVEL', logging.INFO))
-        if not app.logger.handlers:
-             app.logger.addHandler(file_handler)
-        app.logger.setLevel(app.config.get('LOG_LEVEL', logging.INFO))
-        app.logger.info('Production-like logging initialized.')
-    elif app.debug:
-        app.logger.setLevel(logging.DEBUG)
-        app.logger.info('Debug logging initialized.')
+    # 리버스 프록시 뒤에서는 X-Forwarded-For/-Proto의 마지막 TRUSTED_PROXY_COUNT개 홉을 신뢰하여
+    # request.remote_addr를 실제 클라이언트 주소로 교정 (제출 IP별 한도가 프록시 주소 하나로 묶이지 않도록)
+    trusted_proxy_count = app.config.get('TRUSTED_PROXY_COUNT', 0)
+    if trusted_proxy_count:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=trusted_proxy_count, x_proto=trusted_proxy_count)
+
+    # --- 로깅 설정 (큐 기반, 디스크 기록은 별도 리스너 스레드) ---
+    if not app.testing:
+        configure_logging(app)
+        app.logger.info('Logging pipeline initialized.')
 
     db.init_app(app)
     migrate.init_app(app, db)
@@ -63,18 +67,29 @@ def create_app(config_class=Config):
     CORS(app, supports_credentials=True, resources={r"/api/*": {"origins": app.config.get("CORS_ORIGINS", ["http://localhost:3000"]) }})
     jwt.init_app(app)
 
+    # 요청 지연/처리 중 요청 수 측정 (에러 핸들러보다 먼저 등록)
+    metrics.init_app(app)
+    sql_instrumentation.init_app(app)
+    tracing.init_app(app)
+
     app.register_error_handler(HTTPException, errors.handle_http_exception)
     app.register_error_handler(Exception, errors.handle_general_exception)
 
-    try:
-        app.logger.info("Attempting to load AI models...") # Flask 로거 사용
-        ai_service.load_models()
-        app.logger.info("AI models loaded (or were already loaded).")
-    except Exception as e:
-        app.logger.error(f"Failed to load AI models on startup: {e}")
+    if app.config.get('INFERENCE_MODE') == 'server':
+        # 모델은 공유 추론 서버(flask inference serve)가 적재하므로 워커에서는 로드하지 않음
+        app.logger.info(f"Using shared inference server at {app.config.get('INFERENCE_SOCKET_PATH')}")
+    else:
+        try:
+            app.logger.info("Attempting to load AI models...") # Flask 로거 사용
+            with app.app_context(): # 백엔드 선택(MODEL_BACKEND)에 앱 설정 사용
+                ai_service.load_models()
+            app.logger.info("AI models loaded (or were already loaded).")
+        except Exception as e:
+            app.logger.error(f"Failed to load AI models on startup: {e}")
 
     # 순환참조를 막기위해 db.init_app(db 초기화) 이후에 모델 임포트
     from . import models # models.py (또는 models 폴더)가 app 폴더 내에 있다고 가정
+    from .utils.identity_cache import get_identity_cache
 
     # --- JWT 콜백 함수들 (models 임포트 필요) ---
     @jwt.token_in_blocklist_loader
@@ -102,7 +117,7 @@ def create_app(config_class=Config):
 
     @jwt.additional_claims_loader
     def add_claims_to_access_token(identity): # identity는 create_access_token에 전달된 값 (user.id)
-        user = models.User.query.get(identity) # models.User 사용
+        user = get_identity_cache().get(identity) # 요청 메모/TTL 캐시 사용
         if user:
             # 프론트엔드 DecodedToken { id: number; name: string; exp: number; } 등 필요한 정보 추가
             return {
@@ -115,13 +130,22 @@ def create_app(config_class=Config):
     @jwt.user_lookup_loader
     def user_lookup_callback(_jwt_header, jwt_data):
         identity = jwt_data["sub"] # "sub"는 create_access_token의 identity
-        return models.User.query.get(identity) # models.User 사용
+        # 요청당 최대 1회 조회, TTL 캐시 적중 시 조회 없음 (라우트는 current_user 사용)
+        return get_identity_cache().get(identity)
     # --- JWT 콜백 함수들 끝 ---
 
     with app.app_context():
         # db.create_all() # Flask-Migrate를 사용
         app.logger.info("Checked for database tables (db.create_all called).")
 
+    # --- DEK 풀 (쓰기 경로에서 DEK 생성/래핑을 제거, 보충 스레드는 gunicorn post_fork에서 시작) ---
+    if app.config.get('DEK_POOL_ENABLED') and not app.testing:
+        try:
+            from .services.key_service import get_key_service
+            get_key_service().init_dek_pool(app)
+        except Exception as e:
+            app.logger.error(f"Failed to start DEK pool: {e}")
+
 
     # --- 블루프린트 등록 ---
     # routes 폴더가 app 폴더 내에 있다고 가정
@@ -129,11 +153,22 @@ def create_app(config_class=Config):
     from .routes.client_routes import client_bp
     from .routes.counselor_routes import counselor_bp
     from .routes.file_routes import file_bp
+    from .routes.metrics_routes import metrics_bp
 
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(client_bp, url_prefix='/api/client')
     app.register_blueprint(counselor_bp, url_prefix='/api/counselor')
     app.register_blueprint(file_bp, url_prefix='/api/files')
+    app.register_blueprint(metrics_bp)
+
+    # --- CLI 명령 등록 ---
+    from .cli import keys_cli, search_cli, inference_cli, models_cli, calls_cli, users_cli
+    app.cli.add_command(keys_cli)
+    app.cli.add_command(search_cli)
+    app.cli.add_command(inference_cli)
+    app.cli.add_command(models_cli)
+    app.cli.add_command(calls_cli)
+    app.cli.add_command(users_cli)
 
 
     # --- 프론트엔드 앱 제공 라우트 (가장 마지막에 등록하는 것이 좋음) ---
@@ -0,0 +1,364 @@
+# backend/app/cli.py
+import os
+import json
+import click
+from flask.cli import AppGroup
+
+keys_cli = AppGroup('keys', help='암호화 키 관리 명령')
+search_cli = AppGroup('search', help='암호화 필드 검색 인덱스 관리 명령')
+inference_cli = AppGroup('inference', help='공유 추론 서버 명령')
+models_cli = AppGroup('models', help='AI 모델 백엔드 관리 명령')
+calls_cli = AppGroup('calls', help='통화 데이터 관리 명령')
+users_cli = AppGroup('users', help='사용자 관리 명령')
+
+@keys_cli.command('migrate-legacy')
+@click.option('--batch-size', default=500, show_default=True, help='한 번에 처리할 레코드 수')
+def migrate_legacy(batch_size):
+    """레코드별 RSA/PQC로 래핑된 레거시 DEK를 KEK 계층으로 재래핑합니다."""
+    from .services.key_service import migrate_legacy_rows
+
+    stats = migrate_legacy_rows(batch_size=batch_size)
+    click.echo(
+        f"재래핑 완료 - 소견서: {stats['reports']}, 파일: {stats['files']} (RSA 래핑만 검증: {stats['files_rsa_only']}), "
+        f"음성: {stats['audio']}, 실패: {stats['failed']}"
+    )
+
+@keys_cli.command('rotate')
+@click.option('--batch-size', default=1000, show_default=True, help='배치당 처리할 레코드 수')
+@click.option('--workers', default=os.cpu_count() or 1, show_default=True, help='병렬 재래핑 워커 프로세스 수')
+@click.option('--restart', is_flag=True, help='체크포인트를 무시하고 처음부터 다시 실행 (스테이징된 새 키는 재사용)')
+def rotate(batch_size, workers, restart):
+    """
+    시스템 RSA/Kyber 키를 교체합니다.
+    에폭 KEK와 레거시 DEK 래핑만 다시 래핑하며 필드/파일 암호문은 건드리지 않습니다.
+    새 키는 재래핑이 끝난 뒤 한 번에 활성화되며, 실행 중인 앱 프로세스는 재시작 없이 새 키를 다시 로드합니다.
+    블라인드 인덱스 키(blind_index.key)는 교체하지 않습니다.
+    """
+    from .services.key_rotation import KeyRotation
+    from .utils.hybrid_encryption import EncryptionError
+
+    def report_progress(table_name, processed):
+        click.echo(f"  {table_name}: {processed}건 재래핑")
+
+    try:
+        stats = KeyRotation(batch_size=batch_size, workers=workers, progress=report_progress).run(restart=restart)
+    except EncryptionError as e:
+        raise click.ClickException(str(e))
+    click.echo(
+        f"키 교체 완료 - 에폭: {stats['key_epochs']}, 소견서: {stats['consultation_reports']}, "
+        f"파일: {stats['encrypted_files']}"
+    )
+    click.echo(f"이전 키 보관 위치: {stats['retired_dir']} (앱은 사용하지 않으며 keys purge-retired로 삭제할 수 있습니다)")
+
+@keys_cli.command('purge-retired')
+@click.option('--keep', default=0, show_default=True, help='삭제하지 않고 남겨 둘 최근 보관 키 세트 수')
+@click.confirmation_option(prompt='보관된 이전 시스템 키를 삭제합니다. 이전 키로 래핑된 백업은 복구할 수 없게 됩니다. 계속할까요?')
+def purge_retired(keep):
+    """키 교체 후 retired에 보관된 이전 시스템 키를 삭제합니다."""
+    from .services.key_rotation import KeyRotation
+    from .utils.hybrid_encryption import EncryptionError
+
+    try:
+        removed = KeyRotation().purge_retired(keep=keep)
+    except EncryptionError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"보관된 이전 키 삭제 완료 - {len(removed)}개")
+
+@search_cli.command('backfill')
+@click.option('--batch-size', default=500, show_default=True, help='배치당 처리할 소견서 수')
+def backfill_search_index(batch_size):
+    """기존 소견서의 이름/전화번호 블라인드 인덱스를 생성합니다."""
+    from . import db
+    from .services.report_service import ReportService
+
+    processed = ReportService().backfill_search_index(db.session, batch_size=batch_size)
+    click.echo(f"검색 인덱스 생성 완료 - 소견서: {processed}건")
+
+@inference_cli.command('serve')
+@click.option('--socket', 'socket_path', default=None, help='Unix 도메인 소켓 경로 (기본값: INFERENCE_SOCKET_PATH)')
+@click.option('--concurrency', default=None, type=int, help='동시에 실행할 모델 추론 수 (기본값: INFERENCE_SERVER_CONCURRENCY)')
+def serve_inference(socket_path, concurrency):
+    """Whisper/RoBERTa를 한 번만 적재하고 앱 워커의 추론 요청을 처리합니다."""
+    from flask import current_app
+    from .services.inference_server import serve
+
+    config = current_app.config
+    socket_path = socket_path or config['INFERENCE_SOCKET_PATH']
+    click.echo(f"추론 서버 소켓: {socket_path}")
+    serve(socket_path,
+          concurrency=concurrency or config['INFERENCE_SERVER_CONCURRENCY'],
+          max_payload=config['INFERENCE_MAX_PAYLOAD_BYTES'])
+
+@inference_cli.command('ping')
+def ping_inference():
+    """추론 서버 연결을 확인합니다."""
+    from .services.inference_client import get_inference_client
+
+    client = get_inference_client()
+    if not client.ping():
+        raise click.ClickException(f"추론 서버에 연결할 수 없습니다: {client.socket_path}")
+    click.echo(f"추론 서버 응답 확인: {client.socket_path}")
+
+@models_cli.command('export-onnx')
+@click.option('--output-dir', default=None, help='내보낼 디렉토리 (기본값: ONNX_MODEL_DIR)')
+@click.option('--opset', default=17, show_default=True, help='ONNX opset 버전')
+def export_onnx_models(output_dir, opset):
+    """RoBERTa 분류기와 Whisper 인코더/디코더를 그래프 최적화된 ONNX로 내보냅니다."""
+    from flask import current_app
+    from .services.model_backends import export_onnx
+    from .services.model_registry import registry_from_config
+
+    output_dir = output_dir or current_app.config['ONNX_MODEL_DIR']
+    meta = export_onnx(output_dir, opset=opset, registry=registry_from_config())
+    click.echo(f"ONNX 내보내기 완료: {output_dir} (opset {meta['opset']}, 디코더 프롬프트 {meta['decoder_prompt_ids']})")
+
+@models_cli.command('snapshot')
+@click.option('--whisper-revision', default='main', show_default=True, help='Whisper 모델 리비전 (브랜치/태그/커밋)')
+@click.option('--roberta-revision', default='main', show_default=True, help='RoBERTa 모델 리비전 (브랜치/태그/커밋)')
+@click.option('--draft-revision', default=None,
+              help='보조 디코딩용 초안 모델(WHISPER_DRAFT_MODEL_NAME) 리비전 (지정 시에만 등록)')
+@click.option('--registry-dir', default=None, help='레지스트리 디렉토리 (기본값: MODEL_REGISTRY_DIR)')
+def snapshot_models(whisper_revision, roberta_revision, draft_revision, registry_dir):
+    """모델을 커밋 리비전으로 고정하여 내려받고 체크섬과 함께 레지스트리에 등록합니다 (네트워크 필요)."""
+    from flask import current_app
+    from .services.model_backends import WHISPER_MODEL_NAME, ROBERTA_MODEL_NAME
+    from .services.model_registry import ModelRegistry
+
+    registry = ModelRegistry(registry_dir or current_app.config['MODEL_REGISTRY_DIR'])
+    models = [('whisper', WHISPER_MODEL_NAME, whisper_revision), ('roberta', ROBERTA_MODEL_NAME, roberta_revision)]
+    if draft_revision:
+        models.append(('whisper_draft', current_app.config['WHISPER_DRAFT_MODEL_NAME'], draft_revision))
+    for alias, repo_id, revision in models:
+        snapshot = registry.snapshot(alias, repo_id, revision)
+        click.echo(f"[{alias}] {snapshot.version} ({len(snapshot.files)}개 파일)")
+    click.echo(f"레지스트리: {registry.manifest_path}")
+
+@models_cli.command('verify')
+@click.option('--registry-dir', default=None, help='레지스트리 디렉토리 (기본값: MODEL_REGISTRY_DIR)')
+def verify_models(registry_dir):
+    """레지스트리 스냅샷의 모든 파일 체크섬을 다시 계산하여 검증합니다."""
+    from flask import current_app
+    from .services.model_registry import ModelRegistry, ModelRegistryError
+
+    registry = ModelRegistry(registry_dir or current_app.config['MODEL_REGISTRY_DIR'])
+    try:
+        for alias, snapshot in registry.snapshots().items():
+            elapsed = registry.verify(alias, force=True)
+            click.echo(f"[{alias}] {snapshot.version} 검증 완료 ({elapsed:.2f}s)")
+    except ModelRegistryError as e:
+        raise click.ClickException(str(e))
+
+@models_cli.command('benchmark')
+@click.option('--backends', default='torch,onnx', show_default=True, help='비교할 백엔드 (첫 번째가 기준)')
+@click.option('--audio', 'audio_paths', multiple=True, help='오디오 파일 또는 디렉토리 (여러 번 지정 가능)')
+@click.option('--texts', 'texts_file', type=click.Path(exists=True), help='위험도 분류용 텍스트 파일 (한 줄에 하나)')
+@click.option('--runs', default=3, show_default=True, help='반복 측정 횟수')
+@click.option('--json-output', type=click.Path(), help='결과를 JSON 파일로 저장')
+def benchmark_models(backends, audio_paths, texts_file, runs, json_output):
+    """백엔드별 지연 시간과 위험도 레이블 일치율을 측정합니다."""
+    from .services.model_backends import create_backend
+    from .services.model_benchmark import collect_audio_files, run_benchmark
+
+    texts = []
+    if texts_file:
+        with open(texts_file, encoding='utf-8') as f:
+            texts = [line.strip() for line in f if line.strip()]
+    audio_files = collect_audio_files(audio_paths)
+    if not audio_files and not texts:
+        raise click.UsageError('--audio 또는 --texts 중 하나 이상이 필요합니다.')
+
+    report = run_benchmark([create_backend(name.strip()) for name in backends.split(',')],
+                           audio_files=audio_files, texts=texts, runs=runs)
+    for result in report['results']:
+        click.echo(f"[{result['backend']}] 적재 {result['load_seconds']}s, "
+                   f"음성 인식 {result['transcribe'] or '-'}, 위험도 분류 {result['predict_risk'] or '-'}")
+    for parity in report['parity']:
+        click.echo(f"[{parity['backend']} vs {parity['reference']}] 레이블 일치율 - 텍스트: {parity['text_label_agreement']}, "
+                   f"음성: {parity['audio_label_agreement']}, 전사 완전 일치: {parity['transcript_exact_match']}")
+    if json_output:
+        with open(json_output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+@models_cli.command('pipeline-benchmark')
+@click.option('--backend', 'backend_name', default=None, help='모델 백엔드 (기본값: MODEL_BACKEND)')
+@click.option('--audio', 'audio_paths', multiple=True, required=True, help='오디오 파일 또는 디렉토리 (여러 번 지정 가능)')
+@click.option('--workers', default=None, type=int, help='전처리 프로세스 수 (기본값: AUDIO_PIPELINE_WORKERS)')
+@click.option('--queue-size', default=None, type=int, help='추론 대기 슬롯 수 (기본값: AUDIO_PIPELINE_QUEUE_SIZE)')
+@click.option('--json-output', type=click.Path(), help='결과를 JSON 파일로 저장')
+def benchmark_audio_pipeline(backend_name, audio_paths, workers, queue_size, json_output):
+    """순차 처리 대비 병렬 전처리 파이프라인의 처리량을 측정합니다."""
+    from flask import current_app
+    from .services.model_backends import create_backend
+    from .services.model_benchmark import collect_audio_files, benchmark_pipeline
+
+    audio_files = collect_audio_files(audio_paths)
+    if not audio_files:
+        raise click.UsageError('오디오 파일이 없습니다.')
+
+    backend = create_backend(backend_name or current_app.config['MODEL_BACKEND'])
+    report = benchmark_pipeline(backend, audio_files, workers=workers, queue_size=queue_size)
+    click.echo(f"[{report['backend']}] {report['files']}개 파일 ({', '.join(report['formats'])}), "
+               f"음성 {report['audio_seconds']}s, 워커 {report['workers']}, 슬롯 {report['queue_size']}")
+    for mode in ('sequential', 'pipelined'):
+        click.echo(f"  {mode}: {report[mode]}")
+    click.echo(f"  처리량 향상: {report['speedup']}x, 전사 일치율: {report['transcript_exact_match']}")
+    if json_output:
+        with open(json_output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+@models_cli.command('decoding-benchmark')
+@click.option('--backend', 'backend_name', default=None, help='모델 백엔드 (기본값: MODEL_BACKEND)')
+@click.option('--audio', 'audio_paths', multiple=True, required=True,
+              help='오디오 파일 또는 디렉토리 (같은 이름의 .txt가 있으면 정답 전사로 사용, 여러 번 지정 가능)')
+@click.option('--profiles', default='fast-triage,accurate', show_default=True, help='비교할 디코딩 프로필')
+@click.option('--runs', default=1, show_default=True, help='반복 측정 횟수')
+@click.option('--json-output', type=click.Path(), help='결과를 JSON 파일로 저장')
+def benchmark_decoding(backend_name, audio_paths, profiles, runs, json_output):
+    """디코딩 프로필별 음성 인식 지연 시간과 WER/CER을 측정합니다."""
+    from flask import current_app
+    from .services.model_backends import create_backend
+    from .services.model_benchmark import load_fixtures, benchmark_decoding_profiles
+
+    fixtures = load_fixtures(audio_paths)
+    if not fixtures:
+        raise click.UsageError('오디오 파일이 없습니다.')
+
+    backend = create_backend(backend_name or current_app.config['MODEL_BACKEND'])
+    report = benchmark_decoding_profiles(backend, fixtures, [name.strip() for name in profiles.split(',')], runs=runs)
+    click.echo(f"[{report['backend']}] {report['files']}개 파일 (정답 전사 {report['scored_files']}개), 음성 {report['audio_seconds']}s")
+    for result in report['results']:
+        click.echo(f"  {result['profile']} (빔 {result['num_beams']}): {result['transcribe']}, "
+                   f"RTF {result['real_time_factor']}, WER {result['wer']}, CER {result['cer']}")
+    if json_output:
+        with open(json_output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+@models_cli.command('assisted-benchmark')
+@click.option('--audio', 'audio_paths', multiple=True, required=True, help='오디오 파일 또는 디렉토리 (여러 번 지정 가능)')
+@click.option('--profile', default='fast-triage', show_default=True, help='디코딩 프로필 (탐욕 디코딩 프로필만 가능)')
+@click.option('--runs', default=1, show_default=True, help='반복 측정 횟수')
+@click.option('--json-output', type=click.Path(), help='결과를 JSON 파일로 저장')
+def benchmark_assisted(audio_paths, profile, runs, json_output):
+    """초안 모델 보조 디코딩 사용/미사용의 초당 토큰 수와 전사 일치 여부를 비교합니다 (torch 백엔드)."""
+    from flask import current_app
+    from .services.model_backends import TorchBackend
+    from .services.model_benchmark import load_fixtures, benchmark_assisted_decoding
+    from .services.model_registry import registry_from_config
+
+    fixtures = load_fixtures(audio_paths)
+    if not fixtures:
+        raise click.UsageError('오디오 파일이 없습니다.')
+
+    # WHISPER_ASSISTED_PROFILES 설정과 무관하게 초안 모델을 적재하여 비교
+    backend = TorchBackend(registry=registry_from_config(),
+                           draft_model_name=current_app.config['WHISPER_DRAFT_MODEL_NAME'])
+    try:
+        report = benchmark_assisted_decoding(backend, fixtures, profile=profile, runs=runs)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"[{report['backend']}/{report['profile']}] {report['files']}개 파일, 음성 {report['audio_seconds']}s")
+    for mode in ('baseline', 'assisted'):
+        click.echo(f"  {mode}: {report[mode]['tokens_per_second']} tokens/s, {report[mode]['transcribe']}")
+    click.echo(f"  속도 향상: {report['speedup']}x, 전사 일치율: {report['transcript_exact_match']}")
+    if json_output:
+        with open(json_output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+@calls_cli.command('reanalyze')
+@click.option('--call-id', 'call_ids', multiple=True, type=int, help='재분석할 통화 ID (여러 번 지정 가능)')
+@click.option('--status', 'statuses', multiple=True, help='재분석할 analysis_status (예: failed, no_speech, pending_retry)')
+@click.option('--all', 'all_calls', is_flag=True, help='모든 통화를 재분석')
+@click.option('--batch-size', default=100, show_default=True, help='배치당 처리할 통화 수')
+@click.option('--workers', default=0, show_default=True, help='병렬 전처리 프로세스 수 (0이면 순차 처리)')
+@click.option('--priority', type=click.Choice(['interactive', 'batch']), default='batch', show_default=True,
+              help='추론 우선순위 (batch는 CPU 점유율이 제한되고 접수 중인 통화에 양보)')
+@click.option('--profile', type=click.Choice(['fast-triage', 'accurate']), default=None,
+              help='음성 인식 디코딩 프로필 (기본값: WHISPER_DECODING_PROFILE)')
+def reanalyze_calls(call_ids, statuses, all_calls, batch_size, workers, priority, profile):
+    """
+    저장된 표준 형식(16kHz FLAC) 음성으로 통화를 다시 분석합니다.
+    표준 형식 파일이 없는 기존 통화는 원본을 한 번 디코딩하여 생성합니다.
+
+    batch 우선순위는 INFERENCE_MODE=server이면 추론 서버 스케줄러가, 로컬 모드이면 웹 워커와 같은
+    ADMISSION_STORE_PATH를 통해(INFERENCE_SHARED_LANES) 접수 중인 통화에 양보합니다.
+    로컬 모드에서 INFERENCE_SHARED_LANES=0이면 이 프로세스 안에서만 점유율이 제한됩니다.
+
+    추론 지연/장애로 위험도 미정(pending_retry)으로 접수된 통화는 자동으로 재분석되지 않으므로,
+    운영 환경에서는 `--status pending_retry`를 cron 등으로 주기적으로 실행해야 합니다.
+    """
+    from .services.call_service import reanalyze_calls as run_reanalysis
+
+    if not (call_ids or statuses or all_calls):
+        raise click.UsageError('--call-id, --status 또는 --all 중 하나를 지정하세요.')
+
+    def report_progress(last_id, stats):
+        click.echo(f"  통화 {last_id}까지 처리: {stats}")
+
+    stats = run_reanalysis(call_ids=call_ids, statuses=statuses, batch_size=batch_size,
+                           progress=report_progress, workers=workers, priority=priority, profile=profile)
+    click.echo(
+        f"재분석 완료 - 완료: {stats['completed']}, 음성 없음: {stats['no_speech']}, "
+        f"실패: {stats['failed']}, 재시도 대기: {stats['pending_retry']}, 건너뜀: {stats['skipped']}"
+    )
+
+@calls_cli.command('import')
+@click.argument('directory', type=click.Path(exists=True, file_okay=False))
+@click.option('--batch-size', default=None, type=int, help='트랜잭션당 INSERT할 통화 수 (기본값: CALL_IMPORT_BATCH_SIZE)')
+@click.option('--workers', default=None, type=int, help='전처리 프로세스 수 (기본값: AUDIO_PIPELINE_WORKERS)')
+@click.option('--status', default='archived', show_default=True, help='가져온 통화의 상태 (대기열에 넣으려면 pending)')
+@click.option('--phone-pattern', default=None, help='파일명에서 전화번호를 추출할 정규식 (첫 번째 그룹 사용)')
+@click.option('--default-phone', default='unknown', show_default=True, help='파일명에 전화번호가 없을 때 사용할 값')
+@click.option('--profile', type=click.Choice(['fast-triage', 'accurate']), default=None,
+              help='음성 인식 디코딩 프로필 (기본값: WHISPER_DECODING_PROFILE)')
+@click.option('--restart', is_flag=True, help='체크포인트를 무시하고 처음부터 다시 실행')
+def import_calls(directory, batch_size, workers, status, phone_pattern, default_phone, profile, restart):
+    """
+    보관된 통화 녹음 디렉토리를 일괄 가져옵니다.
+    디코딩/특징 추출은 병렬 파이프라인으로, 저장은 배치 단위 트랜잭션으로 수행하며 중단 시 이어서 진행합니다.
+
+    추론은 batch 우선순위로 실행됩니다. 로컬 모드에서 접수 중인 통화에 양보하려면 웹 워커와 같은
+    ADMISSION_STORE_PATH를 사용해야 합니다 (INFERENCE_SHARED_LANES).
+    """
+    from flask import current_app
+    from .services.call_import import CallImport, DEFAULT_PHONE_PATTERN
+
+    def report_progress(stats):
+        click.echo(
+            f"  {stats['processed']}/{stats['total']} 처리 (가져옴 {stats['imported']}, 중복 {stats['duplicates']}, "
+            f"오류 {stats['errors']}) - {stats['files_per_second']}건/s, 음성 {stats['audio_seconds_per_second']}s/s, "
+            f"남은 시간 약 {stats['eta_seconds']}s"
+        )
+
+    config = current_app.config
+    stats = CallImport(
+        directory,
+        batch_size=batch_size or config['CALL_IMPORT_BATCH_SIZE'],
+        workers=workers,
+        status=status,
+        phone_pattern=phone_pattern or DEFAULT_PHONE_PATTERN,
+        default_phone=default_phone,
+        checkpoint_dir=config['CALL_IMPORT_CHECKPOINT_DIR'],
+        upload_folder=config['UPLOAD_FOLDER'],
+        progress=report_progress,
+        profile=profile
+    ).run(restart=restart)
+    click.echo(
+        f"가져오기 완료 - 가져옴: {stats['imported']} (분석 완료 {stats['completed']}, 음성 없음 {stats['no_speech']}, "
+        f"분석 실패 {stats['failed']}, 재시도 대기 {stats['pending_retry']}), 중복: {stats['duplicates']}, 오류: {stats['errors']}, "
+        f"{stats['elapsed_seconds']}s ({stats['files_per_second']}건/s)"
+    )
+
+@users_cli.command('set-role')
+@click.argument('username')
+@click.argument('role', type=click.Choice(['counselor', 'admin']))
+def set_role(username, role):
+    """사용자 역할을 변경합니다 (admin: 추적 조회 등 관리자 API 접근)."""
+    from . import db
+    from .models import User
+
+    user = User.query.filter_by(username=username).first()
+    if user is None:
+        raise click.ClickException(f"사용자를 찾을 수 없습니다: {username}")
+    user.role = role
+    db.session.commit()
+    click.echo(f"{username}의 역할을 {role}(으)로 변경했습니다.")
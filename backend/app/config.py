@@ -29,4 +29,135 @@ class Config:
 
     # --- 로깅 설정 ---
     LOG_LEVEL = logging.INFO # 기본 로그 레벨 (DEBUG, INFO, WARNING, ERROR, CRITICAL)
-    # LOG_FILE_PATH = os.path.join(BASEDIR, 'instance', 'app.log') # 로그 파일 경로 (예시)
\ No newline at end of file
+    # LOG_FILE_PATH = os.path.join(BASEDIR, 'instance', 'app.log') # 로그 파일 경로 (예시)
+    LOG_FORMAT = os.environ.get('LOG_FORMAT', 'json')  # 'json' 또는 'text'
+    LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', 10000))  # 가득 차면 레코드를 버림 (요청 스레드는 대기하지 않음)
+    # 서브시스템별 로그 레벨 ('로거=레벨,...' 형식으로 재정의 가능)
+    LOG_LEVELS = os.environ.get('LOG_LEVELS') or {
+        'app.utils.hybrid_encryption': 'WARNING',
+        'app.services.key_service': 'INFO',
+        'sqlalchemy.engine': 'WARNING',
+        'werkzeug': 'INFO',
+    }
+    # --- 키 계층(KEK) 설정 ---
+    # KEK는 아래 두 조건 중 먼저 도달하는 시점에 새 에폭으로 교체됨
+    KEK_ROTATION_HOURS = int(os.environ.get('KEK_ROTATION_HOURS', 24))        # 에폭 유지 시간
+    KEK_ROTATION_RECORDS = int(os.environ.get('KEK_ROTATION_RECORDS', 10000)) # 에폭당 최대 레코드 수
+
+    # --- DEK 풀 설정 (미리 래핑된 DEK를 백그라운드에서 준비) ---
+    DEK_POOL_ENABLED = os.environ.get('DEK_POOL_ENABLED', '1') == '1'
+    DEK_POOL_SIZE = int(os.environ.get('DEK_POOL_SIZE', 64))                  # 풀 최대 깊이
+    DEK_POOL_LOW_WATERMARK = int(os.environ.get('DEK_POOL_LOW_WATERMARK', 16)) # 이 이하로 떨어지면 보충
+
+    # --- 블라인드 인덱스 (암호화 필드 검색) ---
+    BLIND_INDEX_KEY = os.environ.get('BLIND_INDEX_KEY')  # hex 문자열 (미설정 시 app/keys/blind_index.key 사용, keys rotate 대상 아님)
+    BLIND_INDEX_NAME_MIN_PREFIX = int(os.environ.get('BLIND_INDEX_NAME_MIN_PREFIX', 2))   # 이름 최소 접두어 길이 (2 이상, 한 글자 토큰은 성씨 분포를 노출)
+    BLIND_INDEX_PHONE_MIN_PREFIX = int(os.environ.get('BLIND_INDEX_PHONE_MIN_PREFIX', 3)) # 전화번호 최소 접두어 길이
+
+    # --- 비밀번호 해시 (Argon2id) ---
+    ARGON2_TIME_COST = int(os.environ.get('ARGON2_TIME_COST', 3))
+    ARGON2_MEMORY_COST = int(os.environ.get('ARGON2_MEMORY_COST', 65536))  # KiB (64MB)
+    ARGON2_PARALLELISM = int(os.environ.get('ARGON2_PARALLELISM', 4))
+    ARGON2_MAX_CONCURRENCY = int(os.environ.get('ARGON2_MAX_CONCURRENCY', 4))  # 동시 해시 수 (메모리 상한 = 동시 수 x 64MB)
+    ARGON2_MAX_QUEUE = int(os.environ.get('ARGON2_MAX_QUEUE', 32))             # 대기열 최대 길이 (초과 시 503)
+    ARGON2_QUEUE_TIMEOUT_SECONDS = float(os.environ.get('ARGON2_QUEUE_TIMEOUT_SECONDS', 5))
+    ARGON2_HASH_BUDGET_SECONDS = float(os.environ.get('ARGON2_HASH_BUDGET_SECONDS', 5))  # 해시 1회 실행 시간 상한 (대기 시간과 합산해 요청이 기다리는 최대 시간)
+
+    # --- 사용자 식별 캐시 (JWT user_lookup) ---
+    USER_CACHE_TTL_SECONDS = float(os.environ.get('USER_CACHE_TTL_SECONDS', 30))  # 다른 프로세스의 변경이 반영되는 최대 지연
+    USER_CACHE_MAX_ENTRIES = int(os.environ.get('USER_CACHE_MAX_ENTRIES', 1024))
+
+    # --- 지표 (/metrics, Prometheus 텍스트 형식) ---
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')  # /metrics 스크레이프용 Bearer 토큰 (미설정 시 /metrics 비활성화)
+    METRICS_MULTIPROCESS_DIR = os.environ.get('METRICS_MULTIPROCESS_DIR')  # 워커별 지표 파일 디렉토리 (설정 시 스크레이프 때 합산, 워커 2개 이상이면 gunicorn.conf.py가 기본 설정)
+    METRICS_MULTIPROCESS_INTERVAL = float(os.environ.get('METRICS_MULTIPROCESS_INTERVAL', 5))  # 워커별 지표 기록 주기(초)
+
+    # --- SQL 계측 (요청별 쿼리 예산, 느린 쿼리 EXPLAIN) ---
+    SQL_QUERY_BUDGET = int(os.environ.get('SQL_QUERY_BUDGET', 20))          # 요청당 최대 쿼리 수 (0이면 비활성화)
+    SQL_TIME_BUDGET_MS = float(os.environ.get('SQL_TIME_BUDGET_MS', 200))  # 요청당 최대 DB 시간
+    SQL_SLOW_QUERY_MS = float(os.environ.get('SQL_SLOW_QUERY_MS', 100))    # 이 시간을 넘는 문장은 EXPLAIN과 함께 기록
+    SQL_EXPLAIN_SLOW_QUERIES = os.environ.get('SQL_EXPLAIN_SLOW_QUERIES', '1') == '1'
+
+    # --- 접수 파이프라인 추적 (스팬, /api/admin/traces) ---
+    TRACING_ENABLED = os.environ.get('TRACING_ENABLED', '1') == '1'
+    TRACE_EXPORT = os.environ.get('TRACE_EXPORT', 'memory')  # 'memory', 'jsonl' 또는 'memory,jsonl' ('memory'는 프로세스별이므로 워커 2개 이상이면 gunicorn.conf.py가 'jsonl'로 설정)
+    TRACE_EXPORT_PATH = os.environ.get('TRACE_EXPORT_PATH') or os.path.join(BASEDIR, 'instance', 'traces.jsonl')
+    TRACE_BUFFER_SIZE = int(os.environ.get('TRACE_BUFFER_SIZE', 5000))  # 메모리 링 버퍼에 보관할 최근 스팬 수
+
+    # --- 공유 추론 서버 (Unix 도메인 소켓) ---
+    INFERENCE_MODE = os.environ.get('INFERENCE_MODE', 'local')  # 'local': 워커마다 모델 적재, 'server': 공유 추론 서버 사용
+    INFERENCE_SOCKET_PATH = os.environ.get('INFERENCE_SOCKET_PATH') or os.path.join(BASEDIR, 'instance', 'inference.sock')
+    INFERENCE_POOL_SIZE = int(os.environ.get('INFERENCE_POOL_SIZE', 4))  # 워커 프로세스당 최대 연결 수
+    INFERENCE_CONNECT_TIMEOUT_SECONDS = float(os.environ.get('INFERENCE_CONNECT_TIMEOUT_SECONDS', 1))
+    INFERENCE_TIMEOUT_SECONDS = float(os.environ.get('INFERENCE_TIMEOUT_SECONDS', 120))  # 요청당 응답 대기 시간
+    INFERENCE_SERVER_CONCURRENCY = int(os.environ.get('INFERENCE_SERVER_CONCURRENCY', 1))  # 서버에서 동시에 실행할 추론 수
+    INFERENCE_MAX_PAYLOAD_BYTES = int(os.environ.get('INFERENCE_MAX_PAYLOAD_BYTES', 64 * 1024 * 1024))
+
+    # --- 모델 실행 백엔드 ---
+    MODEL_BACKEND = os.environ.get('MODEL_BACKEND', 'torch')  # 'torch', 'onnx'(ONNX Runtime CPU), 'stub'(모델 없음)
+    ONNX_MODEL_DIR = os.environ.get('ONNX_MODEL_DIR') or os.path.join(BASEDIR, 'instance', 'onnx_models')  # flask models export-onnx 출력
+    ONNX_INTRA_OP_THREADS = int(os.environ.get('ONNX_INTRA_OP_THREADS', 0))  # 0이면 ONNX Runtime 기본값
+
+    # --- 음성 구간 검출 (Whisper 이전 무음 제거) ---
+    VAD_ENABLED = os.environ.get('VAD_ENABLED', '1') == '1'
+    VAD_FRAME_MS = int(os.environ.get('VAD_FRAME_MS', 30))
+    VAD_ENERGY_THRESHOLD_DB = float(os.environ.get('VAD_ENERGY_THRESHOLD_DB', -45))  # 이보다 작은 프레임은 무음 (dBFS)
+    VAD_NOISE_MARGIN_DB = float(os.environ.get('VAD_NOISE_MARGIN_DB', 10))  # 잡음 바닥보다 이만큼 커야 음성
+    VAD_MAX_GAP_MS = int(os.environ.get('VAD_MAX_GAP_MS', 700))  # 내부 무음은 이 길이까지만 남김
+    VAD_PADDING_MS = int(os.environ.get('VAD_PADDING_MS', 200))  # 음성 구간 앞뒤 여유
+    VAD_MIN_SPEECH_MS = int(os.environ.get('VAD_MIN_SPEECH_MS', 250))  # 음성이 이보다 짧으면 '음성 없음'으로 처리
+    VAD_DROP_TONES = os.environ.get('VAD_DROP_TONES', '1') == '1'  # 대기음/신호음 프레임 제외
+
+    # --- 병렬 오디오 전처리 파이프라인 (일괄 재분석/가져오기) ---
+    AUDIO_PIPELINE_WORKERS = int(os.environ.get('AUDIO_PIPELINE_WORKERS', min(4, os.cpu_count() or 1)))  # 디코딩/특징 추출 프로세스 수
+    AUDIO_PIPELINE_QUEUE_SIZE = int(os.environ.get('AUDIO_PIPELINE_QUEUE_SIZE', 8))  # 추론 대기 중인 전처리 결과 최대 수 (공유 메모리 슬롯 수)
+    AUDIO_PIPELINE_SLOT_BYTES = int(os.environ.get('AUDIO_PIPELINE_SLOT_BYTES', 128 * 3000 * 4))  # 슬롯 크기 (Whisper log-mel 30초 기준)
+
+    # --- 업로드 스트리밍 접수 ---
+    MAX_UPLOAD_BYTES = int(os.environ.get('MAX_UPLOAD_BYTES', 50 * 1024 * 1024))  # 통화 녹음 파일 최대 크기 (스트리밍 중 검사)
+    MAX_CONTENT_LENGTH = MAX_UPLOAD_BYTES + 1024 * 1024  # 요청 본문 최대 크기 (multipart 폼 필드 여유 포함)
+    MAX_AUDIO_SECONDS = float(os.environ.get('MAX_AUDIO_SECONDS', 3600))  # 디코딩할 최대 음성 길이 (넘으면 디코딩 오류), 0이면 무제한
+    UPLOAD_CHUNK_BYTES = int(os.environ.get('UPLOAD_CHUNK_BYTES', 1024 * 1024))  # 업로드를 읽는 청크 크기
+
+    # --- 보관 녹음 일괄 가져오기 (flask calls import) ---
+    CALL_IMPORT_BATCH_SIZE = int(os.environ.get('CALL_IMPORT_BATCH_SIZE', 200))  # 트랜잭션(일괄 INSERT)당 통화 수
+    CALL_IMPORT_CHECKPOINT_DIR = os.environ.get('CALL_IMPORT_CHECKPOINT_DIR') or os.path.join(BASEDIR, 'instance', 'imports')
+
+    # --- 통화 제출 접수 제어 (/api/client/submit, 인증 없음) ---
+    SUBMIT_ADMISSION_ENABLED = os.environ.get('SUBMIT_ADMISSION_ENABLED', '1') == '1'
+    TRUSTED_PROXY_COUNT = int(os.environ.get('TRUSTED_PROXY_COUNT', 0))  # 앱 앞의 리버스 프록시 수 (X-Forwarded-For 신뢰 홉, 0이면 헤더 무시: 위조 방지)
+    ADMISSION_STORE_PATH = os.environ.get('ADMISSION_STORE_PATH') or os.path.join(BASEDIR, 'instance', 'admission.sqlite')  # 워커 간 공유 상태
+    SUBMIT_RATE_LIMIT_PER_IP = int(os.environ.get('SUBMIT_RATE_LIMIT_PER_IP', 10))  # 버킷 크기 (0이면 비활성화)
+    SUBMIT_RATE_LIMIT_PER_IP_PERIOD_SECONDS = float(os.environ.get('SUBMIT_RATE_LIMIT_PER_IP_PERIOD_SECONDS', 60))  # 버킷이 다 차는 시간
+    SUBMIT_RATE_LIMIT_PER_PHONE = int(os.environ.get('SUBMIT_RATE_LIMIT_PER_PHONE', 3))
+    SUBMIT_RATE_LIMIT_PER_PHONE_PERIOD_SECONDS = float(os.environ.get('SUBMIT_RATE_LIMIT_PER_PHONE_PERIOD_SECONDS', 600))
+    # 전체 워커에서 동시에 분석할 제출 수 (기본: 코어 하나는 상담사 API용으로 남김)
+    SUBMIT_MAX_ANALYSIS_BACKLOG = int(os.environ.get('SUBMIT_MAX_ANALYSIS_BACKLOG', max(1, (os.cpu_count() or 1) - 1)))
+    SUBMIT_ANALYSIS_LEASE_SECONDS = float(os.environ.get('SUBMIT_ANALYSIS_LEASE_SECONDS', 600))  # 워커가 비정상 종료한 경우 자리 회수 시간
+    SUBMIT_RETRY_AFTER_SECONDS = float(os.environ.get('SUBMIT_RETRY_AFTER_SECONDS', 15))  # 과부하 503의 Retry-After
+
+    # --- 추론 우선순위 스케줄링 (live > interactive > batch) ---
+    INFERENCE_LOCAL_CONCURRENCY = int(os.environ.get('INFERENCE_LOCAL_CONCURRENCY', 1))  # 프로세스 내 동시 모델 실행 수 (추론 서버는 INFERENCE_SERVER_CONCURRENCY)
+    INFERENCE_BATCH_CPU_SHARE = float(os.environ.get('INFERENCE_BATCH_CPU_SHARE', 0.5))  # batch 작업이 모델 실행에 쓸 수 있는 시간 비율 (0~1]
+    INFERENCE_SHARED_LANES = os.environ.get('INFERENCE_SHARED_LANES', '1') == '1'  # 로컬 모드: batch 작업이 다른 프로세스(웹 워커)의 live/interactive 추론에 양보 (ADMISSION_STORE_PATH 공유)
+
+    # --- 추론 제한 시간 / 차단기 ---
+    INFERENCE_DEADLINE_SECONDS = float(os.environ.get('INFERENCE_DEADLINE_SECONDS', 90))  # 통화 하나의 분석(슬롯 대기 포함) 제한 시간, 0이면 무제한
+    WHISPER_GENERATE_TIMEOUT_SECONDS = float(os.environ.get('WHISPER_GENERATE_TIMEOUT_SECONDS', 45))  # 디코딩 루프 제한 시간 (max_time)
+    WHISPER_TOKENS_PER_SECOND = float(os.environ.get('WHISPER_TOKENS_PER_SECOND', 12))  # 음성 1초당 허용할 출력 토큰 수
+    WHISPER_MIN_NEW_TOKENS = int(os.environ.get('WHISPER_MIN_NEW_TOKENS', 32))  # 짧은 녹음에도 허용할 최소 토큰 수
+    INFERENCE_BREAKER_FAILURE_THRESHOLD = int(os.environ.get('INFERENCE_BREAKER_FAILURE_THRESHOLD', 5))  # 연속 실패/시간 초과 횟수
+    INFERENCE_BREAKER_RESET_SECONDS = float(os.environ.get('INFERENCE_BREAKER_RESET_SECONDS', 60))  # 차단 후 시험 호출까지의 시간
+
+    # --- 오프라인 모델 레지스트리 (고정 리비전 스냅샷, flask models snapshot) ---
+    MODEL_REGISTRY_DIR = os.environ.get('MODEL_REGISTRY_DIR') or os.path.join(BASEDIR, 'instance', 'models')  # registry.json + <별칭>/<리비전>/
+    MODEL_REGISTRY_REQUIRED = os.environ.get('MODEL_REGISTRY_REQUIRED', '0') == '1'  # 1이면 레지스트리 없이 허브 이름으로 적재하지 않음 (폐쇄망)
+    MODEL_VERIFY_STATE_DIR = os.environ.get('MODEL_VERIFY_STATE_DIR') or os.path.join(BASEDIR, 'instance', 'model_verify')  # 체크섬 검증 스탬프 (레지스트리는 읽기 전용 가능)
+
+    # --- Whisper 디코딩 프로필 (언어/작업 고정, 탐색 방식, 토큰 상한) ---
+    WHISPER_DECODING_PROFILE = os.environ.get('WHISPER_DECODING_PROFILE', 'fast-triage')  # 작업에서 지정하지 않았을 때의 프로필 ('fast-triage', 'accurate')
+    WHISPER_ACCURATE_NUM_BEAMS = int(os.environ.get('WHISPER_ACCURATE_NUM_BEAMS', 4))  # 'accurate' 프로필의 빔 크기
+
+    # --- Whisper 보조(assisted) 디코딩 (소형 초안 모델이 토큰을 제안하고 본 모델이 검증) ---
+    WHISPER_ASSISTED_PROFILES = tuple(p.strip() for p in os.environ.get('WHISPER_ASSISTED_PROFILES', '').split(',') if p.strip())  # 보조 디코딩을 쓸 프로필 (빈 값이면 사용 안 함, 빔 서치 프로필은 제외)
+    WHISPER_DRAFT_MODEL_NAME = os.environ.get('WHISPER_DRAFT_MODEL_NAME', 'openai/whisper-tiny')  # 레지스트리 별칭 'whisper_draft'로 고정 (본 모델과 어휘가 같아야 함)
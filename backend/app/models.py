@@ -3,7 +3,7 @@ from . import db # app/__init__.py 에서 생성된 db 객체를 가져옴
 from datetime import datetime, timezone
 import logging
 from .utils.hybrid_encryption import EncryptionError
-from argon2 import PasswordHasher, Type
+from .utils.password_hashing import get_password_hasher
 
 logger = logging.getLogger(__name__)
 
@@ -14,29 +14,20 @@ class User(db.Model): # 예시 모델, 실제 모델명으로 대체
     password_hash = db.Column(db.String(128), nullable=False) # 해시된 비밀번호 저장
     name = db.Column(db.String(100), nullable=False)
     status = db.Column(db.String(20), default='offline', nullable=False) # 'offline', 'available', 'busy'
+    role = db.Column(db.String(20), default='counselor', server_default='counselor', nullable=False) # 'counselor', 'admin'
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
 
     def set_password(self, password):
-        """비밀번호를 Argon2id로 해시하여 저장합니다."""
-        ph = PasswordHasher(
-            time_cost=3,        # 반복 횟수 (기본값: 3)
-            memory_cost=65536,  # 메모리 사용량 (64MB)
-            parallelism=4,      # 병렬 처리 수
-            hash_len=32,        # 해시 길이
-            salt_len=16,        # 솔트 길이
-            encoding='utf-8',   # 인코딩
-            type=Type.ID        # Argon2id 사용
-        )
-        self.password_hash = ph.hash(password)
+        """비밀번호를 Argon2id로 해시하여 저장합니다 (전용 실행기에서 수행)."""
+        self.password_hash = get_password_hasher().hash(password)
 
     def check_password(self, password):
-        """비밀번호가 일치하는지 Argon2id로 확인합니다."""
-        try:
-            ph = PasswordHasher()
-            ph.verify(self.password_hash, password)
-            return True
-        except Exception:
-            return False
+        """비밀번호가 일치하는지 Argon2id로 확인합니다. 과부하 시 HasherBusyError가 발생합니다."""
+        return get_password_hasher().verify(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        """저장된 해시가 현재 Argon2 파라미터와 다른지 확인합니다."""
+        return get_password_hasher().needs_rehash(self.password_hash)
 
     def __repr__(self):
         return f'<User {self.username}>'
@@ -47,10 +38,16 @@ class ClientCall(db.Model):
     phone_number = db.Column(db.String(20), nullable=False)
     audio_file_path = db.Column(db.String(255))
     transcribed_text = db.Column(db.Text) # Whisper로 인식된 텍스트
-    risk_level = db.Column(db.Integer, default=0) # 0: unassigned, 1: low, 2: medium, 3: high
+    risk_level = db.Column(db.Integer) # 0: 낮음, 1: 중간, 2: 높음, None: 미정 (분석 전/재분석 대기/분석 실패)
     status = db.Column(db.String(20), default='available_for_assignment', nullable=False) # 'available_for_assignment', 'assigned', 'completed'
     assigned_counselor_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
     received_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    trace_id = db.Column(db.String(32), index=True) # 접수 파이프라인 추적 ID (관리자 추적 조회용)
+    analysis_status = db.Column(db.String(20)) # 'completed', 'no_speech'(VAD: 음성 없음), 'failed', 'pending_retry'(추론 지연/장애: 나중에 재분석)
+    vad_removed_seconds = db.Column(db.Float) # VAD로 제거된 무음 길이(초)
+    canonical_audio_path = db.Column(db.String(255)) # 암호화된 표준 형식(16kHz 모노 FLAC) 음성 파일
+    audio_sha256 = db.Column(db.String(64), index=True) # 업로드 원본(평문)의 SHA-256 (중복/무결성 확인용)
+    model_versions = db.Column(db.Text) # 위험도를 예측한 모델 버전 (JSON, 예: {"roberta": "repo@리비전", ...})
 
     def __repr__(self):
         return f'<ClientCall {self.id} - {self.phone_number}>'
@@ -67,16 +64,24 @@ class ConsultationReport(db.Model):
     encrypted_memo_text = db.Column(db.LargeBinary)
     encrypted_transcribed_text = db.Column(db.LargeBinary)
     
-    # DEK 관련 필드
+    # KEK 계층 기반 DEK 필드 (에폭 KEK로 래핑된 DEK)
+    key_epoch_id = db.Column(db.Integer, db.ForeignKey('key_epochs.id'), nullable=True, index=True)
+    wrapped_dek = db.Column(db.LargeBinary)
+
+    # 레거시 DEK 관련 필드 (레코드별 RSA/PQC 래핑)
     encrypted_dek_trad = db.Column(db.LargeBinary)
     pqc_kem_ciphertext = db.Column(db.LargeBinary)
     pqc_secret_key = db.Column(db.LargeBinary)
     nonce_for_dek_encryption = db.Column(db.LargeBinary)
     encrypted_dek_by_pqc_shared_secret = db.Column(db.LargeBinary)
     
+    # 블라인드 인덱스 (정확 일치 검색용 HMAC 토큰)
+    client_name_bidx = db.Column(db.String(32), index=True)
+    phone_number_bidx = db.Column(db.String(32), index=True)
+
     # 기존 필드들
     client_gender = db.Column(db.String(10))
-    risk_level_recorded = db.Column(db.Integer, nullable=False)
+    risk_level_recorded = db.Column(db.Integer) # 소견서 작성 시점의 통화 위험도 (None: 미정)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
 
     # 복호화된 필드들을 위한 속성
@@ -85,38 +90,95 @@ class ConsultationReport(db.Model):
     memo_text = None
     transcribed_text = None
 
+    # 평문 속성 -> 암호문 컬럼 매핑
+    ENCRYPTED_FIELDS = {
+        'client_name': 'encrypted_client_name',
+        'client_age': 'encrypted_client_age',
+        'memo_text': 'encrypted_memo_text',
+        'transcribed_text': 'encrypted_transcribed_text',
+    }
+
+    # 복호화/암호화 시 복구한 DEK (DB에 저장되지 않는 일시 속성)
+    _dek = None
+
     # 관계 설정
     authoring_counselor = db.relationship('User', backref=db.backref('consultation_reports', lazy=True), foreign_keys=[counselor_id])
     originating_call = db.relationship('ClientCall', backref=db.backref('consultation_report', uselist=False, lazy=True), foreign_keys=[client_call_id])
+    search_tokens = db.relationship('ReportSearchToken', backref='report', lazy=True, cascade='all, delete-orphan')
 
     def __repr__(self):
         return f'<ConsultationReport {self.id} for ClientCall {self.client_call_id}>'
     
+    def _has_legacy_dek(self):
+        return all([self.encrypted_dek_trad, self.pqc_kem_ciphertext, self.pqc_secret_key,
+                    self.nonce_for_dek_encryption, self.encrypted_dek_by_pqc_shared_secret])
+
+    def _resolve_dek(self, hybrid_encryption):
+        """저장된 래핑 정보로부터 DEK를 복구합니다."""
+        if self.key_epoch_id and self.wrapped_dek:
+            from .services.key_service import get_key_service
+            return get_key_service().unwrap_dek(self.key_epoch_id, self.wrapped_dek)
+
+        # 레거시 레코드: 레코드별 RSA/PQC 래핑
+        if not self._has_legacy_dek():
+            raise EncryptionError("DEK 관련 필드가 누락되었습니다.")
+        try:
+            # RSA로 DEK 복호화 시도
+            dek = hybrid_encryption._decrypt_dek_trad(self.encrypted_dek_trad)
+            logger.debug("RSA DEK 복호화 성공")
+            return dek
+        except Exception as e:
+            logger.error(f"RSA DEK 복호화 실패: {e}")
+        try:
+            # PQC로 DEK 복호화 시도
+            encrypted_dek_package = self.nonce_for_dek_encryption + self.encrypted_dek_by_pqc_shared_secret
+            dek = hybrid_encryption._decrypt_dek_pqc(
+                self.pqc_kem_ciphertext,
+                encrypted_dek_package,
+                self.pqc_secret_key
+            )
+            logger.debug("PQC DEK 복호화 성공")
+            return dek
+        except Exception as e:
+            logger.error(f"PQC DEK 복호화 실패: {e}")
+            raise EncryptionError("모든 DEK 복호화 방식이 실패했습니다.")
+
+    def refresh_search_index(self, phone_number=None):
+        """이름과 통화 전화번호의 블라인드 인덱스/접두어 토큰을 다시 계산합니다."""
+        from .utils.blind_index import get_blind_index
+        blind_index = get_blind_index()
+
+        if phone_number is None and self.client_call_id:
+            call = self.originating_call or db.session.get(ClientCall, self.client_call_id)
+            phone_number = call.phone_number if call else None
+
+        self.client_name_bidx = blind_index.exact_token('client_name', self.client_name)
+        self.phone_number_bidx = blind_index.exact_token('phone_number', phone_number)
+        self.search_tokens = [
+            ReportSearchToken(field=field, token=token)
+            for field, value in (('client_name', self.client_name), ('phone_number', phone_number))
+            for token in blind_index.prefix_tokens(field, value)
+        ]
+
+    def clear_legacy_dek(self):
+        """레거시 DEK 필드를 비웁니다 (KEK 계층으로 재래핑된 이후)."""
+        self.encrypted_dek_trad = None
+        self.pqc_kem_ciphertext = None
+        self.pqc_secret_key = None
+        self.nonce_for_dek_encryption = None
+        self.encrypted_dek_by_pqc_shared_secret = None
+
     def encrypt_fields(self, hybrid_encryption):
         """필드를 암호화합니다."""
         try:
-            # DEK 생성 및 저장
-            dek = hybrid_encryption._generate_dek()
-            
-            # DEK를 두 가지 방식으로 암호화
-            encrypted_dek_trad = hybrid_encryption._encrypt_dek_trad(dek)
-            pqc_kem_ciphertext, encrypted_dek_pqc_package, pqc_secret_key = hybrid_encryption._encrypt_dek_pqc(dek)
-            
-            # nonce와 암호문 분리
-            nonce_for_dek_encryption = encrypted_dek_pqc_package[:12]
-            encrypted_dek_by_pqc_shared_secret = encrypted_dek_pqc_package[12:]
-            
-            # DEK 관련 필드 저장
-            self.encrypted_dek_trad = encrypted_dek_trad
-            self.pqc_kem_ciphertext = pqc_kem_ciphertext
-            self.pqc_secret_key = pqc_secret_key
-            self.nonce_for_dek_encryption = nonce_for_dek_encryption
-            self.encrypted_dek_by_pqc_shared_secret = encrypted_dek_by_pqc_shared_secret
-            
-            # DEK 관련 필드가 제대로 저장되었는지 확인
-            if not all([self.encrypted_dek_trad, self.pqc_kem_ciphertext, self.pqc_secret_key, 
-                       self.nonce_for_dek_encryption, self.encrypted_dek_by_pqc_shared_secret]):
-                raise EncryptionError("DEK 관련 필드 저장 실패")
+            from .services.key_service import get_key_service
+
+            # DEK 생성 후 현재 에폭의 KEK로 래핑 (RSA/PQC 연산은 에폭당 1회)
+            dek, key_epoch_id, wrapped_dek = get_key_service().generate_dek()
+            self.key_epoch_id = key_epoch_id
+            self.wrapped_dek = wrapped_dek
+            self.clear_legacy_dek()
+            self._dek = dek
             
             # 필드 암호화
             if hasattr(self, 'client_name') and self.client_name:
@@ -131,6 +193,9 @@ class ConsultationReport(db.Model):
             if hasattr(self, 'transcribed_text') and self.transcribed_text:
                 nonce, ciphertext = hybrid_encryption._encrypt_file_with_dek(self.transcribed_text.encode(), dek)
                 self.encrypted_transcribed_text = nonce + ciphertext
+
+            # 검색용 블라인드 인덱스 갱신
+            self.refresh_search_index()
                 
         except Exception as e:
             logger.error(f"필드 암호화 실패: {e}")
@@ -139,31 +204,13 @@ class ConsultationReport(db.Model):
     def decrypt_fields(self, hybrid_encryption):
         """필드들을 복호화합니다."""
         try:
-            # DEK 관련 필드 확인
-            if not all([self.encrypted_dek_trad, self.pqc_kem_ciphertext, self.pqc_secret_key, 
-                       self.nonce_for_dek_encryption, self.encrypted_dek_by_pqc_shared_secret]):
-                logger.error("DEK 관련 필드가 누락되었습니다.")
-                return
-
-            # DEK 복호화 시도
             try:
-                # RSA로 DEK 복호화 시도
-                dek = hybrid_encryption._decrypt_dek_trad(self.encrypted_dek_trad)
-                logger.debug("RSA DEK 복호화 성공")
-            except Exception as e:
-                logger.error(f"RSA DEK 복호화 실패: {e}")
-                try:
-                    # PQC로 DEK 복호화 시도
-                    encrypted_dek_package = self.nonce_for_dek_encryption + self.encrypted_dek_by_pqc_shared_secret
-                    dek = hybrid_encryption._decrypt_dek_pqc(
-                        self.pqc_kem_ciphertext,
-                        encrypted_dek_package,
-                        self.pqc_secret_key
-                    )
-                    logger.debug("PQC DEK 복호화 성공")
-                except Exception as e:
-                    logger.error(f"PQC DEK 복호화 실패: {e}")
-                    raise EncryptionError("모든 DEK 복호화 방식이 실패했습니다.")
+                dek = self._resolve_dek(hybrid_encryption)
+                self._dek = dek
+            except EncryptionError as e:
+                logger.error(f"DEK 복구 실패: {e}")
+                self._dek = None
+                return
             
             # 필드 복호화 시도
             fields_to_decrypt = [
@@ -200,6 +247,64 @@ class ConsultationReport(db.Model):
             # 개별 필드 복호화 실패는 전체 실패로 처리하지 않음
             pass
 
+    def update_encrypted_fields(self, hybrid_encryption, changes):
+        """
+        변경된 필드만 기존 DEK로 다시 암호화합니다.
+        DEK는 한 번만 복구(이미 복호화한 경우 재사용)하며, 필드마다 새 nonce를 사용합니다.
+        변경되지 않은 암호문 컬럼과 DEK 래핑은 그대로 유지됩니다.
+        """
+        unknown = set(changes) - set(self.ENCRYPTED_FIELDS)
+        if unknown:
+            raise ValueError(f"암호화 대상이 아닌 필드입니다: {', '.join(sorted(unknown))}")
+        if not changes:
+            return
+        try:
+            dek = self._dek if self._dek is not None else self._resolve_dek(hybrid_encryption)
+            self._dek = dek
+
+            for field_name, value in changes.items():
+                setattr(self, field_name, value)
+                column_name = self.ENCRYPTED_FIELDS[field_name]
+                if value is None or value == '':
+                    setattr(self, column_name, None)
+                    continue
+                nonce, ciphertext = hybrid_encryption._encrypt_file_with_dek(str(value).encode(), dek)
+                setattr(self, column_name, nonce + ciphertext)
+
+            if 'client_name' in changes:
+                self.refresh_search_index()
+
+        except Exception as e:
+            logger.error(f"필드 부분 암호화 실패: {e}")
+            raise EncryptionError(f"필드 부분 암호화 실패: {e}")
+
+class ReportSearchToken(db.Model):
+    """소견서 블라인드 인덱스 접두어 토큰"""
+    __tablename__ = 'report_search_tokens'
+    id = db.Column(db.Integer, primary_key=True)
+    report_id = db.Column(db.Integer, db.ForeignKey('consultation_reports.id'), nullable=False, index=True)
+    field = db.Column(db.String(20), nullable=False)  # 'client_name' 또는 'phone_number'
+    token = db.Column(db.String(32), nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_report_search_tokens_field_token', 'field', 'token'),
+    )
+
+    def __repr__(self):
+        return f"<ReportSearchToken {self.field} report={self.report_id}>"
+
+class KeyEpoch(db.Model):
+    """KEK 에폭: 대칭 KEK를 RSA와 PQC로 한 번만 래핑하여 보관"""
+    __tablename__ = 'key_epochs'
+    id = db.Column(db.Integer, primary_key=True)
+    wrapped_kek_trad = db.Column(db.LargeBinary, nullable=False)    # RSA-OAEP로 래핑된 KEK
+    pqc_kem_ciphertext = db.Column(db.LargeBinary, nullable=False)  # 시스템 PQC 공개키에 대한 KEM 암호문
+    wrapped_kek_pqc = db.Column(db.LargeBinary, nullable=False)     # nonce + 공유 비밀로 암호화된 KEK
+    created_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return f"<KeyEpoch {self.id}>"
+
 class TokenBlocklist(db.Model):
     __tablename__ = "token_blocklist"
     id = db.Column(db.Integer, primary_key=True)
@@ -217,10 +322,14 @@ class EncryptedFile(db.Model):
     file_type = db.Column(db.String(10), nullable=False)  # 'audio' 또는 'report'
     file_storage_path = db.Column(db.String(255), unique=True, nullable=False)
     nonce_for_file = db.Column(db.LargeBinary, nullable=False)
-    encrypted_dek_trad = db.Column(db.LargeBinary, nullable=False)
-    pqc_kem_ciphertext = db.Column(db.LargeBinary, nullable=False)
-    nonce_for_dek_encryption = db.Column(db.LargeBinary, nullable=False)
-    encrypted_dek_by_pqc_shared_secret = db.Column(db.LargeBinary, nullable=False)
+    # KEK 계층 기반 DEK 필드
+    key_epoch_id = db.Column(db.Integer, db.ForeignKey('key_epochs.id'), nullable=True, index=True)
+    wrapped_dek = db.Column(db.LargeBinary)
+    # 레거시 DEK 필드 (레코드별 RSA/PQC 래핑)
+    encrypted_dek_trad = db.Column(db.LargeBinary)
+    pqc_kem_ciphertext = db.Column(db.LargeBinary)
+    nonce_for_dek_encryption = db.Column(db.LargeBinary)
+    encrypted_dek_by_pqc_shared_secret = db.Column(db.LargeBinary)
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     created_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
 
@@ -2,11 +2,12 @@
 from flask import Blueprint, request, jsonify, current_app
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_jwt_extended import (
-    create_access_token, create_refresh_token, jwt_required, get_jwt_identity, get_jwt
+    create_access_token, create_refresh_token, jwt_required, get_jwt_identity, get_jwt, current_user
 )
 from datetime import datetime, timezone, timedelta
 from .. import db
 from ..models import User, TokenBlocklist
+from ..utils.password_hashing import get_password_hasher, HasherBusyError
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -16,6 +17,12 @@ def log_event(event, data=None):
         data['user_name'] = data.pop('name')
     current_app.logger.info(f"[Auth] {event}", extra=data if data else {})
 
+def hasher_busy_response(payload=None):
+    """해시 실행기 과부하 시 503 응답 (Retry-After 포함)"""
+    response = jsonify(payload or {'error': '로그인 요청이 많습니다. 잠시 후 다시 시도해주세요.'})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
 def validate_password(password):
     """비밀번호 유효성 검사"""
     if len(password) < 8:
@@ -68,7 +75,10 @@ def signup():
         
         log_event('회원가입 성공', {'username': username, 'user_name': name})
         return jsonify({'message': '회원가입이 완료되었습니다.'}), 201
-        
+
+    except HasherBusyError:
+        log_event('회원가입 실패 - 해시 대기열 포화', {'username': username})
+        return hasher_busy_response()
     except Exception as e:
         log_event('회원가입 실패', {'error': str(e)})
         return jsonify({'error': '회원가입 중 오류가 발생했습니다.'}), 500
@@ -87,10 +97,25 @@ def login():
 
     user = User.query.filter_by(username=username).first()
 
-    if not user or not user.check_password(password):
+    try:
+        password_ok = user is not None and user.check_password(password)
+    except HasherBusyError:
+        log_event('로그인 실패 - 해시 대기열 포화', {'username': username})
+        return hasher_busy_response()
+
+    if not password_ok:
         log_event('로그인 실패 - 인증 실패', {'username': username})
         return jsonify({'error': '아이디 또는 비밀번호가 올바르지 않습니다.'}), 401
 
+    # 이전 파라미터로 저장된 해시는 로그인 시 현재 설정으로 다시 해시 (과부하 시 다음 로그인으로 미룸)
+    if user.password_needs_rehash():
+        try:
+            user.set_password(password)
+            get_password_hasher().record_rehash()
+            log_event('비밀번호 재해시', {'user_id': user.id})
+        except HasherBusyError:
+            pass
+
     access_token = create_access_token(identity=user.id, fresh=True)
     refresh_token = create_refresh_token(identity=user.id)
     user.status = 'available'
@@ -130,7 +155,7 @@ def logout():
 
     try:
         db.session.add(db_token)
-        user = User.query.get(current_user_id)
+        user = current_user
         if user:
             user.status = 'offline'
         db.session.commit()
@@ -4,15 +4,28 @@ import uuid
 from flask import Blueprint, request, jsonify, current_app, send_file
 from flask_jwt_extended import jwt_required
 from werkzeug.utils import secure_filename
-from sqlalchemy import func, desc, asc
+from werkzeug.exceptions import RequestEntityTooLarge
+from sqlalchemy import func, desc, asc, case
 from .. import db
 from ..models import ClientCall, User, ConsultationReport
-from ..services import ai_service
+from ..services import ai_service, call_service, admission_service
 from ..config import Config
+from ..utils.deadline import DeadlineExceeded
 from ..utils.hybrid_encryption import HybridEncryption
+from ..utils.envelope import is_envelope, parse_envelope, parse_legacy_audio_container
+from ..services.key_service import get_key_service
+from ..services.inference_scheduler import inference_priority
+from ..utils.metrics import stage_timer
+from ..utils.rate_limiter import retry_after_header
+from ..utils.tracing import start_trace
 
 client_bp = Blueprint('client', __name__)
 
+# 대기열 정렬: 위험도 미정(재분석 대기/분석 실패) 통화를 가장 먼저, 그다음 위험도 높은 순, 접수 순
+# (NULLS FIRST는 DB마다 지원이 달라 CASE로 정렬)
+QUEUE_ORDER = (case((ClientCall.risk_level.is_(None), 0), else_=1),
+               desc(ClientCall.risk_level), asc(ClientCall.received_at))
+
 UPLOAD_FOLDER = Config.UPLOAD_FOLDER
 ALLOWED_EXTENSIONS = {'wav', 'mp3', 'm4a', 'webm'}
 
@@ -28,6 +41,12 @@ def log_event(event: str, data: dict = None):
         data = {**data, 'user_name': data.pop('name')}
     current_app.logger.info(f"[Client] {event}", extra=data if data else {})
 
+@client_bp.errorhandler(RequestEntityTooLarge)
+def handle_request_too_large(e):
+    # 요청 본문이 MAX_CONTENT_LENGTH를 넘으면 폼 파싱 단계에서 거부됨
+    log_event('통화 제출 실패 - 요청 크기 초과', {'content_length': request.content_length})
+    return jsonify({'message': 'Request entity too large'}), 413
+
 @client_bp.route('/<int:client_call_id>', methods=['GET'])
 @jwt_required()
 def get_client_detail(client_call_id):
@@ -48,7 +67,9 @@ def get_client_detail(client_call_id):
         "id": client_call.id,
         "phone": client_call.phone_number, # ClientCall.phone_number -> phone
         "risk": client_call.risk_level,    # ClientCall.risk_level -> risk
-        "transcribed_text": client_call.transcribed_text  # 음성 인식 텍스트 추가
+        "transcribed_text": client_call.transcribed_text,  # 음성 인식 텍스트 추가
+        "trace_id": client_call.trace_id,  # 접수 파이프라인 추적 ID (/api/admin/traces/<trace_id>)
+        "analysis_status": client_call.analysis_status  # 'no_speech'이면 음성이 없는 녹음
         # 필요에 따라 다른 ClientCall 필드도 추가 가능
         # "status": client_call.status,
         # "received_at": client_call.received_at.isoformat() if client_call.received_at else None,
@@ -64,7 +85,7 @@ def get_waiting_queue():
         log_event('대기열 조회 시도')
         waiting_calls = db.session.query(ClientCall)\
                                   .filter(ClientCall.status.in_(['pending', 'available_for_assignment']))\
-                                  .order_by(db.desc(ClientCall.risk_level), db.asc(ClientCall.received_at))\
+                                  .order_by(*QUEUE_ORDER)\
                                   .all()
 
         client_list_for_frontend = []
@@ -73,7 +94,8 @@ def get_waiting_queue():
                 client_list_for_frontend.append({
                     'id': call.id,
                     'phone': call.phone_number,
-                    'risk': call.risk_level, # 위험도 값 그대로 사용 (0, 1, 2)
+                    'risk': call.risk_level, # 위험도 값 그대로 사용 (0, 1, 2, 미정이면 None)
+                    'analysis_status': call.analysis_status, # 'no_speech' 통화 표시용
                 })
             log_event('대기열 조회 성공', {'count': len(client_list_for_frontend)})
         else:
@@ -90,11 +112,10 @@ def get_waiting_queue():
 def reset_client_queue():
     try:
         log_event('대기열 초기화 시도')
-        calls_to_reset = ClientCall.query.filter(ClientCall.status.in_(['pending', 'available_for_assignment'])).all()
-        num_reset = len(calls_to_reset)
-        
-        for call in calls_to_reset:
-            call.status = 'cancelled_by_reset'
+        # 행을 로드하지 않고 단일 UPDATE로 처리
+        num_reset = ClientCall.query.filter(
+            ClientCall.status.in_(['pending', 'available_for_assignment'])
+        ).update({ClientCall.status: 'cancelled_by_reset'}, synchronize_session=False)
         
         if num_reset > 0:
             db.session.commit()
@@ -151,6 +172,18 @@ def delete_client_from_queue():
 
 @client_bp.route('/submit', methods=['POST'])
 def submit_client_data():
+    # 접수 제어: IP 한도는 요청 본문을 읽기 전에, 분석 대기열 자리는 업로드를 받은 뒤 분석 동안만 확보
+    # (remote_addr는 프록시 뒤에서 TRUSTED_PROXY_COUNT에 따라 ProxyFix가 교정한 클라이언트 주소)
+    try:
+        admission_service.check_client_rate(request.remote_addr)
+        return _submit_client_data()
+    except admission_service.AdmissionRejected as e:
+        log_event('통화 제출 거절 - 접수 제어', {'status_code': e.status_code, 'reason': str(e)})
+        response = jsonify({'message': str(e)})
+        response.headers['Retry-After'] = retry_after_header(e.retry_after)
+        return response, e.status_code
+
+def _submit_client_data():
     if 'audio' not in request.files:
         log_event('통화 제출 실패 - 오디오 파일 누락')
         return jsonify({'message': 'No audio file part'}), 400
@@ -166,98 +199,131 @@ def submit_client_data():
         return jsonify({'message': 'No selected audio file'}), 400
 
     if audio_file and allowed_file(audio_file.filename):
-        try:
-            # 파일 데이터 읽기
-            file_data = audio_file.read()
-            
-            # 하이브리드 암호화 적용
-            hybrid_encryption = HybridEncryption()
-            nonce_for_file, encrypted_file_content, encrypted_dek_trad, pqc_kem_ciphertext, encrypted_dek_by_pqc_shared_secret, pqc_secret_key = hybrid_encryption.encrypt_file_hybrid(file_data)
-            
-            # 암호화된 데이터를 하나의 파일로 저장
-            original_filename = secure_filename(audio_file.filename)
-            unique_filename = str(uuid.uuid4()) + "_" + original_filename
-            audio_file_path = os.path.join(UPLOAD_FOLDER, unique_filename)
-            
-            with open(audio_file_path, 'wb') as f:
-                # 암호화된 데이터를 순서대로 저장
-                f.write(nonce_for_file)  # 12 bytes
-                f.write(encrypted_file_content)  # variable
-                f.write(encrypted_dek_trad)  # 384 bytes for RSA-3072
-                f.write(pqc_kem_ciphertext)  # variable
-                f.write(encrypted_dek_by_pqc_shared_secret)  # variable
-                f.write(pqc_secret_key)  # PQC secret key 추가
-            
-            log_event('오디오 파일 암호화 및 저장 성공', {
-                'file_path': audio_file_path,
-                'nonce_size': len(nonce_for_file),
-                'content_size': len(encrypted_file_content),
-                'dek_trad_size': len(encrypted_dek_trad),
-                'kem_ciphertext_size': len(pqc_kem_ciphertext),
-                'dek_pqc_size': len(encrypted_dek_by_pqc_shared_secret),
-                'pqc_secret_key_size': len(pqc_secret_key)
-            })
+        admission_service.check_phone_rate(phone_number)
+        # 통화 단위 추적: 업로드 읽기부터 커밋까지의 단계별 스팬을 같은 trace_id로 기록
+        # 접수 중인 통화의 위험도 분류는 재분석/가져오기보다 먼저 실행 (live 우선순위)
+        with start_trace('call_ingest') as trace, inference_priority('live'):
+            response, status_code = _ingest_call(audio_file, phone_number, trace.trace_id)
+            trace.set_attribute('status_code', status_code)
+        response.headers['X-Trace-Id'] = trace.trace_id
+        return response, status_code
+    else:
+        return jsonify({'message': 'File type not allowed or no file'}), 400
 
-            try:
-                # 음성 인식 및 위험도 분석을 위해 임시로 복호화
-                decrypted_data = hybrid_encryption.decrypt_file_hybrid(
-                    nonce_for_file, encrypted_file_content,
-                    encrypted_dek_trad, pqc_kem_ciphertext,
-                    encrypted_dek_by_pqc_shared_secret, pqc_secret_key
-                )
-                
-                # 임시 파일로 저장하여 처리
-                temp_file_path = os.path.join(UPLOAD_FOLDER, f"temp_{unique_filename}")
-                with open(temp_file_path, 'wb') as f:
-                    f.write(decrypted_data)
-                
-                transcribed_text = ai_service.speech_to_text(temp_file_path)
-                risk_level = ai_service.predict_suicide_risk(transcribed_text) if transcribed_text else 0
-                
-                # 임시 파일 삭제
-                os.remove(temp_file_path)
+def _ingest_call(audio_file, phone_number, trace_id):
+    """업로드된 통화를 암호화 저장하고 분석하여 대기열에 등록합니다."""
+    try:
+        original_filename = secure_filename(audio_file.filename)
+        unique_filename = str(uuid.uuid4()) + "_" + original_filename
+        audio_file_path = os.path.join(UPLOAD_FOLDER, unique_filename)
 
-                if risk_level is None:
-                    log_event('AI 위험도 분석 실패', {'file_path': audio_file_path})
-                    risk_level = 0
-                else:
-                    log_event('AI 위험도 분석 성공', {'file_path': audio_file_path, 'risk_level': risk_level})
+        # 업로드를 청크 단위로 한 번만 읽으며 암호화 저장(KEK 계층) + SHA-256 + 분석용 평문 기록
+        try:
+            with stage_timer('upload_stream'):
+                upload = call_service.receive_upload(
+                    audio_file.stream, audio_file_path,
+                    max_bytes=current_app.config.get('MAX_UPLOAD_BYTES', Config.MAX_UPLOAD_BYTES),
+                    chunk_size=current_app.config.get('UPLOAD_CHUNK_BYTES', Config.UPLOAD_CHUNK_BYTES)
+                )
+        except call_service.UploadTooLargeError as e:
+            log_event('통화 제출 실패 - 파일 크기 초과', {'error': str(e)})
+            return jsonify({'message': str(e)}), 413
+
+        log_event('오디오 파일 암호화 및 저장 성공', {
+            'file_path': audio_file_path,
+            'size': upload.size,
+            'sha256': upload.sha256
+        })
 
-            except Exception as e:
-                log_event('파일 복호화 실패', {'error': str(e), 'file_path': audio_file_path})
-                # 복호화 실패 시에도 기본값으로 진행
-                transcribed_text = None
-                risk_level = 0
-
-            # 단일 대기열 방식으로 변경
-            new_call = ClientCall(
-                phone_number=phone_number,
-                audio_file_path=audio_file_path,
-                transcribed_text=transcribed_text,
-                risk_level=risk_level,
-                status='pending',  # 단순히 pending 상태로 설정
-                assigned_counselor_id=None  # 상담사 배정은 나중에
-            )
-            try:
-                db.session.add(new_call)
+        try:
+            with admission_service.analysis_slot():
+                canonical_audio_path, analysis = _analyze_upload(upload, audio_file_path)
+        except admission_service.AdmissionRejected:
+            # 분석 대기열이 가득 차면 저장한 업로드를 지우고 거절 (클라이언트가 Retry-After 후 다시 제출)
+            for path in (audio_file_path, upload.plaintext_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            raise
+        transcribed_text = analysis.transcribed_text
+        risk_level = analysis.risk_level
+        analysis_status = analysis.analysis_status
+
+        # 단일 대기열 방식으로 변경
+        new_call = ClientCall(
+            phone_number=phone_number,
+            audio_file_path=audio_file_path,
+            canonical_audio_path=canonical_audio_path,
+            audio_sha256=upload.sha256,
+            transcribed_text=transcribed_text,
+            risk_level=risk_level,
+            status='pending',  # 단순히 pending 상태로 설정
+            assigned_counselor_id=None,  # 상담사 배정은 나중에
+            trace_id=trace_id,
+            analysis_status=analysis_status,
+            vad_removed_seconds=analysis.vad_removed_seconds,
+            model_versions=analysis.model_versions
+        )
+        try:
+            db.session.add(new_call)
+            with stage_timer('db_commit'):
                 db.session.commit()
-                log_event('통화 제출 성공', {'call_id': new_call.id, 'risk_level': risk_level})
-                return jsonify({
-                    'message': 'Call data submitted successfully.',
-                    'call_id': new_call.id,
-                    'risk_level': risk_level
-                }), 201
-            except Exception as e:
-                db.session.rollback()
-                log_event('통화 제출 실패', {'call_id': new_call.id, 'error': str(e)})
-                if os.path.exists(audio_file_path):
-                    os.remove(audio_file_path)
-                return jsonify({'message': 'Failed to submit call data', 'error': str(e)}), 500
+            log_event('통화 제출 성공', {'call_id': new_call.id, 'risk_level': risk_level, 'trace_id': trace_id})
+            return jsonify({
+                'message': 'Call data submitted successfully.',
+                'call_id': new_call.id,
+                'risk_level': risk_level,
+                'analysis_status': analysis_status,
+                'trace_id': trace_id
+            }), 201
         except Exception as e:
-            log_event('파일 처리 중 오류 발생', {'error': str(e)})
-            return jsonify({'message': 'Error processing file', 'error': str(e)}), 500
-    else:
-        return jsonify({'message': 'File type not allowed or no file'}), 400
+            db.session.rollback()
+            log_event('통화 제출 실패', {'call_id': new_call.id, 'error': str(e)})
+            for path in (audio_file_path, canonical_audio_path):
+                if path and os.path.exists(path):
+                    os.remove(path)
+            return jsonify({'message': 'Failed to submit call data', 'error': str(e)}), 500
+    except admission_service.AdmissionRejected:
+        raise
+    except Exception as e:
+        log_event('파일 처리 중 오류 발생', {'error': str(e)})
+        return jsonify({'message': 'Error processing file', 'error': str(e)}), 500
+
+def _analyze_upload(upload, audio_file_path):
+    """업로드 평문을 표준 형식으로 저장하고 분석합니다. (표준 형식 경로, 분석 결과)를 반환합니다."""
+    canonical_audio_path = None
+    deadline = ai_service.new_deadline()  # 디코딩부터 인식까지 통화 하나의 분석 제한 시간
+    try:
+        # 평문을 한 번만 디코딩/리샘플링 → 표준 형식(16kHz FLAC)으로 암호화 저장
+        try:
+            canonical_audio_path, canonical_audio, waveform = call_service.store_canonical_audio(
+                upload.plaintext_path, audio_file_path, deadline
+            )
+        finally:
+            # 임시 파일 삭제
+            os.remove(upload.plaintext_path)
+
+        # 인식/VAD는 이미 디코딩된 파형을 그대로 사용
+        analysis = call_service.analyze_canonical_audio(canonical_audio, waveform, deadline)
+
+        if analysis.analysis_status == 'no_speech':
+            log_event('음성 없음 - AI 분석 생략', {'file_path': audio_file_path, 'vad_removed_seconds': analysis.vad_removed_seconds})
+        elif analysis.analysis_status == 'failed':
+            log_event('AI 위험도 분석 실패', {'file_path': audio_file_path})
+        elif analysis.analysis_status == 'pending_retry':
+            # 추론 시간 초과/차단기 열림: 위험도 미정으로 대기열에 넣고 나중에 재분석
+            log_event('AI 분석 지연 - 재분석 대기', {'file_path': audio_file_path})
+        else:
+            log_event('AI 위험도 분석 성공', {'file_path': audio_file_path, 'risk_level': analysis.risk_level})
+        return canonical_audio_path, analysis
+
+    except DeadlineExceeded as e:
+        # 디코딩 시간 초과: 위험도 미정으로 대기열에 넣고 나중에 재분석 (표준 형식은 재분석 시 생성)
+        log_event('오디오 디코딩 지연 - 재분석 대기', {'error': str(e), 'file_path': audio_file_path})
+        return canonical_audio_path, call_service.CallAnalysis(None, None, 'pending_retry', None)
+    except Exception as e:
+        log_event('오디오 분석 실패', {'error': str(e), 'file_path': audio_file_path})
+        # 분석 실패 시에도 기본값으로 진행
+        return canonical_audio_path, call_service.CallAnalysis(None, None, 'failed', None)
 
 @client_bp.route('/<int:client_call_id>/previous-reports', methods=['GET'])
 @jwt_required()
@@ -269,30 +335,29 @@ def get_previous_reports(client_call_id):
     if not client_call:
         return jsonify({"message": "Client call not found"}), 404
 
-    # 같은 전화번호를 가진 다른 ClientCall들을 찾습니다
-    previous_calls = ClientCall.query.filter(
-        ClientCall.phone_number == client_call.phone_number,
-        ClientCall.id != client_call.id  # 현재 통화는 제외
-    ).all()
+    # 같은 전화번호를 가진 다른 ClientCall의 소견서를 한 번의 조인 쿼리로 조회 (최신순)
+    rows = db.session.query(ConsultationReport, ClientCall.phone_number)\
+                     .join(ClientCall, ConsultationReport.client_call_id == ClientCall.id)\
+                     .filter(ClientCall.phone_number == client_call.phone_number,
+                             ClientCall.id != client_call.id)\
+                     .order_by(ConsultationReport.created_at.desc())\
+                     .all()
 
+    hybrid_encryption = HybridEncryption()
     previous_reports = []
-    for call in previous_calls:
-        report = ConsultationReport.query.filter_by(client_call_id=call.id).first()
-        if report:
-            previous_reports.append({
-                'id': report.id,
-                'name': report.client_name,
-                'age': report.client_age,
-                'gender': report.client_gender,
-                'phone': call.phone_number,
-                'risk': report.risk_level_recorded,
-                'memo': report.memo_text,
-                'transcribed_text': report.transcribed_text,
-                'created_at': report.created_at.isoformat()
-            })
-
-    # 생성일 기준으로 정렬 (최신순)
-    previous_reports.sort(key=lambda x: x['created_at'], reverse=True)
+    for report, phone_number in rows:
+        report.decrypt_fields(hybrid_encryption)
+        previous_reports.append({
+            'id': report.id,
+            'name': report.client_name,
+            'age': report.client_age,
+            'gender': report.client_gender,
+            'phone': phone_number,
+            'risk': report.risk_level_recorded,
+            'memo': report.memo_text,
+            'transcribed_text': report.transcribed_text,
+            'created_at': report.created_at.isoformat()
+        })
 
     return jsonify({
         'reports': previous_reports,
@@ -317,50 +382,42 @@ def get_audio_file(client_call_id):
         with open(client_call.audio_file_path, 'rb') as f:
             encrypted_data = f.read()
 
-        # 암호화된 데이터 파싱
-        # 각 부분의 크기를 계산
-        nonce_size = 12  # AES-GCM nonce 크기
-        rsa_size = 384   # RSA-3072 암호문 크기
-        kem_size = 768   # Kyber512의 KEM 암호문 크기
-        secret_key_size = 1632  # Kyber512의 secret key 크기
-        
-        # 각 부분 추출
-        nonce_for_file = encrypted_data[:nonce_size]
-        remaining_data = encrypted_data[nonce_size:]
-        
-        # RSA 암호문 추출 (마지막 384바이트)
-        encrypted_dek_trad = remaining_data[-rsa_size:]
-        remaining_data = remaining_data[:-rsa_size]
-        
-        # PQC KEM 암호문 추출 (마지막 768바이트)
-        pqc_kem_ciphertext = remaining_data[-kem_size:]
-        remaining_data = remaining_data[:-kem_size]
-        
-        # PQC secret key 추출 (마지막 1632바이트)
-        pqc_secret_key = remaining_data[-secret_key_size:]
-        remaining_data = remaining_data[:-secret_key_size]
-        
-        # 나머지는 암호화된 파일 내용과 PQC로 암호화된 DEK 패키지
-        encrypted_file_content = remaining_data[:-60]  # 마지막 60바이트는 PQC DEK 패키지
-        encrypted_dek_by_pqc_shared_secret = remaining_data[-60:]
-
-        log_event('암호화된 파일 파싱 성공', {
-            'nonce_size': len(nonce_for_file),
-            'content_size': len(encrypted_file_content),
-            'dek_trad_size': len(encrypted_dek_trad),
-            'kem_ciphertext_size': len(pqc_kem_ciphertext),
-            'dek_pqc_size': len(encrypted_dek_by_pqc_shared_secret),
-            'pqc_secret_key_size': len(pqc_secret_key),
-            'total_size': len(encrypted_data)
-        })
+        if is_envelope(encrypted_data):
+            # KEK 계층 형식: 에폭 KEK 캐시를 사용하므로 비대칭 연산 없음
+            key_epoch_id, wrapped_dek, nonce_for_file, encrypted_file_content = parse_envelope(encrypted_data)
+            log_event('암호화된 파일 파싱 성공', {
+                'key_epoch_id': key_epoch_id,
+                'content_size': len(encrypted_file_content),
+                'total_size': len(encrypted_data)
+            })
+            decrypted_data = get_key_service().decrypt_blob(
+                key_epoch_id, wrapped_dek, nonce_for_file, encrypted_file_content
+            )
+        else:
+            # 레거시 형식: 레코드별 RSA/PQC 래핑
+            (
+                nonce_for_file, encrypted_file_content,
+                encrypted_dek_trad,
+                pqc_kem_ciphertext, encrypted_dek_by_pqc_shared_secret, pqc_secret_key
+            ) = parse_legacy_audio_container(encrypted_data)
+
+            log_event('암호화된 파일 파싱 성공', {
+                'nonce_size': len(nonce_for_file),
+                'content_size': len(encrypted_file_content),
+                'dek_trad_size': len(encrypted_dek_trad),
+                'kem_ciphertext_size': len(pqc_kem_ciphertext),
+                'dek_pqc_size': len(encrypted_dek_by_pqc_shared_secret),
+                'pqc_secret_key_size': len(pqc_secret_key),
+                'total_size': len(encrypted_data)
+            })
 
-        # 하이브리드 복호화
-        hybrid_encryption = HybridEncryption()
-        decrypted_data = hybrid_encryption.decrypt_file_hybrid(
-            nonce_for_file, encrypted_file_content,
-            encrypted_dek_trad, pqc_kem_ciphertext,
-            encrypted_dek_by_pqc_shared_secret, pqc_secret_key
-        )
+            # 하이브리드 복호화
+            hybrid_encryption = HybridEncryption()
+            decrypted_data = hybrid_encryption.decrypt_file_hybrid(
+                nonce_for_file, encrypted_file_content,
+                encrypted_dek_trad, pqc_kem_ciphertext,
+                encrypted_dek_by_pqc_shared_secret, pqc_secret_key
+            )
 
         # 임시 파일로 저장
         temp_file_path = os.path.join(UPLOAD_FOLDER, f"temp_play_{client_call_id}.webm")
@@ -1,10 +1,14 @@
 # backend/app/routes/counselor_routes.py
 from flask import Blueprint, request, jsonify, current_app
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt_identity, current_user
 from .. import db
 from ..models import User, ClientCall, ConsultationReport
 from ..utils.hybrid_encryption import HybridEncryption
+from ..services.report_service import ReportService
+from ..utils.password_hashing import HasherBusyError
+from .auth_routes import hasher_busy_response
 import re
+from sqlalchemy.orm import joinedload
 
 counselor_bp = Blueprint('counselor', __name__)
 
@@ -28,7 +32,7 @@ def validate_password(password):
 @jwt_required()
 def manage_counselor_status():
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = current_user
 
     if not user:
         log_event('상태 관리 실패 - 상담사 찾을 수 없음', {'user_id': current_user_id})
@@ -72,7 +76,7 @@ def manage_counselor_status():
 @jwt_required()
 def get_counselor_profile():
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = current_user
 
     if not user:
         log_event('프로필 조회 실패 - 상담사 찾을 수 없음', {'user_id': current_user_id})
@@ -91,7 +95,7 @@ def get_counselor_profile():
 @jwt_required()
 def update_counselor_profile():
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = current_user
 
     if not user:
         log_event('프로필 수정 실패 - 상담사 찾을 수 없음', {'user_id': current_user_id})
@@ -133,7 +137,7 @@ def update_counselor_profile():
 @jwt_required()
 def change_counselor_password():
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = current_user
 
     if not user or user.user_type != 'counselor':
         log_event('비밀번호 변경 실패 - 상담사 찾을 수 없음', {'user_id': current_user_id})
@@ -148,7 +152,13 @@ def change_counselor_password():
         log_event('비밀번호 변경 실패 - 필수 필드 누락', {'user_id': current_user_id})
         return jsonify({"message": "Current password, new password, and confirmation are required"}), 400
     
-    if not user.check_password(current_password):
+    try:
+        current_password_ok = user.check_password(current_password)
+    except HasherBusyError:
+        log_event('비밀번호 변경 실패 - 해시 대기열 포화', {'user_id': current_user_id})
+        return hasher_busy_response({"message": "Server is busy, please retry shortly"})
+
+    if not current_password_ok:
         log_event('비밀번호 변경 실패 - 현재 비밀번호 불일치', {'user_id': current_user_id})
         return jsonify({"message": "Invalid current password"}), 400
     
@@ -162,11 +172,14 @@ def change_counselor_password():
         log_event('비밀번호 변경 실패 - 비밀번호 정책 불일치', {'user_id': current_user_id})
         return jsonify({"message": error_message}), 400
 
-    user.set_password(new_password)
     try:
+        user.set_password(new_password)
         db.session.commit()
         log_event('비밀번호 변경 성공', {'user_id': current_user_id})
         return jsonify({"message": "Password updated successfully"}), 200
+    except HasherBusyError:
+        log_event('비밀번호 변경 실패 - 해시 대기열 포화', {'user_id': current_user_id})
+        return hasher_busy_response({"message": "Server is busy, please retry shortly"})
     except Exception as e:
         db.session.rollback()
         log_event('비밀번호 변경 실패', {'user_id': current_user_id, 'error': str(e)})
@@ -288,7 +301,9 @@ def get_my_reports():
     """상담사가 작성한 모든 소견서 목록을 반환합니다."""
     try:
         current_user_id = get_jwt_identity()
-        reports = ConsultationReport.query.filter_by(counselor_id=current_user_id).all()
+        # 통화 정보는 조인으로 함께 로드 (소견서마다 별도 조회하지 않음)
+        reports = ConsultationReport.query.options(joinedload(ConsultationReport.originating_call))\
+                                          .filter_by(counselor_id=current_user_id).all()
         
         if not reports:
             return jsonify({'reports': []}), 200
@@ -309,8 +324,7 @@ def get_my_reports():
                 # 필드 복호화
                 report.decrypt_fields(hybrid_encryption)
                 
-                # ClientCall 정보 가져오기
-                client_call = ClientCall.query.get(report.client_call_id)
+                client_call = report.originating_call
                 
                 # 복호화된 데이터 확인
                 current_app.logger.debug(f"복호화된 데이터 - client_name: {report.client_name}, memo_text: {report.memo_text}, transcribed_text: {report.transcribed_text}")
@@ -349,6 +363,39 @@ def get_my_reports():
             'reports': []
         }), 500
 
+@counselor_bp.route('/reports/search', methods=['GET'])
+@jwt_required()
+def search_my_reports():
+    """이름 또는 전화번호(접두어)로 상담사 본인의 소견서를 검색합니다."""
+    current_user_id = get_jwt_identity()
+    query = (request.args.get('q') or '').strip()
+    field = request.args.get('field')
+    exact = request.args.get('exact') == '1'
+
+    if not query:
+        return jsonify({'message': 'Search query (q) is required.'}), 400
+    if field not in (None, 'client_name', 'phone_number'):
+        return jsonify({'message': 'field must be client_name or phone_number.'}), 400
+
+    try:
+        reports = ReportService().search_reports(
+            db.session, query, field=field, exact=exact, counselor_id=current_user_id
+        )
+    except Exception as e:
+        current_app.logger.error(f"소견서 검색 실패: {str(e)}")
+        return jsonify({'error': '소견서 검색에 실패했습니다.', 'reports': []}), 500
+
+    report_list = [{
+        'id': report.id,
+        'client_call_id': report.client_call_id,
+        'name': report.client_name if report.client_name else '알 수 없음',
+        'risk': report.risk_level_recorded,
+        'created_at': report.created_at.isoformat() if report.created_at else None,
+        'phone': report.originating_call.phone_number if report.originating_call else '알 수 없음'
+    } for report in reports]
+    log_event('소견서 검색', {'counselor_id': current_user_id, 'result_count': len(report_list)})
+    return jsonify({'reports': report_list}), 200
+
 @counselor_bp.route('/report/<int:report_id>', methods=['GET'])
 @jwt_required()
 def get_report_detail(report_id):
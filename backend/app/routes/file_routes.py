@@ -1,5 +1,5 @@
 from flask import Blueprint, request, send_file, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, current_user
 from io import BytesIO
 import logging
 from ..services.file_service import FileService
@@ -28,8 +28,7 @@ def upload_file():
             return jsonify({'error': '유효하지 않은 파일 타입입니다.'}), 400
 
         # 현재 사용자 조회
-        current_user_id = get_jwt_identity()
-        user = User.query.get_or_404(current_user_id)
+        user = current_user
 
         # 파일 저장
         file_data = file.read()
@@ -52,8 +51,7 @@ def download_file(file_id):
     """파일 다운로드 엔드포인트"""
     try:
         # 현재 사용자 조회
-        current_user_id = get_jwt_identity()
-        user = User.query.get_or_404(current_user_id)
+        user = current_user
 
         # 파일 조회 및 복호화
         file_data, file_type = file_service.get_file(file_id, user)
@@ -85,8 +83,7 @@ def grant_permission(file_id):
             return jsonify({'error': '대상 사용자 ID가 필요합니다.'}), 400
 
         # 현재 사용자와 대상 사용자 조회
-        current_user_id = get_jwt_identity()
-        creator = User.query.get_or_404(current_user_id)
+        creator = current_user
         target_user = User.query.get_or_404(data['target_user_id'])
 
         # 권한 부여
@@ -114,8 +111,7 @@ def revoke_permission(file_id):
             return jsonify({'error': '대상 사용자 ID가 필요합니다.'}), 400
 
         # 현재 사용자와 대상 사용자 조회
-        current_user_id = get_jwt_identity()
-        creator = User.query.get_or_404(current_user_id)
+        creator = current_user
         target_user = User.query.get_or_404(data['target_user_id'])
 
         # 권한 취소
@@ -139,8 +135,7 @@ def delete_file(file_id):
     """파일 삭제 엔드포인트"""
     try:
         # 현재 사용자 조회
-        current_user_id = get_jwt_identity()
-        user = User.query.get_or_404(current_user_id)
+        user = current_user
 
         # 파일 삭제
         file_service.delete_file(file_id, user)
@@ -0,0 +1,101 @@
+# backend/app/routes/metrics_routes.py
+import hmac
+from functools import wraps
+from flask import Blueprint, Response, request, current_app, abort, jsonify
+from flask_jwt_extended import jwt_required, current_user
+from sqlalchemy import func
+from .. import db
+from ..models import ClientCall
+from ..utils.metrics import REGISTRY, render_latest
+from ..utils.tracing import tracer
+
+metrics_bp = Blueprint('metrics', __name__)
+
+QUEUE_STATUSES = ('pending', 'available_for_assignment')
+
+def _queue_depth_collector():
+    """대기열 깊이 (위험도별)"""
+    rows = db.session.query(ClientCall.risk_level, func.count(ClientCall.id))\
+                     .filter(ClientCall.status.in_(QUEUE_STATUSES))\
+                     .group_by(ClientCall.risk_level).all()
+    yield ('call_queue_depth', 'gauge', '대기 중인 통화 수 (위험도별)',
+           [({'risk_level': risk_level if risk_level is not None else 'unknown'}, count) for risk_level, count in rows])
+
+def _stats_metrics(prefix: str, documentation: str, stats: dict, counters=()):
+    """
+    stats()의 항목별 지표. 누적값(*_total 및 counters에 지정한 키)은 *_total 카운터로,
+    나머지는 게이지로 노출합니다.
+    """
+    for key, value in stats.items():
+        if key.endswith('_total') or key in counters:
+            name = f'{prefix}_{key}' if key.endswith('_total') else f'{prefix}_{key}_total'
+            yield (name, 'counter', f'{documentation} ({key})', [({}, value)])
+        else:
+            yield (f'{prefix}_{key}', 'gauge', f'{documentation} ({key})', [({}, value)])
+
+def _service_stats_collector():
+    """DEK 풀, Argon2 실행기, 사용자 식별 캐시 상태"""
+    from ..services.key_service import get_key_service
+    from ..utils.password_hashing import get_password_hasher
+    from ..utils.identity_cache import get_identity_cache
+
+    dek_pool = get_key_service().dek_pool
+    if dek_pool is not None:
+        yield from _stats_metrics('dek_pool', 'DEK 풀', dek_pool.stats())
+    yield from _stats_metrics('argon2_executor', 'Argon2 해시 실행기', get_password_hasher().stats())
+    yield from _stats_metrics('user_identity_cache', '사용자 식별 캐시', get_identity_cache().stats(),
+                              counters=('hits', 'misses', 'invalidations'))
+
+REGISTRY.register_collector(_queue_depth_collector)
+REGISTRY.register_collector(_service_stats_collector, per_process=True)
+
+def _require_metrics_token():
+    """
+    METRICS_TOKEN Bearer 토큰을 요구합니다 (미설정 시 /metrics 비활성화).
+    프록시 뒤에서는 remote_addr가 프록시 주소가 되므로 주소만으로는 접근을 제한할 수 없습니다.
+    """
+    token = current_app.config.get('METRICS_TOKEN')
+    supplied = request.headers.get('Authorization', '')
+    if not token or not hmac.compare_digest(supplied.encode(), f'Bearer {token}'.encode()):
+        abort(404)
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus 텍스트 형식 지표 (METRICS_TOKEN Bearer 토큰 필요)"""
+    _require_metrics_token()
+    return Response(render_latest(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+def admin_required(view):
+    """관리자 JWT 요구 (role은 식별 캐시에 없으므로 DB의 현재 값으로 확인)"""
+    @wraps(view)
+    @jwt_required()
+    def wrapper(*args, **kwargs):
+        if current_user is None or current_user.role != 'admin':
+            return jsonify({'message': 'Admin role required.'}), 403
+        return view(*args, **kwargs)
+    return wrapper
+
+@metrics_bp.route('/api/admin/traces', methods=['GET'])
+@admin_required
+def list_traces():
+    """최근 접수 추적 목록 (JSONL 파일 또는 메모리 링 버퍼, 관리자 전용)"""
+    if tracer.store is None:
+        return jsonify({'message': 'Trace store is disabled (TRACE_EXPORT).'}), 404
+    limit = min(request.args.get('limit', 50, type=int), 500)
+    return jsonify({'traces': tracer.store.recent_traces(limit)}), 200
+
+@metrics_bp.route('/api/admin/traces/<trace_id>', methods=['GET'])
+@admin_required
+def get_trace(trace_id):
+    """한 통화의 단계별 스팬 (시작 시각 순, 관리자 전용)"""
+    if tracer.store is None:
+        return jsonify({'message': 'Trace store is disabled (TRACE_EXPORT).'}), 404
+    spans = sorted(tracer.store.find(trace_id), key=lambda s: s['start_time'])
+    if not spans:
+        return jsonify({'message': 'Trace not found (expired from buffer or unknown id).'}), 404
+    call = ClientCall.query.filter_by(trace_id=trace_id).first()
+    return jsonify({
+        'trace_id': trace_id,
+        'call_id': call.id if call else None,
+        'spans': spans
+    }), 200
@@ -0,0 +1,109 @@
+# backend/app/services/admission_service.py
+import sqlite3
+import hashlib
+import logging
+from contextlib import contextmanager
+from typing import Optional
+from flask import current_app, has_app_context
+from ..config import Config
+from ..utils.metrics import Counter
+from ..utils.rate_limiter import get_admission_store
+
+logger = logging.getLogger(__name__)
+
+SUBMIT_ADMISSION = Counter('submit_admission', '통화 제출 접수 제어 결과', ('result',))
+
+ANALYSIS_POOL = 'submit_analysis'
+
+class AdmissionRejected(Exception):
+    """접수 거절 (429: 요청 한도 초과, 503: 분석 대기열 과부하 또는 접수 제어 저장소 잠금 대기 초과)"""
+
+    def __init__(self, status_code: int, retry_after: float, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def _setting(config, key):
+    return config.get(key, getattr(Config, key))
+
+def _config(config=None):
+    return config if config is not None else (current_app.config if has_app_context() else {})
+
+def _store_busy(config, e: sqlite3.OperationalError) -> AdmissionRejected:
+    """다른 워커가 저장소를 오래 잠그고 있으면(busy timeout) 과부하와 같이 503으로 거절합니다."""
+    SUBMIT_ADMISSION.labels(result='store_busy').inc()
+    logger.warning(f"접수 제어 저장소 사용 불가로 통화 제출 거절: {e}")
+    return AdmissionRejected(503, _setting(config, 'SUBMIT_RETRY_AFTER_SECONDS'), 'Admission control is busy')
+
+def _consume(bucket: str, key: str, capacity_key: str, period_key: str, config) -> Optional[float]:
+    """토큰 하나를 소비합니다. 거절되면 재시도까지의 초를 반환합니다."""
+    capacity = _setting(config, capacity_key)
+    if capacity <= 0:
+        return None  # 0이면 해당 한도 비활성화
+    try:
+        allowed, retry_after = get_admission_store(config).consume(
+            f"{bucket}:{key}", capacity, capacity / _setting(config, period_key))
+    except sqlite3.OperationalError as e:
+        raise _store_busy(config, e) from e
+    return None if allowed else retry_after
+
+def check_client_rate(remote_addr: str, config=None):
+    """IP별 제출 한도를 검사합니다 (요청 본문을 읽기 전에 호출)."""
+    config = _config(config)
+    if not _setting(config, 'SUBMIT_ADMISSION_ENABLED'):
+        return
+    retry_after = _consume('ip', remote_addr or 'unknown',
+                           'SUBMIT_RATE_LIMIT_PER_IP', 'SUBMIT_RATE_LIMIT_PER_IP_PERIOD_SECONDS', config)
+    if retry_after is not None:
+        SUBMIT_ADMISSION.labels(result='rate_limited_ip').inc()
+        raise AdmissionRejected(429, retry_after, 'Too many submissions from this address')
+
+def check_phone_rate(phone_number: str, config=None):
+    """전화번호별 제출 한도를 검사합니다 (공유 저장소에는 전화번호의 해시만 기록)."""
+    config = _config(config)
+    if not _setting(config, 'SUBMIT_ADMISSION_ENABLED'):
+        return
+    phone_key = hashlib.sha256(phone_number.encode('utf-8')).hexdigest()[:32]
+    retry_after = _consume('phone', phone_key,
+                           'SUBMIT_RATE_LIMIT_PER_PHONE', 'SUBMIT_RATE_LIMIT_PER_PHONE_PERIOD_SECONDS', config)
+    if retry_after is not None:
+        SUBMIT_ADMISSION.labels(result='rate_limited_phone').inc()
+        raise AdmissionRejected(429, retry_after, 'Too many submissions for this phone number')
+
+def analysis_backlog(config=None) -> int:
+    """모든 워커에서 분석 중인 제출 수"""
+    return get_admission_store(_config(config)).active_leases(ANALYSIS_POOL)
+
+@contextmanager
+def analysis_slot(config=None):
+    """
+    분석 대기열 자리를 확보합니다.
+
+    전체 워커의 분석 중인 제출 수가 SUBMIT_MAX_ANALYSIS_BACKLOG에 도달하면 503으로 거절하여
+    나머지 워커/CPU는 상담사 API(실시간 통화 처리)에 남겨 둡니다.
+    업로드를 받은 뒤 디코딩/분석 동안만 점유하므로 느린 업로드가 자리를 차지하지 않습니다.
+    """
+    config = _config(config)
+    if not _setting(config, 'SUBMIT_ADMISSION_ENABLED'):
+        yield
+        return
+    store = get_admission_store(config)
+    try:
+        lease_id = store.acquire_lease(ANALYSIS_POOL, _setting(config, 'SUBMIT_MAX_ANALYSIS_BACKLOG'),
+                                       _setting(config, 'SUBMIT_ANALYSIS_LEASE_SECONDS'))
+    except sqlite3.OperationalError as e:
+        raise _store_busy(config, e) from e
+    if lease_id is None:
+        SUBMIT_ADMISSION.labels(result='overloaded').inc()
+        logger.warning("분석 대기열 과부하로 통화 제출 거절")
+        raise AdmissionRejected(503, _setting(config, 'SUBMIT_RETRY_AFTER_SECONDS'), 'Analysis queue is full')
+    SUBMIT_ADMISSION.labels(result='admitted').inc()
+    try:
+        yield
+    finally:
+        try:
+            store.release_lease(lease_id)
+        except sqlite3.OperationalError as e:
+            # 반환하지 못한 자리는 임대 만료(SUBMIT_ANALYSIS_LEASE_SECONDS) 후 회수됨
+            logger.warning(f"분석 대기열 자리 반환 실패: {e}")
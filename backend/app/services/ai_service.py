@@ -1,94 +1,346 @@
 # backend/app/services/ai_service.py
-from transformers import (pipeline, 
-    WhisperProcessor, WhisperForConditionalGeneration,
-    AutoTokenizer, AutoModelForSequenceClassification
-)
-import torch
-import librosa
-from flask import current_app
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, Optional
+from flask import current_app, has_app_context
+from ..config import Config
+from ..utils.circuit_breaker import CircuitBreaker
+from ..utils.deadline import Deadline, DeadlineExceeded
+from ..utils.metrics import stage_timer
+from .model_backends import get_model_backend, SAMPLING_RATE, WHISPER_MAX_NEW_TOKENS
+from .audio_preprocessing import apply_vad, vad_enabled, decode_audio, decode_canonical
+from .inference_scheduler import model_slot
+
+logger = logging.getLogger(__name__)
 
 # --- 0. 모델 로드 (애플리케이션 시작 시 또는 첫 호출 시 로드) ---
+# 실제 모델 실행은 MODEL_BACKEND 설정에 따른 백엔드(torch/onnx/stub)가 담당합니다.
+# 모델 호출은 우선순위(live > interactive > batch) 스케줄러의 슬롯 안에서 실행됩니다.
+# 호출자는 `with inference_priority('batch'):`(inference_scheduler)처럼 작업 단위로 우선순위를 지정합니다.
+
+def load_models():
+    get_model_backend().load()
 
-# Whisper 모델 및 프로세서 로드 (STT)
-whisper_model_name = "YongJaeLee/Whisper_FineTuning_Ko_Stagewise"
-whisper_processor = None
-whisper_model = None
+def inference_mode() -> str:
+    """'local'(프로세스 내 모델) 또는 'server'(공유 추론 서버)"""
+    return current_app.config.get('INFERENCE_MODE', 'local') if has_app_context() else 'local'
 
-# RoBERTa 모델 및 토크나이저 로드 (위험도 예측)
-roberta_model_name = "seungb1027/roberta-suicide-risk"
-roberta_tokenizer = None
-roberta_model = None
+def _setting(key):
+    config = current_app.config if has_app_context() else {}
+    return config.get(key, getattr(Config, key))
+
+
+# --- 제한 시간 / 차단기 ---
+# 통화 하나의 분석에는 INFERENCE_DEADLINE_SECONDS가 주어지고, 각 단계(슬롯 대기, 디코딩 루프)는 남은 시간 안에서 실행됩니다.
+# 시간 초과/모델 오류가 연속되면 차단기가 열려 인식을 시도하지 않고 'circuit_open'을 반환하며,
+# 호출자(call_service)는 통화를 'pending_retry'로 접수하여 나중에 재분석합니다.
+
+# 차단기에 실패로 기록되는 오류 (디코딩 오류는 파일 문제이므로 제외)
+BREAKER_ERRORS = ('timeout', 'model_error', 'unavailable')
+# 나중에 재시도하면 성공할 수 있는 오류
+RETRYABLE_ERRORS = ('timeout', 'unavailable', 'circuit_open')
+
+_breaker: Optional[CircuitBreaker] = None
+_breaker_lock = threading.Lock()
+
+def get_inference_breaker() -> CircuitBreaker:
+    """프로세스 단위 음성 인식 차단기를 반환합니다."""
+    global _breaker
+    if _breaker is None:
+        with _breaker_lock:
+            if _breaker is None:
+                _breaker = CircuitBreaker(
+                    'speech_to_text',
+                    failure_threshold=_setting('INFERENCE_BREAKER_FAILURE_THRESHOLD'),
+                    reset_timeout=_setting('INFERENCE_BREAKER_RESET_SECONDS')
+                )
+    return _breaker
+
+def new_deadline() -> Deadline:
+    """통화 하나의 분석에 주어지는 전체 제한 시간"""
+    return Deadline(_setting('INFERENCE_DEADLINE_SECONDS') or None)
+
+def generate_kwargs_for(audio_seconds: float, deadline: Optional[Deadline] = None,
+                        profile: Optional[str] = None) -> Dict:
+    """
+    디코딩 프로필(미지정 시 현재 작업의 프로필)에 따른 generate 인자
+    음성 길이에 비례한 토큰 상한과 디코딩 제한 시간이 포함됩니다 (반복 디코딩 루프에 빠져도 max_new_tokens/max_time에서 멈춤).
+    """
+    return get_decoding_profile(profile).generate_kwargs(audio_seconds, deadline)
+
+
+# --- 디코딩 프로필 ---
+# 언어 감지를 건너뛰도록 언어(한국어)/작업(받아쓰기)을 고정하고, 탐색 방식과 토큰 상한을 프로필별로 정합니다.
+# 호출자는 `with decoding_profile('accurate'):`처럼 작업 단위로 프로필을 지정합니다 (기본값: WHISPER_DECODING_PROFILE).
+
+class DecodingProfile:
+    """
+    Whisper 디코딩 설정 묶음
+
+    num_beams: 1이면 탐욕(greedy) 디코딩, 그보다 크면 빔 서치 (None이면 config_beams 설정값)
+    token_headroom: 음성 길이 기준 토큰 상한(WHISPER_TOKENS_PER_SECOND)에 곱할 여유 배수
+    """
+
+    def __init__(self, name: str, num_beams: Optional[int] = 1, token_headroom: float = 1.0,
+                 config_beams: Optional[str] = None):
+        self.name = name
+        self.num_beams = num_beams
+        self.token_headroom = token_headroom
+        self.config_beams = config_beams
+
+    def generate_kwargs(self, audio_seconds: float, deadline: Optional[Deadline] = None) -> Dict:
+        num_beams = self.num_beams if self.config_beams is None else max(1, _setting(self.config_beams))
+        per_second = _setting('WHISPER_TOKENS_PER_SECOND') * self.token_headroom
+        max_new_tokens = int(_setting('WHISPER_MIN_NEW_TOKENS') + audio_seconds * per_second)
+        kwargs = {
+            # 언어/작업 토큰을 디코더 프롬프트로 고정 (transformers가 forced decoder ids로 변환)
+            'language': WHISPER_LANGUAGE,
+            'task': WHISPER_TASK,
+            'num_beams': num_beams,
+            'use_cache': True,  # 디코더 self/cross-attention KV 캐시 재사용
+            'max_new_tokens': min(max_new_tokens, WHISPER_MAX_NEW_TOKENS),
+        }
+        if num_beams == 1 and self.name in _setting('WHISPER_ASSISTED_PROFILES'):
+            kwargs['assisted'] = True  # 초안 모델 보조 디코딩 (보조 모델이 없는 백엔드는 무시)
+        max_time = (deadline or Deadline()).cap(_setting('WHISPER_GENERATE_TIMEOUT_SECONDS') or None)
+        if max_time is not None:
+            kwargs['max_time'] = max_time
+        return kwargs
+
+
+WHISPER_LANGUAGE = 'ko'
+WHISPER_TASK = 'transcribe'
+
+DECODING_PROFILES = {
+    # 접수 직후 위험도 분류용: 탐욕 디코딩 + 촘촘한 토큰 상한
+    'fast-triage': DecodingProfile('fast-triage', num_beams=1),
+    # 재분석/상담 기록용: 빔 서치 + 말이 빠른 통화를 자르지 않도록 상한 여유
+    'accurate': DecodingProfile('accurate', num_beams=None, token_headroom=1.5,
+                                config_beams='WHISPER_ACCURATE_NUM_BEAMS'),
+}
+DECODING_PROFILE_NAMES = tuple(DECODING_PROFILES)
+DECODING_PROFILE_CODES = {name: code for code, name in enumerate(DECODING_PROFILE_NAMES)}  # 추론 서버 프로토콜용
+
+_current_profile = contextvars.ContextVar('decoding_profile', default=None)
+
+def current_decoding_profile() -> str:
+    return _current_profile.get() or _setting('WHISPER_DECODING_PROFILE')
+
+def get_decoding_profile(name: Optional[str] = None) -> DecodingProfile:
+    name = name or current_decoding_profile()
+    if name not in DECODING_PROFILES:
+        raise ValueError(f"알 수 없는 디코딩 프로필: {name} (지원: {', '.join(DECODING_PROFILE_NAMES)})")
+    return DECODING_PROFILES[name]
+
+@contextmanager
+def decoding_profile(name: Optional[str]):
+    """블록 안에서 실행되는 음성 인식(로컬/추론 서버)의 디코딩 프로필을 지정합니다 (None이면 기본값 유지)."""
+    if name is None:
+        yield
+        return
+    get_decoding_profile(name)
+    token = _current_profile.set(name)
+    try:
+        yield
+    finally:
+        _current_profile.reset(token)
+
+def _guarded(run, result_class=None):
+    """차단기가 닫혀 있을 때만 인식/위험도 예측을 실행하고 결과를 차단기에 기록합니다."""
+    breaker = get_inference_breaker()
+    if not breaker.allow():
+        return (result_class or TranscriptionResult)(None, error='circuit_open')
+    result = run()
+    if result.error in BREAKER_ERRORS:
+        breaker.record_failure(result.error)
+    else:
+        breaker.record_success()
+    return result
 
-# 모델 로드 함수 (애플리케이션 시작 시 호출되도록 __init__.py 등에서 관리 가능)
-def load_models():
-    global whisper_processor, whisper_model, roberta_tokenizer, roberta_model
-    device = "cuda" if torch.cuda.is_available() else "cpu"
-    print(f"Using device: {device} for AI models.")
-
-    if whisper_processor is None or whisper_model is None:
-        print(f"Loading Whisper model: {whisper_model_name}...")
-        whisper_processor = WhisperProcessor.from_pretrained(whisper_model_name)
-        whisper_model = WhisperForConditionalGeneration.from_pretrained(whisper_model_name).to(device)
-        whisper_model.eval() # 추론 모드로 설정
-        print("Whisper model loaded.")
-
-    if roberta_tokenizer is None or roberta_model is None:
-        print(f"Loading RoBERTa model: {roberta_model_name}...")
-        roberta_tokenizer = AutoTokenizer.from_pretrained(roberta_model_name)
-        roberta_model = AutoModelForSequenceClassification.from_pretrained(roberta_model_name).to(device)
-        roberta_model.eval() # 추론 모드로 설정
-        print("RoBERTa model loaded.")
 
 # --- 1. 음성 파일을 텍스트로 변환 (STT) ---
+class TranscriptionResult:
+    """
+    음성 인식 결과 (text는 실패 또는 음성 없음일 때 None)
+
+    error: None(성공/음성 없음), 'decode_error', 'timeout', 'model_error', 'unavailable'(추론 서버), 'circuit_open'
+    """
+
+    def __init__(self, text, has_speech: bool = True, vad_removed_seconds: float = 0.0, error: Optional[str] = None):
+        self.text = text
+        self.has_speech = has_speech
+        self.vad_removed_seconds = vad_removed_seconds
+        self.error = error
+
+
 def speech_to_text(audio_file_path):
-    if whisper_model is None or whisper_processor is None:
-        load_models() # 모델이 로드되지 않았다면 로드
+    return transcribe_audio(audio_file_path).text
 
-    device = whisper_model.device
+def _transcribe_remote(audio_bytes: bytes, deadline: Deadline) -> TranscriptionResult:
+    from .inference_client import get_inference_client, InferenceError
+    if deadline.expired():
+        return TranscriptionResult(None, error='timeout')
+    try:
+        with stage_timer('remote_transcribe'):
+            client = get_inference_client()
+            return TranscriptionResult(*client.transcribe(
+                audio_bytes, timeout=deadline.cap(client.timeout),
+                profile=DECODING_PROFILE_CODES[current_decoding_profile()]))
+    except InferenceError as e:
+        # 서버가 보낸 오류 종류 그대로 분류 (timeout → 재분석 대기, decode_error → 차단기에 기록하지 않음)
+        logger.error(f"Error in speech_to_text (inference server): {e}")
+        return TranscriptionResult(None, error=e.kind)
 
+def transcribe_audio(audio_file_path, deadline: Optional[Deadline] = None) -> TranscriptionResult:
+    """INFERENCE_MODE에 따라 프로세스 내 모델 또는 공유 추론 서버로 음성을 인식합니다."""
+    deadline = deadline or new_deadline()
+    if inference_mode() != 'server':
+        return _guarded(lambda: transcribe_audio_local(audio_file_path, deadline))
+
+    try:
+        with open(audio_file_path, 'rb') as f:
+            audio_bytes = f.read()
+    except OSError as e:
+        logger.error(f"Error in speech_to_text: {e}")
+        return TranscriptionResult(None, error='decode_error')
+    return _guarded(lambda: _transcribe_remote(audio_bytes, deadline))
+
+def speech_to_text_local(audio_file_path):
+    return transcribe_audio_local(audio_file_path).text
+
+def transcribe_audio_local(audio_file_path, deadline: Optional[Deadline] = None) -> TranscriptionResult:
+    deadline = deadline or new_deadline()
     try:
         # 음성 파일 로드 및 Whisper가 요구하는 형식으로 전처리
-        # Whisper는 16kHz 샘플링 레이트의 모노 오디오를 기대합니다.
-        speech_array, sampling_rate = librosa.load(audio_file_path, sr=16000, mono=True)
+        # Whisper는 16kHz 샘플링 레이트의 모노 오디오를 기대합니다. (길이 상한/남은 시간 안에서 디코딩)
+        with stage_timer('audio_decode'): # 디코딩 + 16kHz 리샘플링
+            speech_array = decode_audio(audio_file_path, deadline)
+    except DeadlineExceeded as e:
+        logger.error(f"Timeout in speech_to_text: {e}")
+        return TranscriptionResult(None, error='timeout')
+    except Exception as e:
+        logger.error(f"Error in speech_to_text: {e}")
+        return TranscriptionResult(None, error='decode_error')
+    return transcribe_waveform_local(speech_array, deadline)
+
+def transcribe_canonical(canonical_audio: bytes, waveform=None, deadline: Optional[Deadline] = None) -> TranscriptionResult:
+    """
+    표준 형식(16kHz 모노 FLAC) 오디오를 인식합니다.
+    접수 시 이미 디코딩한 파형이 있으면 그대로 사용하고, 추론 서버에는 FLAC 바이트를 보냅니다.
+    """
+    deadline = deadline or new_deadline()
+    if inference_mode() == 'server':
+        return _guarded(lambda: _transcribe_remote(canonical_audio, deadline))
+
+    if waveform is None:
+        try:
+            with stage_timer('canonical_decode'):
+                waveform = decode_canonical(canonical_audio)
+        except Exception as e:
+            logger.error(f"Error in speech_to_text: {e}")
+            return TranscriptionResult(None, error='decode_error')
+    return _guarded(lambda: transcribe_waveform_local(waveform, deadline))
 
-        input_features = whisper_processor(speech_array, sampling_rate=16000, return_tensors="pt").input_features.to(device)
+def transcribe_waveform_local(speech_array, deadline: Optional[Deadline] = None) -> TranscriptionResult:
+    """16kHz 모노 파형에 VAD를 적용하고 제한 시간 안에서 인식합니다 (오류는 error로 분류하여 반환)."""
+    backend = get_model_backend()
+    deadline = deadline or new_deadline()
+    removed_seconds = 0.0
+
+    try:
+        backend.load() # 모델이 로드되지 않았다면 로드
 
-        # 음성 인식 수행
-        with torch.no_grad(): # 그래디언트 계산 비활성화 (추론 시)
-            predicted_ids = whisper_model.generate(input_features)
+        # 앞뒤/긴 내부 무음 제거, 음성이 없으면 인식/위험도 분석을 건너뜀
+        if vad_enabled():
+            with stage_timer('vad'):
+                vad = apply_vad(speech_array, SAMPLING_RATE)
+            removed_seconds = vad.removed_seconds
+            if not vad.has_speech:
+                return TranscriptionResult(None, has_speech=False, vad_removed_seconds=removed_seconds)
+            speech_array = vad.audio
 
-        # 예측된 ID를 텍스트로 디코딩
-        transcription = whisper_processor.batch_decode(predicted_ids, skip_special_tokens=True)[0]
-        print(f"Transcription: {transcription}")
-        return transcription
+        # 특징 추출 + 음성 인식 + 디코딩 (슬롯 대기와 디코딩 루프 모두 남은 시간 안에서)
+        with model_slot(timeout=deadline.remaining()):
+            deadline.check('whisper_generate')
+            transcription = backend.transcribe(
+                speech_array, generate_kwargs_for(len(speech_array) / SAMPLING_RATE, deadline))
+        logger.debug(f"Transcription complete ({len(transcription)} chars)")  # 상담 내용은 기록하지 않음
+        return TranscriptionResult(transcription, vad_removed_seconds=removed_seconds)
+    except DeadlineExceeded as e:
+        logger.error(f"Timeout in speech_to_text: {e}")
+        return TranscriptionResult(None, vad_removed_seconds=removed_seconds, error='timeout')
     except Exception as e:
-        print(f"Error in speech_to_text: {e}")
-        return None
+        logger.error(f"Error in speech_to_text: {e}")
+        return TranscriptionResult(None, vad_removed_seconds=removed_seconds, error='model_error')
 
 
 # --- 2. 텍스트 기반 자살 위험도 예측 ---
-def predict_suicide_risk(text):
-    if roberta_model is None or roberta_tokenizer is None:
-        load_models() # 모델이 로드되지 않았다면 로드
+class RiskResult:
+    """위험도 예측 결과 (risk_level은 실패 시 None, error는 TranscriptionResult와 같은 분류)"""
+
+    def __init__(self, risk_level: Optional[int], error: Optional[str] = None):
+        self.risk_level = risk_level
+        self.error = error
 
-    device = roberta_model.device
 
+def predict_suicide_risk(text):
+    return assess_risk(text).risk_level
+
+def _assess_risk_remote(text: str, deadline: Deadline) -> RiskResult:
+    from .inference_client import get_inference_client, InferenceError
+    if deadline.expired():
+        return RiskResult(None, error='timeout')
     try:
-        inputs = roberta_tokenizer(text, return_tensors="pt", truncation=True, padding=True, max_length=512).to(device)
+        with stage_timer('remote_risk_scoring'):
+            client = get_inference_client()
+            risk_level = client.predict_risk(text, timeout=deadline.cap(client.timeout))
+    except InferenceError as e:
+        logger.error(f"Error in predict_suicide_risk (inference server): {e}")
+        return RiskResult(None, error=e.kind)
+    return RiskResult(risk_level, error=None if risk_level is not None else 'model_error')
 
-        with torch.no_grad():
-            outputs = roberta_model(**inputs)
-            logits = outputs.logits
+def assess_risk(text: str, deadline: Optional[Deadline] = None) -> RiskResult:
+    """
+    INFERENCE_MODE에 따라 프로세스 내 모델 또는 공유 추론 서버로 위험도를 예측합니다.
+    음성 인식과 같은 차단기를 거치며, deadline은 인식 단계부터 이어지는 통화 분석 제한 시간입니다.
+    """
+    deadline = deadline or new_deadline()
+    if inference_mode() != 'server':
+        return _guarded(lambda: assess_risk_local(text, deadline), RiskResult)
+    return _guarded(lambda: _assess_risk_remote(text, deadline), RiskResult)
 
-        # 로짓에서 확률 계산 (Softmax) 및 가장 높은 확률의 클래스 예측
-        probabilities = torch.softmax(logits, dim=-1)
-        risk_level = torch.argmax(probabilities, dim=-1).item()
+def predict_suicide_risk_local(text):
+    return assess_risk_local(text).risk_level
 
-        print(f"Predicted Class ID (Risk Level): {risk_level}")
-        return risk_level
+def assess_risk_local(text: str, deadline: Optional[Deadline] = None) -> RiskResult:
+    """남은 시간 안에서 슬롯을 잡아 위험도를 예측합니다 (오류는 error로 분류하여 반환)."""
+    backend = get_model_backend()
+    deadline = deadline or new_deadline()
+
+    try:
+        backend.load() # 모델이 로드되지 않았다면 로드
+        with model_slot(timeout=deadline.remaining()):
+            deadline.check('risk_scoring')
+            risk_level = backend.predict_risk(text)
+        logger.debug(f"Predicted Class ID (Risk Level): {risk_level}")
+        return RiskResult(risk_level)
+    except DeadlineExceeded as e:
+        logger.error(f"Timeout in predict_suicide_risk: {e}")
+        return RiskResult(None, error='timeout')
     except Exception as e:
-        print(f"Error in predict_suicide_risk: {e}")
-        return None # 또는 기본 위험도 레벨 반환
+        logger.error(f"Error in predict_suicide_risk: {e}")
+        return RiskResult(None, error='model_error')
+
+
+def model_versions() -> Dict[str, str]:
+    """위험도 예측에 사용된 모델 버전 (추론 서버 사용 시 서버가 마지막 응답에 보고한 버전)"""
+    if inference_mode() == 'server':
+        from .inference_client import get_inference_client
+
+        return get_inference_client().model_versions or {'backend': 'server'}
+    return get_model_backend().model_versions()
 
 
 # --- 3. 전체 분석 파이프라인 함수 ---
@@ -97,19 +349,19 @@ def analyze_audio_risk(audio_file_path):
     음성 파일을 입력받아 텍스트로 변환 후, 자살 위험도를 예측합니다.
     성공 시 위험도 레벨 (예: 0, 1, 2)을 반환하고, 실패 시 None을 반환합니다.
     """
-    print(f"Starting risk analysis for: {audio_file_path}")
+    logger.debug(f"Starting risk analysis for: {audio_file_path}")
     transcribed_text = speech_to_text(audio_file_path)
 
     if transcribed_text:
         risk_level = predict_suicide_risk(transcribed_text)
         if risk_level is not None:
-            print(f"Analysis complete. Risk level: {risk_level}")
+            logger.debug(f"Analysis complete. Risk level: {risk_level}")
             return risk_level
         else:
-            print("Failed to predict risk from text.")
+            logger.warning("Failed to predict risk from text.")
             return None # 또는 기본 위험도
     else:
-        print("Failed to transcribe audio.")
+        logger.warning("Failed to transcribe audio.")
         return None # 또는 기본 위험도
 
 if __name__ == '__main__':
@@ -0,0 +1,330 @@
+# backend/app/services/audio_pipeline.py
+import io
+import time
+import queue
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Union
+import numpy as np
+from flask import current_app, has_app_context
+from ..config import Config
+from ..utils.deadline import DeadlineExceeded
+from ..utils.metrics import Counter, Gauge, STAGE_DURATION
+from .ai_service import TranscriptionResult, generate_kwargs_for, new_deadline
+from .inference_scheduler import model_slot
+from .audio_preprocessing import (decode_audio, decode_canonical, encode_canonical, get_vad, vad_enabled,
+                                  record_vad, max_audio_seconds, EnergyVad)
+from .model_backends import ModelBackend, create_backend, get_model_backend, SAMPLING_RATE
+
+logger = logging.getLogger(__name__)
+
+# 일괄 처리용 2단계 파이프라인
+#   [전처리 프로세스 풀] 디코딩/리샘플링 → VAD → log-mel 특징 추출 → 공유 메모리 슬롯(float32)
+#   [추론 단계]         슬롯의 특징을 복사 없이 읽어 transcribe_features 실행 → 슬롯 반환
+# 슬롯 수(queue_size)만큼만 전처리가 앞서 나갈 수 있으므로 추론이 느리면 전처리 제출이 멈춥니다.
+
+PIPELINE_ITEMS = Counter('audio_pipeline_items', '파이프라인이 처리한 오디오 수', ('result',))
+PIPELINE_READY = Gauge('audio_pipeline_ready_items', '전처리를 마치고 추론을 기다리는 오디오 수')
+
+# 워커 프로세스에 전달할 설정 (Flask 앱 없이 특징 추출기/VAD를 구성)
+_WORKER_CONFIG_KEYS = (
+    'ONNX_MODEL_DIR', 'ONNX_INTRA_OP_THREADS', 'MODEL_REGISTRY_DIR', 'MODEL_REGISTRY_REQUIRED',
+    'VAD_ENABLED', 'VAD_FRAME_MS', 'VAD_ENERGY_THRESHOLD_DB', 'VAD_NOISE_MARGIN_DB',
+    'VAD_MAX_GAP_MS', 'VAD_PADDING_MS', 'VAD_MIN_SPEECH_MS', 'VAD_DROP_TONES', 'MAX_AUDIO_SECONDS',
+)
+
+AudioSource = Union[str, bytes]  # 원본 오디오 파일 경로 또는 표준 형식(FLAC) 바이트
+
+class PreprocessedAudio:
+    """전처리 결과 (특징은 공유 메모리 슬롯에 있거나, 슬롯보다 크면 features로 직접 전달)"""
+
+    def __init__(self, audio_seconds: float, shape: Optional[Tuple[int, ...]] = None,
+                 features: Optional[np.ndarray] = None, has_speech: bool = True,
+                 vad_removed_seconds: float = 0.0, canonical_audio: Optional[bytes] = None,
+                 timings: Optional[Dict[str, float]] = None):
+        self.audio_seconds = audio_seconds
+        self.shape = shape
+        self.features = features
+        self.has_speech = has_speech
+        self.vad_removed_seconds = vad_removed_seconds
+        self.canonical_audio = canonical_audio
+        self.timings = timings or {}
+
+
+class PipelineResult:
+    """오디오 한 건의 인식 결과 (원본 경로를 입력한 경우 keep_canonical이면 표준 형식 바이트 포함)"""
+
+    def __init__(self, transcription: TranscriptionResult, audio_seconds: float = 0.0,
+                 canonical_audio: Optional[bytes] = None):
+        self.transcription = transcription
+        self.audio_seconds = audio_seconds
+        self.canonical_audio = canonical_audio
+
+
+def preprocess_audio(source: AudioSource, backend: ModelBackend, vad: Optional[EnergyVad],
+                     keep_canonical: bool = False, max_seconds: Optional[float] = None) -> Tuple[PreprocessedAudio, Optional[np.ndarray]]:
+    """디코딩(→16kHz) / VAD / 특징 추출을 수행합니다. 음성이 없으면 특징은 None입니다 (max_seconds: decode_audio 참고)."""
+    timings = {}
+    started = time.perf_counter()
+    if isinstance(source, bytes):
+        waveform = decode_canonical(source)
+        timings['canonical_decode'] = time.perf_counter() - started
+    else:
+        waveform = decode_audio(source, max_seconds=max_seconds)
+        timings['audio_decode'] = time.perf_counter() - started
+
+    canonical_audio = None
+    if keep_canonical and not isinstance(source, bytes):
+        started = time.perf_counter()
+        canonical_audio = encode_canonical(waveform)
+        timings['canonical_encode'] = time.perf_counter() - started
+
+    result = PreprocessedAudio(len(waveform) / SAMPLING_RATE, canonical_audio=canonical_audio, timings=timings)
+    if vad is not None:
+        started = time.perf_counter()
+        trimmed = vad.trim(waveform, SAMPLING_RATE)
+        timings['vad'] = time.perf_counter() - started
+        result.vad_removed_seconds = trimmed.removed_seconds
+        if not trimmed.has_speech:
+            result.has_speech = False
+            return result, None
+        waveform = trimmed.audio
+
+    started = time.perf_counter()
+    features = backend.extract_features(waveform)
+    timings['feature_extraction'] = time.perf_counter() - started
+    result.shape = features.shape
+    return result, features
+
+
+# --- 전처리 워커 프로세스 ---
+
+_worker_backend: Optional[ModelBackend] = None
+_worker_vad: Optional[EnergyVad] = None
+_worker_max_seconds: Optional[float] = None
+
+def _init_worker(backend_name: str, config: Dict[str, Any]):
+    global _worker_backend, _worker_vad, _worker_max_seconds
+    _warm_up_decoder()
+    _worker_backend = create_backend(backend_name, config)
+    _worker_backend.load_feature_extractor()  # 모델 가중치는 적재하지 않음
+    _worker_vad = get_vad(config) if vad_enabled(config) else None
+    _worker_max_seconds = max_audio_seconds(config) or 0
+
+def _warm_up_decoder():
+    """librosa 지연 적재/리샘플러 초기화를 워커 시작 시 끝내 첫 작업의 지연을 없앱니다."""
+    import soundfile
+
+    buffer = io.BytesIO()
+    soundfile.write(buffer, np.zeros(800, dtype=np.float32), 8000, format='WAV')
+    buffer.seek(0)
+    decode_audio(buffer)
+
+def _worker_ready(_) -> bool:
+    return True
+
+def _preprocess_in_worker(source: AudioSource, slot_name: str, keep_canonical: bool) -> PreprocessedAudio:
+    result, features = preprocess_audio(source, _worker_backend, _worker_vad, keep_canonical, _worker_max_seconds)
+    if features is None:
+        return result
+    slot = shared_memory.SharedMemory(name=slot_name)
+    try:
+        if features.nbytes <= slot.size:
+            np.ndarray(features.shape, dtype=np.float32, buffer=slot.buf)[...] = features
+        else:
+            # 슬롯보다 큰 특징(30초 초과 입력을 자르지 않는 백엔드 등)은 피클로 전달
+            result.features = features
+    finally:
+        slot.close()
+    return result
+
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+_DONE = object()
+
+class AudioPipeline:
+    """
+    전처리 프로세스 풀과 추론 단계를 분리한 일괄 음성 인식 파이프라인
+
+    run()에 (키, 오디오) 이터러블을 넘기면 (키, PipelineResult)를 입력 순서대로 돌려줍니다.
+    위험도 예측 등 후속 처리는 호출자가 결과를 받은 뒤 수행합니다.
+    워커와 슬롯은 close()(또는 with 블록 종료) 전까지 여러 run()에서 재사용됩니다.
+    """
+
+    def __init__(self, backend: Optional[ModelBackend] = None, workers: Optional[int] = None,
+                 queue_size: Optional[int] = None, slot_bytes: Optional[int] = None, config=None):
+        config = config if config is not None else (current_app.config if has_app_context() else {})
+        self.backend = backend or get_model_backend()
+        self.workers = max(1, workers or config.get('AUDIO_PIPELINE_WORKERS', Config.AUDIO_PIPELINE_WORKERS))
+        self.queue_size = max(1, queue_size or config.get('AUDIO_PIPELINE_QUEUE_SIZE', Config.AUDIO_PIPELINE_QUEUE_SIZE))
+        self.slot_bytes = slot_bytes or config.get('AUDIO_PIPELINE_SLOT_BYTES', Config.AUDIO_PIPELINE_SLOT_BYTES)
+        self.worker_config = {key: config.get(key, getattr(Config, key)) for key in _WORKER_CONFIG_KEYS}
+
+        self._executor = None
+        self._slots = {}
+        self._free_slots = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def start(self):
+        """모델 적재, 공유 메모리 슬롯 생성, 워커 시작 (여러 번의 run()에서 재사용)"""
+        if self._executor is not None:
+            return
+        self.backend.load()
+        self._free_slots = queue.Queue()
+        for _ in range(self.queue_size):
+            slot = shared_memory.SharedMemory(create=True, size=self.slot_bytes)
+            self._slots[slot.name] = slot
+            self._free_slots.put(slot.name)
+        # 모델이 적재된 부모 프로세스를 fork하지 않도록 spawn으로 워커를 시작
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker, initargs=(self.backend.name, self.worker_config)
+        )
+        # 워커 시작/특징 추출기 적재를 미리 끝내 첫 배치의 지연을 없앰
+        list(self._executor.map(_worker_ready, range(self.workers)))
+
+    def close(self):
+        if self._executor is None:
+            return
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._executor = None
+        for slot in self._slots.values():
+            slot.close()
+            slot.unlink()
+        self._slots = {}
+
+    def run(self, items: Iterable[Tuple[Any, AudioSource]], keep_canonical: bool = False) -> Iterator[Tuple[Any, PipelineResult]]:
+        self.start()
+        ready = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        app = current_app._get_current_object() if has_app_context() else None
+        producer = threading.Thread(
+            target=self._produce, args=(app, items, keep_canonical, ready, stop),
+            name='audio-pipeline-producer', daemon=True
+        )
+        producer.start()
+        try:
+            while True:
+                item = ready.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, _Failure):
+                    raise item.error
+                key, slot_name, future = item
+                PIPELINE_READY.set(ready.qsize())
+                try:
+                    result = self._infer(future, self._slots[slot_name])
+                finally:
+                    self._free_slots.put(slot_name)
+                yield key, result
+        finally:
+            stop.set()
+            producer.join()
+            # 중단된 경우 제출된 전처리를 기다린 뒤 슬롯을 반환 (다음 run()에서 재사용)
+            while not ready.empty():
+                item = ready.get_nowait()
+                if isinstance(item, tuple):
+                    _, slot_name, future = item
+                    if not future.cancel():
+                        future.exception()  # 실행 중인 전처리가 슬롯 쓰기를 마칠 때까지 대기
+                    self._free_slots.put(slot_name)
+            PIPELINE_READY.set(0)
+
+    def _produce(self, app, items, keep_canonical, ready, stop):
+        """입력을 순서대로 전처리 풀에 제출 (빈 슬롯이 없으면 대기)"""
+        context = app.app_context() if app is not None else None
+        if context is not None:
+            context.push()  # 입력 이터러블이 DB/키 서비스를 사용할 수 있도록
+        try:
+            for key, source in items:
+                slot_name = _wait(self._free_slots.get, stop)
+                future = None
+                try:
+                    future = self._executor.submit(_preprocess_in_worker, source, slot_name, keep_canonical)
+                    _wait(lambda timeout: ready.put((key, slot_name, future), timeout=timeout), stop)
+                except BaseException:
+                    # 준비 큐에 넣지 못한 항목의 슬롯은 전처리가 끝난 뒤 직접 반환
+                    if future is not None and not future.cancel():
+                        future.exception()
+                    self._free_slots.put(slot_name)
+                    raise
+            _wait(lambda timeout: ready.put(_DONE, timeout=timeout), stop)
+        except _Stopped:
+            pass
+        except Exception as e:
+            try:
+                _wait(lambda timeout: ready.put(_Failure(e), timeout=timeout), stop)
+            except _Stopped:
+                pass
+        finally:
+            if context is not None:
+                context.pop()
+
+    def _infer(self, future, slot) -> PipelineResult:
+        try:
+            preprocessed = future.result()
+        except Exception as e:
+            logger.error(f"Error in audio preprocessing: {e}")
+            PIPELINE_ITEMS.labels(result='failed').inc()
+            return PipelineResult(TranscriptionResult(None, error='decode_error'))
+
+        for stage, seconds in preprocessed.timings.items():
+            STAGE_DURATION.labels(stage=stage).observe(seconds)
+        if 'vad' in preprocessed.timings:
+            record_vad(preprocessed.audio_seconds, preprocessed.vad_removed_seconds, preprocessed.has_speech)
+        if not preprocessed.has_speech:
+            PIPELINE_ITEMS.labels(result='no_speech').inc()
+            return PipelineResult(TranscriptionResult(None, has_speech=False,
+                                                      vad_removed_seconds=preprocessed.vad_removed_seconds),
+                                  preprocessed.audio_seconds, preprocessed.canonical_audio)
+
+        features = preprocessed.features
+        if features is None:
+            features = np.ndarray(preprocessed.shape, dtype=np.float32, buffer=slot.buf)
+        deadline = new_deadline()
+        error = None
+        try:
+            # 디코딩 토큰 상한/제한 시간은 VAD 이후 음성 길이 기준
+            generate_kwargs = generate_kwargs_for(
+                preprocessed.audio_seconds - preprocessed.vad_removed_seconds, deadline)
+            with model_slot(timeout=deadline.remaining()):
+                text = self.backend.transcribe_features(features, generate_kwargs)
+            PIPELINE_ITEMS.labels(result='completed').inc()
+        except DeadlineExceeded as e:
+            logger.error(f"Timeout in speech_to_text: {e}")
+            PIPELINE_ITEMS.labels(result='timeout').inc()
+            text, error = None, 'timeout'
+        except Exception as e:
+            logger.error(f"Error in speech_to_text: {e}")
+            PIPELINE_ITEMS.labels(result='failed').inc()
+            text, error = None, 'model_error'
+        finally:
+            del features  # 슬롯 버퍼 참조 해제 (슬롯 재사용/해제 전)
+        return PipelineResult(TranscriptionResult(text, vad_removed_seconds=preprocessed.vad_removed_seconds, error=error),
+                              preprocessed.audio_seconds, preprocessed.canonical_audio)
+
+
+class _Stopped(Exception):
+    pass
+
+def _wait(call, stop: threading.Event, interval: float = 0.1):
+    """중단 신호를 확인하면서 큐 get/put을 기다립니다."""
+    while not stop.is_set():
+        try:
+            return call(timeout=interval)
+        except (queue.Empty, queue.Full):
+            continue
+    raise _Stopped()
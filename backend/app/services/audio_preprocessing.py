@@ -0,0 +1,230 @@
+# backend/app/services/audio_preprocessing.py
+import io
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Optional
+import numpy as np
+from flask import current_app, has_app_context
+from ..config import Config
+from ..utils.deadline import Deadline, DeadlineExceeded
+from ..utils.metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+# 표준 오디오 형식: 16kHz 모노 16-bit FLAC (무손실, 원본 대비 작고 디코딩이 빠름)
+# 접수 시 한 번만 디코딩/리샘플링하여 암호화 저장하고, 이후 분석/재분석은 이 형식만 읽습니다.
+CANONICAL_SAMPLING_RATE = 16000
+CANONICAL_FORMAT = 'FLAC'
+CANONICAL_SUBTYPE = 'PCM_16'
+FLAC_MAGIC = b'fLaC'
+
+VAD_REMOVED_SECONDS = Counter('vad_removed_audio_seconds', 'VAD로 제거된 오디오 길이(초)')
+VAD_INPUT_SECONDS = Counter('vad_input_audio_seconds', 'VAD에 입력된 오디오 길이(초)')
+VAD_NO_SPEECH_CALLS = Counter('vad_no_speech_calls', '음성이 없어 분석을 건너뛴 통화 수')
+
+class VadResult:
+    """VAD 결과: 남길 파형과 제거량"""
+
+    def __init__(self, audio: np.ndarray, original_seconds: float, kept_seconds: float, has_speech: bool):
+        self.audio = audio
+        self.original_seconds = original_seconds
+        self.kept_seconds = kept_seconds
+        self.has_speech = has_speech
+
+    @property
+    def removed_seconds(self) -> float:
+        return round(self.original_seconds - self.kept_seconds, 3)
+
+
+class EnergyVad:
+    """
+    에너지 기반 음성 구간 검출 및 무음 제거
+
+    - 프레임 RMS(dBFS)가 절대 하한(threshold_db)과 잡음 바닥(하위 10% 프레임) + noise_margin_db를
+      모두 넘는 프레임을 음성으로 봅니다. (잡음 바닥 기준은 상위 10% 레벨 - noise_margin_db를 넘지 않음)
+    - 대기음/신호음처럼 에너지가 소수의 주파수에 몰린 프레임은 음성에서 제외합니다 (drop_tones).
+    - 앞/뒤 무음은 잘라내고, 내부 무음은 max_gap_ms까지만 남깁니다. 음성 구간 앞뒤로 padding_ms를 둡니다.
+    - 음성 프레임 합계가 min_speech_ms 미만이면 음성이 없는 녹음으로 판단합니다.
+    """
+
+    TONE_BINS = 6
+    TONE_ENERGY_RATIO = 0.95  # 순음/이중음은 해닝 창 주엽(6개 빈)에 에너지가 거의 모두 모임
+
+    def __init__(self, frame_ms: int = 30, threshold_db: float = -45.0, noise_margin_db: float = 10.0,
+                 max_gap_ms: int = 700, padding_ms: int = 200, min_speech_ms: int = 250, drop_tones: bool = True):
+        self.frame_ms = frame_ms
+        self.threshold_db = threshold_db
+        self.noise_margin_db = noise_margin_db
+        self.max_gap_ms = max_gap_ms
+        self.padding_ms = padding_ms
+        self.min_speech_ms = min_speech_ms
+        self.drop_tones = drop_tones
+
+    def _frames(self, audio: np.ndarray, frame_length: int) -> np.ndarray:
+        n_frames = len(audio) // frame_length
+        return audio[:n_frames * frame_length].reshape(n_frames, frame_length)
+
+    def speech_frames(self, audio: np.ndarray, sampling_rate: int) -> np.ndarray:
+        """프레임별 음성 여부 (bool 배열)"""
+        frame_length = max(1, int(sampling_rate * self.frame_ms / 1000))
+        frames = self._frames(audio.astype(np.float32, copy=False), frame_length)
+        if len(frames) == 0:
+            return np.zeros(0, dtype=bool)
+
+        rms = np.sqrt(np.mean(frames ** 2, axis=1) + 1e-12)
+        energy_db = 20 * np.log10(rms + 1e-12)
+        # 잡음 바닥 기준 임계값 (녹음 전체가 음성인 경우를 위해 상위 10% 레벨 - 여유로 상한을 둠)
+        noise_floor_db, loud_db = np.percentile(energy_db, [10, 90])
+        adaptive_db = min(noise_floor_db + self.noise_margin_db, loud_db - self.noise_margin_db)
+        speech = energy_db > max(self.threshold_db, adaptive_db)
+
+        if self.drop_tones and speech.any():
+            # 순음/이중음(대기음, DTMF)은 스펙트럼 에너지가 몇 개의 빈에 집중됨
+            spectrum = np.abs(np.fft.rfft(frames[speech] * np.hanning(frame_length), axis=1)) ** 2
+            top = np.sort(spectrum, axis=1)[:, -self.TONE_BINS:].sum(axis=1)
+            tonal = top / (spectrum.sum(axis=1) + 1e-12) > self.TONE_ENERGY_RATIO
+            speech[np.flatnonzero(speech)[tonal]] = False
+        return speech
+
+    def trim(self, audio: np.ndarray, sampling_rate: int) -> VadResult:
+        original_seconds = len(audio) / sampling_rate
+        speech = self.speech_frames(audio, sampling_rate)
+        frame_length = max(1, int(sampling_rate * self.frame_ms / 1000))
+
+        if speech.sum() * self.frame_ms < self.min_speech_ms:
+            return VadResult(audio[:0], original_seconds, 0.0, has_speech=False)
+
+        # 음성 프레임 구간을 샘플 범위로 변환하고 앞뒤 여유를 둠
+        padding = int(sampling_rate * self.padding_ms / 1000)
+        edges = np.diff(np.concatenate(([0], speech.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1) * frame_length
+        ends = np.flatnonzero(edges == -1) * frame_length
+        segments = [[max(0, s - padding), min(len(audio), e + padding)] for s, e in zip(starts, ends)]
+
+        # 겹치는 구간 병합, 긴 내부 무음은 max_gap만 남김
+        max_gap = int(sampling_rate * self.max_gap_ms / 1000)
+        merged = [segments[0]]
+        for start, end in segments[1:]:
+            if start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+
+        pieces = []
+        for i, (start, end) in enumerate(merged):
+            if i > 0:
+                gap_start = merged[i - 1][1]
+                gap = start - gap_start
+                if gap > max_gap:
+                    # 긴 무음은 앞쪽 max_gap만 남김
+                    pieces.append(audio[gap_start:gap_start + max_gap])
+                else:
+                    pieces.append(audio[gap_start:start])
+            pieces.append(audio[start:end])
+        trimmed = np.concatenate(pieces) if pieces else audio[:0]
+        return VadResult(trimmed, original_seconds, len(trimmed) / sampling_rate, has_speech=True)
+
+
+def get_vad(config=None) -> EnergyVad:
+    config = config if config is not None else (current_app.config if has_app_context() else {})
+    return EnergyVad(
+        frame_ms=config.get('VAD_FRAME_MS', Config.VAD_FRAME_MS),
+        threshold_db=config.get('VAD_ENERGY_THRESHOLD_DB', Config.VAD_ENERGY_THRESHOLD_DB),
+        noise_margin_db=config.get('VAD_NOISE_MARGIN_DB', Config.VAD_NOISE_MARGIN_DB),
+        max_gap_ms=config.get('VAD_MAX_GAP_MS', Config.VAD_MAX_GAP_MS),
+        padding_ms=config.get('VAD_PADDING_MS', Config.VAD_PADDING_MS),
+        min_speech_ms=config.get('VAD_MIN_SPEECH_MS', Config.VAD_MIN_SPEECH_MS),
+        drop_tones=config.get('VAD_DROP_TONES', Config.VAD_DROP_TONES)
+    )
+
+def vad_enabled(config=None) -> bool:
+    config = config if config is not None else (current_app.config if has_app_context() else {})
+    return config.get('VAD_ENABLED', Config.VAD_ENABLED)
+
+def apply_vad(audio: np.ndarray, sampling_rate: int, vad: EnergyVad = None) -> VadResult:
+    """VAD로 무음을 제거하고 제거량을 지표에 기록합니다."""
+    result = (vad or get_vad()).trim(audio, sampling_rate)
+    record_vad(result.original_seconds, result.removed_seconds, result.has_speech)
+    logger.debug(f"VAD: {result.original_seconds:.1f}s -> {result.kept_seconds:.1f}s (speech={result.has_speech})")
+    return result
+
+def record_vad(original_seconds: float, removed_seconds: float, has_speech: bool):
+    """VAD 결과를 지표에 기록합니다 (전처리 워커 프로세스의 결과는 부모 프로세스에서 기록)."""
+    VAD_INPUT_SECONDS.inc(original_seconds)
+    VAD_REMOVED_SECONDS.inc(removed_seconds)
+    if not has_speech:
+        VAD_NO_SPEECH_CALLS.inc()
+
+
+# --- 표준 형식 변환 ---
+
+class AudioTooLongError(ValueError):
+    """음성이 MAX_AUDIO_SECONDS보다 김 (디코딩 오류로 처리)"""
+    pass
+
+_decode_executor: Optional[ThreadPoolExecutor] = None
+_decode_executor_lock = threading.Lock()
+
+def _get_decode_executor() -> ThreadPoolExecutor:
+    global _decode_executor
+    if _decode_executor is None:
+        with _decode_executor_lock:
+            if _decode_executor is None:
+                _decode_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix='audio-decode')
+    return _decode_executor
+
+def max_audio_seconds(config=None) -> Optional[float]:
+    config = config if config is not None else (current_app.config if has_app_context() else {})
+    return config.get('MAX_AUDIO_SECONDS', Config.MAX_AUDIO_SECONDS) or None
+
+def _load_audio(audio_file_path, max_seconds: Optional[float]) -> np.ndarray:
+    import librosa
+
+    # 상한보다 한 샘플만 더 읽어 초과 여부를 판단 (긴 녹음 전체를 디코딩하지 않음)
+    duration = None if max_seconds is None else max_seconds + 1.0 / CANONICAL_SAMPLING_RATE
+    speech_array, _ = librosa.load(audio_file_path, sr=CANONICAL_SAMPLING_RATE, mono=True, duration=duration)
+    if max_seconds is not None and len(speech_array) > max_seconds * CANONICAL_SAMPLING_RATE:
+        raise AudioTooLongError(f"음성이 너무 깁니다 (최대 {max_seconds:g}초)")
+    return speech_array
+
+def decode_audio(audio_file_path, deadline: Optional[Deadline] = None, max_seconds: Optional[float] = None) -> np.ndarray:
+    """
+    업로드 원본(webm/m4a/mp3/wav)을 16kHz 모노 float32 파형으로 디코딩합니다 (압축 형식은 ffmpeg 경유).
+
+    max_seconds(None이면 MAX_AUDIO_SECONDS, 0이면 무제한)보다 긴 음성은 상한까지만 읽고 AudioTooLongError를 발생시킵니다.
+    deadline이 있으면 디코딩 스레드에서 실행하여 남은 시간 안에 끝나지 않을 때 DeadlineExceeded를 발생시킵니다.
+    (이미 시작된 디코딩은 중단할 수 없지만 길이 상한까지만 진행됩니다.)
+    """
+    max_seconds = max_audio_seconds() if max_seconds is None else (max_seconds or None)
+    remaining = None if deadline is None else deadline.remaining()
+    if remaining is None:
+        return _load_audio(audio_file_path, max_seconds)
+    future = _get_decode_executor().submit(_load_audio, audio_file_path, max_seconds)
+    try:
+        return future.result(timeout=remaining)
+    except FutureTimeoutError:
+        future.cancel()
+        raise DeadlineExceeded('audio_decode', f"음성 디코딩 시간 초과 ({remaining:.1f}s)") from None
+
+def encode_canonical(waveform: np.ndarray) -> bytes:
+    """파형을 표준 형식(16kHz 모노 FLAC) 바이트로 인코딩합니다."""
+    import soundfile
+
+    buffer = io.BytesIO()
+    soundfile.write(buffer, np.clip(waveform, -1.0, 1.0), CANONICAL_SAMPLING_RATE,
+                    format=CANONICAL_FORMAT, subtype=CANONICAL_SUBTYPE)
+    return buffer.getvalue()
+
+def decode_canonical(data: bytes) -> np.ndarray:
+    """표준 형식 바이트를 메모리에서 바로 파형으로 복원합니다 (임시 파일/리샘플링 없음)."""
+    import soundfile
+
+    waveform, sampling_rate = soundfile.read(io.BytesIO(data), dtype='float32')
+    if sampling_rate != CANONICAL_SAMPLING_RATE:
+        raise ValueError(f"표준 형식이 아닌 오디오입니다: {sampling_rate}Hz")
+    return waveform
+
+def is_canonical(data: bytes) -> bool:
+    return data[:len(FLAC_MAGIC)] == FLAC_MAGIC
@@ -0,0 +1,237 @@
+# backend/app/services/call_import.py
+import os
+import re
+import json
+import time
+import uuid
+import hashlib
+import logging
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+from sqlalchemy import select, insert
+from werkzeug.utils import secure_filename
+from .. import db
+from ..config import Config
+from ..models import ClientCall
+from ..utils.deadline import DeadlineExceeded
+from . import ai_service, call_service
+from .audio_pipeline import AudioPipeline, PipelineResult
+from .audio_preprocessing import decode_audio, encode_canonical
+from .inference_scheduler import inference_priority
+from .model_backends import SAMPLING_RATE
+
+logger = logging.getLogger(__name__)
+
+IMPORT_EXTENSIONS = ('.wav', '.mp3', '.m4a', '.webm', '.flac', '.ogg')
+DEFAULT_PHONE_PATTERN = r'(0\d{8,10})'  # 파일명에 포함된 전화번호 (예: 01012345678_20240101.wav)
+
+def discover_audio_files(directory: str) -> List[str]:
+    """디렉토리 아래의 오디오 파일을 상대 경로 기준으로 정렬하여 반환합니다 (체크포인트 순서 고정)."""
+    files = []
+    for root, _, names in os.walk(directory):
+        for name in names:
+            if name.lower().endswith(IMPORT_EXTENSIONS):
+                files.append(os.path.relpath(os.path.join(root, name), directory))
+    return sorted(files)
+
+
+class CallImport:
+    """
+    보관된 통화 녹음 일괄 가져오기
+
+    - 디코딩/VAD/특징 추출은 AudioPipeline 워커 프로세스에서, 음성 인식/위험도 예측은 이 프로세스에서 수행합니다.
+      추론 서버 모드(INFERENCE_MODE=server)에서는 파이프라인(모델 적재) 없이 이 프로세스에서 디코딩하고 서버에 인식을 요청합니다.
+    - 원본과 표준 형식(16kHz FLAC)은 접수와 같은 KEK 계층 컨테이너로 암호화 저장합니다.
+    - batch_size건마다 ClientCall을 한 트랜잭션으로 일괄 INSERT하고 체크포인트를 기록하므로
+      중단 후 다시 실행하면 마지막으로 커밋된 파일 다음부터 이어서 진행합니다.
+    - 저장 중 실패한 파일은 체크포인트의 failed_paths에 남겨 다음 실행에서 다시 시도합니다.
+    - 같은 SHA-256의 녹음이 이미 있으면 건너뜁니다 (커밋 후 체크포인트 기록 전에 중단된 경우 포함).
+    - 모델 추론은 batch 우선순위로 실행되어 접수 중인 통화의 위험도 분류를 지연시키지 않습니다.
+    """
+
+    def __init__(self, directory: str, batch_size: int = 200, workers: Optional[int] = None,
+                 status: str = 'archived', phone_pattern: str = DEFAULT_PHONE_PATTERN,
+                 default_phone: str = 'unknown', checkpoint_dir: Optional[str] = None,
+                 upload_folder: Optional[str] = None, progress: Optional[Callable[[Dict], None]] = None,
+                 profile: Optional[str] = None):
+        self.directory = os.path.abspath(directory)
+        self.batch_size = batch_size
+        self.workers = workers
+        self.status = status
+        self.phone_pattern = re.compile(phone_pattern)
+        self.default_phone = default_phone
+        self.upload_folder = upload_folder or Config.UPLOAD_FOLDER
+        self.progress = progress
+        self.profile = profile  # 음성 인식 디코딩 프로필 (None이면 WHISPER_DECODING_PROFILE)
+        checkpoint_dir = checkpoint_dir or Config.CALL_IMPORT_CHECKPOINT_DIR
+        directory_key = hashlib.sha256(self.directory.encode('utf-8')).hexdigest()[:16]
+        self.checkpoint_path = os.path.join(checkpoint_dir, f"{directory_key}.json")
+
+    # --- 체크포인트 ---
+
+    def _load_checkpoint(self) -> Dict:
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path) as f:
+                return json.load(f)
+        return {'directory': self.directory, 'last_path': None, 'failed_paths': []}
+
+    def _save_checkpoint(self, checkpoint: Dict):
+        os.makedirs(os.path.dirname(self.checkpoint_path), exist_ok=True)
+        tmp_path = self.checkpoint_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    # --- 파일 단위 처리 ---
+
+    def _phone_number(self, relative_path: str) -> str:
+        match = self.phone_pattern.search(os.path.basename(relative_path))
+        return match.group(1)[:20] if match else self.default_phone
+
+    def _store(self, relative_path: str, result) -> Dict:
+        """원본/표준 형식을 암호화 저장하고 위험도를 예측하여 INSERT할 행을 만듭니다."""
+        source_path = os.path.join(self.directory, relative_path)
+        part_path = os.path.join(self.upload_folder, f"import_{uuid.uuid4().hex}")
+        with open(source_path, 'rb') as f:
+            upload = call_service.receive_upload(f, part_path, max_bytes=os.path.getsize(source_path), spool=False)
+        # 같은 녹음은 항상 같은 경로에 저장되어 재실행 시 고아 파일이 남지 않음
+        audio_file_path = os.path.join(
+            self.upload_folder, f"import_{upload.sha256[:16]}_{secure_filename(os.path.basename(relative_path))}")
+        os.replace(upload.audio_file_path, audio_file_path)
+
+        canonical_audio_path = None
+        if result.canonical_audio is not None:
+            canonical_audio_path = call_service.canonical_path_for(audio_file_path)
+            call_service.write_encrypted_audio(canonical_audio_path, result.canonical_audio)
+
+        analysis = call_service.analyze_transcription(result.transcription)
+        return {
+            'phone_number': self._phone_number(relative_path),
+            'audio_file_path': audio_file_path,
+            'canonical_audio_path': canonical_audio_path,
+            'audio_sha256': upload.sha256,
+            'transcribed_text': analysis.transcribed_text,
+            'risk_level': analysis.risk_level,
+            'status': self.status,
+            'received_at': datetime.fromtimestamp(os.path.getmtime(source_path), timezone.utc),
+            'analysis_status': analysis.analysis_status,
+            'vad_removed_seconds': analysis.vad_removed_seconds,
+            'model_versions': analysis.model_versions,
+        }
+
+    def _results_in_process(self, files: List[str]):
+        """추론 서버 모드: 이 프로세스에서 디코딩/표준 형식 변환 후 서버에 인식을 요청합니다."""
+        for relative_path in files:
+            deadline = ai_service.new_deadline()
+            try:
+                waveform = decode_audio(os.path.join(self.directory, relative_path), deadline)
+                canonical_audio = encode_canonical(waveform)
+            except DeadlineExceeded as e:
+                logger.error(f"Timeout in audio preprocessing ({relative_path}): {e}")
+                yield relative_path, PipelineResult(ai_service.TranscriptionResult(None, error='timeout'))
+                continue
+            except Exception as e:
+                logger.error(f"Error in audio preprocessing ({relative_path}): {e}")
+                yield relative_path, PipelineResult(ai_service.TranscriptionResult(None, error='decode_error'))
+                continue
+            transcription = ai_service.transcribe_canonical(canonical_audio, waveform, deadline)
+            yield relative_path, PipelineResult(transcription, len(waveform) / SAMPLING_RATE, canonical_audio)
+
+    def _flush(self, rows: List[Dict], stats: Dict) -> None:
+        """이미 가져온 녹음(SHA-256 중복)을 제외하고 한 트랜잭션으로 일괄 INSERT합니다."""
+        if not rows:
+            return
+        table = ClientCall.__table__
+        with db.engine.begin() as conn:
+            existing = dict(conn.execute(
+                select(table.c.audio_sha256, table.c.audio_file_path)
+                .where(table.c.audio_sha256.in_({row['audio_sha256'] for row in rows}))
+            ).all())
+            new_rows = []
+            for row in rows:
+                if row['audio_sha256'] in existing:
+                    stats['duplicates'] += 1
+                    if existing[row['audio_sha256']] != row['audio_file_path']:
+                        _remove_files(row)  # 다른 경로로 이미 저장된 녹음
+                    continue
+                existing[row['audio_sha256']] = row['audio_file_path']
+                new_rows.append(row)
+            if new_rows:
+                conn.execute(insert(table), new_rows)
+        stats['imported'] += len(new_rows)
+        for row in new_rows:
+            stats[row['analysis_status']] += 1
+
+    def run(self, restart: bool = False) -> Dict:
+        if restart and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+        checkpoint = self._load_checkpoint()
+        os.makedirs(self.upload_folder, exist_ok=True)
+
+        files = discover_audio_files(self.directory)
+        failed = set(checkpoint.get('failed_paths') or [])
+        if checkpoint.get('last_path'):
+            # 이전 실행에서 실패한 파일은 마지막 파일 이전이라도 다시 시도
+            files = [path for path in files if path > checkpoint['last_path'] or path in failed]
+        failed &= set(files)  # 그 사이 삭제된 파일은 재시도 목록에서 제외
+
+        stats = {
+            'total': len(files), 'processed': 0, 'imported': 0, 'duplicates': 0, 'errors': 0,
+            'completed': 0, 'no_speech': 0, 'failed': 0, 'pending_retry': 0, 'audio_seconds': 0.0,
+        }
+        started = time.perf_counter()
+        if not files:
+            return _with_throughput(stats, 0.0)
+        rows, last_path = [], checkpoint.get('last_path')
+
+        def commit_batch():
+            self._flush(rows, stats)
+            rows.clear()
+            checkpoint['last_path'] = last_path
+            checkpoint['failed_paths'] = sorted(failed)
+            self._save_checkpoint(checkpoint)
+            if self.progress:
+                self.progress(_with_throughput(stats, time.perf_counter() - started))
+
+        with ExitStack() as stack:
+            stack.enter_context(inference_priority('batch'))
+            stack.enter_context(ai_service.decoding_profile(self.profile))
+            if ai_service.inference_mode() == 'server':
+                # 모델은 추론 서버에만 있으므로 워커 풀/모델을 이 프로세스에 적재하지 않음
+                results = self._results_in_process(files)
+            else:
+                pipeline = stack.enter_context(AudioPipeline(workers=self.workers))
+                results = pipeline.run(((path, os.path.join(self.directory, path)) for path in files),
+                                       keep_canonical=True)
+            for relative_path, result in results:
+                try:
+                    rows.append(self._store(relative_path, result))
+                    stats['audio_seconds'] += result.audio_seconds
+                    failed.discard(relative_path)
+                except Exception as e:
+                    logger.error(f"가져오기 실패 ({relative_path}): {e}")
+                    stats['errors'] += 1
+                    failed.add(relative_path)
+                stats['processed'] += 1
+                last_path = max(last_path or relative_path, relative_path)
+                if len(rows) >= self.batch_size:
+                    commit_batch()
+            commit_batch()
+
+        return _with_throughput(stats, time.perf_counter() - started)
+
+
+def _remove_files(row: Dict):
+    for path in (row['audio_file_path'], row['canonical_audio_path']):
+        if path and os.path.exists(path):
+            os.remove(path)
+
+def _with_throughput(stats: Dict, elapsed: float) -> Dict:
+    """진행률/처리량(파일/초, 음성 초/초)과 남은 시간 추정을 더한 사본"""
+    report = dict(stats, audio_seconds=round(stats['audio_seconds'], 1), elapsed_seconds=round(elapsed, 1))
+    report['files_per_second'] = round(stats['processed'] / elapsed, 2) if elapsed else None
+    report['audio_seconds_per_second'] = round(stats['audio_seconds'] / elapsed, 2) if elapsed else None
+    remaining = stats['total'] - stats['processed']
+    report['eta_seconds'] = round(remaining / report['files_per_second']) if report['files_per_second'] else None
+    return report
@@ -0,0 +1,296 @@
+# backend/app/services/call_service.py
+import os
+import json
+import hashlib
+import logging
+import tempfile
+from typing import BinaryIO, Iterable, List, Optional, Tuple
+import numpy as np
+from .. import db
+from ..models import ClientCall
+from ..utils.deadline import Deadline
+from ..utils.envelope import pack_envelope_header, is_envelope, parse_envelope, parse_legacy_audio_container
+from ..utils.hybrid_encryption import HybridEncryption
+from ..utils.metrics import stage_timer
+from . import ai_service
+from .audio_preprocessing import decode_audio, encode_canonical
+from .inference_scheduler import inference_priority
+from .key_service import get_key_service
+
+logger = logging.getLogger(__name__)
+
+CANONICAL_SUFFIX = '.16k.flac'
+
+class UploadTooLargeError(Exception):
+    """업로드가 허용 크기(MAX_UPLOAD_BYTES)를 초과함"""
+    pass
+
+
+class ReceivedUpload:
+    """스트리밍 접수 결과: 암호화 원본 경로, 분석용 평문 임시 파일, 다이제스트, 크기"""
+
+    def __init__(self, audio_file_path: str, plaintext_path: str, sha256: str, size: int):
+        self.audio_file_path = audio_file_path
+        self.plaintext_path = plaintext_path
+        self.sha256 = sha256
+        self.size = size
+
+
+class CallAnalysis:
+    """통화 분석 결과 (ClientCall의 분석 컬럼과 대응)"""
+
+    def __init__(self, transcribed_text: Optional[str], risk_level: Optional[int], analysis_status: str,
+                 vad_removed_seconds: Optional[float], model_versions: Optional[str] = None):
+        self.transcribed_text = transcribed_text
+        self.risk_level = risk_level  # None: 위험도 미정 (대기열에서 가장 먼저 표시)
+        self.analysis_status = analysis_status
+        self.vad_removed_seconds = vad_removed_seconds
+        self.model_versions = model_versions  # 위험도를 예측한 모델 버전 (JSON)
+
+    def apply_to(self, call: ClientCall):
+        call.transcribed_text = self.transcribed_text
+        call.risk_level = self.risk_level
+        call.analysis_status = self.analysis_status
+        call.vad_removed_seconds = self.vad_removed_seconds
+        call.model_versions = self.model_versions
+
+
+# --- 암호화 음성 파일 ---
+
+def write_encrypted_audio(path: str, data: bytes):
+    """데이터를 현재 에폭 KEK 기반 컨테이너로 암호화하여 저장합니다."""
+    key_epoch_id, wrapped_dek, nonce, ciphertext = get_key_service().encrypt_blob(data)
+    with open(path, 'wb') as f:
+        f.write(pack_envelope_header(key_epoch_id, wrapped_dek))
+        f.write(nonce)
+        f.write(ciphertext)
+
+def receive_upload(stream: BinaryIO, audio_file_path: str, max_bytes: int,
+                   chunk_size: int = 1024 * 1024, spool: bool = True) -> ReceivedUpload:
+    """
+    업로드 스트림을 한 번만 읽으면서 청크마다 암호화 저장, SHA-256 계산, 분석용 평문 기록을 함께 수행합니다.
+    전체 파일을 메모리에 올리거나 방금 만든 암호문을 다시 복호화하지 않습니다.
+    크기가 max_bytes를 넘으면 기록 중인 파일을 지우고 UploadTooLargeError를 발생시킵니다.
+    spool=False이면 평문 임시 파일을 만들지 않습니다 (원본이 이미 디스크에 있는 일괄 가져오기).
+    """
+    digest = hashlib.sha256()
+    size = 0
+    part_path = audio_file_path + '.part'  # 완료 전에는 원본 경로에 파일이 생기지 않도록
+    plaintext_path = None
+    if spool:
+        fd, plaintext_path = tempfile.mkstemp(prefix='temp_', suffix=os.path.splitext(audio_file_path)[1],
+                                              dir=os.path.dirname(audio_file_path))
+        os.close(fd)
+    try:
+        with open(part_path, 'wb') as encrypted, open(plaintext_path or os.devnull, 'wb') as plaintext:
+            writer = get_key_service().envelope_writer(encrypted)
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(f"업로드 크기 제한({max_bytes} bytes)을 초과했습니다.")
+                writer.update(chunk)
+                digest.update(chunk)
+                if spool:
+                    plaintext.write(chunk)
+            writer.finalize()
+        os.replace(part_path, audio_file_path)
+    except BaseException:
+        for path in (part_path, plaintext_path):
+            if path and os.path.exists(path):
+                os.remove(path)
+        raise
+    return ReceivedUpload(audio_file_path, plaintext_path, digest.hexdigest(), size)
+
+def read_encrypted_audio(path: str) -> bytes:
+    """KEK 계층 컨테이너 또는 레거시(RSA/PQC) 컨테이너를 복호화합니다."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if is_envelope(data):
+        return get_key_service().decrypt_blob(*parse_envelope(data))
+    return HybridEncryption().decrypt_file_hybrid(*parse_legacy_audio_container(data))
+
+def canonical_path_for(audio_file_path: str) -> str:
+    """원본 암호화 파일 옆에 둘 표준 형식 파일 경로"""
+    return os.path.splitext(audio_file_path)[0] + CANONICAL_SUFFIX
+
+
+# --- 표준 형식 변환 ---
+
+def store_canonical_audio(original_path: str, audio_file_path: str,
+                          deadline: Optional[Deadline] = None) -> Tuple[str, bytes, np.ndarray]:
+    """
+    복호화된 원본을 한 번만 디코딩/리샘플링하여 표준 형식으로 암호화 저장합니다.
+    (표준 형식 경로, FLAC 바이트, 파형)을 반환하며 파형은 곧바로 인식에 사용할 수 있습니다.
+    디코딩은 MAX_AUDIO_SECONDS 상한과 deadline(통화 분석 제한 시간) 안에서 수행합니다.
+    """
+    with stage_timer('audio_decode'):
+        waveform = decode_audio(original_path, deadline)
+    with stage_timer('canonical_encode'):
+        canonical_audio = encode_canonical(waveform)
+    canonical_path = canonical_path_for(audio_file_path)
+    with stage_timer('encrypt'):
+        write_encrypted_audio(canonical_path, canonical_audio)
+    return canonical_path, canonical_audio, waveform
+
+def _decrypt_to_temp_file(audio_file_path: str) -> str:
+    """암호화 원본을 소유자 전용 임시 파일로 복호화합니다 (librosa/ffmpeg는 경로 입력이 필요)."""
+    decrypted = read_encrypted_audio(audio_file_path)
+    fd, temp_path = tempfile.mkstemp(prefix='canonical_', suffix=os.path.splitext(audio_file_path)[1])
+    with os.fdopen(fd, 'wb') as f:
+        f.write(decrypted)
+    return temp_path
+
+def backfill_canonical_audio(call: ClientCall) -> Tuple[bytes, np.ndarray]:
+    """표준 형식 파일이 없는 기존 통화: 원본을 복호화/디코딩하여 표준 형식을 만들고 경로를 기록합니다."""
+    temp_path = _decrypt_to_temp_file(call.audio_file_path)
+    try:
+        call.canonical_audio_path, canonical_audio, waveform = store_canonical_audio(temp_path, call.audio_file_path)
+    finally:
+        os.remove(temp_path)
+    return canonical_audio, waveform
+
+def load_canonical_audio(call: ClientCall) -> Tuple[bytes, Optional[np.ndarray]]:
+    """통화의 표준 형식 오디오를 읽습니다. 파형은 새로 변환한 경우에만 함께 반환됩니다."""
+    if call.canonical_audio_path and os.path.exists(call.canonical_audio_path):
+        with stage_timer('decrypt'):
+            return read_encrypted_audio(call.canonical_audio_path), None
+    return backfill_canonical_audio(call)
+
+
+# --- 분석 ---
+
+def analyze_canonical_audio(canonical_audio: bytes, waveform: Optional[np.ndarray] = None,
+                            deadline: Optional[Deadline] = None) -> CallAnalysis:
+    """표준 형식 오디오로 음성 인식과 위험도 예측을 수행합니다 (deadline: 디코딩부터 이어지는 통화 분석 제한 시간)."""
+    deadline = deadline or ai_service.new_deadline()
+    return analyze_transcription(ai_service.transcribe_canonical(canonical_audio, waveform, deadline), deadline)
+
+def analyze_transcription(transcription: ai_service.TranscriptionResult,
+                          deadline: Optional[Deadline] = None) -> CallAnalysis:
+    """음성 인식 결과로 위험도를 예측하고 분석 상태를 정합니다 (위험도 예측도 인식과 같은 제한 시간 안에서)."""
+    if transcription.error in ai_service.RETRYABLE_ERRORS:
+        # 시간 초과/추론 서버 장애/차단기 열림: 위험도 미정(None)으로 접수하고 나중에 재분석
+        # (운영 환경에서는 flask calls reanalyze --status pending_retry를 주기적으로 실행)
+        return CallAnalysis(None, None, 'pending_retry', transcription.vad_removed_seconds)
+
+    if not transcription.has_speech:
+        # 음성이 없는 녹음은 인식/위험도 분석을 건너뛰고 표시만 함
+        return CallAnalysis(None, None, 'no_speech', transcription.vad_removed_seconds)
+    transcribed_text = transcription.text
+    if transcribed_text is None:
+        return CallAnalysis(None, None, 'failed', transcription.vad_removed_seconds)
+
+    risk = ai_service.assess_risk(transcribed_text, deadline)
+    if risk.error in ai_service.RETRYABLE_ERRORS:
+        # 인식 후 위험도 예측 단계에서 시간 초과/차단기 열림: 인식 결과는 남기고 재분석 대기
+        return CallAnalysis(transcribed_text, None, 'pending_retry', transcription.vad_removed_seconds)
+    if risk.risk_level is None:
+        return CallAnalysis(transcribed_text, None, 'failed', transcription.vad_removed_seconds)
+    return CallAnalysis(transcribed_text, risk.risk_level, 'completed', transcription.vad_removed_seconds,
+                        json.dumps(ai_service.model_versions(), sort_keys=True))
+
+def reanalyze_call(call: ClientCall) -> CallAnalysis:
+    """저장된 표준 형식 오디오로 통화를 다시 분석합니다 (원본 디코딩 없음, 커밋은 호출자가 수행)."""
+    canonical_audio, waveform = load_canonical_audio(call)
+    analysis = analyze_canonical_audio(canonical_audio, waveform)
+    analysis.apply_to(call)
+    logger.info(f"통화 {call.id} 재분석: {analysis.analysis_status} (risk={analysis.risk_level})")
+    return analysis
+
+def _reanalyze_pipelined(calls: List[ClientCall], pipeline, stats: dict):
+    """배치를 병렬 전처리 파이프라인으로 재분석 (복호화는 입력 제공 시, 인식/위험도 예측은 결과 수신 시)"""
+    temp_paths = {}
+
+    def sources():
+        for call in calls:
+            if not os.path.exists(call.audio_file_path):
+                stats['skipped'] += 1
+                continue
+            try:
+                if call.canonical_audio_path and os.path.exists(call.canonical_audio_path):
+                    yield call, read_encrypted_audio(call.canonical_audio_path)
+                else:
+                    # 표준 형식이 없으면 원본을 임시 파일로 복호화하여 워커가 디코딩/표준 형식 인코딩
+                    temp_paths[call.id] = _decrypt_to_temp_file(call.audio_file_path)
+                    yield call, temp_paths[call.id]
+            except Exception as e:
+                logger.error(f"통화 {call.id} 음성 복호화 실패: {e}")
+                stats['failed'] += 1
+
+    try:
+        for call, result in pipeline.run(sources(), keep_canonical=True):
+            try:
+                if result.canonical_audio is not None:
+                    canonical_path = canonical_path_for(call.audio_file_path)
+                    write_encrypted_audio(canonical_path, result.canonical_audio)
+                    call.canonical_audio_path = canonical_path
+                analysis = analyze_transcription(result.transcription)
+                analysis.apply_to(call)
+                stats[analysis.analysis_status] += 1
+            except Exception as e:
+                logger.error(f"통화 {call.id} 재분석 실패: {e}")
+                stats['failed'] += 1
+            finally:
+                temp_path = temp_paths.pop(call.id, None)
+                if temp_path:
+                    os.remove(temp_path)
+    finally:
+        # 중단된 경우 아직 처리되지 않은 원본 임시 파일 삭제
+        for temp_path in temp_paths.values():
+            os.remove(temp_path)
+
+def reanalyze_calls(call_ids: Iterable[int] = (), statuses: Iterable[str] = (), batch_size: int = 100,
+                    progress=None, workers: int = 0, priority: str = 'batch',
+                    profile: Optional[str] = None) -> dict:
+    """
+    조건에 맞는 통화를 배치 단위로 재분석하고 상태별 건수를 반환합니다.
+    workers > 0이면 디코딩/특징 추출을 프로세스 풀에서 병렬로 수행합니다 (로컬 모델 전용).
+    모델 추론은 priority 우선순위로 실행되어 기본값(batch)에서는 접수 중인 통화에 양보합니다.
+    profile은 음성 인식 디코딩 프로필입니다 (None이면 WHISPER_DECODING_PROFILE).
+    """
+    query = ClientCall.query.filter(ClientCall.audio_file_path.isnot(None))
+    call_ids, statuses = list(call_ids), list(statuses)
+    if call_ids:
+        query = query.filter(ClientCall.id.in_(call_ids))
+    if statuses:
+        query = query.filter(ClientCall.analysis_status.in_(statuses))
+
+    with inference_priority(priority), ai_service.decoding_profile(profile):
+        if workers and ai_service.inference_mode() != 'server':
+            from .audio_pipeline import AudioPipeline
+
+            with AudioPipeline(workers=workers) as pipeline:
+                return _reanalyze_batches(query, batch_size, progress, pipeline)
+        return _reanalyze_batches(query, batch_size, progress)
+
+def _reanalyze_batches(query, batch_size: int, progress=None, pipeline=None) -> dict:
+    stats = {'completed': 0, 'no_speech': 0, 'failed': 0, 'pending_retry': 0, 'skipped': 0}
+    last_id = 0
+    while True:
+        calls = query.filter(ClientCall.id > last_id).order_by(ClientCall.id).limit(batch_size).all()
+        if not calls:
+            break
+        last_id = calls[-1].id
+        if pipeline is not None:
+            _reanalyze_pipelined(calls, pipeline, stats)
+            db.session.commit()
+            if progress:
+                progress(last_id, stats)
+            continue
+        for call in calls:
+            if not os.path.exists(call.audio_file_path):
+                stats['skipped'] += 1
+                continue
+            try:
+                analysis = reanalyze_call(call)
+                stats[analysis.analysis_status] += 1
+            except Exception as e:
+                logger.error(f"통화 {call.id} 재분석 실패: {e}")
+                stats['failed'] += 1
+        db.session.commit()
+        if progress:
+            progress(last_id, stats)
+    return stats
@@ -0,0 +1,113 @@
+# backend/app/services/dek_pool.py
+import os
+import threading
+import time
+import logging
+from collections import deque
+from typing import Deque, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+class DekPool:
+    """
+    미리 생성·래핑된 DEK의 메모리 풀
+
+    쓰기 경로는 acquire()로 (DEK, 에폭 ID, 래핑된 DEK)를 O(1)에 꺼내 쓰고,
+    DEK 생성과 래핑(에폭 교체 시의 RSA/PQC 연산 포함)은 백그라운드 스레드가 담당합니다.
+    풀이 비어 있으면 요청 스레드에서 직접 생성하며 이를 고갈(starvation) 이벤트로 집계합니다.
+    """
+
+    RATE_WINDOW_SECONDS = 60
+
+    def __init__(self, key_service, app, size: int = 64, low_watermark: int = 16):
+        self.key_service = key_service
+        self.app = app
+        self.size = size
+        self.low_watermark = min(low_watermark, size)
+        self._pool: Deque[Tuple[bytes, int, bytes]] = deque()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._pid = None
+        self._stopped = False
+
+        # 지표
+        self._acquired_total = 0
+        self._refilled_total = 0
+        self._starvation_total = 0
+        self._refill_seconds_total = 0.0
+        self._refill_times: Deque[float] = deque()
+
+    def start(self):
+        """백그라운드 보충 스레드를 시작합니다 (fork 이후 자식 프로세스에서는 재시작)."""
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            if self._pid != os.getpid():
+                # fork 이전 부모 프로세스의 풀/스레드 상태는 사용하지 않음
+                self._pool.clear()
+            self._pid = os.getpid()
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name='dek-pool-refill', daemon=True)
+            self._thread.start()
+            logger.info(f"DEK 풀 시작 (size={self.size}, low_watermark={self.low_watermark})")
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def acquire(self) -> Tuple[bytes, int, bytes]:
+        """래핑된 DEK 하나를 꺼냅니다. 풀이 비었으면 즉시 생성합니다."""
+        if self._pid != os.getpid():
+            self.start()
+        with self._cond:
+            self._acquired_total += 1
+            if self._pool:
+                item = self._pool.popleft()
+                if len(self._pool) <= self.low_watermark:
+                    self._cond.notify()
+                return item
+            self._starvation_total += 1
+            self._cond.notify()
+        logger.warning("DEK 풀 고갈 - 요청 스레드에서 DEK를 직접 생성합니다.")
+        return self.key_service.new_wrapped_dek()
+
+    def _run(self):
+        with self.app.app_context():
+            while True:
+                with self._cond:
+                    while not self._stopped and len(self._pool) >= self.size:
+                        self._cond.wait()
+                    if self._stopped:
+                        return
+                started = time.perf_counter()
+                try:
+                    item = self.key_service.new_wrapped_dek()
+                except Exception as e:
+                    logger.error(f"DEK 풀 보충 실패: {e}")
+                    time.sleep(1)
+                    continue
+                elapsed = time.perf_counter() - started
+                with self._cond:
+                    self._pool.append(item)
+                    self._refilled_total += 1
+                    self._refill_seconds_total += elapsed
+                    now = time.monotonic()
+                    self._refill_times.append(now)
+                    while self._refill_times and now - self._refill_times[0] > self.RATE_WINDOW_SECONDS:
+                        self._refill_times.popleft()
+
+    def stats(self) -> Dict[str, float]:
+        """풀 상태 지표를 반환합니다."""
+        with self._cond:
+            now = time.monotonic()
+            recent = sum(1 for t in self._refill_times if now - t <= self.RATE_WINDOW_SECONDS)
+            return {
+                'depth': len(self._pool),
+                'capacity': self.size,
+                'acquired_total': self._acquired_total,
+                'refilled_total': self._refilled_total,
+                'refill_rate_per_second': recent / self.RATE_WINDOW_SECONDS,
+                'refill_seconds_total': self._refill_seconds_total,
+                'starvation_total': self._starvation_total,
+            }
@@ -6,6 +6,7 @@ import logging
 from ..models import EncryptedFile, FilePermission, User
 from ..utils.hybrid_encryption import HybridEncryption, EncryptionError, KeyVerificationError
 from .. import db
+from .key_service import get_key_service
 
 logger = logging.getLogger(__name__)
 
@@ -20,12 +21,9 @@ class FileService:
         파일을 암호화하여 저장하고 메타데이터를 DB에 기록
         """
         try:
-            # 파일 암호화
-            (
-                nonce_for_file, encrypted_file_content,
-                encrypted_dek_trad,
-                pqc_kem_ciphertext, nonce_for_dek_encryption, encrypted_dek_by_pqc_shared_secret
-            ) = self.encryption.encrypt_file_hybrid(file_data)
+            # 파일 암호화 (DEK는 현재 에폭 KEK로 래핑)
+            key_epoch_id, wrapped_dek, nonce_for_file, encrypted_file_content = \
+                get_key_service().encrypt_blob(file_data)
 
             # 파일 저장 경로 생성
             file_storage_path = str(uuid.uuid4())
@@ -39,10 +37,8 @@ class FileService:
                 file_type=file_type,
                 file_storage_path=file_storage_path,
                 nonce_for_file=nonce_for_file,
-                encrypted_dek_trad=encrypted_dek_trad,
-                pqc_kem_ciphertext=pqc_kem_ciphertext,
-                nonce_for_dek_encryption=nonce_for_dek_encryption,
-                encrypted_dek_by_pqc_shared_secret=encrypted_dek_by_pqc_shared_secret,
+                key_epoch_id=key_epoch_id,
+                wrapped_dek=wrapped_dek,
                 created_at=datetime.utcnow(),
                 created_by=user.id
             )
@@ -81,14 +77,22 @@ class FileService:
                 encrypted_file_content = f.read()
 
             # 파일 복호화
-            decrypted_file = self.encryption.decrypt_file_hybrid(
-                encrypted_file.nonce_for_file,
-                encrypted_file_content,
-                encrypted_file.encrypted_dek_trad,
-                encrypted_file.pqc_kem_ciphertext,
-                encrypted_file.nonce_for_dek_encryption,
-                encrypted_file.encrypted_dek_by_pqc_shared_secret
-            )
+            if encrypted_file.key_epoch_id:
+                decrypted_file = get_key_service().decrypt_blob(
+                    encrypted_file.key_epoch_id,
+                    encrypted_file.wrapped_dek,
+                    encrypted_file.nonce_for_file,
+                    encrypted_file_content
+                )
+            else:
+                decrypted_file = self.encryption.decrypt_file_hybrid(
+                    encrypted_file.nonce_for_file,
+                    encrypted_file_content,
+                    encrypted_file.encrypted_dek_trad,
+                    encrypted_file.pqc_kem_ciphertext,
+                    encrypted_file.nonce_for_dek_encryption,
+                    encrypted_file.encrypted_dek_by_pqc_shared_secret
+                )
 
             logger.info(f"파일 {file_id}가 성공적으로 조회되었습니다.")
             return decrypted_file, encrypted_file.file_type
@@ -184,4 +188,5 @@ class FileService:
 
     def _has_permission(self, encrypted_file: EncryptedFile, user: User) -> bool:
         """사용자의 파일 접근 권한 확인"""
-        return any(p.user_id == user.id for p in encrypted_file.permissions) 
\ No newline at end of file
+        # 권한 목록 전체를 로드하지 않고 기본키로 단건 조회
+        return db.session.get(FilePermission, (encrypted_file.id, user.id)) is not None 
\ No newline at end of file
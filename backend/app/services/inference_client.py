@@ -0,0 +1,157 @@
+# backend/app/services/inference_client.py
+import os
+import queue
+import socket
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+from flask import current_app, has_app_context
+from ..config import Config
+from ..utils import inference_protocol as protocol
+from .inference_scheduler import PRIORITY_CODES, current_priority
+
+logger = logging.getLogger(__name__)
+
+class InferenceError(Exception):
+    """추론 서버 호출 실패 (kind: TranscriptionResult.error로 쓰이는 오류 종류)"""
+
+    kind = 'model_error'
+
+    def __init__(self, message: str = '', kind: Optional[str] = None):
+        super().__init__(message)
+        if kind is not None:
+            self.kind = kind
+
+class InferenceUnavailableError(InferenceError):
+    """서버에 연결할 수 없거나 연결 풀이 고갈됨"""
+    kind = 'unavailable'
+
+class InferenceTimeoutError(InferenceError):
+    """응답 대기 시간 초과 (서버가 제한 시간 초과로 작업을 중단한 경우 포함)"""
+    kind = 'timeout'
+
+
+class InferenceClient:
+    """
+    공유 추론 서버용 경량 클라이언트
+
+    - 프로세스별 연결 풀(최대 pool_size개)을 재사용하며, 풀이 가득 차면 connect_timeout 동안만 기다립니다.
+    - 요청마다 timeout을 적용하고 서버에도 같은 제한 시간을 보내 기다리지 않는 작업은 서버가 중단합니다.
+      실패한 연결은 풀에 돌려놓지 않습니다.
+    - 재사용한 연결이 서버 재시작 등으로 끊겨 있으면 새 연결로 한 번 재시도합니다 (추론 요청은 멱등).
+    """
+
+    def __init__(self, socket_path: str, pool_size: int = 4, connect_timeout: float = 1.0,
+                 timeout: float = 120.0, max_payload: int = protocol.DEFAULT_MAX_PAYLOAD):
+        self.socket_path = socket_path
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.timeout = timeout
+        self.max_payload = max_payload
+        self.model_versions: Optional[Dict[str, str]] = None  # 서버가 마지막 위험도 응답에 보고한 모델 버전
+        self._reset_pool()
+
+    def _reset_pool(self):
+        self._pid = os.getpid()
+        self._idle: "queue.LifoQueue[socket.socket]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.pool_size)
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.connect_timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError as e:
+            sock.close()
+            raise InferenceUnavailableError(f"추론 서버 연결 실패 ({self.socket_path}): {e}") from e
+        return sock
+
+    def _checkout(self):
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            return self._connect(), False
+
+    def _request(self, op: int, payload: bytes = b'', timeout: Optional[float] = None, profile: int = 0) -> bytes:
+        if self._pid != os.getpid():
+            # fork 이후에는 부모의 연결을 공유하지 않음
+            self._reset_pool()
+        if not self._slots.acquire(timeout=self.connect_timeout):
+            raise InferenceUnavailableError('추론 서버 연결 풀이 고갈되었습니다.')
+        try:
+            for attempt in range(2):
+                sock, reused = self._checkout()
+                request_timeout = timeout if timeout is not None else self.timeout
+                try:
+                    sock.settimeout(request_timeout)
+                    protocol.send_frame(sock, op, payload, PRIORITY_CODES[current_priority()], profile,
+                                        protocol.deadline_to_ms(request_timeout))
+                    frame = protocol.recv_frame(sock, self.max_payload)
+                    if frame is None:
+                        raise ConnectionError('서버가 연결을 종료했습니다.')
+                except socket.timeout as e:
+                    sock.close()
+                    raise InferenceTimeoutError(f"추론 응답 시간 초과 ({request_timeout}s)") from e
+                except (ConnectionError, protocol.ProtocolError, OSError) as e:
+                    sock.close()
+                    if reused and attempt == 0:
+                        continue
+                    raise InferenceUnavailableError(f"추론 서버 통신 실패: {e}") from e
+                self._idle.put(sock)
+                status, body = frame[:2]
+                if status == protocol.STATUS_ERROR:
+                    kind, message = protocol.decode_error(body)
+                    if kind == 'timeout':
+                        raise InferenceTimeoutError(f"추론 서버 제한 시간 초과: {message}")
+                    raise InferenceError(message, kind)
+                if status != protocol.STATUS_OK:
+                    raise InferenceError(body.decode('utf-8', errors='replace'))
+                return body
+        finally:
+            self._slots.release()
+
+    def ping(self) -> bool:
+        try:
+            self._request(protocol.OP_PING, timeout=self.connect_timeout)
+            return True
+        except InferenceError:
+            return False
+
+    def transcribe(self, audio_bytes: bytes, timeout: Optional[float] = None,
+                   profile: int = 0) -> Tuple[Optional[str], bool, float]:
+        """(텍스트, 음성 여부, VAD 제거 초)를 반환합니다 (profile: ai_service.DECODING_PROFILE_CODES)."""
+        return protocol.decode_transcription(
+            self._request(protocol.OP_TRANSCRIBE, audio_bytes, timeout=timeout, profile=profile))
+
+    def predict_risk(self, text: str, timeout: Optional[float] = None) -> Optional[int]:
+        payload = self._request(protocol.OP_PREDICT_RISK, text.encode('utf-8'), timeout=timeout)
+        # 서버 재시작으로 모델이 바뀔 수 있으므로 응답마다 갱신
+        self.model_versions = protocol.decode_model_versions(payload) or self.model_versions
+        return protocol.decode_risk(payload)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_inference_client: Optional[InferenceClient] = None
+_inference_client_lock = threading.Lock()
+
+def get_inference_client() -> InferenceClient:
+    """프로세스 단위 추론 서버 클라이언트를 반환합니다."""
+    global _inference_client
+    if _inference_client is None:
+        with _inference_client_lock:
+            if _inference_client is None:
+                config = current_app.config if has_app_context() else {}
+                _inference_client = InferenceClient(
+                    socket_path=config.get('INFERENCE_SOCKET_PATH', Config.INFERENCE_SOCKET_PATH),
+                    pool_size=config.get('INFERENCE_POOL_SIZE', Config.INFERENCE_POOL_SIZE),
+                    connect_timeout=config.get('INFERENCE_CONNECT_TIMEOUT_SECONDS', Config.INFERENCE_CONNECT_TIMEOUT_SECONDS),
+                    timeout=config.get('INFERENCE_TIMEOUT_SECONDS', Config.INFERENCE_TIMEOUT_SECONDS),
+                    max_payload=config.get('INFERENCE_MAX_PAYLOAD_BYTES', Config.INFERENCE_MAX_PAYLOAD_BYTES)
+                )
+    return _inference_client
@@ -0,0 +1,242 @@
+# backend/app/services/inference_scheduler.py
+import time
+import sqlite3
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Optional
+from flask import current_app, has_app_context
+from ..config import Config
+from ..utils.deadline import DeadlineExceeded
+from ..utils.metrics import Counter, Gauge, Histogram
+from ..utils.rate_limiter import AdmissionStore, get_admission_store
+
+logger = logging.getLogger(__name__)
+
+# 추론 우선순위 (앞일수록 먼저 실행)
+# - live:        접수 중인 통화의 위험도 분류 (상담 대기열에 바로 반영)
+# - interactive: 상담사가 요청한 작업
+# - batch:       재분석/가져오기 등 백그라운드 작업 (CPU 점유율 제한, 모델 호출 사이에서 양보)
+PRIORITIES = ('live', 'interactive', 'batch')
+DEFAULT_PRIORITY = 'interactive'
+PRIORITY_CODES = {name: code for code, name in enumerate(PRIORITIES)}  # 추론 서버 프로토콜용
+
+INFERENCE_QUEUE_WAIT = Histogram(
+    'inference_queue_wait_seconds', '모델 실행 슬롯 대기 시간', ('priority',))
+INFERENCE_BUSY_SECONDS = Counter(
+    'inference_busy_seconds', '우선순위별 모델 실행 시간(초)', ('priority',))
+INFERENCE_WAITING = Gauge(
+    'inference_waiting', '모델 실행 슬롯을 기다리는 작업 수', ('priority',))
+INFERENCE_BATCH_YIELD_WAIT = Histogram(
+    'inference_batch_yield_wait_seconds', 'batch 작업이 다른 프로세스의 live/interactive 추론에 양보한 시간')
+
+FOREGROUND_POOL = 'inference_foreground'  # 공유 저장소의 live/interactive 추론 임대 풀
+
+_current_priority = contextvars.ContextVar('inference_priority', default=DEFAULT_PRIORITY)
+
+def current_priority() -> str:
+    return _current_priority.get()
+
+@contextmanager
+def inference_priority(priority: str):
+    """블록 안에서 호출되는 모델 추론(로컬/추론 서버)에 우선순위를 지정합니다."""
+    if priority not in PRIORITY_CODES:
+        raise ValueError(f"알 수 없는 추론 우선순위: {priority} (지원: {', '.join(PRIORITIES)})")
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class InferenceScheduler:
+    """
+    우선순위 기반 모델 실행 슬롯
+
+    - 빈 슬롯은 항상 대기 중인 가장 높은 우선순위의 작업에 배정됩니다 (live > interactive > batch).
+    - 슬롯은 모델 호출(Whisper 인식, RoBERTa 분류) 단위로 잡고 놓으므로,
+      batch 작업은 호출 사이에서 선점되어 live 작업은 진행 중인 호출 하나만 기다립니다.
+    - batch 작업은 batch_share 비율만큼만 실행됩니다. 호출이 d초 걸렸으면 다음 batch 호출은
+      d * (1 - share) / share초 뒤에 시작할 수 있어, 다른 프로세스(웹 워커)에도 CPU가 남습니다.
+    """
+
+    def __init__(self, concurrency: int = 1, batch_share: float = 0.5):
+        if not 0 < batch_share <= 1:
+            raise ValueError(f"batch_share는 0보다 크고 1 이하여야 합니다: {batch_share}")
+        self.concurrency = concurrency
+        self.batch_share = batch_share
+        self._cond = threading.Condition()
+        self._free = concurrency
+        self._waiting = {priority: 0 for priority in PRIORITIES}
+        self._batch_ready_at = 0.0
+
+    def _can_run(self, priority: str, now: float) -> bool:
+        if self._free <= 0:
+            return False
+        rank = PRIORITY_CODES[priority]
+        if any(self._waiting[higher] for higher in PRIORITIES[:rank]):
+            return False
+        return priority != 'batch' or now >= self._batch_ready_at
+
+    @contextmanager
+    def slot(self, priority: Optional[str] = None, timeout: Optional[float] = None):
+        """
+        모델 실행 슬롯 하나를 잡습니다 (priority 미지정 시 현재 컨텍스트의 우선순위).
+        timeout 안에 슬롯을 얻지 못하면 DeadlineExceeded를 발생시킵니다.
+        """
+        priority = priority or current_priority()
+        if priority not in PRIORITY_CODES:
+            raise ValueError(f"알 수 없는 추론 우선순위: {priority}")
+        queued_at = time.monotonic()
+        give_up_at = None if timeout is None else queued_at + timeout
+        with self._cond:
+            self._waiting[priority] += 1
+            INFERENCE_WAITING.labels(priority=priority).inc()
+            acquired = False
+            try:
+                while not self._can_run(priority, time.monotonic()):
+                    # batch는 점유율 제한이 풀리는 시점에 스스로 깨어남
+                    wake_at = give_up_at
+                    if priority == 'batch' and self._free > 0 and self._batch_ready_at > time.monotonic():
+                        wake_at = self._batch_ready_at if wake_at is None else min(wake_at, self._batch_ready_at)
+                    if give_up_at is not None and time.monotonic() >= give_up_at:
+                        INFERENCE_QUEUE_WAIT.labels(priority=priority).observe(time.monotonic() - queued_at)
+                        raise DeadlineExceeded('inference_slot', f"모델 실행 슬롯 대기 시간 초과 ({timeout}s)")
+                    self._cond.wait(None if wake_at is None else max(0.0, wake_at - time.monotonic()))
+                acquired = True
+            finally:
+                self._waiting[priority] -= 1
+                INFERENCE_WAITING.labels(priority=priority).dec()
+                if not acquired:
+                    self._cond.notify_all()  # 대기를 포기한 상위 작업 때문에 막혀 있던 하위 작업을 깨움
+            self._free -= 1
+
+        started = time.monotonic()
+        INFERENCE_QUEUE_WAIT.labels(priority=priority).observe(started - queued_at)
+        try:
+            yield
+        finally:
+            finished = time.monotonic()
+            busy = finished - started
+            INFERENCE_BUSY_SECONDS.labels(priority=priority).inc(busy)
+            with self._cond:
+                self._free += 1
+                if priority == 'batch' and self.batch_share < 1:
+                    idle = busy * (1 - self.batch_share) / self.batch_share
+                    self._batch_ready_at = max(self._batch_ready_at, finished) + idle
+                self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return {'concurrency': self.concurrency, 'free': self._free, 'waiting': dict(self._waiting)}
+
+
+class SharedLanes:
+    """
+    로컬 모드(INFERENCE_MODE=local)의 프로세스 간 우선순위
+
+    InferenceScheduler는 프로세스 단위이므로 CLI 재분석/가져오기 프로세스는 웹 워커의 live 작업을 볼 수 없습니다.
+    live/interactive 모델 호출은 슬롯 대기와 실행 동안 접수 제어 저장소(ADMISSION_STORE_PATH)에 임대를 기록하고,
+    batch 모델 호출은 어느 프로세스에도 그런 임대가 없을 때까지 기다린 뒤 슬롯을 잡습니다.
+    (추론 서버 모드에서는 서버의 스케줄러가 모든 프로세스의 요청을 함께 보므로 사용하지 않습니다.)
+    저장소를 쓸 수 없으면 추론을 막지 않고 프로세스 내 스케줄링만 적용합니다.
+    """
+
+    def __init__(self, store: AdmissionStore, lease_seconds: float, poll_interval: float = 0.05):
+        self.store = store
+        self.lease_seconds = lease_seconds  # 비정상 종료한 프로세스의 임대 만료 시간
+        self.poll_interval = poll_interval
+
+    @contextmanager
+    def foreground(self):
+        """live/interactive 호출이 진행 중임을 다른 프로세스에 알립니다."""
+        try:
+            lease_id = self.store.acquire_lease(FOREGROUND_POOL, 2 ** 31, self.lease_seconds)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"추론 우선순위 공유 실패: {e}")
+            lease_id = None
+        try:
+            yield
+        finally:
+            if lease_id is not None:
+                try:
+                    self.store.release_lease(lease_id)
+                except sqlite3.OperationalError as e:
+                    logger.warning(f"추론 우선순위 임대 반환 실패 (만료 후 회수): {e}")
+
+    def wait_for_foreground(self, timeout: Optional[float] = None) -> float:
+        """다른 프로세스의 live/interactive 호출이 없어질 때까지 기다리고 기다린 초를 반환합니다."""
+        started = time.monotonic()
+        while True:
+            try:
+                if self.store.active_leases(FOREGROUND_POOL) == 0:
+                    break
+            except sqlite3.OperationalError as e:
+                logger.warning(f"추론 우선순위 확인 실패: {e}")
+                break
+            if timeout is not None and time.monotonic() - started >= timeout:
+                raise DeadlineExceeded('inference_slot', f"모델 실행 슬롯 대기 시간 초과 ({timeout}s)")
+            time.sleep(self.poll_interval)
+        waited = time.monotonic() - started
+        INFERENCE_BATCH_YIELD_WAIT.observe(waited)
+        return waited
+
+
+_scheduler: Optional[InferenceScheduler] = None
+_scheduler_lock = threading.Lock()
+
+def get_inference_scheduler(config=None, concurrency: Optional[int] = None) -> InferenceScheduler:
+    """프로세스 단위 추론 스케줄러를 반환합니다 (추론 서버는 서버 동시 실행 수로 생성)."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                config = config if config is not None else (current_app.config if has_app_context() else {})
+                _scheduler = InferenceScheduler(
+                    concurrency=concurrency or config.get('INFERENCE_LOCAL_CONCURRENCY', Config.INFERENCE_LOCAL_CONCURRENCY),
+                    batch_share=config.get('INFERENCE_BATCH_CPU_SHARE', Config.INFERENCE_BATCH_CPU_SHARE)
+                )
+    return _scheduler
+
+_shared_lanes: Optional[SharedLanes] = None
+_shared_lanes_lock = threading.Lock()
+_shared_lanes_disabled = False
+
+def disable_shared_lanes():
+    """이 프로세스에서 프로세스 간 우선순위를 끕니다 (추론 서버: 서버 스케줄러가 모든 요청을 함께 봄)."""
+    global _shared_lanes_disabled
+    _shared_lanes_disabled = True
+
+def get_shared_lanes(config=None) -> Optional[SharedLanes]:
+    """로컬 모드의 프로세스 간 우선순위 (INFERENCE_SHARED_LANES가 꺼져 있거나 추론 서버 모드이면 None)"""
+    global _shared_lanes
+    config = config if config is not None else (current_app.config if has_app_context() else {})
+    if _shared_lanes_disabled or not config.get('INFERENCE_SHARED_LANES', Config.INFERENCE_SHARED_LANES) \
+            or config.get('INFERENCE_MODE', Config.INFERENCE_MODE) == 'server':
+        return None
+    if _shared_lanes is None:
+        with _shared_lanes_lock:
+            if _shared_lanes is None:
+                deadline = config.get('INFERENCE_DEADLINE_SECONDS', Config.INFERENCE_DEADLINE_SECONDS)
+                _shared_lanes = SharedLanes(
+                    get_admission_store(config),
+                    lease_seconds=deadline or config.get('SUBMIT_ANALYSIS_LEASE_SECONDS', Config.SUBMIT_ANALYSIS_LEASE_SECONDS)
+                )
+    return _shared_lanes
+
+@contextmanager
+def model_slot(priority: Optional[str] = None, timeout: Optional[float] = None):
+    """현재 우선순위로 모델 실행 슬롯을 잡습니다 (로컬 모드에서는 다른 프로세스의 우선순위도 반영)."""
+    priority = priority or current_priority()
+    lanes = get_shared_lanes()
+    if lanes is None:
+        with get_inference_scheduler().slot(priority, timeout):
+            yield
+    elif priority == 'batch':
+        waited = lanes.wait_for_foreground(timeout)
+        with get_inference_scheduler().slot(priority, None if timeout is None else max(0.0, timeout - waited)):
+            yield
+    else:
+        with lanes.foreground(), get_inference_scheduler().slot(priority, timeout):
+            yield
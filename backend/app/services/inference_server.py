@@ -0,0 +1,174 @@
+# backend/app/services/inference_server.py
+import os
+import socket
+import logging
+import tempfile
+import socketserver
+from contextlib import nullcontext
+from typing import Optional
+from flask import current_app, has_app_context
+from ..utils import inference_protocol as protocol
+from ..utils.deadline import Deadline, DeadlineExceeded
+from ..utils.metrics import Counter
+from .inference_scheduler import (
+    PRIORITIES, PRIORITY_CODES, DEFAULT_PRIORITY, get_inference_scheduler, inference_priority,
+    disable_shared_lanes
+)
+
+logger = logging.getLogger(__name__)
+
+INFERENCE_SERVER_REQUESTS = Counter(
+    'inference_server_requests', '추론 서버가 처리한 요청 수', ('op', 'status'))
+
+_OP_NAMES = {
+    protocol.OP_PING: 'ping',
+    protocol.OP_TRANSCRIBE: 'transcribe',
+    protocol.OP_PREDICT_RISK: 'predict_risk',
+}
+
+class _InferenceRequestHandler(socketserver.BaseRequestHandler):
+    """연결 하나에서 요청 프레임을 반복 처리 (클라이언트가 연결을 재사용)"""
+
+    def handle(self):
+        server: 'InferenceServer' = self.server
+        while True:
+            try:
+                frame = protocol.recv_frame(self.request, server.max_payload)
+            except (protocol.ProtocolError, ConnectionError, OSError) as e:
+                logger.warning(f"추론 요청 수신 실패: {e}")
+                return
+            if frame is None:
+                return
+            op, payload, priority, profile, deadline_ms = frame
+            # 연결 스레드에는 앱 컨텍스트가 없으므로 요청마다 push (설정값/키 서비스를 앱 설정으로 조회)
+            with server.app_context():
+                status, body = server.dispatch(op, payload, priority, profile, deadline_ms)
+            INFERENCE_SERVER_REQUESTS.labels(op=_OP_NAMES.get(op, 'unknown'), status=status).inc()
+            try:
+                protocol.send_frame(self.request, status, body)
+            except OSError as e:
+                # 클라이언트가 타임아웃으로 먼저 연결을 끊은 경우
+                logger.info(f"추론 응답 전송 실패: {e}")
+                return
+
+
+class InferenceServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Whisper/RoBERTa를 한 프로세스에만 적재하고 Unix 도메인 소켓으로 추론을 제공하는 서버
+
+    연결마다 스레드가 할당되며, 모델 실행은 추론 스케줄러가 요청의 우선순위(live > interactive > batch) 순으로
+    concurrency 개수만큼만 동시에 진행합니다.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, socket_path: str, concurrency: int = 1, max_payload: int = protocol.DEFAULT_MAX_PAYLOAD,
+                 app=None):
+        self.socket_path = socket_path
+        self.max_payload = max_payload
+        self.app = app  # 요청 처리 스레드에 push할 Flask 앱 (없으면 Config 기본값 사용)
+        self.scheduler = get_inference_scheduler(concurrency=concurrency)
+        disable_shared_lanes()  # 모든 클라이언트의 우선순위를 이 스케줄러가 직접 처리
+        _remove_stale_socket(socket_path)
+        os.makedirs(os.path.dirname(socket_path) or '.', exist_ok=True)
+        super().__init__(socket_path, _InferenceRequestHandler)
+        os.chmod(socket_path, 0o660)  # 같은 그룹의 앱 워커만 접근
+
+    def app_context(self):
+        return self.app.app_context() if self.app is not None else nullcontext()
+
+    def dispatch(self, op: int, payload: bytes, priority: int = PRIORITY_CODES[DEFAULT_PRIORITY],
+                 profile: Optional[int] = None, deadline_ms: int = 0):
+        from . import ai_service
+
+        if not 0 <= priority < len(PRIORITIES):
+            return protocol.STATUS_BAD_REQUEST, f'알 수 없는 우선순위: {priority}'.encode('utf-8')
+        if profile is not None and not 0 <= profile < len(ai_service.DECODING_PROFILE_NAMES):
+            return protocol.STATUS_BAD_REQUEST, f'알 수 없는 디코딩 프로필: {profile}'.encode('utf-8')
+        # 요청자가 더 기다리지 않는 작업은 시작하지 않고, 슬롯 대기/디코딩/인식도 남은 시간 안에서만 진행
+        deadline = Deadline(deadline_ms / 1000 if deadline_ms else None)
+        try:
+            if op == protocol.OP_PING:
+                return protocol.STATUS_OK, b''
+            deadline.check('inference_request')
+            # 모델 실행 슬롯은 ai_service의 로컬 추론 함수가 이 우선순위로 잡음
+            profile_name = None if profile is None else ai_service.DECODING_PROFILE_NAMES[profile]
+            with inference_priority(PRIORITIES[priority]), ai_service.decoding_profile(profile_name):
+                return self._run(ai_service, op, payload, deadline)
+        except DeadlineExceeded as e:
+            logger.warning(f"추론 요청 제한 시간 초과: {e}")
+            return protocol.STATUS_ERROR, protocol.encode_error('timeout', str(e))
+        except Exception as e:
+            logger.error(f"추론 처리 중 오류: {e}")
+            return protocol.STATUS_ERROR, protocol.encode_error('model_error', str(e))
+
+    def _run(self, ai_service, op: int, payload: bytes, deadline: Deadline):
+        if op == protocol.OP_TRANSCRIBE:
+            result = _transcribe_bytes(ai_service, payload, deadline)
+            if result.text is None and result.has_speech:
+                # 오류 종류를 함께 보내 클라이언트가 시간 초과는 재분석 대기로, 디코딩 오류는 차단기와 무관하게 처리
+                return protocol.STATUS_ERROR, protocol.encode_error(result.error or 'model_error', '음성 인식 실패')
+            return protocol.STATUS_OK, protocol.encode_transcription(
+                result.text, result.has_speech, result.vad_removed_seconds)
+        if op == protocol.OP_PREDICT_RISK:
+            result = ai_service.assess_risk_local(payload.decode('utf-8'), deadline)
+            if result.error:
+                return protocol.STATUS_ERROR, protocol.encode_error(result.error, '위험도 예측 실패')
+            return protocol.STATUS_OK, protocol.encode_risk(result.risk_level, ai_service.model_versions())
+        return protocol.STATUS_BAD_REQUEST, f'알 수 없는 연산: {op}'.encode('utf-8')
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+
+def _transcribe_bytes(ai_service, audio_bytes: bytes, deadline: Deadline):
+    from .audio_preprocessing import is_canonical, decode_canonical
+
+    if is_canonical(audio_bytes):
+        # 표준 형식(16kHz FLAC)은 메모리에서 바로 디코딩
+        try:
+            waveform = decode_canonical(audio_bytes)
+        except Exception as e:
+            logger.error(f"Error in speech_to_text: {e}")
+            return ai_service.TranscriptionResult(None, error='decode_error')
+        return ai_service.transcribe_waveform_local(waveform, deadline)
+    # 원본 형식: librosa/audioread는 경로 입력이 가장 호환성이 좋으므로 소유자 전용 임시 파일을 사용
+    fd, temp_path = tempfile.mkstemp(prefix='inference_', suffix='.audio')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(audio_bytes)
+        return ai_service.transcribe_audio_local(temp_path, deadline)
+    finally:
+        os.remove(temp_path)
+
+def _remove_stale_socket(socket_path: str):
+    """이전 실행이 남긴 소켓 파일을 정리 (다른 서버가 응답하면 시작하지 않음)"""
+    if not os.path.exists(socket_path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except OSError:
+        os.unlink(socket_path)
+    else:
+        raise RuntimeError(f"추론 서버가 이미 실행 중입니다: {socket_path}")
+    finally:
+        probe.close()
+
+def serve(socket_path: str, concurrency: int = 1, max_payload: int = protocol.DEFAULT_MAX_PAYLOAD):
+    """모델을 적재한 뒤 종료될 때까지 요청을 처리합니다."""
+    from . import ai_service
+
+    ai_service.load_models()
+    app = current_app._get_current_object() if has_app_context() else None
+    server = InferenceServer(socket_path, concurrency=concurrency, max_payload=max_payload, app=app)
+    logger.info(f"추론 서버 시작: {socket_path} (동시 실행 {concurrency})")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
@@ -0,0 +1,230 @@
+# backend/app/services/key_rotation.py
+import os
+import json
+import shutil
+import logging
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy import select, update, bindparam
+from .. import db
+from ..models import KeyEpoch, ConsultationReport, EncryptedFile
+from ..utils.hybrid_encryption import HybridEncryption, EncryptionError, read_active_pointer, write_active_pointer
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_FILE = 'checkpoint.json'
+
+# --- 워커 프로세스 (DEK/KEK 래핑만 다루며 필드·파일 암호문은 전달되지 않음) ---
+
+_old_keys: Optional[HybridEncryption] = None
+_new_keys: Optional[HybridEncryption] = None
+
+def _init_worker(old_keys_dir: str, new_keys_dir: str):
+    global _old_keys, _new_keys
+    _old_keys = HybridEncryption(keys_dir=old_keys_dir, create=False)
+    _new_keys = HybridEncryption(keys_dir=new_keys_dir, create=False)
+
+def _rewrap_epoch(row: Tuple[int, bytes, bytes, bytes]) -> Dict:
+    """에폭 KEK를 이전 시스템 키로 풀고 새 시스템 키로 다시 래핑"""
+    row_id, wrapped_kek_trad, pqc_kem_ciphertext, wrapped_kek_pqc = row
+    kek = _old_keys.unwrap_kek(wrapped_kek_trad, pqc_kem_ciphertext, wrapped_kek_pqc)
+    new_trad, new_kem_ciphertext, new_pqc = _new_keys.wrap_kek(kek)
+    return {
+        'b_id': row_id,
+        'wrapped_kek_trad': new_trad,
+        'pqc_kem_ciphertext': new_kem_ciphertext,
+        'wrapped_kek_pqc': new_pqc,
+    }
+
+def _rewrap_legacy_trad(row: Tuple[int, bytes]) -> Dict:
+    """
+    레거시 레코드의 RSA 래핑만 교체합니다.
+    레거시 PQC 래핑은 레코드별 일회용 키쌍을 사용하므로 시스템 키 교체의 영향을 받지 않습니다.
+    """
+    row_id, encrypted_dek_trad = row
+    dek = _old_keys._decrypt_dek_trad(encrypted_dek_trad)
+    return {'b_id': row_id, 'encrypted_dek_trad': _new_keys._encrypt_dek_trad(dek)}
+
+def _copy_key_files(source_dir: str, target_dir: str):
+    os.makedirs(target_dir, exist_ok=True)
+    for name in HybridEncryption.KEY_FILES:
+        source_path = os.path.join(source_dir, name)
+        if os.path.exists(source_path):
+            shutil.copy2(source_path, os.path.join(target_dir, name))
+
+
+class KeyRotation:
+    """
+    시스템 RSA/Kyber 키 교체 작업
+
+    - 새 키는 keys/rotation 디렉토리에 스테이징되고, 재래핑이 끝나면 keys/sets/<시각>으로 복사한 뒤
+      ACTIVE 포인터를 원자적으로 교체하여 한 번에 활성화합니다. 이전 키는 keys/retired/<시각>에 보관됩니다.
+    - 각 테이블을 ID 순으로 배치 스트리밍하며 래핑 컬럼만 조회/갱신합니다.
+    - 배치마다 체크포인트를 기록하므로 중단 후 다시 실행하면 이어서 진행합니다.
+      이어서 실행할 때 스테이징된 키가 없으면 키를 새로 생성하지 않고 중단합니다
+      (이미 스테이징 키로 재래핑된 레코드가 있으므로 새 키를 만들면 복구할 수 없게 됨).
+    - 교체 중 앱 프로세스는 새 에폭의 KEK를 스테이징된 키로 래핑하고, 활성화 직전에 key_epochs를 한 번 더 훑어
+      스테이징 이전 키로 만들어진 에폭까지 재래핑합니다. 활성화 후에는 재시작 전인 프로세스도
+      ACTIVE 포인터 변경을 감지해 새 키를 다시 로드합니다.
+    - blind_index.key(검색용 HMAC 키)는 교체 대상이 아닙니다.
+    """
+
+    def __init__(self, keys_dir: Optional[str] = None, batch_size: int = 1000, workers: int = 4,
+                 progress: Optional[Callable[[str, int], None]] = None):
+        self.keys_dir = keys_dir or HybridEncryption.DEFAULT_KEYS_DIR
+        self.rotation_dir = os.path.join(self.keys_dir, HybridEncryption.ROTATION_DIR_NAME)
+        self.checkpoint_path = os.path.join(self.rotation_dir, CHECKPOINT_FILE)
+        self.batch_size = batch_size
+        self.workers = workers
+        self.progress = progress
+
+    # --- 체크포인트 ---
+
+    def _load_checkpoint(self) -> Dict[str, int]:
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path) as f:
+                return json.load(f)
+        return {}
+
+    def _save_checkpoint(self, checkpoint: Dict[str, int]):
+        tmp_path = self.checkpoint_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    # --- 테이블별 재래핑 ---
+
+    def _tasks(self) -> List[Tuple[str, object, List, Callable, object]]:
+        """(체크포인트 키, 테이블, 조회 컬럼, 워커 함수, 추가 조건)"""
+        epochs = KeyEpoch.__table__
+        reports = ConsultationReport.__table__
+        files = EncryptedFile.__table__
+        return [
+            ('key_epochs', epochs,
+             [epochs.c.id, epochs.c.wrapped_kek_trad, epochs.c.pqc_kem_ciphertext, epochs.c.wrapped_kek_pqc],
+             _rewrap_epoch, None),
+            ('consultation_reports', reports,
+             [reports.c.id, reports.c.encrypted_dek_trad],
+             _rewrap_legacy_trad, reports.c.encrypted_dek_trad.isnot(None)),
+            ('encrypted_files', files,
+             [files.c.id, files.c.encrypted_dek_trad],
+             _rewrap_legacy_trad, files.c.encrypted_dek_trad.isnot(None)),
+        ]
+
+    def _rewrap_table(self, executor, checkpoint, name, table, columns, worker_fn, condition) -> int:
+        last_id = checkpoint.get(name, 0)
+        processed = 0
+        while True:
+            query = select(*columns).where(table.c.id > last_id)
+            if condition is not None:
+                query = query.where(condition)
+            query = query.order_by(table.c.id).limit(self.batch_size)
+            with db.engine.connect() as conn:
+                rows = [tuple(row) for row in conn.execute(query)]
+            if not rows:
+                return processed
+
+            updates = list(executor.map(worker_fn, rows, chunksize=max(1, len(rows) // (self.workers * 4))))
+            value_columns = {key: bindparam(key) for key in updates[0] if key != 'b_id'}
+            with db.engine.begin() as conn:
+                conn.execute(
+                    update(table).where(table.c.id == bindparam('b_id')).values(**value_columns),
+                    updates
+                )
+
+            last_id = rows[-1][0]
+            processed += len(rows)
+            checkpoint[name] = last_id
+            self._save_checkpoint(checkpoint)
+            if self.progress:
+                self.progress(name, processed)
+
+    # --- 키 파일 교체 ---
+
+    def _prepare_new_keys(self, allow_create: bool):
+        """교체용 새 키를 준비 (이미 존재하면 재사용, 이어서 실행할 때는 생성하지 않음)"""
+        os.makedirs(self.rotation_dir, exist_ok=True)
+        try:
+            HybridEncryption(keys_dir=self.rotation_dir, create=allow_create)
+        except EncryptionError as e:
+            raise EncryptionError(
+                f"체크포인트가 있지만 스테이징된 새 키를 로드할 수 없어 교체를 이어갈 수 없습니다 ({self.rotation_dir}): {e}"
+            ) from e
+
+    def _promote_new_keys(self, checkpoint: Dict) -> str:
+        """
+        스테이징된 새 키를 활성화하고 이전 키를 retired로 보관합니다.
+        ACTIVE 포인터 교체가 유일한 전환 시점이므로 중간에 중단되어도 키 세트가 섞이지 않으며,
+        다시 실행하면 체크포인트에 기록된 대상 세트로 이어서 진행합니다.
+        """
+        if 'promoted_set' not in checkpoint:
+            stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+            checkpoint['promoted_set'] = os.path.join(HybridEncryption.SETS_DIR_NAME, stamp)
+            checkpoint['previous_set'] = read_active_pointer(self.keys_dir) or ''
+            checkpoint['retired_dir'] = os.path.join(HybridEncryption.RETIRED_DIR_NAME, stamp)
+            self._save_checkpoint(checkpoint)
+
+        new_set_dir = os.path.join(self.keys_dir, checkpoint['promoted_set'])
+        previous_dir = os.path.join(self.keys_dir, checkpoint['previous_set']) if checkpoint['previous_set'] else self.keys_dir
+        retired_dir = os.path.join(self.keys_dir, checkpoint['retired_dir'])
+
+        if read_active_pointer(self.keys_dir) != checkpoint['promoted_set']:
+            # 복사만 하므로 여기서 중단되어도 활성 키는 그대로
+            _copy_key_files(previous_dir, retired_dir)
+            _copy_key_files(self.rotation_dir, new_set_dir)
+            write_active_pointer(self.keys_dir, checkpoint['promoted_set'])
+
+        # 정리: 이전 활성 키 파일과 스테이징 키 (키 파일을 먼저 지워 교체 진행 중 상태를 즉시 해제)
+        for directory in (previous_dir, self.rotation_dir):
+            for name in HybridEncryption.KEY_FILES:
+                path = os.path.join(directory, name)
+                if os.path.exists(path):
+                    os.remove(path)
+        if previous_dir != self.keys_dir:
+            shutil.rmtree(previous_dir, ignore_errors=True)
+        shutil.rmtree(self.rotation_dir)
+        return retired_dir
+
+    def run(self, restart: bool = False) -> Dict[str, int]:
+        resuming = os.path.exists(self.checkpoint_path)
+        checkpoint = {} if restart else self._load_checkpoint()
+        if restart and resuming:
+            os.remove(self.checkpoint_path)
+        tasks = self._tasks()
+        stats = {name: 0 for name, *_ in tasks}
+
+        if 'promoted_set' not in checkpoint:
+            # 체크포인트가 남아 있으면 (--restart 포함) 이미 스테이징 키로 재래핑된 레코드가 있을 수 있음
+            self._prepare_new_keys(allow_create=not resuming)
+            self._save_checkpoint(checkpoint)  # 이후 중단되면 스테이징 키를 재사용하도록 교체 시작을 기록
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(self.keys_dir, self.rotation_dir)) as executor:
+                for name, table, columns, worker_fn, condition in tasks:
+                    stats[name] = self._rewrap_table(executor, checkpoint, name, table, columns, worker_fn, condition)
+                # 다른 테이블을 처리하는 동안 (스테이징 이전 키로) 생성된 에폭을 활성화 직전에 재래핑
+                stats['key_epochs'] += self._rewrap_table(executor, checkpoint, *tasks[0])
+
+        retired_dir = self._promote_new_keys(checkpoint)
+        logger.info(f"시스템 키 교체 완료. 이전 키 보관 위치: {retired_dir}")
+        stats['retired_dir'] = retired_dir
+        return stats
+
+    def purge_retired(self, keep: int = 0) -> List[str]:
+        """
+        retired에 보관된 이전 시스템 키를 삭제합니다 (최근 keep개는 유지).
+        보관된 키는 앱이 자동으로 사용하지 않으며, 교체가 진행 중이면 거부합니다.
+        """
+        if os.path.exists(self.rotation_dir):
+            raise EncryptionError("키 교체가 진행 중(또는 중단됨)입니다. keys rotate를 완료한 뒤 다시 실행하세요.")
+        retired_root = os.path.join(self.keys_dir, HybridEncryption.RETIRED_DIR_NAME)
+        if not os.path.isdir(retired_root):
+            return []
+        names = sorted(os.listdir(retired_root), reverse=True)
+        removed = []
+        for name in names[keep:]:
+            path = os.path.join(retired_root, name)
+            shutil.rmtree(path)
+            removed.append(path)
+            logger.info(f"보관된 이전 시스템 키 삭제: {path}")
+        return removed
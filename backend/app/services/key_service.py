@@ -0,0 +1,305 @@
+# backend/app/services/key_service.py
+import os
+import threading
+import time
+import logging
+from datetime import datetime, timezone
+from typing import BinaryIO, Dict, Optional, Tuple
+from flask import current_app, has_app_context
+from sqlalchemy import select, insert
+from .. import db
+from ..config import Config
+from ..models import KeyEpoch, ClientCall, ConsultationReport, EncryptedFile
+from ..utils.hybrid_encryption import HybridEncryption, EncryptionError
+from ..utils.metrics import count_crypto
+from ..utils.envelope import parse_legacy_audio_container, pack_envelope_header, EnvelopeWriter
+from .dek_pool import DekPool
+
+logger = logging.getLogger(__name__)
+
+class KeyService:
+    """
+    KEK 계층 기반 키 관리
+
+    - KEK(대칭키)는 에폭 단위로 생성되며 RSA + PQC로 한 번만 래핑되어 key_epochs 테이블에 저장됩니다.
+    - 레코드별 DEK는 현재 에폭의 KEK로 AES-GCM 래핑됩니다.
+    - 복호화된 KEK는 프로세스 내에 캐시되므로 비대칭 연산은 에폭당(프로세스당) 한 번만 발생합니다.
+    - 현재 에폭은 프로세스별로 관리됩니다. 워커가 처음 쓰기를 할 때(또는 에폭이 만료됐을 때)는
+      다른 워커가 만든 최신 에폭이 KEK_ROTATION_HOURS 안이면 그 에폭을 이어서 사용하므로
+      워커 수만큼 에폭이 생기지 않습니다. KEK_ROTATION_RECORDS는 프로세스별로 집계됩니다.
+    """
+
+    def __init__(self, hybrid_encryption: Optional[HybridEncryption] = None):
+        self.hybrid_encryption = hybrid_encryption or HybridEncryption()
+        self._lock = threading.Lock()
+        self._kek_cache: Dict[int, bytes] = {}
+        self._current_epoch_id: Optional[int] = None
+        self._current_epoch_started = 0.0
+        self._current_epoch_records = 0
+        self.dek_pool: Optional[DekPool] = None
+
+    def _config(self, key: str):
+        if has_app_context():
+            return current_app.config.get(key, getattr(Config, key))
+        return getattr(Config, key)
+
+    def _epoch_expired(self) -> bool:
+        if self._current_epoch_id is None:
+            return True
+        max_age = self._config('KEK_ROTATION_HOURS') * 3600
+        max_records = self._config('KEK_ROTATION_RECORDS')
+        if time.monotonic() - self._current_epoch_started >= max_age:
+            return True
+        return self._current_epoch_records >= max_records
+
+    def _latest_epoch(self) -> Optional[Tuple[int, float]]:
+        """
+        DB의 최신 에폭이 아직 교체 주기 안이고 이 프로세스가 방금 다 쓴 에폭이 아니면
+        (에폭 ID, 에폭 시작 시각(monotonic 기준))을 반환합니다.
+        """
+        table = KeyEpoch.__table__
+        with db.engine.connect() as conn:
+            row = conn.execute(
+                select(table.c.id, table.c.created_at).order_by(table.c.id.desc()).limit(1)
+            ).first()
+        if row is None or row.id == self._current_epoch_id:
+            return None
+        created_at = row.created_at
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)  # SQLite는 시간대를 보존하지 않음
+        age = (datetime.now(timezone.utc) - created_at).total_seconds()
+        if not 0 <= age < self._config('KEK_ROTATION_HOURS') * 3600:
+            return None
+        return row.id, time.monotonic() - age
+
+    def _create_epoch(self) -> Tuple[int, bytes]:
+        """새 KEK를 생성하고 RSA/PQC로 래핑하여 저장"""
+        kek = os.urandom(32)
+        count_crypto('kek_wrap')
+        wrapped_kek_trad, pqc_kem_ciphertext, wrapped_kek_pqc = self.hybrid_encryption.wrap_kek(kek)
+        # 호출자의 세션 트랜잭션과 분리하기 위해 별도 커넥션으로 즉시 커밋
+        with db.engine.begin() as conn:
+            result = conn.execute(insert(KeyEpoch.__table__).values(
+                wrapped_kek_trad=wrapped_kek_trad,
+                pqc_kem_ciphertext=pqc_kem_ciphertext,
+                wrapped_kek_pqc=wrapped_kek_pqc
+            ))
+            key_epoch_id = result.inserted_primary_key[0]
+        self._kek_cache[key_epoch_id] = kek
+        logger.info(f"새 KEK 에폭 생성: {key_epoch_id}")
+        return key_epoch_id, kek
+
+    def current_epoch(self) -> Tuple[int, bytes]:
+        """현재 에폭의 (ID, KEK)를 반환하고 필요 시 에폭을 교체"""
+        with self._lock:
+            if self._epoch_expired():
+                latest = self._latest_epoch()
+                if latest is not None:
+                    # 다른 워커가 만든 에폭을 이어서 사용 (KEK 언래핑은 프로세스당 한 번)
+                    self._current_epoch_id, self._current_epoch_started = latest
+                    if self._current_epoch_id not in self._kek_cache:
+                        self._kek_cache[self._current_epoch_id] = self._fetch_kek(self._current_epoch_id)
+                else:
+                    self._current_epoch_id, _ = self._create_epoch()
+                    self._current_epoch_started = time.monotonic()
+                self._current_epoch_records = 0
+            self._current_epoch_records += 1
+            return self._current_epoch_id, self._kek_cache[self._current_epoch_id]
+
+    def load_kek(self, key_epoch_id: int) -> bytes:
+        """에폭 KEK를 조회 (캐시 미스 시에만 RSA/PQC 언래핑)"""
+        kek = self._kek_cache.get(key_epoch_id)
+        if kek is not None:
+            count_crypto('kek_cache_hit')
+            return kek
+        with self._lock:
+            kek = self._kek_cache.get(key_epoch_id)
+            if kek is None:
+                kek = self._kek_cache[key_epoch_id] = self._fetch_kek(key_epoch_id)
+            return kek
+
+    def _fetch_kek(self, key_epoch_id: int) -> bytes:
+        """DB의 에폭 래핑을 RSA/PQC로 해제합니다 (호출자가 _lock을 보유)."""
+        with db.engine.connect() as conn:
+            row = conn.execute(
+                select(KeyEpoch.__table__).where(KeyEpoch.__table__.c.id == key_epoch_id)
+            ).mappings().first()
+        if row is None:
+            raise EncryptionError(f"KEK 에폭을 찾을 수 없습니다: {key_epoch_id}")
+        count_crypto('kek_unwrap')
+        return self.hybrid_encryption.unwrap_kek(
+            row['wrapped_kek_trad'], row['pqc_kem_ciphertext'], row['wrapped_kek_pqc']
+        )
+
+    def wrap_dek(self, dek: bytes) -> Tuple[int, bytes]:
+        """기존 DEK를 현재 에폭의 KEK로 래핑"""
+        key_epoch_id, kek = self.current_epoch()
+        return key_epoch_id, self.hybrid_encryption.wrap_dek_with_kek(dek, kek, key_epoch_id)
+
+    def new_wrapped_dek(self) -> Tuple[bytes, int, bytes]:
+        """새 DEK를 생성하고 현재 에폭 KEK로 래핑 (풀을 거치지 않음)"""
+        dek = self.hybrid_encryption._generate_dek()
+        key_epoch_id, wrapped_dek = self.wrap_dek(dek)
+        return dek, key_epoch_id, wrapped_dek
+
+    def generate_dek(self) -> Tuple[bytes, int, bytes]:
+        """(DEK, 에폭 ID, 래핑된 DEK)를 반환 (DEK 풀이 있으면 풀에서 꺼냄)"""
+        if self.dek_pool is not None:
+            return self.dek_pool.acquire()
+        return self.new_wrapped_dek()
+
+    def init_dek_pool(self, app) -> DekPool:
+        """
+        미리 래핑된 DEK 풀을 생성합니다.
+        보충 스레드는 gunicorn post_fork에서 워커별로 시작되며, 그 밖의 실행 환경에서는 첫 사용 시 시작됩니다.
+        """
+        if self.dek_pool is None:
+            self.dek_pool = DekPool(
+                self, app,
+                size=app.config.get('DEK_POOL_SIZE', Config.DEK_POOL_SIZE),
+                low_watermark=app.config.get('DEK_POOL_LOW_WATERMARK', Config.DEK_POOL_LOW_WATERMARK)
+            )
+        return self.dek_pool
+
+    def unwrap_dek(self, key_epoch_id: int, wrapped_dek: bytes) -> bytes:
+        """에폭 KEK로 래핑된 DEK를 복호화"""
+        kek = self.load_kek(key_epoch_id)
+        return self.hybrid_encryption.unwrap_dek_with_kek(wrapped_dek, kek, key_epoch_id)
+
+    def encrypt_blob(self, data: bytes) -> Tuple[int, bytes, bytes, bytes]:
+        """데이터를 새 DEK로 암호화하여 (에폭 ID, 래핑된 DEK, nonce, 암호문)을 반환"""
+        dek, key_epoch_id, wrapped_dek = self.generate_dek()
+        nonce, ciphertext = self.hybrid_encryption._encrypt_file_with_dek(data, dek)
+        return key_epoch_id, wrapped_dek, nonce, ciphertext
+
+    def envelope_writer(self, file: BinaryIO) -> EnvelopeWriter:
+        """새 DEK로 컨테이너를 스트리밍 암호화하는 writer를 반환 (헤더/nonce는 즉시 기록)"""
+        dek, key_epoch_id, wrapped_dek = self.generate_dek()
+        count_crypto('aes_gcm_encrypt')
+        return EnvelopeWriter(file, key_epoch_id, wrapped_dek, dek)
+
+    def decrypt_blob(self, key_epoch_id: int, wrapped_dek: bytes, nonce: bytes, ciphertext: bytes) -> bytes:
+        """encrypt_blob으로 암호화된 데이터를 복호화"""
+        dek = self.unwrap_dek(key_epoch_id, wrapped_dek)
+        return self.hybrid_encryption._decrypt_file_with_dek(nonce, ciphertext, dek)
+
+
+_key_service: Optional[KeyService] = None
+_key_service_lock = threading.Lock()
+
+def get_key_service() -> KeyService:
+    """프로세스 단위 KeyService 인스턴스를 반환합니다."""
+    global _key_service
+    if _key_service is None:
+        with _key_service_lock:
+            if _key_service is None:
+                _key_service = KeyService()
+    return _key_service
+
+
+# --- 레거시 레코드 마이그레이션 ---
+
+def migrate_legacy_rows(batch_size: int = 500) -> Dict[str, int]:
+    """
+    레코드별 RSA/PQC로 래핑된 DEK를 KEK 계층으로 재래핑합니다.
+    필드/파일 암호문은 그대로 두고 DEK 래핑만 교체합니다.
+
+    - 소견서/통화 음성: RSA와 PQC 래핑을 모두 풀 수 있으면 두 DEK가 일치하는지 검증합니다 (_recover_dek).
+    - EncryptedFile: 레코드별 PQC 개인키가 저장되지 않아 PQC 래핑을 검증할 수 없으므로 RSA 래핑만으로 DEK를 복구합니다
+      (복구한 DEK는 재래핑 전에 확인할 방법이 없으며, 건수는 stats['files_rsa_only']로 따로 집계합니다).
+    """
+    key_service = get_key_service()
+    hybrid = key_service.hybrid_encryption
+    stats = {'reports': 0, 'files': 0, 'files_rsa_only': 0, 'audio': 0, 'failed': 0}
+
+    # 1) 소견서
+    last_id = 0
+    while True:
+        reports = ConsultationReport.query.filter(
+            ConsultationReport.key_epoch_id.is_(None),
+            ConsultationReport.id > last_id
+        ).order_by(ConsultationReport.id).limit(batch_size).all()
+        if not reports:
+            break
+        for report in reports:
+            last_id = report.id
+            try:
+                if not report._has_legacy_dek():
+                    raise EncryptionError("DEK 관련 필드가 누락되었습니다.")
+                dek = hybrid._recover_dek(
+                    report.encrypted_dek_trad,
+                    report.pqc_kem_ciphertext,
+                    report.nonce_for_dek_encryption + report.encrypted_dek_by_pqc_shared_secret,
+                    report.pqc_secret_key
+                )
+                report.key_epoch_id, report.wrapped_dek = key_service.wrap_dek(dek)
+                report.clear_legacy_dek()
+                stats['reports'] += 1
+            except Exception as e:
+                logger.error(f"소견서 {report.id} 재래핑 실패: {e}")
+                stats['failed'] += 1
+        db.session.commit()
+
+    # 2) 암호화 파일 메타데이터
+    last_id = 0
+    while True:
+        files = EncryptedFile.query.filter(
+            EncryptedFile.key_epoch_id.is_(None),
+            EncryptedFile.id > last_id
+        ).order_by(EncryptedFile.id).limit(batch_size).all()
+        if not files:
+            break
+        for encrypted_file in files:
+            last_id = encrypted_file.id
+            try:
+                # EncryptedFile에는 PQC 개인키가 저장되지 않으므로 RSA 래핑만 사용 (PQC 절반은 검증하지 않음)
+                dek = hybrid._decrypt_dek_trad(encrypted_file.encrypted_dek_trad)
+                encrypted_file.key_epoch_id, encrypted_file.wrapped_dek = key_service.wrap_dek(dek)
+                encrypted_file.encrypted_dek_trad = None
+                encrypted_file.pqc_kem_ciphertext = None
+                encrypted_file.nonce_for_dek_encryption = None
+                encrypted_file.encrypted_dek_by_pqc_shared_secret = None
+                stats['files'] += 1
+                stats['files_rsa_only'] += 1
+            except Exception as e:
+                logger.error(f"파일 {encrypted_file.id} 재래핑 실패: {e}")
+                stats['failed'] += 1
+        db.session.commit()
+
+    # 3) 통화 음성 파일 (파일 헤더의 DEK 래핑만 교체, 암호문은 그대로 복사)
+    last_id = 0
+    while True:
+        calls = ClientCall.query.filter(
+            ClientCall.audio_file_path.isnot(None),
+            ClientCall.id > last_id
+        ).order_by(ClientCall.id).limit(batch_size).all()
+        if not calls:
+            break
+        for call in calls:
+            last_id = call.id
+            path = call.audio_file_path
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+                legacy = parse_legacy_audio_container(data)
+                if legacy is None:
+                    continue  # 이미 새 형식
+                (nonce_for_file, encrypted_file_content, encrypted_dek_trad,
+                 pqc_kem_ciphertext, encrypted_dek_pqc_package, pqc_secret_key) = legacy
+                dek = hybrid._recover_dek(encrypted_dek_trad, pqc_kem_ciphertext,
+                                          encrypted_dek_pqc_package, pqc_secret_key)
+                key_epoch_id, wrapped_dek = key_service.wrap_dek(dek)
+                tmp_path = path + '.rewrap'
+                with open(tmp_path, 'wb') as f:
+                    f.write(pack_envelope_header(key_epoch_id, wrapped_dek))
+                    f.write(nonce_for_file)
+                    f.write(encrypted_file_content)
+                os.replace(tmp_path, path)
+                stats['audio'] += 1
+            except Exception as e:
+                logger.error(f"통화 {call.id} 음성 파일 재래핑 실패: {e}")
+                stats['failed'] += 1
+
+    return stats
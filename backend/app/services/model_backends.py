@@ -0,0 +1,522 @@
+# backend/app/services/model_backends.py
+import os
+import json
+import time
+import logging
+import threading
+from typing import Dict, Optional
+import numpy as np
+from flask import current_app, has_app_context
+from ..config import Config
+from ..utils.deadline import DeadlineExceeded
+from ..utils.metrics import Counter, stage_timer, MODEL_LOAD_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# 음성 인식(Whisper) / 위험도 분류(RoBERTa) 실행 백엔드
+# - torch: transformers eager 모델 (기본값)
+# - onnx:  `flask models export-onnx`로 내보낸 그래프를 ONNX Runtime(CPU)으로 실행
+# - stub:  모델 없이 고정 결과를 반환 (개발/부하 테스트용)
+
+WHISPER_MODEL_NAME = "YongJaeLee/Whisper_FineTuning_Ko_Stagewise"
+ROBERTA_MODEL_NAME = "seungb1027/roberta-suicide-risk"
+SAMPLING_RATE = 16000  # Whisper는 16kHz 모노 오디오를 기대함
+WHISPER_MAX_NEW_TOKENS = 440  # 디코더 최대 길이(448) - 프롬프트(언어/작업/타임스탬프 토큰)
+
+WHISPER_GENERATED_TOKENS = Counter(
+    'whisper_generated_tokens', 'Whisper 디코딩 출력 토큰 수 (프롬프트 포함)', ('assisted',))
+WHISPER_DECODE_SECONDS = Counter(
+    'whisper_decode_seconds', 'Whisper 디코딩(generate) 시간(초)', ('assisted',))
+
+class ModelBackend:
+    name = ''
+
+    def __init__(self):
+        self._load_lock = threading.Lock()
+        self.loaded = False
+        self.feature_extractor = None
+
+    def load(self):
+        """모델을 적재합니다 (여러 번 호출해도 한 번만 적재)."""
+        if self.loaded:
+            return
+        with self._load_lock:
+            if not self.loaded:
+                self._load()
+                self.loaded = True
+
+    def _load(self):
+        raise NotImplementedError
+
+    def load_feature_extractor(self):
+        """
+        특징 추출기만 적재합니다 (모델 가중치 없이 CPU 전처리만 하는 워커 프로세스용).
+        load() 시에는 모델의 프로세서에 포함된 추출기를 그대로 사용합니다.
+        """
+        if self.feature_extractor is None:
+            self.feature_extractor = self._load_feature_extractor()
+
+    def _load_feature_extractor(self):
+        raise NotImplementedError
+
+    def extract_features(self, speech_array: np.ndarray) -> np.ndarray:
+        """16kHz 모노 파형을 Whisper 입력 특징(log-mel, float32, [1, mel, frames])으로 변환합니다."""
+        with stage_timer('feature_extraction'):
+            return self.feature_extractor(
+                speech_array, sampling_rate=SAMPLING_RATE, return_tensors="np"
+            ).input_features.astype(np.float32, copy=False)
+
+    def transcribe_features(self, input_features: np.ndarray, generate_kwargs: Optional[Dict] = None) -> str:
+        """extract_features() 결과를 텍스트로 변환합니다."""
+        raise NotImplementedError
+
+    def transcribe(self, speech_array: np.ndarray, generate_kwargs: Optional[Dict] = None) -> str:
+        """16kHz 모노 파형을 텍스트로 변환합니다."""
+        return self.transcribe_features(self.extract_features(speech_array), generate_kwargs)
+
+    def predict_risk(self, text: str) -> int:
+        """텍스트의 위험도 클래스 ID를 반환합니다."""
+        raise NotImplementedError
+
+    def model_versions(self) -> Dict[str, str]:
+        """위험도 예측과 함께 기록할 모델 버전 (별칭 -> 저장소@리비전)"""
+        return {'backend': self.name}
+
+
+class TorchBackend(ModelBackend):
+    """
+    transformers eager 모델 실행 백엔드
+
+    모델 레지스트리(MODEL_REGISTRY_DIR)가 있으면 고정된 스냅샷을 체크섬 검증 후 오프라인으로만 적재하며,
+    가중치는 safetensors(메모리 맵)로 읽습니다. 레지스트리가 없으면 허브 이름(캐시/네트워크)으로 적재합니다.
+    draft_model_name이 있으면 탐욕 디코딩 프로필의 인식에 소형 초안 모델을 보조(assisted) 모델로 사용합니다.
+    """
+
+    name = 'torch'
+
+    def __init__(self, whisper_model_name: str = WHISPER_MODEL_NAME, roberta_model_name: str = ROBERTA_MODEL_NAME,
+                 registry=None, draft_model_name: Optional[str] = None):
+        super().__init__()
+        self.whisper_model_name = whisper_model_name
+        self.roberta_model_name = roberta_model_name
+        self.registry = registry
+        self.draft_model_name = draft_model_name  # 보조(assisted) 디코딩용 소형 Whisper (None이면 사용 안 함)
+        self.whisper_processor = None
+        self.whisper_model = None
+        self.draft_model = None
+        self.roberta_tokenizer = None
+        self.roberta_model = None
+
+    def _source(self, alias: str, model_name: str):
+        """(from_pretrained 경로, 추가 인자) - 레지스트리 스냅샷은 로컬 파일만 사용 (허브 조회 없음)"""
+        if self.registry is None:
+            return model_name, {}
+        return self.registry.path(alias), {'local_files_only': True}
+
+    def model_versions(self) -> Dict[str, str]:
+        if self.registry is not None:
+            versions = self.registry.versions()
+        else:
+            versions = {'whisper': f"{self.whisper_model_name}@unpinned", 'roberta': f"{self.roberta_model_name}@unpinned"}
+        return {'backend': self.name, **versions}
+
+    def _load(self):
+        import torch
+        from transformers import (WhisperProcessor, WhisperForConditionalGeneration,
+                                  AutoTokenizer, AutoModelForSequenceClassification)
+
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        logger.info(f"Using device: {device} for AI models.")
+
+        weights = {}
+        if self.registry is not None:
+            for alias in ('whisper', 'roberta'):
+                self.registry.verify(alias)
+            weights = {'use_safetensors': True}  # pickle(*.bin) 대신 메모리 맵 safetensors만 허용
+
+        whisper_path, options = self._source('whisper', self.whisper_model_name)
+        logger.info(f"Loading Whisper model: {whisper_path}...")
+        started = time.perf_counter()
+        self.whisper_processor = WhisperProcessor.from_pretrained(whisper_path, **options)
+        self.whisper_model = WhisperForConditionalGeneration.from_pretrained(
+            whisper_path, **options, **weights).to(device)
+        self.whisper_model.eval() # 추론 모드로 설정
+        self.feature_extractor = self.whisper_processor.feature_extractor
+        MODEL_LOAD_SECONDS.labels(model='whisper').set(time.perf_counter() - started)
+        logger.info(f"Whisper model loaded ({time.perf_counter() - started:.2f}s).")
+        if self.draft_model_name:
+            self._load_draft(device, weights)
+
+        roberta_path, options = self._source('roberta', self.roberta_model_name)
+        logger.info(f"Loading RoBERTa model: {roberta_path}...")
+        started = time.perf_counter()
+        self.roberta_tokenizer = AutoTokenizer.from_pretrained(roberta_path, **options)
+        self.roberta_model = AutoModelForSequenceClassification.from_pretrained(
+            roberta_path, **options, **weights).to(device)
+        self.roberta_model.eval() # 추론 모드로 설정
+        MODEL_LOAD_SECONDS.labels(model='roberta').set(time.perf_counter() - started)
+        logger.info(f"RoBERTa model loaded ({time.perf_counter() - started:.2f}s).")
+
+    def _load_draft(self, device, weights):
+        """
+        보조 디코딩용 소형 Whisper를 적재합니다 (레지스트리가 있으면 'whisper_draft' 스냅샷에서만).
+        토크나이저(어휘)가 본 모델과 다르면 토큰을 제안할 수 없으므로 사용하지 않습니다.
+        """
+        from transformers import WhisperForConditionalGeneration
+
+        if self.registry is not None:
+            if 'whisper_draft' not in self.registry.snapshots():
+                logger.warning("레지스트리에 'whisper_draft' 모델이 없어 보조 디코딩을 사용하지 않습니다.")
+                return
+            self.registry.verify('whisper_draft')
+        draft_path, options = self._source('whisper_draft', self.draft_model_name)
+        started = time.perf_counter()
+        draft_model = WhisperForConditionalGeneration.from_pretrained(draft_path, **options, **weights).to(device)
+        if draft_model.config.vocab_size != self.whisper_model.config.vocab_size:
+            logger.warning(f"보조 모델의 어휘 크기가 달라 보조 디코딩을 사용하지 않습니다: {draft_path} "
+                           f"({draft_model.config.vocab_size} != {self.whisper_model.config.vocab_size})")
+            return
+        self.draft_model = draft_model.eval()
+        MODEL_LOAD_SECONDS.labels(model='whisper_draft').set(time.perf_counter() - started)
+        logger.info(f"Whisper draft model loaded: {draft_path} ({time.perf_counter() - started:.2f}s).")
+
+    def _load_feature_extractor(self):
+        from transformers import WhisperFeatureExtractor
+
+        whisper_path, options = self._source('whisper', self.whisper_model_name)
+        return WhisperFeatureExtractor.from_pretrained(whisper_path, **options)
+
+    def _check_registry(self):
+        """백그라운드 체크섬 검증에서 불일치가 발견된 스냅샷으로는 추론하지 않습니다."""
+        if self.registry is not None:
+            self.registry.check()
+
+    def transcribe_features(self, input_features, generate_kwargs=None):
+        import torch
+
+        self._check_registry()
+        generate_kwargs = dict(generate_kwargs or {})
+        assisted = generate_kwargs.pop('assisted', False) and self.draft_model is not None \
+            and generate_kwargs.get('num_beams', 1) == 1
+        if assisted:
+            # 보조 모델이 제안한 토큰열을 본 모델이 한 번의 forward로 검증하고, 일치하는 접두부만 채택
+            # (탐욕 디코딩에서는 본 모델 단독 디코딩과 같은 결과)
+            generate_kwargs['assistant_model'] = self.draft_model
+        input_features = torch.from_numpy(input_features).to(self.whisper_model.device)
+        started = time.perf_counter()
+        with stage_timer('whisper_generate'), torch.no_grad(): # 그래디언트 계산 비활성화 (추론 시)
+            # max_time은 transformers의 MaxTimeCriteria(StoppingCriteria)로 디코딩 루프를 중단함
+            predicted_ids = self.whisper_model.generate(input_features, **generate_kwargs)
+        label = 'true' if assisted else 'false'
+        WHISPER_DECODE_SECONDS.labels(assisted=label).inc(time.perf_counter() - started)
+        WHISPER_GENERATED_TOKENS.labels(assisted=label).inc(predicted_ids.shape[-1])
+        _raise_if_timed_out(started, generate_kwargs)
+
+        # 예측된 ID를 텍스트로 디코딩
+        return self.whisper_processor.batch_decode(predicted_ids, skip_special_tokens=True)[0]
+
+    def predict_risk(self, text):
+        import torch
+
+        self._check_registry()
+        with stage_timer('risk_scoring'): # 토크나이즈 + 추론 + 클래스 선택
+            inputs = self.roberta_tokenizer(
+                text, return_tensors="pt", truncation=True, padding=True, max_length=512
+            ).to(self.roberta_model.device)
+
+            with stage_timer('roberta_forward'), torch.no_grad():
+                logits = self.roberta_model(**inputs).logits
+
+            # 로짓에서 확률 계산 (Softmax) 및 가장 높은 확률의 클래스 예측
+            probabilities = torch.softmax(logits, dim=-1)
+            return torch.argmax(probabilities, dim=-1).item()
+
+
+class OnnxBackend(ModelBackend):
+    """
+    ONNX Runtime(CPU) 실행 백엔드
+
+    Whisper는 인코더 1회 + 디코더 반복 호출의 탐욕(greedy) 디코딩으로 실행합니다.
+    디코더는 KV 캐시 없이 전체 토큰열을 다시 계산하므로 짧은 통화 녹음 기준으로 최적화되어 있으며,
+    generate_kwargs 중 language/task(디코더 프롬프트), max_new_tokens/max_time만 적용됩니다 (빔 서치/use_cache는 무시).
+    """
+
+    name = 'onnx'
+
+    ENCODER_FILE = 'whisper_encoder.onnx'
+    DECODER_FILE = 'whisper_decoder.onnx'
+    ROBERTA_FILE = 'roberta.onnx'
+    META_FILE = 'export_meta.json'
+    WHISPER_PROCESSOR_DIR = 'whisper_processor'
+    ROBERTA_TOKENIZER_DIR = 'roberta_tokenizer'
+
+    def __init__(self, model_dir: str, intra_op_threads: int = 0):
+        super().__init__()
+        self.model_dir = model_dir
+        self.intra_op_threads = intra_op_threads
+        self.meta = None
+        self._prompt_cache = {}
+
+    def _session(self, ort, filename: str):
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if self.intra_op_threads:
+            options.intra_op_num_threads = self.intra_op_threads
+        return ort.InferenceSession(os.path.join(self.model_dir, filename), options,
+                                    providers=['CPUExecutionProvider'])
+
+    def _load(self):
+        import onnxruntime as ort
+        from transformers import WhisperProcessor, AutoTokenizer
+
+        meta_path = os.path.join(self.model_dir, self.META_FILE)
+        if not os.path.exists(meta_path):
+            raise FileNotFoundError(f"ONNX 모델이 없습니다: {self.model_dir} ('flask models export-onnx'로 생성)")
+        with open(meta_path, encoding='utf-8') as f:
+            self.meta = json.load(f)
+
+        started = time.perf_counter()
+        self.whisper_processor = WhisperProcessor.from_pretrained(os.path.join(self.model_dir, self.WHISPER_PROCESSOR_DIR))
+        self.feature_extractor = self.whisper_processor.feature_extractor
+        self.encoder_session = self._session(ort, self.ENCODER_FILE)
+        self.decoder_session = self._session(ort, self.DECODER_FILE)
+        MODEL_LOAD_SECONDS.labels(model='whisper_onnx').set(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        self.roberta_tokenizer = AutoTokenizer.from_pretrained(os.path.join(self.model_dir, self.ROBERTA_TOKENIZER_DIR))
+        self.roberta_session = self._session(ort, self.ROBERTA_FILE)
+        self.roberta_input_names = {i.name for i in self.roberta_session.get_inputs()}
+        MODEL_LOAD_SECONDS.labels(model='roberta_onnx').set(time.perf_counter() - started)
+        logger.info(f"ONNX models loaded from {self.model_dir}")
+
+    def _load_feature_extractor(self):
+        from transformers import WhisperFeatureExtractor
+
+        return WhisperFeatureExtractor.from_pretrained(os.path.join(self.model_dir, self.WHISPER_PROCESSOR_DIR))
+
+    def model_versions(self):
+        meta = self.meta or {}
+        versions = meta.get('model_versions') or {
+            'whisper': f"{meta.get('whisper_model', WHISPER_MODEL_NAME)}@unpinned",
+            'roberta': f"{meta.get('roberta_model', ROBERTA_MODEL_NAME)}@unpinned",
+        }
+        return {'backend': self.name, **versions}
+
+    def _prompt_ids(self, language: Optional[str], task: Optional[str]):
+        """디코더 시작 토큰 + 언어/작업/타임스탬프 없음 토큰 (미지정 시 내보낼 때의 프롬프트)"""
+        if language is None and task is None:
+            return self.meta['decoder_prompt_ids']
+        key = (language, task)
+        if key not in self._prompt_cache:
+            forced = self.whisper_processor.get_decoder_prompt_ids(language=language, task=task, no_timestamps=True)
+            self._prompt_cache[key] = [self.meta['decoder_prompt_ids'][0]] + [token for _, token in sorted(forced)]
+        return self._prompt_cache[key]
+
+    def transcribe_features(self, input_features, generate_kwargs=None):
+        generate_kwargs = dict(generate_kwargs or {})
+        prompt_ids = self._prompt_ids(generate_kwargs.pop('language', None), generate_kwargs.pop('task', None))
+        max_new_tokens = min(self.meta['max_new_tokens'], generate_kwargs.pop('max_new_tokens', self.meta['max_new_tokens']))
+        max_time = generate_kwargs.pop('max_time', None)
+        generate_kwargs.pop('use_cache', None)  # 캐시 없는 디코더 그래프
+        generate_kwargs.pop('assisted', None)  # 보조 모델 없음
+        if generate_kwargs.get('num_beams') == 1:
+            del generate_kwargs['num_beams']  # 탐욕 디코딩과 동일
+        if generate_kwargs:
+            logger.debug(f"ONNX backend ignores generate_kwargs: {sorted(generate_kwargs)}")
+
+        started = time.perf_counter()
+        with stage_timer('whisper_generate'):
+            encoder_hidden_states = self.encoder_session.run(None, {'input_features': input_features})[0]
+            tokens = list(prompt_ids)
+            for _ in range(max_new_tokens):
+                _raise_if_timed_out(started, {'max_time': max_time})
+                logits = self.decoder_session.run(None, {
+                    'input_ids': np.asarray([tokens], dtype=np.int64),
+                    'encoder_hidden_states': encoder_hidden_states,
+                })[0]
+                next_token = int(logits[0, -1].argmax())
+                if next_token == self.meta['eos_token_id']:
+                    break
+                tokens.append(next_token)
+
+        return self.whisper_processor.batch_decode([tokens], skip_special_tokens=True)[0]
+
+    def predict_risk(self, text):
+        with stage_timer('risk_scoring'):
+            inputs = self.roberta_tokenizer(text, return_tensors="np", truncation=True, padding=True, max_length=512)
+            feed = {name: inputs[name].astype(np.int64) for name in self.roberta_input_names}
+            with stage_timer('roberta_forward'):
+                logits = self.roberta_session.run(None, feed)[0]
+            return int(np.argmax(logits, axis=-1)[0])
+
+
+class StubBackend(ModelBackend):
+    """모델 없이 결정적인 결과를 반환 (개발/부하 테스트용)"""
+
+    name = 'stub'
+
+    def __init__(self, risk_level: int = 0):
+        super().__init__()
+        self.risk_level = risk_level
+
+    def _load(self):
+        pass
+
+    def _load_feature_extractor(self):
+        return None
+
+    def extract_features(self, speech_array):
+        # 파형을 그대로 특징으로 사용 ([1, 1, samples])
+        return np.asarray(speech_array, dtype=np.float32).reshape(1, 1, -1)
+
+    def transcribe_features(self, input_features, generate_kwargs=None):
+        return f"stub transcript ({input_features.shape[-1] / SAMPLING_RATE:.1f}s)"
+
+    def predict_risk(self, text):
+        return self.risk_level
+
+
+def _raise_if_timed_out(started: float, generate_kwargs: Dict):
+    """max_time에 도달해 디코딩이 중단된 경우 (잘린 전사는 사용하지 않음)"""
+    max_time = generate_kwargs.get('max_time')
+    if max_time is not None and time.perf_counter() - started >= max_time:
+        raise DeadlineExceeded('whisper_generate', f"음성 인식 디코딩 시간 초과 ({max_time:.1f}s)")
+
+
+BACKENDS = ('torch', 'onnx', 'stub')
+
+def create_backend(name: str, config=None) -> ModelBackend:
+    """설정값으로 백엔드 인스턴스를 생성합니다 (모델은 load() 시 적재)."""
+    config = config if config is not None else (current_app.config if has_app_context() else {})
+    if name == 'torch':
+        from .model_registry import registry_from_config
+
+        # 보조 디코딩을 쓰는 프로필이 있을 때만 초안 모델을 적재
+        assisted = config.get('WHISPER_ASSISTED_PROFILES', Config.WHISPER_ASSISTED_PROFILES)
+        draft_model_name = config.get('WHISPER_DRAFT_MODEL_NAME', Config.WHISPER_DRAFT_MODEL_NAME) if assisted else None
+        return TorchBackend(registry=registry_from_config(config), draft_model_name=draft_model_name)
+    if name == 'onnx':
+        return OnnxBackend(
+            model_dir=config.get('ONNX_MODEL_DIR', Config.ONNX_MODEL_DIR),
+            intra_op_threads=config.get('ONNX_INTRA_OP_THREADS', Config.ONNX_INTRA_OP_THREADS)
+        )
+    if name == 'stub':
+        return StubBackend()
+    raise ValueError(f"알 수 없는 모델 백엔드: {name} (지원: {', '.join(BACKENDS)})")
+
+
+_model_backend: Optional[ModelBackend] = None
+_model_backend_lock = threading.Lock()
+
+def get_model_backend() -> ModelBackend:
+    """프로세스 단위 모델 백엔드를 반환합니다 (MODEL_BACKEND 설정)."""
+    global _model_backend
+    if _model_backend is None:
+        with _model_backend_lock:
+            if _model_backend is None:
+                config = current_app.config if has_app_context() else {}
+                _model_backend = create_backend(config.get('MODEL_BACKEND', Config.MODEL_BACKEND), config)
+    return _model_backend
+
+
+def export_onnx(output_dir: str, opset: int = 17,
+                whisper_model_name: str = WHISPER_MODEL_NAME, roberta_model_name: str = ROBERTA_MODEL_NAME,
+                registry=None) -> Dict:
+    """
+    RoBERTa 분류기와 Whisper 인코더/디코더를 ONNX로 내보냅니다.
+    내보낸 그래프는 ONNX Runtime 오프라인 그래프 최적화(ORT_ENABLE_ALL)를 거쳐 저장됩니다.
+    registry가 있으면 고정된 스냅샷에서 내보내고 그 버전을 메타데이터에 기록합니다.
+    """
+    import torch
+    import onnxruntime as ort
+    from transformers import (WhisperProcessor, WhisperForConditionalGeneration,
+                              AutoTokenizer, AutoModelForSequenceClassification)
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    class RobertaLogits(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, input_ids, attention_mask):
+            return self.model(input_ids=input_ids, attention_mask=attention_mask).logits
+
+    class WhisperEncoder(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.encoder = model.model.encoder
+
+        def forward(self, input_features):
+            return self.encoder(input_features=input_features).last_hidden_state
+
+    class WhisperDecoder(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.decoder = model.model.decoder
+            self.proj_out = model.proj_out
+
+        def forward(self, input_ids, encoder_hidden_states):
+            hidden = self.decoder(input_ids=input_ids, encoder_hidden_states=encoder_hidden_states,
+                                  use_cache=False).last_hidden_state
+            return self.proj_out(hidden)
+
+    def export(module, args, filename, input_names, output_names, dynamic_axes):
+        raw_path = os.path.join(output_dir, filename + '.raw')
+        torch.onnx.export(module, args, raw_path, input_names=input_names, output_names=output_names,
+                          dynamic_axes=dynamic_axes, opset_version=opset, do_constant_folding=True)
+        # 오프라인 그래프 최적화 결과를 저장하여 서비스 시작 시 최적화 비용을 줄임
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.optimized_model_filepath = os.path.join(output_dir, filename)
+        ort.InferenceSession(raw_path, options, providers=['CPUExecutionProvider'])
+        os.remove(raw_path)
+
+    source = TorchBackend(whisper_model_name, roberta_model_name, registry=registry)
+    if registry is not None:
+        for alias in ('whisper', 'roberta'):
+            registry.verify(alias, force=True)  # 내보낸 모델에는 이후 검증이 없으므로 전부 해시
+
+    # --- RoBERTa 분류기 ---
+    roberta_path, options = source._source('roberta', roberta_model_name)
+    tokenizer = AutoTokenizer.from_pretrained(roberta_path, **options)
+    roberta = AutoModelForSequenceClassification.from_pretrained(roberta_path, **options).eval()
+    sample = tokenizer("내보내기용 예시 문장", return_tensors="pt")
+    with torch.no_grad():
+        export(RobertaLogits(roberta), (sample['input_ids'], sample['attention_mask']), OnnxBackend.ROBERTA_FILE,
+               ['input_ids', 'attention_mask'], ['logits'],
+               {'input_ids': {0: 'batch', 1: 'sequence'}, 'attention_mask': {0: 'batch', 1: 'sequence'},
+                'logits': {0: 'batch'}})
+    tokenizer.save_pretrained(os.path.join(output_dir, OnnxBackend.ROBERTA_TOKENIZER_DIR))
+
+    # --- Whisper 인코더/디코더 ---
+    whisper_path, options = source._source('whisper', whisper_model_name)
+    processor = WhisperProcessor.from_pretrained(whisper_path, **options)
+    whisper = WhisperForConditionalGeneration.from_pretrained(whisper_path, **options).eval()
+    features = torch.zeros(1, whisper.config.num_mel_bins, 2 * whisper.config.max_source_positions)
+    generation_config = whisper.generation_config
+    prompt_ids = [generation_config.decoder_start_token_id]
+    prompt_ids += [token for _, token in sorted(generation_config.forced_decoder_ids or [])]
+    with torch.no_grad():
+        export(WhisperEncoder(whisper), (features,), OnnxBackend.ENCODER_FILE,
+               ['input_features'], ['last_hidden_state'],
+               {'input_features': {0: 'batch'}, 'last_hidden_state': {0: 'batch'}})
+        hidden = WhisperEncoder(whisper)(features)
+        export(WhisperDecoder(whisper), (torch.tensor([prompt_ids]), hidden), OnnxBackend.DECODER_FILE,
+               ['input_ids', 'encoder_hidden_states'], ['logits'],
+               {'input_ids': {0: 'batch', 1: 'sequence'}, 'encoder_hidden_states': {0: 'batch'},
+                'logits': {0: 'batch', 1: 'sequence'}})
+    processor.save_pretrained(os.path.join(output_dir, OnnxBackend.WHISPER_PROCESSOR_DIR))
+
+    meta = {
+        'whisper_model': whisper_model_name,
+        'roberta_model': roberta_model_name,
+        'opset': opset,
+        'decoder_prompt_ids': prompt_ids,
+        'eos_token_id': generation_config.eos_token_id,
+        'max_new_tokens': whisper.config.max_target_positions - len(prompt_ids),
+        'model_versions': {alias: version for alias, version in source.model_versions().items() if alias != 'backend'},
+    }
+    with open(os.path.join(output_dir, OnnxBackend.META_FILE), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    return meta
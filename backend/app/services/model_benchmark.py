@@ -0,0 +1,304 @@
+# backend/app/services/model_benchmark.py
+import os
+import time
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from .model_backends import ModelBackend, SAMPLING_RATE
+
+logger = logging.getLogger(__name__)
+
+AUDIO_EXTENSIONS = ('.wav', '.mp3', '.m4a', '.flac', '.ogg', '.webm')
+
+def collect_audio_files(paths: Sequence[str]) -> List[str]:
+    """파일/디렉토리 경로에서 오디오 파일 목록을 만듭니다."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(os.path.join(path, name) for name in os.listdir(path)
+                                if name.lower().endswith(AUDIO_EXTENSIONS)))
+        else:
+            files.append(path)
+    return files
+
+def load_fixtures(paths: Sequence[str]) -> List[Tuple[str, Optional[str]]]:
+    """오디오 파일과 같은 이름의 .txt 정답 전사를 (경로, 정답 또는 None) 목록으로 만듭니다."""
+    fixtures = []
+    for path in collect_audio_files(paths):
+        reference_path = os.path.splitext(path)[0] + '.txt'
+        reference = None
+        if os.path.exists(reference_path):
+            with open(reference_path, encoding='utf-8') as f:
+                reference = f.read().strip()
+        fixtures.append((path, reference))
+    return fixtures
+
+def _edit_distance(reference: Sequence, hypothesis: Sequence) -> int:
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref in enumerate(reference, 1):
+        current = [i]
+        for j, hyp in enumerate(hypothesis, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref != hyp)))
+        previous = current
+    return previous[-1]
+
+def error_rate(references: Sequence[str], hypotheses: Sequence[Optional[str]], unit: str = 'word') -> Optional[float]:
+    """
+    전체 정답 길이 대비 편집 거리 (unit='word'면 WER, 'char'면 공백을 제외한 CER)
+    한국어는 띄어쓰기 차이가 WER에 크게 반영되므로 CER을 함께 봅니다.
+    """
+    def split(text):
+        return text.split() if unit == 'word' else list(text.replace(' ', ''))
+
+    errors = total = 0
+    for reference, hypothesis in zip(references, hypotheses):
+        reference_units = split(reference)
+        errors += _edit_distance(reference_units, split(hypothesis or ''))
+        total += len(reference_units)
+    return round(errors / total, 4) if total else None
+
+def _latency_summary(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {}
+    values = np.asarray(samples) * 1000
+    return {
+        'count': len(samples),
+        'mean_ms': round(float(values.mean()), 2),
+        'p50_ms': round(float(np.percentile(values, 50)), 2),
+        'p95_ms': round(float(np.percentile(values, 95)), 2),
+    }
+
+def benchmark_backend(backend: ModelBackend, waveforms: Sequence[np.ndarray], texts: Sequence[str],
+                      runs: int = 1) -> Dict:
+    """
+    한 백엔드의 적재 시간, 음성 인식/위험도 분류 지연을 측정합니다.
+    음성 디코딩은 백엔드와 무관하므로 측정에서 제외합니다 (waveforms는 미리 디코딩된 16kHz 파형).
+    """
+    started = time.perf_counter()
+    backend.load()
+    load_seconds = time.perf_counter() - started
+
+    # 첫 호출의 지연 초기화 비용은 제외 (워밍업)
+    if waveforms:
+        backend.transcribe(waveforms[0])
+    if texts:
+        backend.predict_risk(texts[0])
+
+    transcribe_latency, risk_latency = [], []
+    transcripts, audio_labels, text_labels = [], [], []
+    for run in range(runs):
+        for waveform in waveforms:
+            started = time.perf_counter()
+            transcript = backend.transcribe(waveform)
+            transcribe_latency.append(time.perf_counter() - started)
+            started = time.perf_counter()
+            label = backend.predict_risk(transcript) if transcript else 0
+            risk_latency.append(time.perf_counter() - started)
+            if run == 0:
+                transcripts.append(transcript)
+                audio_labels.append(label)
+        for text in texts:
+            started = time.perf_counter()
+            label = backend.predict_risk(text)
+            risk_latency.append(time.perf_counter() - started)
+            if run == 0:
+                text_labels.append(label)
+
+    return {
+        'backend': backend.name,
+        'load_seconds': round(load_seconds, 2),
+        'transcribe': _latency_summary(transcribe_latency),
+        'predict_risk': _latency_summary(risk_latency),
+        'audio_seconds': round(sum(len(w) for w in waveforms) / SAMPLING_RATE, 1),
+        'transcripts': transcripts,
+        'audio_labels': audio_labels,
+        'text_labels': text_labels,
+    }
+
+def _agreement(reference: List, candidate: List):
+    if not reference:
+        return None
+    return round(sum(a == b for a, b in zip(reference, candidate)) / len(reference), 4)
+
+def compare_backends(results: List[Dict]) -> List[Dict]:
+    """첫 번째 백엔드를 기준으로 위험도 레이블/전사 일치율을 계산합니다."""
+    reference = results[0]
+    parity = []
+    for result in results[1:]:
+        parity.append({
+            'reference': reference['backend'],
+            'backend': result['backend'],
+            # 같은 텍스트 입력에 대한 분류기 레이블 일치율 (분류기 자체의 동등성)
+            'text_label_agreement': _agreement(reference['text_labels'], result['text_labels']),
+            # 음성 입력부터의 종단간 레이블 일치율
+            'audio_label_agreement': _agreement(reference['audio_labels'], result['audio_labels']),
+            'transcript_exact_match': _agreement(reference['transcripts'], result['transcripts']),
+        })
+    return parity
+
+def run_benchmark(backends: Sequence[ModelBackend], audio_files: Sequence[str] = (), texts: Sequence[str] = (),
+                  runs: int = 1) -> Dict:
+    import librosa
+
+    waveforms = [librosa.load(path, sr=SAMPLING_RATE, mono=True)[0] for path in audio_files]
+    results = [benchmark_backend(backend, waveforms, texts, runs=runs) for backend in backends]
+    return {'results': results, 'parity': compare_backends(results)}
+
+def benchmark_pipeline(backend: ModelBackend, audio_files: Sequence[str], workers: int, queue_size: int,
+                       config=None) -> Dict:
+    """
+    원본 파일(혼합 형식) 디렉토리의 처리량을 순차 처리와 파이프라인으로 비교합니다.
+    순차 처리는 디코딩 → VAD → 특징 추출 → 인식을 한 스레드에서 파일마다 반복합니다.
+    """
+    from .audio_pipeline import AudioPipeline, preprocess_audio
+    from .audio_preprocessing import get_vad, vad_enabled
+
+    backend.load()
+    vad = get_vad(config) if vad_enabled(config) else None
+    if audio_files:
+        preprocess_audio(audio_files[0], backend, vad)  # 워밍업 (디코더/특징 추출기 초기화)
+
+    started = time.perf_counter()
+    sequential_transcripts, audio_seconds = [], 0.0
+    for path in audio_files:
+        preprocessed, features = preprocess_audio(path, backend, vad)
+        audio_seconds += preprocessed.audio_seconds
+        sequential_transcripts.append(backend.transcribe_features(features) if features is not None else None)
+    sequential_seconds = time.perf_counter() - started
+
+    with AudioPipeline(backend, workers=workers, queue_size=queue_size, config=config) as pipeline:
+        # 워커 프로세스 시작 비용은 일괄 작업 전체에서 한 번이므로 측정에서 제외
+        started = time.perf_counter()
+        pipelined_transcripts = [result.transcription.text
+                                 for _, result in pipeline.run((path, path) for path in audio_files)]
+        pipelined_seconds = time.perf_counter() - started
+
+    def throughput(seconds):
+        return {
+            'seconds': round(seconds, 2),
+            'files_per_second': round(len(audio_files) / seconds, 2) if seconds else None,
+            'audio_seconds_per_second': round(audio_seconds / seconds, 2) if seconds else None,
+        }
+
+    return {
+        'backend': backend.name,
+        'files': len(audio_files),
+        'formats': sorted({os.path.splitext(path)[1].lower() for path in audio_files}),
+        'audio_seconds': round(audio_seconds, 1),
+        'workers': pipeline.workers,
+        'queue_size': pipeline.queue_size,
+        'sequential': throughput(sequential_seconds),
+        'pipelined': throughput(pipelined_seconds),
+        'speedup': round(sequential_seconds / pipelined_seconds, 2) if pipelined_seconds else None,
+        'transcript_exact_match': _agreement(sequential_transcripts, pipelined_transcripts),
+    }
+
+def benchmark_decoding_profiles(backend: ModelBackend, fixtures: Sequence[Tuple[str, Optional[str]]],
+                                profiles: Sequence[str], runs: int = 1) -> Dict:
+    """
+    디코딩 프로필별 음성 인식 지연 시간과 정답 전사 대비 WER/CER을 측정합니다.
+    각 프로필은 서비스와 같은 generate 인자(언어/작업 고정, 빔 크기, 음성 길이 기준 토큰 상한)로 실행됩니다.
+    """
+    import librosa
+    from .ai_service import generate_kwargs_for
+
+    waveforms = [librosa.load(path, sr=SAMPLING_RATE, mono=True)[0] for path, _ in fixtures]
+    audio_seconds = sum(len(w) for w in waveforms) / SAMPLING_RATE
+    scored = [i for i, (_, reference) in enumerate(fixtures) if reference is not None]
+    backend.load()
+
+    results = []
+    for profile in profiles:
+        kwargs = [generate_kwargs_for(len(waveform) / SAMPLING_RATE, profile=profile) for waveform in waveforms]
+        if waveforms:
+            backend.transcribe(waveforms[0], kwargs[0])  # 워밍업
+
+        latency, transcripts = [], []
+        for run in range(runs):
+            for waveform, generate_kwargs in zip(waveforms, kwargs):
+                started = time.perf_counter()
+                transcript = backend.transcribe(waveform, generate_kwargs)
+                latency.append(time.perf_counter() - started)
+                if run == 0:
+                    transcripts.append(transcript)
+
+        references = [fixtures[i][1] for i in scored]
+        hypotheses = [transcripts[i] for i in scored]
+        results.append({
+            'profile': profile,
+            'num_beams': kwargs[0]['num_beams'] if kwargs else None,
+            'transcribe': _latency_summary(latency),
+            'real_time_factor': round(sum(latency) / runs / audio_seconds, 4) if audio_seconds else None,
+            'wer': error_rate(references, hypotheses, 'word'),
+            'cer': error_rate(references, hypotheses, 'char'),
+            'transcripts': transcripts,
+        })
+
+    return {
+        'backend': backend.name,
+        'files': len(fixtures),
+        'scored_files': len(scored),
+        'audio_seconds': round(audio_seconds, 1),
+        'results': results,
+    }
+
+def _token_count(backend: ModelBackend, text: Optional[str]) -> int:
+    tokenizer = getattr(getattr(backend, 'whisper_processor', None), 'tokenizer', None)
+    if not text:
+        return 0
+    if tokenizer is None:
+        return len(text.split())
+    return len(tokenizer(text, add_special_tokens=False).input_ids)
+
+def benchmark_assisted_decoding(backend: ModelBackend, fixtures: Sequence[Tuple[str, Optional[str]]],
+                                profile: str = 'fast-triage', runs: int = 1) -> Dict:
+    """
+    같은 프로필로 보조(초안 모델) 디코딩 사용/미사용의 초당 토큰 수를 비교합니다.
+    보조 디코딩은 결과가 같아야 하므로 두 방식의 전사 완전 일치율을 함께 보고합니다.
+    """
+    import librosa
+    from .ai_service import generate_kwargs_for
+
+    backend.load()
+    if getattr(backend, 'draft_model', None) is None:
+        raise ValueError(f"보조 모델이 적재되지 않았습니다 ({backend.name} 백엔드)")
+    waveforms = [librosa.load(path, sr=SAMPLING_RATE, mono=True)[0] for path, _ in fixtures]
+    kwargs = [generate_kwargs_for(len(waveform) / SAMPLING_RATE, profile=profile) for waveform in waveforms]
+    if kwargs and kwargs[0]['num_beams'] != 1:
+        raise ValueError(f"보조 디코딩은 탐욕 디코딩 프로필에서만 사용합니다: {profile}")
+
+    modes = {}
+    for assisted in (False, True):
+        mode_kwargs = [dict(generate_kwargs, assisted=assisted) for generate_kwargs in kwargs]
+        if waveforms:
+            backend.transcribe(waveforms[0], mode_kwargs[0])  # 워밍업
+
+        latency, transcripts = [], []
+        for run in range(runs):
+            for waveform, generate_kwargs in zip(waveforms, mode_kwargs):
+                started = time.perf_counter()
+                transcript = backend.transcribe(waveform, generate_kwargs)
+                latency.append(time.perf_counter() - started)
+                if run == 0:
+                    transcripts.append(transcript)
+
+        tokens = sum(_token_count(backend, transcript) for transcript in transcripts)
+        modes['assisted' if assisted else 'baseline'] = {
+            'transcribe': _latency_summary(latency),
+            'tokens': tokens,
+            'tokens_per_second': round(tokens * runs / sum(latency), 2) if sum(latency) else None,
+            'transcripts': transcripts,
+        }
+
+    baseline, assisted = modes['baseline'], modes['assisted']
+    return {
+        'backend': backend.name,
+        'profile': profile,
+        'files': len(fixtures),
+        'audio_seconds': round(sum(len(w) for w in waveforms) / SAMPLING_RATE, 1),
+        'baseline': baseline,
+        'assisted': assisted,
+        'speedup': round(assisted['tokens_per_second'] / baseline['tokens_per_second'], 2)
+        if assisted['tokens_per_second'] and baseline['tokens_per_second'] else None,
+        'transcript_exact_match': _agreement(baseline['transcripts'], assisted['transcripts']),
+    }
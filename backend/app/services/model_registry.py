@@ -0,0 +1,298 @@
+# backend/app/services/model_registry.py
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+from flask import current_app, has_app_context
+from ..config import Config
+from ..utils.metrics import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = 'registry.json'
+VERIFIED_FILE = '.verified.json'  # 이전 버전이 스냅샷 디렉토리에 남긴 검증 스탬프 (스냅샷 파일 목록에서 제외)
+SNAPSHOT_PATTERNS = ('*.json', '*.safetensors', '*.txt', '*.model', 'merges.txt', 'vocab.*', '*.tiktoken')
+
+MODEL_VERIFY_SECONDS = Gauge('model_verify_seconds', '모델 파일 체크섬 검증 소요 시간(초)', ('model',))
+MODEL_VERIFY_FAILURES = Counter('model_verify_failures', '백그라운드 체크섬 검증에서 발견된 모델 파일 불일치 수', ('model',))
+
+class ModelRegistryError(Exception):
+    """레지스트리가 없거나 스냅샷 파일이 매니페스트와 다름"""
+    pass
+
+
+def _sha256_file(path: str, chunk_size: int = 4 * 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ModelSnapshot:
+    """고정된 리비전의 모델 스냅샷 하나 (레지스트리 디렉토리 기준 상대 경로)"""
+
+    def __init__(self, alias: str, repo_id: str, revision: str, path: str, files: Dict[str, str]):
+        self.alias = alias
+        self.repo_id = repo_id
+        self.revision = revision
+        self.path = path
+        self.files = files  # 상대 경로 -> SHA-256
+
+    @property
+    def version(self) -> str:
+        return f"{self.repo_id}@{self.revision[:12]}"
+
+    def to_dict(self) -> Dict:
+        return {'repo_id': self.repo_id, 'revision': self.revision, 'path': self.path, 'files': self.files}
+
+
+class ModelRegistry:
+    """
+    오프라인 모델 레지스트리
+
+    registry_dir/registry.json에 별칭(whisper, roberta, whisper_draft)별로 허브 저장소, 커밋 리비전, 파일별 SHA-256을 고정하고
+    스냅샷 파일은 registry_dir/<별칭>/<리비전>/ 아래에 둡니다.
+    서비스는 이 디렉토리에서만 모델을 적재하며(네트워크/허브 캐시 미사용), 적재 전에 체크섬을 검증합니다.
+    스냅샷은 네트워크가 되는 곳에서 `flask models snapshot`으로 만든 뒤 디렉토리째 반입합니다.
+    검증 스탬프는 state_dir(MODEL_VERIFY_STATE_DIR)에 기록하므로 레지스트리 디렉토리는 읽기 전용이어도 됩니다.
+    """
+
+    def __init__(self, registry_dir: str, state_dir: Optional[str] = None):
+        if state_dir is None:
+            config = current_app.config if has_app_context() else {}
+            state_dir = config.get('MODEL_VERIFY_STATE_DIR', Config.MODEL_VERIFY_STATE_DIR)
+        self.registry_dir = registry_dir
+        self.state_dir = state_dir
+        self.manifest_path = os.path.join(registry_dir, MANIFEST_FILE)
+        self._snapshots: Optional[Dict[str, ModelSnapshot]] = None
+        self._failures: Dict[str, str] = {}  # 별칭 -> 백그라운드 검증 실패 내용
+        self._background: Dict[str, threading.Thread] = {}
+        self._pending: Dict[str, List[Tuple[str, str]]] = {}  # 별칭 -> 아직 끝나지 않은 백그라운드 검증 대상
+        self._pid = None  # 백그라운드 검증 스레드를 시작한 프로세스 (fork 이후 자식에서 재시작)
+
+    def exists(self) -> bool:
+        return os.path.exists(self.manifest_path)
+
+    def snapshots(self) -> Dict[str, ModelSnapshot]:
+        if self._snapshots is None:
+            if not self.exists():
+                raise ModelRegistryError(f"모델 레지스트리가 없습니다: {self.manifest_path} ('flask models snapshot'으로 생성)")
+            with open(self.manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+            self._snapshots = {
+                alias: ModelSnapshot(alias, entry['repo_id'], entry['revision'], entry['path'], entry['files'])
+                for alias, entry in manifest.get('models', {}).items()
+            }
+        return self._snapshots
+
+    def get(self, alias: str) -> ModelSnapshot:
+        snapshot = self.snapshots().get(alias)
+        if snapshot is None:
+            raise ModelRegistryError(f"레지스트리에 '{alias}' 모델이 없습니다: {self.manifest_path}")
+        return snapshot
+
+    def path(self, alias: str) -> str:
+        return os.path.join(self.registry_dir, self.get(alias).path)
+
+    def versions(self) -> Dict[str, str]:
+        return {alias: snapshot.version for alias, snapshot in self.snapshots().items()}
+
+    # --- 검증 ---
+
+    def verify(self, alias: str, force: bool = False) -> float:
+        """
+        스냅샷 파일의 SHA-256을 매니페스트와 비교합니다 (적재 전 검증 소요 시간 반환).
+
+        마지막 검증 이후 크기/수정 시각/변경 시각(ctime)이 그대로인 파일은 적재를 막지 않도록 백그라운드에서
+        다시 해시하며, 불일치가 발견되면 이후 check()가 ModelRegistryError를 발생시킵니다.
+        force=True면 모든 파일을 그 자리에서 해시합니다.
+        """
+        snapshot = self.get(alias)
+        snapshot_dir = self.path(alias)
+        stamp_path = self._stamp_path(snapshot)
+        stamps = {} if force else self._read_stamps(stamp_path)
+
+        started = time.perf_counter()
+        new_stamps, deferred = {}, []
+        for relative_path, expected in snapshot.files.items():
+            file_path = os.path.join(snapshot_dir, relative_path)
+            try:
+                stat = os.stat(file_path)
+            except FileNotFoundError:
+                raise ModelRegistryError(f"모델 파일이 없습니다: {file_path}")
+            stamp = [stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns, expected]
+            if stamps.get(relative_path) == stamp:
+                deferred.append((file_path, expected))
+            elif _sha256_file(file_path) != expected:
+                raise ModelRegistryError(f"모델 파일 체크섬 불일치: {file_path}")
+            new_stamps[relative_path] = stamp
+        elapsed = time.perf_counter() - started
+
+        self._failures.pop(alias, None)
+        if new_stamps != stamps:
+            self._write_stamps(stamp_path, new_stamps)
+        if deferred:
+            self._verify_in_background(alias, deferred)
+        MODEL_VERIFY_SECONDS.labels(model=alias).set(elapsed)
+        logger.info(f"모델 체크섬 검증 완료: {snapshot.version} ({len(snapshot.files) - len(deferred)}개 파일, "
+                    f"{elapsed:.2f}s, 백그라운드 {len(deferred)}개)")
+        return elapsed
+
+    def check(self):
+        """백그라운드 검증에서 불일치가 발견되었으면 ModelRegistryError를 발생시킵니다 (추론 전 호출)."""
+        self.resume_background_checks()
+        if self._failures:
+            raise ModelRegistryError('; '.join(self._failures.values()))
+
+    def wait_verified(self, timeout: Optional[float] = None):
+        """진행 중인 백그라운드 검증이 끝날 때까지 기다린 뒤 check()합니다."""
+        self.resume_background_checks()
+        for thread in list(self._background.values()):
+            thread.join(timeout)
+        self.check()
+
+    def resume_background_checks(self):
+        """
+        fork된 자식 프로세스에서 끝나지 않은 백그라운드 검증을 다시 시작합니다.
+        (preload로 마스터에서 모델을 적재하면 검증 스레드는 fork되지 않으므로 워커마다 다시 해시)
+        """
+        if self._pid is None or self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        for alias, files in list(self._pending.items()):
+            logger.info(f"fork 이후 백그라운드 체크섬 검증 재시작: {alias} ({len(files)}개 파일)")
+            self._verify_in_background(alias, files)
+
+    def _verify_in_background(self, alias: str, files: List[Tuple[str, str]]):
+        def run():
+            try:
+                for file_path, expected in files:
+                    try:
+                        matches = _sha256_file(file_path) == expected
+                    except OSError as e:
+                        logger.error(f"모델 파일 읽기 실패: {file_path} ({e})")
+                        matches = False
+                    if not matches:
+                        self._failures[alias] = f"모델 파일 체크섬 불일치: {file_path}"
+                        MODEL_VERIFY_FAILURES.labels(model=alias).inc()
+                        logger.critical(f"백그라운드 체크섬 검증 실패, '{alias}' 모델로 추론하지 않습니다: {file_path}")
+                        return
+            finally:
+                if self._pending.get(alias) is files:
+                    del self._pending[alias]
+
+        self._pid = os.getpid()
+        self._pending[alias] = files
+        thread = threading.Thread(target=run, name=f'model-verify-{alias}', daemon=True)
+        self._background[alias] = thread
+        thread.start()
+
+    def _stamp_path(self, snapshot: ModelSnapshot) -> str:
+        registry_key = hashlib.sha256(os.path.abspath(self.registry_dir).encode('utf-8')).hexdigest()[:12]
+        return os.path.join(self.state_dir, f"{registry_key}_{snapshot.alias}_{snapshot.revision[:12]}.json")
+
+    def _read_stamps(self, stamp_path: str) -> Dict:
+        try:
+            with open(stamp_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_stamps(self, stamp_path: str, stamps: Dict):
+        """검증 스탬프를 기록합니다 (기록하지 못하면 다음 시작 시 다시 해시할 뿐이므로 무시)."""
+        try:
+            os.makedirs(self.state_dir, exist_ok=True)
+            tmp_path = stamp_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(stamps, f)
+            os.replace(tmp_path, stamp_path)
+        except OSError as e:
+            logger.warning(f"모델 검증 스탬프 기록 실패: {stamp_path} ({e})")
+
+    # --- 스냅샷 생성 (네트워크 필요) ---
+
+    def snapshot(self, alias: str, repo_id: str, revision: str = 'main') -> ModelSnapshot:
+        """
+        허브 저장소의 리비전을 커밋 해시로 고정하여 내려받고 매니페스트에 등록합니다.
+        safetensors 가중치가 없는 저장소는 내려받은 뒤 safetensors로 변환합니다.
+        """
+        from huggingface_hub import HfApi, snapshot_download
+
+        commit = HfApi().model_info(repo_id, revision=revision).sha
+        relative_dir = os.path.join(alias, commit)
+        target_dir = os.path.join(self.registry_dir, relative_dir)
+        logger.info(f"모델 스냅샷 다운로드: {repo_id}@{commit} -> {target_dir}")
+        snapshot_download(repo_id, revision=commit, local_dir=target_dir,
+                          allow_patterns=list(SNAPSHOT_PATTERNS) + ['*.bin'])
+        _ensure_safetensors(alias, target_dir)
+
+        files = {}
+        for root, _, names in os.walk(target_dir):
+            for name in names:
+                file_path = os.path.join(root, name)
+                relative_path = os.path.relpath(file_path, target_dir)
+                if name == VERIFIED_FILE or relative_path.startswith('.cache'):
+                    continue
+                files[relative_path] = _sha256_file(file_path)
+
+        snapshot = ModelSnapshot(alias, repo_id, commit, relative_dir, dict(sorted(files.items())))
+        snapshots = dict(self.snapshots()) if self.exists() else {}
+        snapshots[alias] = snapshot
+        self._write_manifest(snapshots)
+        return snapshot
+
+    def _write_manifest(self, snapshots: Dict[str, ModelSnapshot]):
+        os.makedirs(self.registry_dir, exist_ok=True)
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'models': {alias: s.to_dict() for alias, s in sorted(snapshots.items())}},
+                      f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+        self._snapshots = snapshots
+
+
+def _ensure_safetensors(alias: str, target_dir: str):
+    """PyTorch pickle(*.bin) 가중치만 있으면 safetensors로 변환하고 원본은 삭제합니다 (메모리 맵 적재용)."""
+    names = os.listdir(target_dir)
+    if any(name.endswith('.safetensors') for name in names):
+        for name in names:
+            if name.endswith('.bin'):
+                os.remove(os.path.join(target_dir, name))
+        return
+    if not any(name.endswith('.bin') for name in names):
+        raise ModelRegistryError(f"가중치 파일이 없습니다: {target_dir}")
+
+    from transformers import WhisperForConditionalGeneration, AutoModelForSequenceClassification
+
+    model_class = WhisperForConditionalGeneration if alias.startswith('whisper') else AutoModelForSequenceClassification
+    model = model_class.from_pretrained(target_dir, local_files_only=True)
+    converted_dir = target_dir + '.converted'
+    model.save_pretrained(converted_dir, safe_serialization=True)
+    for name in names:
+        if name.endswith('.bin'):
+            os.remove(os.path.join(target_dir, name))
+    for name in os.listdir(converted_dir):
+        if name.endswith('.safetensors') or name.endswith('.safetensors.index.json'):
+            os.replace(os.path.join(converted_dir, name), os.path.join(target_dir, name))
+    shutil.rmtree(converted_dir)
+    logger.info(f"safetensors로 변환: {target_dir}")
+
+
+def registry_from_config(config=None) -> Optional[ModelRegistry]:
+    """
+    설정의 모델 레지스트리를 반환합니다.
+    레지스트리가 없으면 MODEL_REGISTRY_REQUIRED일 때 오류, 아니면 None(허브 이름으로 적재)을 반환합니다.
+    """
+    config = config if config is not None else (current_app.config if has_app_context() else {})
+    registry = ModelRegistry(config.get('MODEL_REGISTRY_DIR', Config.MODEL_REGISTRY_DIR),
+                             config.get('MODEL_VERIFY_STATE_DIR', Config.MODEL_VERIFY_STATE_DIR))
+    if registry.exists():
+        return registry
+    if config.get('MODEL_REGISTRY_REQUIRED', Config.MODEL_REGISTRY_REQUIRED):
+        raise ModelRegistryError(f"모델 레지스트리가 없습니다: {registry.manifest_path} ('flask models snapshot'으로 생성)")
+    return None
@@ -1,11 +1,19 @@
 from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
-from app.models import ConsultationReport
+from sqlalchemy.orm import Session, joinedload
+from app.models import ConsultationReport, ReportSearchToken
 from app.utils.hybrid_encryption import HybridEncryption
+from app.utils.blind_index import get_blind_index
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
+def _plain_value(value):
+    """암호화 필드 값 비교용 정규화 (빈 문자열은 None, 나이는 문자열로 저장되므로 문자열로 비교)"""
+    if value is None or value == '':
+        return None
+    return str(value)
+
 class ReportService:
     def __init__(self):
         self.hybrid_encryption = HybridEncryption()
@@ -72,13 +80,21 @@ class ReportService:
             if not report:
                 return None
                 
-            # 필드 업데이트
+            # 현재 값과 비교하기 위해 먼저 복호화 (DEK는 report._dek에 남아 재암호화에 재사용)
+            if any(key in ConsultationReport.ENCRYPTED_FIELDS for key in report_data):
+                report.decrypt_fields(self.hybrid_encryption)
+
+            # 평문 컬럼과 암호화 필드를 분리하여 업데이트 (암호화 필드는 값이 바뀐 것만)
+            encrypted_changes = {}
             for key, value in report_data.items():
-                if hasattr(report, key):
+                if key in ConsultationReport.ENCRYPTED_FIELDS:
+                    if _plain_value(value) != _plain_value(getattr(report, key)):
+                        encrypted_changes[key] = value
+                elif hasattr(report, key):
                     setattr(report, key, value)
             
-            # 필드 암호화
-            report.encrypt_fields(self.hybrid_encryption)
+            # 변경된 필드만 기존 DEK로 재암호화 (DEK 재생성/재래핑 없음)
+            report.update_encrypted_fields(self.hybrid_encryption, encrypted_changes)
             
             db.commit()
             db.refresh(report)
@@ -105,18 +121,81 @@ class ReportService:
             logger.error(f"소견서 삭제 실패: {str(e)}")
             raise
 
-    def search_reports(self, db: Session, query: str) -> List[ConsultationReport]:
-        """소견서 검색 (암호화된 필드는 검색에서 제외)"""
+    def search_reports(self, db: Session, query: str, field: Optional[str] = None,
+                       exact: bool = False, counselor_id: Optional[int] = None,
+                       limit: int = 50) -> List[ConsultationReport]:
+        """
+        블라인드 인덱스로 소견서 검색
+
+        검색어를 토큰으로 변환해 인덱스 조회로 후보를 찾고, 일치한 행만 복호화합니다.
+        field를 지정하지 않으면 숫자/하이픈만으로 된 검색어는 전화번호, 그 외는 이름으로 검색합니다.
+        """
         try:
-            # 암호화되지 않은 필드로만 검색
-            reports = db.query(ConsultationReport).filter(
-                ConsultationReport.id.ilike(f"%{query}%")
-            ).all()
-            
+            if field is None:
+                field = 'phone_number' if re.fullmatch(r'[\d\-\s]+', query.strip()) else 'client_name'
+            if field not in ('client_name', 'phone_number'):
+                raise ValueError(f"검색할 수 없는 필드입니다: {field}")
+
+            blind_index = get_blind_index()
+            if exact:
+                token = blind_index.exact_token(field, query)
+                if token is None:
+                    return []
+                column = (ConsultationReport.client_name_bidx if field == 'client_name'
+                          else ConsultationReport.phone_number_bidx)
+                report_query = db.query(ConsultationReport).filter(column == token)
+            else:
+                token = blind_index.prefix_token(field, query)
+                if token is None:
+                    return []
+                matching_ids = db.query(ReportSearchToken.report_id).filter(
+                    ReportSearchToken.field == field,
+                    ReportSearchToken.token == token
+                )
+                report_query = db.query(ConsultationReport).filter(ConsultationReport.id.in_(matching_ids))
+
+            if counselor_id is not None:
+                report_query = report_query.filter(ConsultationReport.counselor_id == counselor_id)
+
+            reports = report_query.options(joinedload(ConsultationReport.originating_call))\
+                                  .order_by(ConsultationReport.created_at.desc()).limit(limit).all()
             for report in reports:
                 report.decrypt_fields(self.hybrid_encryption)
             return reports
             
         except Exception as e:
             logger.error(f"소견서 검색 실패: {str(e)}")
-            raise 
\ No newline at end of file
+            raise
+
+    def backfill_search_index(self, db: Session, batch_size: int = 500) -> int:
+        """
+        기존 소견서의 블라인드 인덱스를 ID 순 배치로 다시 계산합니다.
+        DEK나 이름을 복호화하지 못한 소견서는 기존 토큰을 지우지 않도록 건너뜁니다.
+        """
+        processed = 0
+        skipped = 0
+        last_id = 0
+        while True:
+            reports = db.query(ConsultationReport).filter(
+                ConsultationReport.id > last_id
+            ).order_by(ConsultationReport.id).limit(batch_size).all()
+            if not reports:
+                if skipped:
+                    logger.warning(f"복호화할 수 없어 검색 인덱스를 갱신하지 않은 소견서: {skipped}건")
+                return processed
+
+            for report in reports:
+                try:
+                    report.decrypt_fields(self.hybrid_encryption)
+                    # decrypt_fields는 실패해도 예외 없이 필드를 비워 두므로, 그대로 갱신하면 토큰이 삭제됨
+                    if report._dek is None or (report.encrypted_client_name and report.client_name is None):
+                        logger.error(f"소견서 {report.id} 복호화 실패로 검색 인덱스 갱신을 건너뜁니다.")
+                        skipped += 1
+                        continue
+                    report.refresh_search_index()
+                    processed += 1
+                except Exception as e:
+                    logger.error(f"소견서 {report.id} 검색 인덱스 생성 실패: {e}")
+            last_id = reports[-1].id
+            db.commit()
+            db.expunge_all()
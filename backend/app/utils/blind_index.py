@@ -0,0 +1,110 @@
+# backend/app/utils/blind_index.py
+import os
+import hmac
+import hashlib
+import threading
+import unicodedata
+import logging
+from typing import List, Optional
+from flask import current_app, has_app_context
+
+logger = logging.getLogger(__name__)
+
+class BlindIndex:
+    """
+    암호화된 필드 검색을 위한 키 기반 HMAC 블라인드 인덱스
+
+    평문은 정규화한 뒤 HMAC-SHA256으로 토큰화되며, 접두어 검색을 위해
+    정규화된 값의 각 접두어에 대한 토큰도 생성합니다.
+
+    HMAC 키(blind_index.key 또는 BLIND_INDEX_KEY)는 시스템 키 교체(keys rotate) 대상이 아닙니다.
+    이 키를 바꾸려면 새 키를 설정한 뒤 search backfill로 모든 토큰을 다시 계산해야 합니다.
+    """
+
+    TOKEN_BYTES = 16      # 토큰 길이 (hex 32자)
+    MAX_PREFIX_LENGTH = 20
+    MIN_NAME_PREFIX = 2   # 한 글자 이름 토큰은 성씨 빈도로 추측 가능하므로 허용하지 않음
+
+    def __init__(self, key: bytes, name_min_prefix: int = 2, phone_min_prefix: int = 3):
+        if len(key) < 32:
+            raise ValueError("블라인드 인덱스 키는 32바이트 이상이어야 합니다.")
+        if name_min_prefix < self.MIN_NAME_PREFIX:
+            raise ValueError(f"이름 최소 접두어 길이는 {self.MIN_NAME_PREFIX} 이상이어야 합니다.")
+        self._key = key
+        self.min_prefix = {
+            'client_name': name_min_prefix,
+            'phone_number': phone_min_prefix,
+        }
+
+    @staticmethod
+    def normalize(field: str, value) -> str:
+        """필드별 정규화 (이름: NFKC + 소문자 + 공백 제거, 전화번호: 숫자만)"""
+        if value is None:
+            return ''
+        text = unicodedata.normalize('NFKC', str(value))
+        if field == 'phone_number':
+            return ''.join(c for c in text if c.isdigit())
+        return ''.join(text.casefold().split())
+
+    def _hmac(self, kind: str, field: str, normalized: str) -> str:
+        message = f"{kind}\x00{field}\x00{normalized}".encode('utf-8')
+        return hmac.new(self._key, message, hashlib.sha256).digest()[:self.TOKEN_BYTES].hex()
+
+    def exact_token(self, field: str, value) -> Optional[str]:
+        """정확히 일치하는 값에 대한 토큰"""
+        normalized = self.normalize(field, value)
+        if not normalized:
+            return None
+        return self._hmac('exact', field, normalized)
+
+    def prefix_token(self, field: str, value) -> Optional[str]:
+        """검색어(접두어)에 대한 토큰 (최소 접두어 길이 미만이면 None)"""
+        normalized = self.normalize(field, value)[:self.MAX_PREFIX_LENGTH]
+        if len(normalized) < self.min_prefix.get(field, 1):
+            return None
+        return self._hmac('prefix', field, normalized)
+
+    def prefix_tokens(self, field: str, value) -> List[str]:
+        """저장 시 생성하는 모든 접두어 토큰"""
+        normalized = self.normalize(field, value)[:self.MAX_PREFIX_LENGTH]
+        start = self.min_prefix.get(field, 1)
+        return [self._hmac('prefix', field, normalized[:length])
+                for length in range(start, len(normalized) + 1)]
+
+
+_blind_index: Optional[BlindIndex] = None
+_blind_index_lock = threading.Lock()
+
+def _load_or_generate_key(keys_dir: str) -> bytes:
+    """키 디렉토리의 블라인드 인덱스 키를 로드하거나 생성"""
+    key_path = os.path.join(keys_dir, 'blind_index.key')
+    if os.path.exists(key_path):
+        with open(key_path, 'rb') as f:
+            return f.read()
+    os.makedirs(keys_dir, exist_ok=True)
+    key = os.urandom(32)
+    with open(key_path, 'wb') as f:
+        f.write(key)
+    logger.info("새 블라인드 인덱스 키를 생성했습니다.")
+    return key
+
+def get_blind_index() -> BlindIndex:
+    """프로세스 단위 BlindIndex 인스턴스를 반환합니다."""
+    global _blind_index
+    if _blind_index is None:
+        with _blind_index_lock:
+            if _blind_index is None:
+                from ..config import Config
+                config = current_app.config if has_app_context() else {}
+                key_hex = config.get('BLIND_INDEX_KEY', Config.BLIND_INDEX_KEY)
+                if key_hex:
+                    key = bytes.fromhex(key_hex)
+                else:
+                    from .hybrid_encryption import HybridEncryption
+                    key = _load_or_generate_key(HybridEncryption.DEFAULT_KEYS_DIR)
+                _blind_index = BlindIndex(
+                    key,
+                    name_min_prefix=config.get('BLIND_INDEX_NAME_MIN_PREFIX', Config.BLIND_INDEX_NAME_MIN_PREFIX),
+                    phone_min_prefix=config.get('BLIND_INDEX_PHONE_MIN_PREFIX', Config.BLIND_INDEX_PHONE_MIN_PREFIX)
+                )
+    return _blind_index
@@ -0,0 +1,89 @@
+# backend/app/utils/circuit_breaker.py
+import time
+import logging
+import threading
+from typing import Optional
+from .metrics import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+HALF_OPEN = 'half_open'
+OPEN = 'open'
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+CIRCUIT_STATE = Gauge(
+    'circuit_breaker_state', '차단기 상태 (0 = closed, 1 = half_open, 2 = open)', ('name',))
+CIRCUIT_FAILURES = Counter(
+    'circuit_breaker_failures', '차단기가 기록한 실패 수', ('name', 'kind'))
+CIRCUIT_REJECTED = Counter(
+    'circuit_breaker_rejected_calls', '차단기가 열려 실행하지 않은 호출 수', ('name',))
+CIRCUIT_TRANSITIONS = Counter(
+    'circuit_breaker_transitions', '차단기 상태 전환 수', ('name', 'state'))
+
+class CircuitBreaker:
+    """
+    연속 실패 차단기
+
+    - closed: 호출을 실행하며, 연속 실패가 failure_threshold에 도달하면 open으로 전환합니다.
+    - open: reset_timeout 동안 호출을 거절합니다 (호출자는 작업을 나중에 재시도하도록 처리).
+    - half_open: reset_timeout이 지나면 시험 호출 하나만 허용하여, 성공하면 closed, 실패하면 다시 open이 됩니다.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        CIRCUIT_STATE.labels(name=name).set(_STATE_VALUES[CLOSED])
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def _transition(self, state: str):
+        if state == self._state:
+            return
+        logger.warning(f"차단기 '{self.name}' 상태 전환: {self._state} -> {state}")
+        self._state = state
+        CIRCUIT_STATE.labels(name=self.name).set(_STATE_VALUES[state])
+        CIRCUIT_TRANSITIONS.labels(name=self.name, state=state).inc()
+
+    def allow(self, now: Optional[float] = None) -> bool:
+        """호출을 실행해도 되는지 확인합니다 (허용하면 결과를 record_success/record_failure로 알려야 함)."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self._state == OPEN and now - self._opened_at >= self.reset_timeout:
+                self._transition(HALF_OPEN)
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+        CIRCUIT_REJECTED.labels(name=self.name).inc()
+        return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._probe_in_flight = False
+            self._transition(CLOSED)
+
+    def record_failure(self, kind: str = 'error', now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        CIRCUIT_FAILURES.labels(name=self.name, kind=kind).inc()
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = now
+                self._probe_in_flight = False
+                self._transition(OPEN)
+
+    def stats(self):
+        with self._lock:
+            return {'name': self.name, 'state': self._state, 'consecutive_failures': self._failures}
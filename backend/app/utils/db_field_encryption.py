@@ -6,8 +6,20 @@ import logging
 logger = logging.getLogger(__name__)
 
 class DBFieldEncryption:
-    def __init__(self):
-        self.hybrid_encryption = HybridEncryption()
+    def __init__(self, key_service=None):
+        """
+        Args:
+            key_service: KEK 계층 키 서비스 (None이면 프로세스 공용 KeyService 사용)
+        """
+        self._key_service = key_service
+        self.hybrid_encryption = key_service.hybrid_encryption if key_service else HybridEncryption()
+
+    @property
+    def key_service(self):
+        if self._key_service is None:
+            from ..services.key_service import get_key_service
+            self._key_service = get_key_service()
+        return self._key_service
 
     def _serialize_field_value(self, value: Any) -> bytes:
         """필드 값을 바이트로 직렬화"""
@@ -50,15 +62,11 @@ class DBFieldEncryption:
         Returns:
             Tuple[Dict[str, bytes], Dict[str, bytes]]: 
                 - 암호화된 필드값과 nonce를 포함하는 딕셔너리
-                - 암호화된 DEK 정보를 포함하는 딕셔너리
+                - 암호화된 DEK 정보를 포함하는 딕셔너리 (에폭 ID와 KEK로 래핑된 DEK)
         """
         try:
-            # DEK 생성
-            dek = self.hybrid_encryption._generate_dek()
-            
-            # DEK를 하이브리드 방식으로 암호화
-            encrypted_dek_trad = self.hybrid_encryption._encrypt_dek_trad(dek)
-            pqc_kem_ciphertext, encrypted_dek_pqc_package, pqc_secret_key = self.hybrid_encryption._encrypt_dek_pqc(dek)
+            # DEK 생성 및 현재 에폭 KEK로 래핑
+            dek, key_epoch_id, wrapped_dek = self.key_service.generate_dek()
             
             # 암호화된 필드값과 nonce를 저장할 딕셔너리
             encrypted_fields = {}
@@ -81,10 +89,8 @@ class DBFieldEncryption:
             
             # DEK 정보 저장
             dek_info = {
-                "dek_trad_encrypted": encrypted_dek_trad,
-                "dek_pqc_kem_ciphertext": pqc_kem_ciphertext,
-                "dek_pqc_package": encrypted_dek_pqc_package,
-                "dek_pqc_secret_key": pqc_secret_key
+                "key_epoch_id": key_epoch_id,
+                "wrapped_dek": wrapped_dek
             }
             
             return encrypted_fields, nonces, dek_info
@@ -110,37 +116,17 @@ class DBFieldEncryption:
             Dict[str, Any]: 복호화된 필드값을 포함하는 딕셔너리
         """
         try:
-            # DEK 복호화
-            dek_from_trad = None
-            dek_from_pqc = None
-            
-            # 전통 방식으로 DEK 복호화 시도
-            try:
-                dek_from_trad = self.hybrid_encryption._decrypt_dek_trad(dek_info["dek_trad_encrypted"])
-            except Exception as e:
-                logger.warning(f"전통 방식 DEK 복호화 실패: {str(e)}")
-
-            # PQC 방식으로 DEK 복호화 시도
-            try:
-                dek_from_pqc = self.hybrid_encryption._decrypt_dek_pqc(
-                    dek_info["dek_pqc_kem_ciphertext"],
-                    dek_info["dek_pqc_package"],
-                    dek_info["dek_pqc_secret_key"]
-                )
-            except Exception as e:
-                logger.warning(f"PQC 방식 DEK 복호화 실패: {str(e)}")
-
-            # DEK 검증 및 선택
-            if dek_from_trad and dek_from_pqc:
-                if dek_from_trad != dek_from_pqc:
-                    raise ValueError("DEK 불일치: 전통 방식과 PQC 방식의 DEK가 다릅니다.")
-                final_dek = dek_from_trad
-            elif dek_from_trad:
-                final_dek = dek_from_trad
-            elif dek_from_pqc:
-                final_dek = dek_from_pqc
+            if "key_epoch_id" in dek_info:
+                # KEK 계층 형식
+                final_dek = self.key_service.unwrap_dek(dek_info["key_epoch_id"], dek_info["wrapped_dek"])
             else:
-                raise ValueError("모든 DEK 복호화 방식이 실패했습니다.")
+                # 레거시 형식 (레코드별 RSA/PQC 래핑)
+                final_dek = self.hybrid_encryption._recover_dek(
+                    dek_info.get("dek_trad_encrypted"),
+                    dek_info.get("dek_pqc_kem_ciphertext"),
+                    dek_info.get("dek_pqc_package"),
+                    dek_info.get("dek_pqc_secret_key")
+                )
 
             # 각 필드 복호화
             decrypted_fields = {}
@@ -0,0 +1,43 @@
+# backend/app/utils/deadline.py
+import time
+from typing import Optional
+
+class DeadlineExceeded(Exception):
+    """작업 단계가 제한 시간 안에 끝나지 않음"""
+
+    def __init__(self, stage: str, message: Optional[str] = None):
+        super().__init__(message or f"{stage} 단계 제한 시간 초과")
+        self.stage = stage
+
+
+class Deadline:
+    """
+    한 작업(통화 하나의 분석 등)에 주어진 전체 제한 시간
+
+    각 단계는 시작 전에 check()로 남은 시간을 확인하고, 단계별 제한은 cap()으로 남은 시간 이하로 줄입니다.
+    seconds가 None이면 제한이 없습니다.
+    """
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.seconds = seconds
+        self.expires_at = None if seconds is None else time.monotonic() + seconds
+
+    def remaining(self) -> Optional[float]:
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def check(self, stage: str):
+        """남은 시간이 없으면 DeadlineExceeded를 발생시킵니다."""
+        if self.expired():
+            raise DeadlineExceeded(stage)
+
+    def cap(self, seconds: Optional[float]) -> Optional[float]:
+        """단계별 제한 시간과 남은 시간 중 작은 값 (둘 다 없으면 None)"""
+        remaining = self.remaining()
+        if seconds is None:
+            return remaining
+        return seconds if remaining is None else min(seconds, remaining)
@@ -0,0 +1,96 @@
+# backend/app/utils/envelope.py
+import os
+import struct
+from typing import BinaryIO, Optional, Tuple
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+# 암호화 음성 파일 컨테이너 형식 (KEK 계층)
+#   magic(4) | key_epoch_id(8) | wrapped_dek 길이(2) | wrapped_dek | nonce(12) | AES-GCM 암호문(+태그)
+ENVELOPE_MAGIC = b'CCE1'
+_HEADER = struct.Struct('>4sQH')
+NONCE_SIZE = 12
+TAG_SIZE = 16
+
+# 레거시 컨테이너 형식 (레코드별 RSA/PQC 래핑)
+#   nonce(12) | 암호문 | RSA-3072 DEK(384) | Kyber512 KEM 암호문(768) | PQC DEK 패키지(60) | Kyber512 개인키(1632)
+LEGACY_RSA_SIZE = 384
+LEGACY_KEM_SIZE = 768
+LEGACY_PQC_PACKAGE_SIZE = 60
+LEGACY_SECRET_KEY_SIZE = 1632
+
+def pack_envelope_header(key_epoch_id: int, wrapped_dek: bytes) -> bytes:
+    """컨테이너 헤더(매직, 에폭 ID, 래핑된 DEK)를 생성합니다."""
+    return _HEADER.pack(ENVELOPE_MAGIC, key_epoch_id, len(wrapped_dek)) + wrapped_dek
+
+class EnvelopeWriter:
+    """
+    KEK 계층 컨테이너를 청크 단위로 기록합니다 (스트리밍 AES-GCM, 마지막에 16바이트 태그).
+    AESGCM.encrypt의 출력(암호문 + 태그)과 같은 형식이므로 parse_envelope/decrypt_blob으로 복호화됩니다.
+    """
+
+    def __init__(self, file: BinaryIO, key_epoch_id: int, wrapped_dek: bytes, dek: bytes):
+        nonce = os.urandom(NONCE_SIZE)
+        self._file = file
+        self._encryptor = Cipher(algorithms.AES(dek), modes.GCM(nonce)).encryptor()
+        file.write(pack_envelope_header(key_epoch_id, wrapped_dek))
+        file.write(nonce)
+
+    def update(self, chunk: bytes):
+        self._file.write(self._encryptor.update(chunk))
+
+    def finalize(self):
+        self._file.write(self._encryptor.finalize())
+        self._file.write(self._encryptor.tag)
+
+
+def is_envelope(data: bytes) -> bool:
+    return data[:len(ENVELOPE_MAGIC)] == ENVELOPE_MAGIC
+
+def parse_envelope(data: bytes) -> Tuple[int, bytes, bytes, bytes]:
+    """
+    새 형식 컨테이너를 (에폭 ID, 래핑된 DEK, nonce, 암호문)으로 분리합니다.
+    매직이 다르거나 헤더/nonce/태그가 잘린 경우 ValueError를 발생시킵니다.
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("컨테이너 헤더가 잘렸습니다.")
+    magic, key_epoch_id, wrapped_len = _HEADER.unpack_from(data)
+    if magic != ENVELOPE_MAGIC:
+        raise ValueError("알 수 없는 컨테이너 형식입니다.")
+    if len(data) < _HEADER.size + wrapped_len + NONCE_SIZE + TAG_SIZE:
+        raise ValueError("컨테이너가 잘렸습니다.")
+    offset = _HEADER.size
+    wrapped_dek = data[offset:offset + wrapped_len]
+    offset += wrapped_len
+    nonce = data[offset:offset + NONCE_SIZE]
+    ciphertext = data[offset + NONCE_SIZE:]
+    return key_epoch_id, wrapped_dek, nonce, ciphertext
+
+def parse_legacy_audio_container(data: bytes) -> Optional[Tuple[bytes, bytes, bytes, bytes, bytes, bytes]]:
+    """
+    레거시 컨테이너를 decrypt_file_hybrid 인자 순서로 분리합니다.
+    새 형식 컨테이너인 경우 None을 반환합니다.
+    """
+    if is_envelope(data):
+        return None
+
+    nonce_for_file = data[:NONCE_SIZE]
+    remaining_data = data[NONCE_SIZE:]
+
+    # 저장 순서의 역순으로 끝에서부터 잘라냄
+    pqc_secret_key = remaining_data[-LEGACY_SECRET_KEY_SIZE:]
+    remaining_data = remaining_data[:-LEGACY_SECRET_KEY_SIZE]
+
+    encrypted_dek_pqc_package = remaining_data[-LEGACY_PQC_PACKAGE_SIZE:]
+    remaining_data = remaining_data[:-LEGACY_PQC_PACKAGE_SIZE]
+
+    pqc_kem_ciphertext = remaining_data[-LEGACY_KEM_SIZE:]
+    remaining_data = remaining_data[:-LEGACY_KEM_SIZE]
+
+    encrypted_dek_trad = remaining_data[-LEGACY_RSA_SIZE:]
+    encrypted_file_content = remaining_data[:-LEGACY_RSA_SIZE]
+
+    return (
+        nonce_for_file, encrypted_file_content,
+        encrypted_dek_trad,
+        pqc_kem_ciphertext, encrypted_dek_pqc_package, pqc_secret_key
+    )
@@ -1,13 +1,15 @@
 import os
+import time
 import traceback
 from cryptography.hazmat.primitives.asymmetric import rsa, padding as rsa_padding
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 import oqs
-from typing import Tuple, Optional
+from typing import List, Tuple, Optional
 import logging
 import cryptography.exceptions
 import ctypes as ct
+from .metrics import count_crypto
 
 logger = logging.getLogger(__name__)
 
@@ -19,28 +21,93 @@ class KeyVerificationError(EncryptionError):
     """DEK 검증 실패 예외"""
     pass
 
+def read_active_pointer(keys_dir: str) -> Optional[str]:
+    """활성 키 세트 포인터(keys_dir 기준 상대 경로)를 읽습니다. 키 교체 전이면 None"""
+    try:
+        with open(os.path.join(keys_dir, HybridEncryption.ACTIVE_POINTER_FILE)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+def write_active_pointer(keys_dir: str, pointer: str):
+    """활성 키 세트 포인터를 원자적으로 교체합니다 (키 세트 전환의 유일한 시점)."""
+    pointer_path = os.path.join(keys_dir, HybridEncryption.ACTIVE_POINTER_FILE)
+    tmp_path = pointer_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(pointer)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, pointer_path)
+
 class HybridEncryption:
     # PQC KEM 알고리즘 설정
     PQC_KEM_ALG = "Kyber512"  # 또는 보안 레벨에 따라 "Kyber768" 사용
 
-    def __init__(self):
+    # 기본 키 디렉토리 및 키 교체 시 사용하는 하위 디렉토리
+    DEFAULT_KEYS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'app', 'keys')
+    ROTATION_DIR_NAME = 'rotation'  # 교체 진행 중인 새 키 (스테이징)
+    RETIRED_DIR_NAME = 'retired'    # 교체 완료 후 보관되는 이전 키 (자동으로 사용하지 않음, keys purge-retired로 삭제)
+    SETS_DIR_NAME = 'sets'          # 키 교체로 활성화된 키 세트
+    ACTIVE_POINTER_FILE = 'ACTIVE'  # 활성 키 세트 포인터 (없으면 keys_dir 바로 아래의 키 사용)
+    KEY_FILES = ('trad_private_key.pem', 'trad_public_key.pem', 'pqc_public_key.bin', 'pqc_private_key.bin')
+    FALLBACK_KEYS_RESCAN_SECONDS = 60
+
+    def __init__(self, keys_dir: Optional[str] = None, create: bool = True):
         # 키 파일 디렉토리 설정
-        self.keys_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'app', 'keys')
+        self.keys_dir = keys_dir or self.DEFAULT_KEYS_DIR
+        self._fallback_trad_keys = None
         try:
             os.makedirs(self.keys_dir, exist_ok=True)
-            logger.info(f"키 디렉토리 생성/확인 완료: {self.keys_dir}")
+            logger.debug(f"키 디렉토리 생성/확인 완료: {self.keys_dir}")
         except Exception as e:
             logger.error(f"키 디렉토리 생성 실패: {e}")
             raise EncryptionError(f"키 디렉토리 생성 실패: {e}")
         
-        # 시스템 키 로드 또는 생성
-        self.trad_private_key, self.trad_public_key = self._load_or_generate_trad_keys()
-        self.pqc_public_key, self.pqc_private_key = self._load_or_generate_pqc_keys()
-
-    def _load_or_generate_trad_keys(self) -> Tuple[rsa.RSAPrivateKey, rsa.RSAPublicKey]:
-        """RSA 키 쌍을 로드하거나 생성"""
-        private_key_path = os.path.join(self.keys_dir, 'trad_private_key.pem')
-        public_key_path = os.path.join(self.keys_dir, 'trad_public_key.pem')
+        # 시스템 키 로드 또는 생성 (키 교체로 활성 키 세트가 지정된 뒤에는 키가 없어도 새로 생성하지 않음)
+        self._active_pointer = read_active_pointer(self.keys_dir)
+        self.active_keys_dir = self._resolve_active_dir(self._active_pointer)
+        create = create and self._active_pointer is None
+        self.trad_private_key, self.trad_public_key = self._load_or_generate_trad_keys(self.active_keys_dir, create)
+        self.pqc_public_key, self.pqc_private_key = self._load_or_generate_pqc_keys(self.active_keys_dir, create)
+
+    def _resolve_active_dir(self, pointer: Optional[str]) -> str:
+        return os.path.join(self.keys_dir, pointer) if pointer else self.keys_dir
+
+    def refresh_active_keys(self) -> bool:
+        """
+        다른 프로세스의 키 교체로 활성 키 세트가 바뀌었으면 다시 로드합니다.
+        재시작 전인 프로세스도 교체 직후부터 새 키로 래핑/복호화하도록 하기 위함입니다.
+        """
+        pointer = read_active_pointer(self.keys_dir)
+        if pointer == self._active_pointer:
+            return False
+        directory = self._resolve_active_dir(pointer)
+        try:
+            trad_keys = self._load_or_generate_trad_keys(directory, create=False)
+            pqc_keys = self._load_or_generate_pqc_keys(directory, create=False)
+        except EncryptionError as e:
+            logger.error(f"교체된 활성 키 로드 실패: {e}")
+            return False
+        self.trad_private_key, self.trad_public_key = trad_keys
+        self.pqc_public_key, self.pqc_private_key = pqc_keys
+        self.active_keys_dir = directory
+        self._active_pointer = pointer
+        self._fallback_trad_keys = None
+        logger.info(f"활성 키 세트가 교체되어 다시 로드했습니다: {directory}")
+        return True
+
+    def rotation_dir(self) -> str:
+        return os.path.join(self.keys_dir, self.ROTATION_DIR_NAME)
+
+    def rotation_in_progress(self) -> bool:
+        """키 교체용 새 키가 스테이징되어 있는지 (keys rotate 실행 중이거나 중단된 상태)"""
+        return all(os.path.exists(os.path.join(self.rotation_dir(), name)) for name in self.KEY_FILES)
+
+    def _load_or_generate_trad_keys(self, directory: str,
+                                    create: bool = True) -> Tuple[rsa.RSAPrivateKey, rsa.RSAPublicKey]:
+        """RSA 키 쌍을 로드하거나 생성 (create=False이면 생성하지 않고 예외)"""
+        private_key_path = os.path.join(directory, 'trad_private_key.pem')
+        public_key_path = os.path.join(directory, 'trad_public_key.pem')
         
         try:
             # 키 파일이 존재하는 경우 로드
@@ -52,11 +119,14 @@ class HybridEncryption:
                     )
                 with open(public_key_path, "rb") as f:
                     public_key = serialization.load_pem_public_key(f.read())
-                logger.info("RSA 키 쌍을 성공적으로 로드했습니다.")
+                logger.debug("RSA 키 쌍을 성공적으로 로드했습니다.")
                 return private_key, public_key
         except Exception as e:
             logger.warning(f"RSA 키 로드 실패: {e}. 새로운 키 쌍을 생성합니다.")
-        
+
+        if not create:
+            raise EncryptionError(f"RSA 키를 로드할 수 없습니다 (키를 새로 생성하지 않음): {directory}")
+
         # 새로운 RSA 키 쌍 생성
         try:
             private_key = rsa.generate_private_key(
@@ -85,10 +155,10 @@ class HybridEncryption:
             logger.error(f"RSA 키 생성/저장 실패: {e}")
             raise EncryptionError(f"RSA 키 생성/저장 실패: {e}")
 
-    def _load_or_generate_pqc_keys(self) -> Tuple[bytes, bytes]:
-        """PQC 공개키와 개인키를 로드하거나 생성"""
-        public_key_path = os.path.join(self.keys_dir, 'pqc_public_key.bin')
-        private_key_path = os.path.join(self.keys_dir, 'pqc_private_key.bin')
+    def _load_or_generate_pqc_keys(self, directory: str, create: bool = True) -> Tuple[bytes, bytes]:
+        """PQC 공개키와 개인키를 로드하거나 생성 (create=False이면 생성하지 않고 예외)"""
+        public_key_path = os.path.join(directory, 'pqc_public_key.bin')
+        private_key_path = os.path.join(directory, 'pqc_private_key.bin')
         
         try:
             if os.path.exists(public_key_path) and os.path.exists(private_key_path):
@@ -96,11 +166,14 @@ class HybridEncryption:
                     public_key = f_pub.read()
                 with open(private_key_path, "rb") as f_priv:
                     private_key = f_priv.read()
-                logger.info("PQC 공개키와 개인키를 성공적으로 로드했습니다.")
+                logger.debug("PQC 공개키와 개인키를 성공적으로 로드했습니다.")
                 return public_key, private_key # 올바른 튜플 반환
         except Exception as e:
             logger.warning(f"PQC 키 로드 실패: {e}. 새로운 키 쌍을 생성합니다.")
-        
+
+        if not create:
+            raise EncryptionError(f"PQC 키를 로드할 수 없습니다 (키를 새로 생성하지 않음): {directory}")
+
         try:
             # 새로운 키쌍 생성
             with oqs.KeyEncapsulation(self.PQC_KEM_ALG) as kem:
@@ -125,10 +198,11 @@ class HybridEncryption:
         """DEK 생성"""
         return os.urandom(32)  # AES-256용 32바이트 DEK
 
-    def _encrypt_dek_trad(self, dek: bytes) -> bytes:
-        """RSA로 DEK 암호화"""
+    def _encrypt_dek_trad(self, dek: bytes, public_key: Optional[rsa.RSAPublicKey] = None) -> bytes:
+        """RSA로 DEK 암호화 (public_key 미지정 시 활성 시스템 공개키)"""
+        count_crypto('rsa_encrypt')
         try:
-            encrypted_dek = self.trad_public_key.encrypt(
+            encrypted_dek = (public_key or self.trad_public_key).encrypt(
                 dek,
                 rsa_padding.OAEP(
                     mgf=rsa_padding.MGF1(algorithm=hashes.SHA256()),
@@ -143,6 +217,7 @@ class HybridEncryption:
 
     def _decrypt_dek_trad(self, encrypted_dek_trad: bytes) -> bytes:
         """RSA로 DEK 복호화"""
+        count_crypto('rsa_decrypt')
         try:
             dek = self.trad_private_key.decrypt(
                 encrypted_dek_trad,
@@ -154,11 +229,69 @@ class HybridEncryption:
             )
             return dek
         except Exception as e:
+            # 다른 프로세스가 키 교체를 마쳤다면 새 활성 키로 다시 시도
+            if self.refresh_active_keys():
+                return self._decrypt_dek_trad(encrypted_dek_trad)
+            # 키 교체 중이라면 교체 대상(새) 키로 이미 재래핑된 값일 수 있음
+            for fallback_key in self._get_fallback_trad_keys():
+                try:
+                    return fallback_key.decrypt(
+                        encrypted_dek_trad,
+                        rsa_padding.OAEP(
+                            mgf=rsa_padding.MGF1(algorithm=hashes.SHA256()),
+                            algorithm=hashes.SHA256(),
+                            label=None
+                        )
+                    )
+                except Exception:
+                    continue
             logger.error(f"RSA DEK 복호화 실패: {e}")
             raise EncryptionError(f"RSA DEK 복호화 실패: {e}")
 
+    def _get_fallback_trad_keys(self) -> List[rsa.RSAPrivateKey]:
+        """
+        키 교체가 진행 중일 때만 교체용(rotation) RSA 개인키를 로드합니다 (생성하지 않음).
+        보관(retired)된 이전 키는 사용하지 않습니다.
+        """
+        in_progress = self.rotation_in_progress()
+        if self._fallback_trad_keys is not None:
+            loaded_at, keys = self._fallback_trad_keys
+            # 교체 시작/종료는 즉시 반영하고, 진행 중에는 일정 주기로 다시 로드
+            if bool(keys) == in_progress and time.monotonic() - loaded_at < self.FALLBACK_KEYS_RESCAN_SECONDS:
+                return keys
+
+        keys = []
+        if in_progress:
+            private_key_path = os.path.join(self.rotation_dir(), 'trad_private_key.pem')
+            try:
+                with open(private_key_path, "rb") as f:
+                    keys.append(serialization.load_pem_private_key(f.read(), password=None))
+            except Exception as e:
+                logger.warning(f"교체용 RSA 키 로드 실패: {e}")
+        self._fallback_trad_keys = (time.monotonic(), keys)
+        return keys
+
+    def _kek_wrapping_keys(self) -> Tuple[rsa.RSAPublicKey, bytes]:
+        """
+        새 KEK를 래핑할 (RSA 공개키, PQC 공개키)를 반환합니다.
+        키 교체가 진행 중이면 교체 대상(새) 키를 사용하여, 교체 도중 생성된 에폭이 이전 키로 남지 않게 합니다.
+        """
+        self.refresh_active_keys()
+        if self.rotation_in_progress():
+            rotation_dir = self.rotation_dir()
+            try:
+                with open(os.path.join(rotation_dir, 'trad_public_key.pem'), "rb") as f:
+                    trad_public_key = serialization.load_pem_public_key(f.read())
+                with open(os.path.join(rotation_dir, 'pqc_public_key.bin'), "rb") as f:
+                    pqc_public_key = f.read()
+                return trad_public_key, pqc_public_key
+            except Exception as e:
+                logger.warning(f"교체용 공개키 로드 실패, 활성 키로 래핑합니다: {e}")
+        return self.trad_public_key, self.pqc_public_key
+
     def _encrypt_dek_pqc(self, dek: bytes) -> Tuple[bytes, bytes, bytes]:
         """PQC KEM을 사용하여 DEK를 암호화"""
+        count_crypto('pqc_encapsulate')
         try:
             # 새로운 KeyEncapsulation 인스턴스 생성
             with oqs.KeyEncapsulation(self.PQC_KEM_ALG) as kem:
@@ -169,10 +302,6 @@ class HybridEncryption:
                 # 공유 비밀 생성 및 KEM 암호문 생성
                 kem_ciphertext, shared_secret = kem.encap_secret(public_key)
                 
-                # 공유 비밀의 크기와 첫 8바이트 로깅
-                logger.info(f"PQC 암호화 - 공유 비밀 크기: {len(shared_secret)}, KEM 암호문 크기: {len(kem_ciphertext)}")
-                logger.info(f"PQC 암호화 - 공유 비밀 첫 8바이트: {shared_secret[:8].hex()}")
-                
                 # AES-GCM으로 DEK 암호화
                 nonce = os.urandom(12)
                 aes_gcm_for_dek = AESGCM(shared_secret)
@@ -181,8 +310,9 @@ class HybridEncryption:
                 # nonce와 암호문을 하나의 패키지로 결합
                 encrypted_dek_package = nonce + ciphertext
                 
-                logger.info(f"PQC 암호화 - DEK 패키지 크기: {len(encrypted_dek_package)}")
-                logger.info(f"PQC 암호화 - nonce 첫 8바이트: {nonce[:8].hex()}")
+                # 키 재료(공유 비밀/nonce)는 기록하지 않음
+                logger.debug("PQC DEK 암호화 완료 (KEM 암호문 %d바이트, 패키지 %d바이트)",
+                             len(kem_ciphertext), len(encrypted_dek_package))
                 
                 return kem_ciphertext, encrypted_dek_package, secret_key
                 
@@ -194,6 +324,7 @@ class HybridEncryption:
 
     def _decrypt_dek_pqc(self, kem_ciphertext: bytes, encrypted_dek_package: bytes, secret_key: bytes) -> bytes:
         """PQC KEM을 사용하여 DEK를 복호화"""
+        count_crypto('pqc_decapsulate')
         try:
             # 새로운 KeyEncapsulation 인스턴스 생성
             kem = oqs.KeyEncapsulation(self.PQC_KEM_ALG)
@@ -205,16 +336,12 @@ class HybridEncryption:
                 # KEM 복호화로 공유 비밀 복구
                 shared_secret = kem.decap_secret(kem_ciphertext)
                 
-                # 공유 비밀의 크기와 첫 8바이트 로깅
-                logger.info(f"PQC 복호화 - 공유 비밀 크기: {len(shared_secret)}, KEM 암호문 크기: {len(kem_ciphertext)}")
-                logger.info(f"PQC 복호화 - 공유 비밀 첫 8바이트: {shared_secret[:8].hex()}")
-                
                 # nonce와 암호문 분리
                 nonce = encrypted_dek_package[:12]
                 ciphertext = encrypted_dek_package[12:]
                 
-                logger.info(f"PQC 복호화 - nonce 크기: {len(nonce)}, ciphertext 크기: {len(ciphertext)}")
-                logger.info(f"PQC 복호화 - nonce 첫 8바이트: {nonce[:8].hex()}")
+                logger.debug("PQC DEK 복호화 (KEM 암호문 %d바이트, 패키지 %d바이트)",
+                             len(kem_ciphertext), len(encrypted_dek_package))
                 
                 # 공유 비밀 검증
                 if len(shared_secret) != 32:
@@ -238,6 +365,7 @@ class HybridEncryption:
 
     def _encrypt_file_with_dek(self, file_data: bytes, dek: bytes) -> Tuple[bytes, bytes]:
         """DEK로 파일 암호화"""
+        count_crypto('aes_gcm_encrypt')
         try:
             aes_gcm_for_file = AESGCM(dek)
             nonce_for_file = os.urandom(12)
@@ -251,6 +379,7 @@ class HybridEncryption:
     def _decrypt_file_with_dek(self, nonce_for_file: bytes, encrypted_file_content: bytes, 
                               dek: bytes) -> bytes:
         """DEK로 파일 복호화"""
+        count_crypto('aes_gcm_decrypt')
         try:
             aes_gcm_for_file = AESGCM(dek)
             decrypted_file_data = aes_gcm_for_file.decrypt(nonce_for_file, encrypted_file_content, None)
@@ -283,54 +412,105 @@ class HybridEncryption:
             logger.error(f"하이브리드 파일 암호화 실패: {e}")
             raise EncryptionError(f"하이브리드 파일 암호화 실패: {e}")
 
-    def decrypt_file_hybrid(self, nonce_for_file: bytes, encrypted_file_content: bytes,
-                          encrypted_dek_trad: bytes, pqc_kem_ciphertext: bytes,
-                          encrypted_dek_pqc_package: bytes, pqc_secret_key: bytes) -> bytes:
-        """하이브리드 방식으로 파일 복호화"""
+    def _recover_dek(self, encrypted_dek_trad: Optional[bytes], pqc_kem_ciphertext: Optional[bytes],
+                     encrypted_dek_pqc_package: Optional[bytes], pqc_secret_key: Optional[bytes]) -> bytes:
+        """RSA/PQC 두 방식으로 래핑된 키를 복구하고 결과가 일치하는지 검증"""
         dek_from_trad = None
         dek_from_pqc = None
         
         # 전통 방식으로 DEK 복호화 시도
-        try:
-            dek_from_trad = self._decrypt_dek_trad(encrypted_dek_trad)
-            logger.info("전통 방식 DEK 복호화 성공")
-        except Exception as e:
-            logger.warning(f"전통 방식 DEK 복호화 실패: {str(e)}")
+        if encrypted_dek_trad:
+            try:
+                dek_from_trad = self._decrypt_dek_trad(encrypted_dek_trad)
+                logger.debug("전통 방식 DEK 복호화 성공")
+            except Exception as e:
+                logger.warning(f"전통 방식 DEK 복호화 실패: {str(e)}")
 
         # PQC 방식으로 DEK 복호화 시도
-        try:
-            logger.info(f"PQC KEM 암호문 크기: {len(pqc_kem_ciphertext)}, 암호화된 DEK 크기: {len(encrypted_dek_pqc_package)}")
-            dek_from_pqc = self._decrypt_dek_pqc(pqc_kem_ciphertext, encrypted_dek_pqc_package, pqc_secret_key)
-            logger.info("PQC 방식 DEK 복호화 성공")
-        except Exception as e:
-            logger.warning(f"PQC 방식 DEK 복호화 실패: {str(e)}")
+        if pqc_kem_ciphertext and encrypted_dek_pqc_package and pqc_secret_key:
+            try:
+                dek_from_pqc = self._decrypt_dek_pqc(pqc_kem_ciphertext, encrypted_dek_pqc_package, pqc_secret_key)
+                logger.debug("PQC 방식 DEK 복호화 성공")
+            except Exception as e:
+                logger.warning(f"PQC 방식 DEK 복호화 실패: {str(e)}")
 
         # DEK 검증 및 선택
         if dek_from_trad and dek_from_pqc:
             if dek_from_trad != dek_from_pqc:
                 logger.error("DEK 불일치: 전통 방식과 PQC 방식의 DEK가 다릅니다.")
                 raise KeyVerificationError("DEK 불일치: 전통 방식과 PQC 방식의 DEK가 다릅니다.")
-            final_dek = dek_from_trad
-            logger.info("두 방식 모두 성공적으로 DEK를 복호화했습니다.")
+            logger.debug("두 방식 모두 성공적으로 DEK를 복호화했습니다.")
+            return dek_from_trad
         elif dek_from_trad:
-            final_dek = dek_from_trad
-            logger.info("전통 방식으로만 DEK를 복호화했습니다.")
+            logger.debug("전통 방식으로만 DEK를 복호화했습니다.")
+            return dek_from_trad
         elif dek_from_pqc:
-            final_dek = dek_from_pqc
-            logger.info("PQC 방식으로만 DEK를 복호화했습니다.")
-        else:
-            logger.error("모든 DEK 복호화 방식이 실패했습니다.")
-            raise EncryptionError("모든 DEK 복호화 방식이 실패했습니다.")
+            logger.debug("PQC 방식으로만 DEK를 복호화했습니다.")
+            return dek_from_pqc
+
+        logger.error("모든 DEK 복호화 방식이 실패했습니다.")
+        raise EncryptionError("모든 DEK 복호화 방식이 실패했습니다.")
+
+    def decrypt_file_hybrid(self, nonce_for_file: bytes, encrypted_file_content: bytes,
+                          encrypted_dek_trad: bytes, pqc_kem_ciphertext: bytes,
+                          encrypted_dek_pqc_package: bytes, pqc_secret_key: bytes) -> bytes:
+        """하이브리드 방식으로 파일 복호화"""
+        final_dek = self._recover_dek(encrypted_dek_trad, pqc_kem_ciphertext,
+                                      encrypted_dek_pqc_package, pqc_secret_key)
 
         # 파일 복호화
         try:
             decrypted_file = self._decrypt_file_with_dek(nonce_for_file, encrypted_file_content, final_dek)
-            logger.info("파일 복호화 성공")
+            logger.debug("파일 복호화 성공")
             return decrypted_file
         except Exception as e:
             logger.error(f"파일 복호화 실패: {str(e)}")
             raise EncryptionError(f"파일 복호화 실패: {str(e)}")
 
+    # --- KEK 계층 (에폭 단위 KEK로 레코드별 DEK를 래핑) ---
+
+    def wrap_kek(self, kek: bytes) -> Tuple[bytes, bytes, bytes]:
+        """KEK를 RSA와 시스템 PQC 공개키로 각각 한 번씩 래핑 (키 교체 중에는 새 키로 래핑)"""
+        try:
+            trad_public_key, pqc_public_key = self._kek_wrapping_keys()
+            wrapped_kek_trad = self._encrypt_dek_trad(kek, trad_public_key)
+            count_crypto('pqc_encapsulate')
+            with oqs.KeyEncapsulation(self.PQC_KEM_ALG) as kem:
+                pqc_kem_ciphertext, shared_secret = kem.encap_secret(pqc_public_key)
+            nonce = os.urandom(12)
+            wrapped_kek_pqc = nonce + AESGCM(shared_secret).encrypt(nonce, kek, None)
+            return wrapped_kek_trad, pqc_kem_ciphertext, wrapped_kek_pqc
+        except Exception as e:
+            logger.error(f"KEK 래핑 실패: {e}")
+            raise EncryptionError(f"KEK 래핑 실패: {e}")
+
+    def unwrap_kek(self, wrapped_kek_trad: bytes, pqc_kem_ciphertext: bytes, wrapped_kek_pqc: bytes) -> bytes:
+        """시스템 개인키로 KEK 래핑을 해제"""
+        return self._recover_dek(wrapped_kek_trad, pqc_kem_ciphertext, wrapped_kek_pqc, self.pqc_private_key)
+
+    def wrap_dek_with_kek(self, dek: bytes, kek: bytes, key_epoch_id: int) -> bytes:
+        """AES-GCM으로 DEK를 KEK 아래에 래핑 (에폭 ID를 AAD로 바인딩)"""
+        count_crypto('dek_wrap')
+        try:
+            nonce = os.urandom(12)
+            return nonce + AESGCM(kek).encrypt(nonce, dek, self._kek_aad(key_epoch_id))
+        except Exception as e:
+            logger.error(f"DEK 래핑 실패: {e}")
+            raise EncryptionError(f"DEK 래핑 실패: {e}")
+
+    def unwrap_dek_with_kek(self, wrapped_dek: bytes, kek: bytes, key_epoch_id: int) -> bytes:
+        """KEK로 래핑된 DEK를 복호화"""
+        count_crypto('dek_unwrap')
+        try:
+            return AESGCM(kek).decrypt(wrapped_dek[:12], wrapped_dek[12:], self._kek_aad(key_epoch_id))
+        except Exception as e:
+            logger.error(f"DEK 언래핑 실패: {e}")
+            raise EncryptionError(f"DEK 언래핑 실패: {e}")
+
+    @staticmethod
+    def _kek_aad(key_epoch_id: int) -> bytes:
+        return f"key_epoch:{key_epoch_id}".encode()
+
     def encrypt_field(self, field_value: str) -> bytes:
         """문자열 필드를 암호화합니다."""
         try:
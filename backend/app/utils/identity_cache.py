@@ -0,0 +1,131 @@
+# backend/app/utils/identity_cache.py
+import threading
+import time
+import logging
+from collections import OrderedDict
+from typing import Dict, Optional
+from flask import current_app, g, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import make_transient_to_detached
+from .. import db
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+class UserIdentityCache:
+    """
+    JWT 인증 사용자 조회 캐시
+
+    - 요청 범위: 한 요청 안에서는 g에 메모이즈된 동일 인스턴스를 반환합니다.
+    - 프로세스 범위: 짧은 TTL 동안 사용자 컬럼 스냅샷(password_hash, status 제외)을 보관하고,
+      세션에 merge(load=False)로 붙여 조회 쿼리 없이 영속 객체를 복원합니다.
+    User 행이 갱신/삭제되면 해당 항목이 무효화되며, 다른 프로세스의 변경은 TTL 이내에 반영됩니다.
+    status(상담 가능 여부)와 role(관리자 여부)은 권한 판단에 쓰이므로 캐시하지 않으며, 접근하는 라우트에서만 DB에서 읽습니다.
+    """
+
+    SNAPSHOT_COLUMNS = ('id', 'username', 'name', 'created_at')
+
+    def __init__(self, ttl_seconds: float = 30.0, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def _snapshot(self, user) -> Dict:
+        return {column: getattr(user, column) for column in self.SNAPSHOT_COLUMNS}
+
+    def _restore(self, snapshot: Dict):
+        from ..models import User
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return db.session.merge(user, load=False)
+
+    def get(self, user_id):
+        """사용자 인스턴스를 반환합니다 (없으면 None)."""
+        try:
+            user_id = int(user_id)
+        except (TypeError, ValueError):
+            return None
+
+        memo = g.setdefault('_identity_users', {})
+        if user_id in memo:
+            return memo[user_id]
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(user_id)
+                self._hits += 1
+                snapshot = entry[1]
+            else:
+                self._misses += 1
+                snapshot = None
+
+        if snapshot is not None:
+            user = self._restore(snapshot)
+        else:
+            from ..models import User
+            user = db.session.get(User, user_id)
+            if user is not None:
+                self.put(user)
+
+        memo[user_id] = user
+        return user
+
+    def put(self, user):
+        with self._lock:
+            self._entries[user.id] = (time.monotonic() + self.ttl_seconds, self._snapshot(user))
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self._invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self._hits,
+                'misses': self._misses,
+                'invalidations': self._invalidations,
+            }
+
+
+_identity_cache: Optional[UserIdentityCache] = None
+_identity_cache_lock = threading.Lock()
+
+def get_identity_cache() -> UserIdentityCache:
+    """프로세스 단위 사용자 식별 캐시를 반환합니다."""
+    global _identity_cache
+    if _identity_cache is None:
+        with _identity_cache_lock:
+            if _identity_cache is None:
+                config = current_app.config if has_app_context() else {}
+                _identity_cache = UserIdentityCache(
+                    ttl_seconds=config.get('USER_CACHE_TTL_SECONDS', Config.USER_CACHE_TTL_SECONDS),
+                    max_entries=config.get('USER_CACHE_MAX_ENTRIES', Config.USER_CACHE_MAX_ENTRIES)
+                )
+                _register_invalidation()
+    return _identity_cache
+
+def _register_invalidation():
+    """프로필/비밀번호/상태 변경(User UPDATE/DELETE) 시 캐시 항목을 무효화합니다."""
+    from ..models import User
+
+    def invalidate(mapper, connection, target):
+        if _identity_cache is not None:
+            _identity_cache.invalidate(target.id)
+
+    event.listen(User, 'after_update', invalidate)
+    event.listen(User, 'after_delete', invalidate)
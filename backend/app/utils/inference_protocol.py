@@ -0,0 +1,110 @@
+# backend/app/utils/inference_protocol.py
+import json
+import socket
+import struct
+from typing import Dict, Optional, Tuple
+
+# 추론 서버 바이너리 프로토콜 (Unix 도메인 소켓)
+# 프레임 = 헤더 14바이트 [매직 'CI'(2) | 버전(1) | 코드(1) | 우선순위(1) | 디코딩 프로필(1) | 제한 시간 ms(4) | 페이로드 길이(4)] + 페이로드
+# (정수는 big-endian) 요청의 코드는 연산(OP_*), 응답의 코드는 상태(STATUS_*)입니다.
+# 우선순위는 요청에만 의미가 있습니다 (0 = live, 1 = interactive, 2 = batch; 응답은 0).
+# 디코딩 프로필은 OP_TRANSCRIBE 요청에만 의미가 있습니다 (ai_service.DECODING_PROFILE_CODES; 그 외는 0).
+# 제한 시간은 요청자가 응답을 기다리는 남은 시간입니다 (0 = 없음). 서버는 이 시간이 지나면 작업을 시작/계속하지 않습니다.
+#   OP_TRANSCRIBE     요청: 표준 형식(16kHz FLAC) 또는 원본 오디오 바이트    응답: [음성 여부(1) | VAD 제거 초(float32)] + UTF-8 텍스트
+#   OP_PREDICT_RISK   요청: UTF-8 텍스트              응답: int8 위험도 (-1 = 예측 실패) + 모델 버전 JSON(UTF-8, 생략 가능)
+#   OP_PING           요청/응답: 빈 페이로드
+# STATUS_ERROR 응답의 페이로드는 [오류 종류(1, ERROR_KINDS)] + UTF-8 오류 메시지, STATUS_BAD_REQUEST는 UTF-8 오류 메시지입니다.
+
+MAGIC = b'CI'
+VERSION = 5
+HEADER = struct.Struct('!2sBBBBII')
+RISK = struct.Struct('!b')
+TRANSCRIPTION = struct.Struct('!?f')
+
+OP_PING = 0
+OP_TRANSCRIBE = 1
+OP_PREDICT_RISK = 2
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+STATUS_BAD_REQUEST = 2
+
+# 오류 종류 (ai_service.TranscriptionResult.error와 같은 이름)
+ERROR_KINDS = ('model_error', 'timeout', 'decode_error')
+
+DEFAULT_MAX_PAYLOAD = 64 * 1024 * 1024
+
+class ProtocolError(Exception):
+    """잘못된 프레임 (매직/버전 불일치, 페이로드 크기 초과)"""
+    pass
+
+def send_frame(sock: socket.socket, code: int, payload: bytes = b'', priority: int = 0, profile: int = 0,
+               deadline_ms: int = 0):
+    sock.sendall(HEADER.pack(MAGIC, VERSION, code, priority, profile, deadline_ms, len(payload)))
+    if payload:
+        sock.sendall(payload)
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:], size - received)
+        if n == 0:
+            raise ConnectionError('연결이 종료되었습니다.')
+        received += n
+    return bytes(buffer)
+
+def recv_frame(sock: socket.socket, max_payload: int = DEFAULT_MAX_PAYLOAD) -> Optional[Tuple[int, bytes, int, int, int]]:
+    """
+    프레임 하나를 (코드, 페이로드, 우선순위, 디코딩 프로필, 제한 시간 ms)로 읽습니다.
+    프레임 경계에서 연결이 닫히면 None을 반환합니다.
+    """
+    first = sock.recv(HEADER.size)
+    if not first:
+        return None
+    header = first if len(first) == HEADER.size else first + _recv_exact(sock, HEADER.size - len(first))
+    magic, version, code, priority, profile, deadline_ms, length = HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION:
+        raise ProtocolError(f"알 수 없는 프레임 (magic={magic!r}, version={version})")
+    if length > max_payload:
+        raise ProtocolError(f"페이로드가 너무 큽니다: {length} bytes")
+    return code, (_recv_exact(sock, length) if length else b''), priority, profile, deadline_ms
+
+def deadline_to_ms(seconds: Optional[float]) -> int:
+    """남은 시간(초)을 헤더 값으로 변환합니다 (None이면 0 = 제한 없음, 남은 시간이 있으면 최소 1ms)."""
+    if seconds is None:
+        return 0
+    return min(max(1, int(seconds * 1000)), 0xFFFFFFFF)
+
+def encode_error(kind: str, message: str) -> bytes:
+    code = ERROR_KINDS.index(kind) if kind in ERROR_KINDS else 0
+    return bytes([code]) + message.encode('utf-8')
+
+def decode_error(payload: bytes) -> Tuple[str, str]:
+    """STATUS_ERROR 응답을 (오류 종류, 메시지)로 읽습니다."""
+    if not payload:
+        return ERROR_KINDS[0], ''
+    kind = ERROR_KINDS[payload[0]] if payload[0] < len(ERROR_KINDS) else ERROR_KINDS[0]
+    return kind, payload[1:].decode('utf-8', errors='replace')
+
+def encode_risk(risk_level: Optional[int], model_versions: Optional[Dict[str, str]] = None) -> bytes:
+    versions = json.dumps(model_versions, sort_keys=True).encode('utf-8') if model_versions else b''
+    return RISK.pack(-1 if risk_level is None else risk_level) + versions
+
+def decode_risk(payload: bytes) -> Optional[int]:
+    value = RISK.unpack_from(payload)[0]
+    return None if value < 0 else value
+
+def decode_model_versions(payload: bytes) -> Optional[Dict[str, str]]:
+    """위험도 응답에 포함된 모델 버전 (없으면 None)"""
+    versions = payload[RISK.size:]
+    return json.loads(versions.decode('utf-8')) if versions else None
+
+def encode_transcription(text: Optional[str], has_speech: bool, vad_removed_seconds: float) -> bytes:
+    return TRANSCRIPTION.pack(has_speech, vad_removed_seconds) + (text or '').encode('utf-8')
+
+def decode_transcription(payload: bytes) -> Tuple[Optional[str], bool, float]:
+    has_speech, vad_removed_seconds = TRANSCRIPTION.unpack_from(payload)
+    text = payload[TRANSCRIPTION.size:].decode('utf-8')
+    return (text if has_speech else None), has_speech, round(vad_removed_seconds, 3)
@@ -0,0 +1,141 @@
+# backend/app/utils/logging_pipeline.py
+import os
+import json
+import queue
+import atexit
+import logging
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional
+from .metrics import Counter
+
+LOG_RECORDS_DROPPED = Counter('log_records_dropped', '로그 큐가 가득 차 버려진 레코드 수')
+
+# LogRecord 기본 속성 (extra로 전달된 필드와 구분하기 위함)
+_RESERVED_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON 구조화 로그 (extra로 전달된 필드 포함)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'module': record.module,
+            'line': record.lineno,
+            'process': record.process,
+            'thread': record.threadName,
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_text:
+            entry['exc_info'] = record.exc_text
+        elif record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    요청 스레드에서는 레코드를 큐에 넣기만 하는 핸들러
+    큐가 가득 차면 기다리지 않고 레코드를 버리며 log_records_dropped_total로 집계합니다.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 메시지 인자와 예외 정보는 지금 문자열로 확정 (extra 필드는 유지)
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[NonBlockingQueueHandler] = None
+_lock = threading.Lock()
+
+def parse_log_levels(spec) -> Dict[str, int]:
+    """'app.utils.hybrid_encryption=WARNING,sqlalchemy.engine=INFO' 형식 또는 dict를 로거별 레벨로 변환"""
+    if isinstance(spec, dict):
+        items = spec.items()
+    else:
+        items = (part.split('=', 1) for part in (spec or '').split(',') if '=' in part)
+    levels = {}
+    for name, level in items:
+        levels[name.strip()] = logging.getLevelName(str(level).strip().upper()) if isinstance(level, str) else level
+    return levels
+
+def _restart_listener_in_child():
+    # fork 이후 자식 프로세스에는 리스너 스레드가 없으므로 새로 시작
+    # 부모가 아직 기록하지 않은 레코드가 중복 기록되지 않도록 큐도 새로 만듦
+    global _listener
+    if _listener is not None and _queue_handler is not None:
+        _queue_handler.queue = queue.Queue(maxsize=_listener.queue.maxsize)
+        _listener = QueueListener(_queue_handler.queue, *_listener.handlers, respect_handler_level=True)
+        _listener.start()
+
+def _stop_listener():
+    if _listener is not None:
+        try:
+            _listener.stop()
+        except Exception:
+            pass
+
+def configure_logging(app):
+    """
+    큐 기반 로깅 파이프라인을 설정합니다.
+    요청 스레드는 QueueHandler로 큐에 넣기만 하고, 디스크 기록은 QueueListener 스레드가 담당합니다.
+    """
+    global _listener, _queue_handler
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+        root_logger = logging.getLogger()
+        if _queue_handler is not None:
+            root_logger.removeHandler(_queue_handler)
+
+        if app.debug:
+            target = logging.StreamHandler()
+        else:
+            log_file_path = app.config.get('LOG_FILE_PATH') or os.path.join(app.instance_path, 'production.log')
+            os.makedirs(os.path.dirname(log_file_path), exist_ok=True)
+            target = RotatingFileHandler(log_file_path, maxBytes=1024 * 1024 * 10, backupCount=5)
+
+        if app.config.get('LOG_FORMAT', 'json') == 'json':
+            target.setFormatter(JsonFormatter())
+        else:
+            target.setFormatter(logging.Formatter(
+                '%(asctime)s %(levelname)s %(name)s: %(message)s [in %(pathname)s:%(lineno)d]'
+            ))
+
+        base_level = logging.DEBUG if app.debug else app.config.get('LOG_LEVEL', logging.INFO)
+        log_queue = queue.Queue(maxsize=app.config.get('LOG_QUEUE_SIZE', 10000))
+        _queue_handler = NonBlockingQueueHandler(log_queue)
+        root_logger.addHandler(_queue_handler)
+        root_logger.setLevel(base_level)
+        app.logger.setLevel(base_level)
+
+        # 서브시스템별 레벨 (예: 암호화 모듈은 WARNING)
+        for logger_name, level in parse_log_levels(app.config.get('LOG_LEVELS')).items():
+            logging.getLogger(logger_name).setLevel(level)
+
+        _listener = QueueListener(log_queue, target, respect_handler_level=True)
+        _listener.start()
+
+        if not getattr(configure_logging, '_hooks_registered', False):
+            os.register_at_fork(after_in_child=_restart_listener_in_child)
+            atexit.register(_stop_listener)
+            configure_logging._hooks_registered = True
@@ -0,0 +1,454 @@
+# backend/app/utils/metrics.py
+import os
+import json
+import math
+import atexit
+import fcntl
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from .tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Prometheus 텍스트 형식(0.0.4)으로 노출하는 프로세스 내 지표 레지스트리.
+# 외부 의존성 없이 Counter/Gauge/Histogram과 스크레이프 시점 수집기(collector)를 지원합니다.
+# 멀티 프로세스(gunicorn 워커) 환경에서는 METRICS_MULTIPROCESS_DIR을 설정하면 워커별 값을 파일로 모아
+# 스크레이프 시 합산합니다 (MultiProcessStore). 설정하지 않으면 요청을 받은 워커의 값만 노출됩니다.
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    parts = []
+    for key, value in labels.items():
+        escaped = str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+        parts.append(f'{key}="{escaped}"')
+    return '{' + ','.join(parts) + '}'
+
+
+def _render_families(families) -> str:
+    """(이름, 타입, 설명, [(샘플 이름, 레이블, 값)]) 목록을 텍스트 형식으로 변환합니다."""
+    lines: List[str] = []
+    for name, metric_type, documentation, samples in families:
+        lines.append(f'# HELP {name} {documentation}')
+        lines.append(f'# TYPE {name} {metric_type}')
+        for sample_name, labels, value in samples:
+            lines.append(f'{sample_name}{_format_labels(labels)} {_format_value(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List['_Metric'] = []
+        self._collectors: List[Tuple[Callable[[], Iterable[Tuple[str, str, str, List[Tuple[Dict, float]]]]], bool]] = []
+        self._lock = threading.Lock()
+        self.multiprocess: Optional['MultiProcessStore'] = None
+
+    def register(self, metric: '_Metric'):
+        with self._lock:
+            self._metrics.append(metric)
+
+    def register_collector(self, collector, per_process: bool = False):
+        """
+        스크레이프 시 호출되어 (이름, 타입, 설명, [(레이블, 값)])을 반환하는 함수를 등록합니다.
+        per_process=True는 프로세스마다 값이 다른 수집기 (멀티 프로세스 모드에서 워커 값을 합산)입니다.
+        """
+        with self._lock:
+            self._collectors.append((collector, per_process))
+
+    def collect(self, per_process: Optional[bool] = None) -> List[Tuple[str, str, str, List[Tuple[str, Dict, float]]]]:
+        """
+        지표 계열 목록을 반환합니다. per_process가 True이면 프로세스별 값(지표 + 프로세스별 수집기)만,
+        False이면 프로세스와 무관한 수집기만 수집합니다.
+        """
+        families = []
+        with self._lock:
+            metrics = list(self._metrics)
+            collectors = list(self._collectors)
+        if per_process is not False:
+            families.extend(metric.collect() for metric in metrics)
+        for collector, collector_per_process in collectors:
+            if per_process is not None and collector_per_process != per_process:
+                continue
+            try:
+                for name, metric_type, documentation, samples in list(collector()):
+                    families.append((name, metric_type, documentation,
+                                     [(name, labels, value) for labels, value in samples]))
+            except Exception as e:
+                logger.warning(f"지표 수집기 실행 실패: {e}")
+        return families
+
+    def render(self) -> str:
+        if self.multiprocess is not None:
+            return _render_families(self.multiprocess.merged() + self.collect(per_process=False))
+        return _render_families(self.collect())
+
+
+class MultiProcessStore:
+    """
+    워커별 지표 스냅샷 디렉토리 (gunicorn 멀티 워커)
+
+    각 워커는 interval초마다(그리고 스크레이프 시) 자기 값을 <pid>.json에 기록하고, 스크레이프를 받은 워커가
+    모든 파일을 합쳐 노출합니다. 카운터/히스토그램은 합산하고, 게이지는 pid 레이블로 워커별로 노출합니다.
+    종료된 워커의 카운터/히스토그램은 archive.json에 합쳐 보존하고(값이 뒤로 가지 않도록) 게이지는 버립니다.
+    """
+    ARCHIVE_FILE = 'archive.json'
+    LOCK_FILE = '.lock'
+
+    def __init__(self, directory: str, registry: MetricsRegistry, interval: float = 5.0):
+        self.directory = directory
+        self.registry = registry
+        self.interval = interval
+        self._pid = None
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def ensure_writer(self):
+        """이 프로세스의 주기 기록 스레드를 시작합니다 (fork 이후 자식 프로세스에서는 새로 시작)."""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            threading.Thread(target=self._run, name='metrics-writer', daemon=True).start()
+            atexit.register(self.write)  # 워커 종료 직전 값까지 남김
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.write()
+            except Exception as e:
+                logger.warning(f"워커 지표 기록 실패: {e}")
+
+    def write(self):
+        families = self.registry.collect(per_process=True)
+        path = os.path.join(self.directory, f'{os.getpid()}.json')
+        _write_json(path, {'pid': os.getpid(), 'families': families})
+
+    def merged(self) -> List[Tuple[str, str, str, List[Tuple[str, Dict, float]]]]:
+        """모든 워커의 최근 값을 합칩니다 (이 워커의 값은 지금 기록)."""
+        self.write()
+        with open(os.path.join(self.directory, self.LOCK_FILE), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            snapshots = self._read_snapshots()
+        return _merge_families(snapshots)
+
+    def _read_snapshots(self) -> List[Tuple[Optional[int], List]]:
+        archive_path = os.path.join(self.directory, self.ARCHIVE_FILE)
+        archive = _read_json(archive_path) or {'families': []}
+        snapshots, dead = [], []
+        for filename in sorted(os.listdir(self.directory)):
+            if not filename.endswith('.json') or filename == self.ARCHIVE_FILE:
+                continue
+            path = os.path.join(self.directory, filename)
+            snapshot = _read_json(path)
+            if snapshot is None:
+                continue
+            if _pid_alive(snapshot['pid']):
+                snapshots.append((snapshot['pid'], snapshot['families']))
+            else:
+                dead.append((path, snapshot))
+        if dead:
+            # 종료된 워커: 누적값만 보관 파일에 합치고 워커 파일 삭제
+            archived = [(None, archive['families'])] + [
+                (None, [f for f in snapshot['families'] if f[1] != 'gauge']) for _, snapshot in dead]
+            archive = {'families': _merge_families(archived)}
+            _write_json(archive_path, archive)
+            for path, _ in dead:
+                os.remove(path)
+        return [(None, archive['families'])] + snapshots
+
+
+def _merge_families(snapshots) -> List[Tuple[str, str, str, List[Tuple[str, Dict, float]]]]:
+    """워커별 계열을 합칩니다 (pid가 있는 스냅샷의 게이지는 pid 레이블을 붙여 구분)."""
+    merged: Dict[str, Tuple[str, str, Dict]] = {}
+    for pid, families in snapshots:
+        for name, metric_type, documentation, samples in families:
+            _, _, merged_samples = merged.setdefault(name, (metric_type, documentation, {}))
+            for sample_name, labels, value in samples:
+                if metric_type == 'gauge' and pid is not None:
+                    labels = {**labels, 'pid': str(pid)}
+                key = (sample_name, tuple(sorted(labels.items())))
+                if key in merged_samples:
+                    merged_samples[key][2] += value
+                else:
+                    merged_samples[key] = [sample_name, labels, value]
+    return [(name, metric_type, documentation, [tuple(sample) for sample in samples.values()])
+            for name, (metric_type, documentation, samples) in merged.items()]
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def _read_json(path: str) -> Optional[Dict]:
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_json(path: str, data: Dict):
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+REGISTRY = MetricsRegistry()
+
+
+class _Metric:
+    metric_type = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 registry: Optional[MetricsRegistry] = REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _unlabelled(self):
+        if self.labelnames:
+            raise ValueError(f"{self.name}: 레이블 값이 필요합니다.")
+        return self.labels()
+
+    def _samples(self, labels: Dict[str, str], child) -> List[Tuple[str, Dict[str, str], float]]:
+        raise NotImplementedError
+
+    def exposed_name(self) -> str:
+        """HELP/TYPE 줄에 쓰는 이름 (샘플 이름과 일치해야 함)"""
+        return self.name
+
+    def collect(self) -> Tuple[str, str, str, List[Tuple[str, Dict[str, str], float]]]:
+        """(노출 이름, 타입, 설명, [(샘플 이름, 레이블, 값)])"""
+        with self._lock:
+            children = list(self._children.items())
+        samples = []
+        for key, child in children:
+            samples.extend(self._samples(dict(zip(self.labelnames, key)), child))
+        return self.exposed_name(), self.metric_type, self.documentation, samples
+
+
+class _CounterChild:
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self._value += amount
+
+    def get(self) -> float:
+        return self._value
+
+
+class Counter(_Metric):
+    metric_type = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self._unlabelled().inc(amount)
+
+    def exposed_name(self) -> str:
+        return self.name if self.name.endswith('_total') else f'{self.name}_total'
+
+    def _samples(self, labels, child):
+        return [(self.exposed_name(), labels, child.get())]
+
+
+class _GaugeChild:
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float):
+        with self._lock:
+            self._value = value
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self._value -= amount
+
+    def get(self) -> float:
+        return self._value
+
+
+class Gauge(_Metric):
+    metric_type = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self._unlabelled().set(value)
+
+    def inc(self, amount: float = 1.0):
+        self._unlabelled().inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self._unlabelled().dec(amount)
+
+    def _samples(self, labels, child):
+        return [(self.name, labels, child.get())]
+
+
+class _HistogramChild:
+    def __init__(self, buckets: Sequence[float]):
+        self._upper_bounds = list(buckets) + [math.inf]
+        self._counts = [0] * len(self._upper_bounds)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self._sum += value
+            for i, bound in enumerate(self._upper_bounds):
+                if value <= bound:
+                    self._counts[i] += 1
+                    break
+
+    @contextmanager
+    def time(self):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+    def snapshot(self):
+        with self._lock:
+            return list(zip(self._upper_bounds, self._counts)), self._sum
+
+
+class Histogram(_Metric):
+    metric_type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS, registry: Optional[MetricsRegistry] = REGISTRY):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self._unlabelled().observe(value)
+
+    def time(self):
+        return self._unlabelled().time()
+
+    def _samples(self, labels, child):
+        buckets, total = child.snapshot()
+        samples = []
+        cumulative = 0
+        for bound, count in buckets:
+            cumulative += count
+            samples.append((f'{self.name}_bucket', {**labels, 'le': _format_value(bound)}, cumulative))
+        samples.append((f'{self.name}_sum', labels, total))
+        samples.append((f'{self.name}_count', labels, cumulative))
+        return samples
+
+
+# --- 애플리케이션 지표 ---
+
+HTTP_REQUESTS = Counter(
+    'http_requests', 'HTTP 요청 수', ('blueprint', 'route', 'method', 'status'))
+HTTP_REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds', 'HTTP 요청 처리 시간(초)', ('blueprint', 'route', 'method'))
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    'http_requests_in_flight', '처리 중인 HTTP 요청 수', ('blueprint', 'route'))
+STAGE_DURATION = Histogram(
+    'pipeline_stage_duration_seconds', '처리 단계별 소요 시간(초)', ('stage',))
+MODEL_LOAD_SECONDS = Gauge(
+    'model_load_seconds', '모델 로드 소요 시간(초)', ('model',))
+CRYPTO_OPERATIONS = Counter(
+    'crypto_operations', '암호 연산 수', ('operation',))
+
+@contextmanager
+def stage_timer(stage: str):
+    """처리 단계 소요 시간을 pipeline_stage_duration_seconds에 기록하고, 활성 추적이 있으면 같은 이름의 스팬을 남깁니다."""
+    with span(stage), STAGE_DURATION.labels(stage=stage).time():
+        yield
+
+def count_crypto(operation: str, amount: int = 1):
+    CRYPTO_OPERATIONS.labels(operation=operation).inc(amount)
+
+def render_latest() -> str:
+    return REGISTRY.render()
+
+
+def init_app(app):
+    """요청별 지연/처리 중 요청 수 측정 훅을 등록합니다 (METRICS_MULTIPROCESS_DIR이 있으면 워커별 기록)."""
+    from flask import g, request
+
+    directory = app.config.get('METRICS_MULTIPROCESS_DIR')
+    REGISTRY.multiprocess = MultiProcessStore(
+        directory, REGISTRY, app.config.get('METRICS_MULTIPROCESS_INTERVAL', 5.0)) if directory else None
+
+    def _labels():
+        rule = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        return request.blueprint or 'app', rule
+
+    @app.before_request
+    def _start_request_timer():
+        if REGISTRY.multiprocess is not None:
+            REGISTRY.multiprocess.ensure_writer()
+        blueprint, route = _labels()
+        g._metrics_started = time.perf_counter()
+        g._metrics_labels = (blueprint, route)
+        HTTP_REQUESTS_IN_FLIGHT.labels(blueprint=blueprint, route=route).inc()
+
+    @app.after_request
+    def _record_status(response):
+        g._metrics_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def _observe_request(exc):
+        started = g.pop('_metrics_started', None)
+        if started is None:
+            return
+        blueprint, route = g.pop('_metrics_labels')
+        status = g.pop('_metrics_status', 500)
+        HTTP_REQUESTS_IN_FLIGHT.labels(blueprint=blueprint, route=route).dec()
+        HTTP_REQUEST_DURATION.labels(blueprint=blueprint, route=route, method=request.method).observe(
+            time.perf_counter() - started)
+        HTTP_REQUESTS.labels(blueprint=blueprint, route=route, method=request.method, status=status).inc()
@@ -0,0 +1,197 @@
+# backend/app/utils/password_hashing.py
+import os
+import threading
+import time
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Deque, Dict, Optional
+from argon2 import PasswordHasher, Type
+from argon2.exceptions import VerificationError, InvalidHashError
+from flask import current_app, has_app_context
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+class HasherBusyError(Exception):
+    """해시 실행기 대기열이 가득 찼거나 대기 시간이 초과된 경우"""
+    pass
+
+class PasswordHashingExecutor:
+    """
+    Argon2id 해시/검증 전용 실행기
+
+    동시 해시 수를 max_concurrency로 제한하여 메모리 사용량(동시 수 x memory_cost)을 고정하고,
+    대기열 길이와 대기 시간도 제한하여 로그인 폭주 시 초과 요청은 HasherBusyError로 즉시 거절합니다.
+    요청 스레드는 최대 queue_timeout + hash_budget 동안만 기다리며, 시간이 지나면 HasherBusyError를 받습니다
+    (이미 실행 중인 해시는 끝까지 실행되고, 끝날 때까지 대기열 자리를 차지합니다).
+    argon2-cffi는 해시 중 GIL을 해제하므로 스레드 풀로 충분합니다.
+    """
+
+    LATENCY_WINDOW = 1024  # 백분위 계산에 사용할 최근 표본 수
+
+    def __init__(self, max_concurrency: int = 4, max_queue: int = 32, queue_timeout: float = 5.0,
+                 time_cost: int = 3, memory_cost: int = 65536, parallelism: int = 4, hash_budget: float = 5.0):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.hash_budget = hash_budget
+        self.hasher = PasswordHasher(
+            time_cost=time_cost,
+            memory_cost=memory_cost,
+            parallelism=parallelism,
+            hash_len=32,
+            salt_len=16,
+            encoding='utf-8',
+            type=Type.ID
+        )
+        self._admission = threading.BoundedSemaphore(max_concurrency + max_queue)
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pid = None
+
+        # 지표
+        self._in_flight = 0
+        self._queued = 0
+        self._completed = {'hash': 0, 'verify': 0}
+        self._rejected_total = 0
+        self._timeout_total = 0
+        self._rehash_total = 0
+        self._latency_seconds_total = 0.0
+        self._queue_seconds_total = 0.0
+        self._latencies: Deque[float] = deque(maxlen=self.LATENCY_WINDOW)
+        self._queue_waits: Deque[float] = deque(maxlen=self.LATENCY_WINDOW)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # fork된 자식 프로세스에서는 부모의 스레드가 없으므로 새로 생성
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                                    thread_name_prefix='argon2')
+                self._pid = os.getpid()
+            return self._executor
+
+    def _run(self, op: str, fn, *args):
+        if not self._admission.acquire(timeout=0):
+            with self._lock:
+                self._rejected_total += 1
+            raise HasherBusyError("비밀번호 해시 대기열이 가득 찼습니다.")
+
+        submitted = time.perf_counter()
+        with self._lock:
+            self._queued += 1
+
+        def task():
+            started = time.perf_counter()
+            waited = started - submitted
+            with self._lock:
+                self._queued -= 1
+                self._queue_seconds_total += waited
+                self._queue_waits.append(waited)
+                if waited > self.queue_timeout:
+                    self._timeout_total += 1
+                    raise HasherBusyError("비밀번호 해시 대기 시간이 초과되었습니다.")
+                self._in_flight += 1
+            try:
+                return fn(*args)
+            finally:
+                elapsed = time.perf_counter() - started
+                with self._lock:
+                    self._in_flight -= 1
+                    self._completed[op] += 1
+                    self._latency_seconds_total += elapsed
+                    self._latencies.append(elapsed)
+
+        try:
+            future = self._get_executor().submit(task)
+        except Exception:
+            self._admission.release()
+            raise
+        # 대기열 자리는 작업이 실제로 끝날 때 반환 (시간 초과로 요청이 먼저 돌아가도 동시 수 상한 유지)
+        future.add_done_callback(lambda _: self._admission.release())
+        try:
+            return future.result(timeout=self.queue_timeout + self.hash_budget)
+        except FutureTimeoutError:
+            cancelled = future.cancel()  # 아직 대기 중이면 실행하지 않음
+            with self._lock:
+                self._timeout_total += 1
+                if cancelled:
+                    self._queued -= 1
+            raise HasherBusyError("비밀번호 해시 처리 시간이 초과되었습니다.")
+
+    def hash(self, password: str) -> str:
+        return self._run('hash', self.hasher.hash, password)
+
+    def verify(self, password_hash: str, password: str) -> bool:
+        """비밀번호 일치 여부 (불일치/잘못된 해시는 False, 과부하는 HasherBusyError)"""
+        def verify_fn():
+            try:
+                return self.hasher.verify(password_hash, password)
+            except (VerificationError, InvalidHashError):
+                return False
+        return self._run('verify', verify_fn)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """저장된 해시의 파라미터가 현재 설정과 다른지 확인합니다."""
+        try:
+            return self.hasher.check_needs_rehash(password_hash)
+        except InvalidHashError:
+            return True
+
+    def record_rehash(self):
+        with self._lock:
+            self._rehash_total += 1
+
+    @staticmethod
+    def _percentile(samples, q: float) -> float:
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def stats(self) -> Dict[str, float]:
+        """해시 지연/대기열 지표를 반환합니다."""
+        with self._lock:
+            latencies = list(self._latencies)
+            queue_waits = list(self._queue_waits)
+            return {
+                'max_concurrency': self.max_concurrency,
+                'in_flight': self._in_flight,
+                'queued': self._queued,
+                'hash_total': self._completed['hash'],
+                'verify_total': self._completed['verify'],
+                'rehash_total': self._rehash_total,
+                'rejected_total': self._rejected_total,
+                'queue_timeout_total': self._timeout_total,
+                'latency_seconds_total': self._latency_seconds_total,
+                'queue_seconds_total': self._queue_seconds_total,
+                'latency_p50_seconds': self._percentile(latencies, 0.5),
+                'latency_p99_seconds': self._percentile(latencies, 0.99),
+                'queue_wait_p99_seconds': self._percentile(queue_waits, 0.99),
+            }
+
+
+_password_hasher: Optional[PasswordHashingExecutor] = None
+_password_hasher_lock = threading.Lock()
+
+def get_password_hasher() -> PasswordHashingExecutor:
+    """프로세스 단위 비밀번호 해시 실행기를 반환합니다."""
+    global _password_hasher
+    if _password_hasher is None:
+        with _password_hasher_lock:
+            if _password_hasher is None:
+                config = current_app.config if has_app_context() else {}
+
+                def setting(key):
+                    return config.get(key, getattr(Config, key))
+
+                _password_hasher = PasswordHashingExecutor(
+                    max_concurrency=setting('ARGON2_MAX_CONCURRENCY'),
+                    max_queue=setting('ARGON2_MAX_QUEUE'),
+                    queue_timeout=setting('ARGON2_QUEUE_TIMEOUT_SECONDS'),
+                    time_cost=setting('ARGON2_TIME_COST'),
+                    memory_cost=setting('ARGON2_MEMORY_COST'),
+                    parallelism=setting('ARGON2_PARALLELISM'),
+                    hash_budget=setting('ARGON2_HASH_BUDGET_SECONDS')
+                )
+    return _password_hasher
@@ -0,0 +1,150 @@
+# backend/app/utils/rate_limiter.py
+import os
+import math
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Optional, Tuple
+from flask import current_app, has_app_context
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS token_buckets ("
+    " key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS leases ("
+    " lease_id TEXT PRIMARY KEY, pool TEXT NOT NULL, expires_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS ix_leases_pool ON leases (pool, expires_at)",
+)
+
+class AdmissionStore:
+    """
+    워커 프로세스 간에 공유되는 접수 제어 상태 (로컬 SQLite 파일)
+
+    - 토큰 버킷: 키(IP, 전화번호 등)별로 초당 refill_rate개씩 capacity까지 채워지며 요청마다 1개를 소비합니다.
+    - 임대(lease): 풀별 동시 실행 수를 제한합니다. 워커가 비정상 종료해도 lease_seconds 후 자동으로 만료됩니다.
+    모든 갱신은 BEGIN IMMEDIATE 트랜잭션 안에서 읽기-수정-쓰기로 수행되어 워커 간 경쟁에도 원자적입니다.
+    """
+
+    PRUNE_INTERVAL_SECONDS = 60.0
+
+    def __init__(self, path: str, busy_timeout_ms: int = 2000, bucket_idle_seconds: float = 86400.0):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self.bucket_idle_seconds = bucket_idle_seconds  # 가장 느린 버킷이 가득 차는 시간보다 길어야 함
+        self._local = threading.local()
+        self._last_prune = 0.0
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._transaction() as conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    def _connection(self) -> sqlite3.Connection:
+        # 스레드마다 별도 연결 (fork 이후에는 부모의 연결을 재사용하지 않음)
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+            conn.execute("PRAGMA synchronous=NORMAL")  # 재시작 시 유실되어도 되는 휘발성 상태
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        # 쓰기 잠금을 먼저 잡아 읽기-수정-쓰기 사이에 다른 워커가 끼어들지 못하게 함
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    # --- 토큰 버킷 ---
+
+    def consume(self, key: str, capacity: float, refill_rate: float,
+                cost: float = 1.0, now: Optional[float] = None) -> Tuple[bool, float]:
+        """
+        토큰을 소비합니다.
+
+        Returns:
+            (허용 여부, 거절된 경우 토큰이 다시 충분해질 때까지의 초)
+        """
+        now = time.time() if now is None else now
+        with self._transaction() as conn:
+            row = conn.execute("SELECT tokens, updated_at FROM token_buckets WHERE key = ?", (key,)).fetchone()
+            tokens = capacity if row is None else min(capacity, row[0] + max(0.0, now - row[1]) * refill_rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            conn.execute(
+                "INSERT INTO token_buckets (key, tokens, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at",
+                (key, tokens, now)
+            )
+        self._maybe_prune(now)
+        if allowed:
+            return True, 0.0
+        return False, (cost - tokens) / refill_rate if refill_rate > 0 else float('inf')
+
+    # --- 동시 실행 임대 ---
+
+    def acquire_lease(self, pool: str, limit: int, lease_seconds: float,
+                      now: Optional[float] = None) -> Optional[str]:
+        """풀의 활성 임대 수가 limit 미만이면 임대 ID를, 아니면 None을 반환합니다."""
+        now = time.time() if now is None else now
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM leases WHERE pool = ? AND expires_at <= ?", (pool, now))
+            active = conn.execute("SELECT COUNT(*) FROM leases WHERE pool = ?", (pool,)).fetchone()[0]
+            if active >= limit:
+                return None
+            lease_id = uuid.uuid4().hex
+            conn.execute("INSERT INTO leases (lease_id, pool, expires_at) VALUES (?, ?, ?)",
+                         (lease_id, pool, now + lease_seconds))
+        return lease_id
+
+    def release_lease(self, lease_id: str):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM leases WHERE lease_id = ?", (lease_id,))
+
+    def active_leases(self, pool: str, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        row = self._connection().execute(
+            "SELECT COUNT(*) FROM leases WHERE pool = ? AND expires_at > ?", (pool, now)).fetchone()
+        return row[0]
+
+    def _maybe_prune(self, now: float):
+        """오래 갱신되지 않은 버킷(이미 가득 찬 것과 같은 상태)을 주기적으로 정리합니다."""
+        if now - self._last_prune < self.PRUNE_INTERVAL_SECONDS:
+            return
+        self._last_prune = now
+        try:
+            with self._transaction() as conn:
+                conn.execute("DELETE FROM token_buckets WHERE updated_at < ?", (now - self.bucket_idle_seconds,))
+        except sqlite3.OperationalError as e:
+            logger.warning(f"접수 제어 상태 정리 실패: {e}")
+
+
+_admission_store: Optional[AdmissionStore] = None
+_admission_store_lock = threading.Lock()
+
+def get_admission_store(config=None) -> AdmissionStore:
+    """프로세스 단위 접수 제어 저장소를 반환합니다 (같은 파일을 쓰는 워커끼리 상태 공유)."""
+    global _admission_store
+    if _admission_store is None:
+        with _admission_store_lock:
+            if _admission_store is None:
+                config = config if config is not None else (current_app.config if has_app_context() else {})
+                _admission_store = AdmissionStore(config.get('ADMISSION_STORE_PATH', Config.ADMISSION_STORE_PATH))
+    return _admission_store
+
+def retry_after_header(seconds: float) -> str:
+    """Retry-After 헤더 값 (정수 초, 최소 1)"""
+    return str(max(1, math.ceil(seconds)))
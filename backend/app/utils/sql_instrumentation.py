@@ -0,0 +1,173 @@
+# backend/app/utils/sql_instrumentation.py
+import re
+import time
+import logging
+import threading
+from collections import Counter as CountDict, OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from .metrics import Histogram, Counter
+
+logger = logging.getLogger(__name__)
+
+DB_QUERIES_PER_REQUEST = Histogram(
+    'db_queries_per_request', '요청당 SQL 실행 수', ('route',),
+    buckets=(1, 2, 3, 5, 8, 13, 21, 34, 55, 89))
+DB_TIME_PER_REQUEST = Histogram(
+    'db_time_per_request_seconds', '요청당 SQL 실행 시간 합계(초)', ('route',))
+DB_SLOW_QUERIES = Counter('db_slow_queries', '느린 SQL 실행 수')
+DB_BUDGET_EXCEEDED = Counter('db_query_budget_exceeded', '쿼리 예산을 초과한 요청 수', ('route',))
+
+_WHITESPACE = re.compile(r'\s+')
+
+class QueryStats:
+    """한 범위(요청, 테스트 블록 등)에서 실행된 SQL 집계"""
+
+    def __init__(self, label: str = ''):
+        self.label = label
+        self.count = 0
+        self.total_seconds = 0.0
+        self.statements: List[Tuple[str, float]] = []
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.total_seconds += elapsed
+        self.statements.append((statement, elapsed))
+
+    def repeated(self, top: int = 3) -> List[Tuple[str, int]]:
+        """가장 많이 반복된 문장 (N+1 탐지용)"""
+        normalized = CountDict(_WHITESPACE.sub(' ', statement)[:200] for statement, _ in self.statements)
+        return [(statement, n) for statement, n in normalized.most_common(top) if n > 1]
+
+
+# 현재 활성화된 집계 범위 (중첩 가능: 요청 범위 안에 테스트 범위 등)
+_active_stats: ContextVar[Tuple[QueryStats, ...]] = ContextVar('sql_query_stats', default=())
+
+@contextmanager
+def capture_queries(label: str = ''):
+    """블록 안에서 실행된 SQL을 집계합니다."""
+    stats = QueryStats(label)
+    token = _active_stats.set(_active_stats.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _active_stats.reset(token)
+
+
+class SqlInstrumentation:
+    """
+    SQLAlchemy 엔진 이벤트 기반 SQL 계측
+
+    - 요청별 쿼리 수/DB 시간을 집계하고 예산(SQL_QUERY_BUDGET, SQL_TIME_BUDGET_MS)을 넘으면 경고를 남깁니다.
+    - SQL_SLOW_QUERY_MS를 넘는 SELECT는 같은 커넥션에서 EXPLAIN 결과를 수집해 기록합니다 (문장당 1회).
+    """
+
+    EXPLAINED_CACHE_SIZE = 256
+
+    def __init__(self):
+        self.query_budget = 0
+        self.time_budget_seconds = 0.0
+        self.slow_query_seconds = 0.0
+        self.explain_enabled = True
+        self._explained: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._installed = False
+
+    def init_app(self, app):
+        from flask import g, request
+
+        self.query_budget = app.config.get('SQL_QUERY_BUDGET', 0)
+        self.time_budget_seconds = app.config.get('SQL_TIME_BUDGET_MS', 0) / 1000.0
+        self.slow_query_seconds = app.config.get('SQL_SLOW_QUERY_MS', 0) / 1000.0
+        self.explain_enabled = app.config.get('SQL_EXPLAIN_SLOW_QUERIES', True)
+
+        if not self._installed:
+            event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+            self._installed = True
+
+        @app.before_request
+        def _start_query_stats():
+            stats = QueryStats()
+            g._sql_stats = stats
+            g._sql_stats_token = _active_stats.set(_active_stats.get() + (stats,))
+
+        @app.teardown_request
+        def _finish_query_stats(exc):
+            stats = g.pop('_sql_stats', None)
+            token = g.pop('_sql_stats_token', None)
+            if stats is None:
+                return
+            try:
+                _active_stats.reset(token)
+            except ValueError:
+                pass
+            route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+            self.check_budget(stats, route)
+
+    # --- 엔진 이벤트 ---
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('_query_started', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started_stack = conn.info.get('_query_started')
+        if not started_stack:
+            return
+        elapsed = time.perf_counter() - started_stack.pop()
+        for stats in _active_stats.get():
+            stats.record(statement, elapsed)
+        if self.slow_query_seconds and elapsed >= self.slow_query_seconds:
+            DB_SLOW_QUERIES.inc()
+            plan = self._explain(conn, statement, parameters) if not executemany else None
+            logger.warning(
+                f"느린 SQL ({elapsed * 1000:.1f}ms): {_WHITESPACE.sub(' ', statement)[:500]}",
+                extra={'duration_ms': round(elapsed * 1000, 1), 'explain': plan}
+            )
+
+    def _explain(self, conn, statement: str, parameters) -> Optional[str]:
+        """SELECT 문에 대해 EXPLAIN 결과를 수집 (DBAPI 커서를 직접 사용하여 이벤트 재귀를 피함)"""
+        if not self.explain_enabled or not statement.lstrip().upper().startswith('SELECT'):
+            return None
+        with self._lock:
+            if statement in self._explained:
+                return None
+            self._explained[statement] = None
+            while len(self._explained) > self.EXPLAINED_CACHE_SIZE:
+                self._explained.popitem(last=False)
+
+        prefix = 'EXPLAIN QUERY PLAN ' if conn.dialect.name == 'sqlite' else 'EXPLAIN '
+        try:
+            cursor = conn.connection.dbapi_connection.cursor()
+            try:
+                cursor.execute(prefix + statement, parameters)
+                return '\n'.join(' '.join(str(col) for col in row) for row in cursor.fetchall())
+            finally:
+                cursor.close()
+        except Exception as e:
+            logger.debug(f"EXPLAIN 실패: {e}")
+            return None
+
+    # --- 예산 ---
+
+    def check_budget(self, stats: QueryStats, route: str) -> bool:
+        """요청 집계를 지표로 기록하고 예산 초과 시 경고를 남깁니다."""
+        DB_QUERIES_PER_REQUEST.labels(route=route).observe(stats.count)
+        DB_TIME_PER_REQUEST.labels(route=route).observe(stats.total_seconds)
+        over_count = self.query_budget and stats.count > self.query_budget
+        over_time = self.time_budget_seconds and stats.total_seconds > self.time_budget_seconds
+        if not (over_count or over_time):
+            return True
+        DB_BUDGET_EXCEEDED.labels(route=route).inc()
+        logger.warning(
+            f"SQL 예산 초과: {route} - {stats.count}개 쿼리, {stats.total_seconds * 1000:.1f}ms",
+            extra={'route': route, 'query_count': stats.count,
+                   'db_time_ms': round(stats.total_seconds * 1000, 1), 'repeated': stats.repeated()}
+        )
+        return False
+
+
+sql_instrumentation = SqlInstrumentation()
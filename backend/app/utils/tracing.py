@@ -0,0 +1,232 @@
+# backend/app/utils/tracing.py
+import os
+import json
+import time
+import queue
+import uuid
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 경량 스팬 기반 추적
+# - start_trace()로 루트 스팬을 열면 그 안의 span() 호출이 같은 trace_id로 기록됩니다.
+# - 활성 추적이 없으면 span()은 아무것도 기록하지 않습니다.
+# - 종료된 스팬은 메모리 링 버퍼 및/또는 JSONL 파일(백그라운드 스레드 기록)로 내보냅니다.
+
+class Span:
+    __slots__ = ('trace_id', 'span_id', 'parent_id', 'name', 'start_time', '_started', 'duration_ms',
+                 'attributes', 'error')
+
+    def __init__(self, trace_id: str, name: str, parent_id: Optional[str] = None, attributes: Dict = None):
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.start_time = time.time()
+        self._started = time.perf_counter()
+        self.duration_ms = None
+        self.attributes = dict(attributes or {})
+        self.error = None
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def finish(self):
+        self.duration_ms = (time.perf_counter() - self._started) * 1000
+
+    def to_dict(self) -> Dict:
+        return {
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'start_time': self.start_time,
+            'duration_ms': round(self.duration_ms, 3) if self.duration_ms is not None else None,
+            'attributes': self.attributes,
+            'error': self.error,
+        }
+
+
+class RingBufferExporter:
+    """최근 스팬을 메모리에 보관 (관리자 엔드포인트에서 조회)"""
+
+    def __init__(self, capacity: int = 5000):
+        self._spans: Deque[Dict] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def export(self, span: Dict):
+        with self._lock:
+            self._spans.append(span)
+
+    def find(self, trace_id: Optional[str] = None, limit: int = 200) -> List[Dict]:
+        with self._lock:
+            spans = list(self._spans)
+        if trace_id:
+            return [s for s in spans if s['trace_id'] == trace_id]
+        return spans[-limit:]
+
+    def recent_traces(self, limit: int = 50) -> List[Dict]:
+        """최근 루트 스팬 목록"""
+        with self._lock:
+            roots = [s for s in self._spans if s['parent_id'] is None]
+        return roots[-limit:][::-1]
+
+
+class JsonlExporter:
+    """
+    스팬을 JSONL 파일에 기록 (요청 스레드는 큐에 넣기만 함)
+    모든 워커가 같은 파일에 기록하므로 관리자 조회는 어느 워커에서든 같은 결과를 봅니다 (파일 전체를 읽음).
+    """
+
+    def __init__(self, path: str, queue_size: int = 10000):
+        self.path = path
+        self.queue_size = queue_size
+        self._queue: Optional[queue.Queue] = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def _ensure_writer(self):
+        # fork 이후 자식 프로세스에서는 큐와 기록 스레드를 새로 만듦
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue(maxsize=self.queue_size)
+            self._pid = os.getpid()
+            threading.Thread(target=self._run, args=(self._queue,), name='trace-writer', daemon=True).start()
+
+    def export(self, span: Dict):
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self, span_queue: queue.Queue):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        while True:
+            span = span_queue.get()
+            batch = [span]
+            while len(batch) < 256:
+                try:
+                    batch.append(span_queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    for item in batch:
+                        f.write(json.dumps(item, ensure_ascii=False, default=str) + '\n')
+            except Exception as e:
+                logger.warning(f"스팬 기록 실패: {e}")
+
+    def _read(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue  # 다른 워커가 기록 중인 마지막 줄
+        except FileNotFoundError:
+            return
+
+    def find(self, trace_id: Optional[str] = None, limit: int = 200) -> List[Dict]:
+        if trace_id:
+            return [s for s in self._read() if s['trace_id'] == trace_id]
+        return list(deque(self._read(), maxlen=limit))
+
+    def recent_traces(self, limit: int = 50) -> List[Dict]:
+        """최근 루트 스팬 목록"""
+        return list(deque((s for s in self._read() if s['parent_id'] is None), maxlen=limit))[::-1]
+
+
+class Tracer:
+    def __init__(self):
+        self.enabled = True
+        self.exporters: List = []
+        self.ring_buffer: Optional[RingBufferExporter] = None
+        self.store = None  # 관리자 조회용 (JSONL이 있으면 워커 간 공유되는 JSONL, 없으면 메모리 링 버퍼)
+
+    def configure(self, enabled: bool = True, export: str = 'memory', jsonl_path: Optional[str] = None,
+                  buffer_size: int = 5000):
+        self.enabled = enabled
+        self.exporters = []
+        self.ring_buffer = None
+        self.store = None
+        targets = {t.strip() for t in export.split(',')}
+        if 'memory' in targets:
+            self.ring_buffer = RingBufferExporter(buffer_size)
+            self.exporters.append(self.ring_buffer)
+            self.store = self.ring_buffer
+        if 'jsonl' in targets and jsonl_path:
+            self.store = JsonlExporter(jsonl_path)
+            self.exporters.append(self.store)
+
+    def export(self, span: Span):
+        data = span.to_dict()
+        for exporter in self.exporters:
+            try:
+                exporter.export(data)
+            except Exception as e:
+                logger.debug(f"스팬 내보내기 실패: {e}")
+
+
+tracer = Tracer()
+tracer.configure()
+_current_span: ContextVar[Optional[Span]] = ContextVar('current_span', default=None)
+
+def new_trace_id() -> str:
+    return uuid.uuid4().hex
+
+def current_trace_id() -> Optional[str]:
+    span = _current_span.get()
+    return span.trace_id if span is not None else None
+
+@contextmanager
+def _run_span(span: Span):
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        span.finish()
+        _current_span.reset(token)
+        tracer.export(span)
+
+@contextmanager
+def start_trace(name: str, trace_id: Optional[str] = None, **attributes):
+    """새 추적(루트 스팬)을 시작합니다. 추적이 비활성화되어도 trace_id는 발급됩니다."""
+    span = Span(trace_id or new_trace_id(), name, None, attributes)
+    if not tracer.enabled:
+        yield span
+        return
+    with _run_span(span):
+        yield span
+
+@contextmanager
+def span(name: str, **attributes):
+    """현재 추적의 하위 스팬 (활성 추적이 없으면 기록하지 않음)"""
+    parent = _current_span.get()
+    if parent is None or not tracer.enabled:
+        yield None
+        return
+    with _run_span(Span(parent.trace_id, name, parent.span_id, attributes)) as child:
+        yield child
+
+def init_app(app):
+    """설정값으로 추적기를 구성합니다."""
+    tracer.configure(
+        enabled=app.config.get('TRACING_ENABLED', True),
+        export=app.config.get('TRACE_EXPORT', 'memory'),
+        jsonl_path=app.config.get('TRACE_EXPORT_PATH'),
+        buffer_size=app.config.get('TRACE_BUFFER_SIZE', 5000)
+    )
@@ -0,0 +1,111 @@
+# backend/gunicorn.conf.py
+# 운영 서버 설정: gunicorn -c gunicorn.conf.py wsgi:app
+#
+# - preload_app: 마스터에서 create_app()과 모델 적재를 한 번만 수행한 뒤 fork하여
+#   워커들이 모델 가중치를 copy-on-write로 공유합니다.
+#   (CUDA는 fork 이후 재초기화할 수 없으므로 GPU 사용 시에는 INFERENCE_MODE=server로 추론 서버를 분리하세요.)
+# - 워커별 torch 스레드 수를 제한하여 (워커 수 x 코어 수) 과다 구독을 막습니다.
+# - max_requests로 워커를 주기적으로 교체하고, graceful_timeout 동안 처리 중인 요청을 마칩니다.
+import gc
+import os
+import multiprocessing
+
+cpu_count = multiprocessing.cpu_count()
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('WEB_CONCURRENCY', max(2, cpu_count // 2)))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))  # 워커당 요청 스레드 수 (I/O 대기가 많은 상담사 요청 위주)
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1'
+
+# /metrics와 추적 조회(TRACE_EXPORT=memory)는 요청을 받은 워커의 메모리만 보므로,
+# 워커가 둘 이상이면 워커 간 공유되는 파일 저장소를 기본으로 사용 (환경 변수로 지정하면 그 값 사용)
+if workers > 1:
+    os.environ.setdefault('METRICS_MULTIPROCESS_DIR',
+                          os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'metrics'))
+    os.environ.setdefault('TRACE_EXPORT', 'jsonl')
+
+# 음성 인식 요청은 수십 초가 걸릴 수 있음
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 180))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 60))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# 워커 재활용 (메모리 단편화/누수 대비), 지터로 동시 재시작을 피함
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 200))
+
+# 워커당 torch 연산 스레드 수 (기본값: 코어 수 / 워커 수)
+torch_threads = int(os.environ.get('TORCH_NUM_THREADS', max(1, cpu_count // workers)))
+
+# OpenMP/MKL 스레드 풀은 torch 임포트 전에 환경 변수로 제한해야 적용됨 (preload 시 마스터에서 임포트)
+for _var in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS'):
+    os.environ.setdefault(_var, str(torch_threads))
+
+# 마스터에서는 GC를 끄고 fork 직전에 힙을 freeze하여,
+# 자식의 GC가 공유 페이지(모델 객체)의 헤더를 건드려 복사가 일어나는 것을 막음
+gc.disable()
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = os.environ.get('GUNICORN_ERROR_LOG', '-')
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def on_starting(server):
+    # 이전 실행이 남긴 워커별 지표 파일 정리 (카운터는 서버 재시작 시 0부터 다시 셈)
+    directory = os.environ.get('METRICS_MULTIPROCESS_DIR')
+    if directory and os.path.isdir(directory):
+        for name in os.listdir(directory):
+            if name.endswith('.json'):
+                os.remove(os.path.join(directory, name))
+
+def pre_fork(server, worker):
+    gc.freeze()
+
+def post_fork(server, worker):
+    gc.enable()
+    _limit_torch_threads(server)
+    _dispose_inherited_db_connections(server)
+    _start_dek_pool(server)
+    _resume_model_verification(server)
+    server.log.info(f"Worker {worker.pid} ready (threads={threads}, torch_threads={torch_threads})")
+
+def _limit_torch_threads(server):
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(torch_threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # 마스터에서 이미 병렬 작업이 시작된 경우 변경 불가
+        server.log.debug("torch interop threads already initialized")
+
+def _dispose_inherited_db_connections(server):
+    # 마스터(preload)에서 연 DB 커넥션을 자식이 공유하지 않도록 풀을 비움 (부모 소켓은 닫지 않음)
+    if not preload_app:
+        return
+    from app import db
+    flask_app = server.app.wsgi()
+    with flask_app.app_context():
+        db.engine.dispose(close=False)
+
+def _start_dek_pool(server):
+    # 첫 쓰기 요청이 풀 고갈로 DEK를 직접 생성하지 않도록 워커 시작 시 보충 스레드를 미리 띄움
+    # (마스터에서 스레드를 시작하면 fork 시 잠금 상태가 복사되므로 워커에서만 시작)
+    server.app.wsgi()  # preload가 아니면 여기서 워커의 앱이 생성됨 (이후 gunicorn이 같은 객체를 재사용)
+    from app.services.key_service import get_key_service
+    dek_pool = get_key_service().dek_pool
+    if dek_pool is not None:
+        dek_pool.start()
+
+def _resume_model_verification(server):
+    # 마스터에서 적재한 모델의 백그라운드 체크섬 검증 스레드는 fork되지 않으므로 워커에서 다시 시작
+    # (그대로 두면 워커의 검증 실패 기록이 갱신되지 않아 변조된 가중치로 추론함)
+    if not preload_app:
+        return
+    from app.services.model_backends import get_model_backend
+    with server.app.wsgi().app_context():
+        registry = getattr(get_model_backend(), 'registry', None)
+        if registry is not None:
+            registry.resume_background_checks()
@@ -0,0 +1,63 @@
+"""add key_epochs and KEK-wrapped DEK columns
+
+Revision ID: 7a1f3c9e4b20
+Revises: 3d2b27ade7d8
+Create Date: 2026-10-19 09:12:41.204518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a1f3c9e4b20'
+down_revision = '3d2b27ade7d8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('key_epochs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('wrapped_kek_trad', sa.LargeBinary(), nullable=False),
+    sa.Column('pqc_kem_ciphertext', sa.LargeBinary(), nullable=False),
+    sa.Column('wrapped_kek_pqc', sa.LargeBinary(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    with op.batch_alter_table('consultation_reports', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('key_epoch_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('wrapped_dek', sa.LargeBinary(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_consultation_reports_key_epoch_id'), ['key_epoch_id'], unique=False)
+        batch_op.create_foreign_key('fk_consultation_reports_key_epoch_id', 'key_epochs', ['key_epoch_id'], ['id'])
+
+    with op.batch_alter_table('encrypted_files', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('key_epoch_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('wrapped_dek', sa.LargeBinary(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_encrypted_files_key_epoch_id'), ['key_epoch_id'], unique=False)
+        batch_op.create_foreign_key('fk_encrypted_files_key_epoch_id', 'key_epochs', ['key_epoch_id'], ['id'])
+        batch_op.alter_column('encrypted_dek_trad', existing_type=sa.LargeBinary(), nullable=True)
+        batch_op.alter_column('pqc_kem_ciphertext', existing_type=sa.LargeBinary(), nullable=True)
+        batch_op.alter_column('nonce_for_dek_encryption', existing_type=sa.LargeBinary(), nullable=True)
+        batch_op.alter_column('encrypted_dek_by_pqc_shared_secret', existing_type=sa.LargeBinary(), nullable=True)
+
+
+def downgrade():
+    with op.batch_alter_table('encrypted_files', schema=None) as batch_op:
+        batch_op.alter_column('encrypted_dek_by_pqc_shared_secret', existing_type=sa.LargeBinary(), nullable=False)
+        batch_op.alter_column('nonce_for_dek_encryption', existing_type=sa.LargeBinary(), nullable=False)
+        batch_op.alter_column('pqc_kem_ciphertext', existing_type=sa.LargeBinary(), nullable=False)
+        batch_op.alter_column('encrypted_dek_trad', existing_type=sa.LargeBinary(), nullable=False)
+        batch_op.drop_constraint('fk_encrypted_files_key_epoch_id', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_encrypted_files_key_epoch_id'))
+        batch_op.drop_column('wrapped_dek')
+        batch_op.drop_column('key_epoch_id')
+
+    with op.batch_alter_table('consultation_reports', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_consultation_reports_key_epoch_id', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_consultation_reports_key_epoch_id'))
+        batch_op.drop_column('wrapped_dek')
+        batch_op.drop_column('key_epoch_id')
+
+    op.drop_table('key_epochs')
@@ -0,0 +1,26 @@
+"""add model_versions to client_calls
+
+Revision ID: a4e7d2c91f36
+Revises: f1c6d83e2a59
+Create Date: 2026-10-19 21:42:11.508317
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4e7d2c91f36'
+down_revision = 'f1c6d83e2a59'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('client_calls', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('model_versions', sa.Text(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('client_calls', schema=None) as batch_op:
+        batch_op.drop_column('model_versions')
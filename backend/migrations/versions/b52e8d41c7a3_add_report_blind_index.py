@@ -0,0 +1,50 @@
+"""add blind index columns and report_search_tokens
+
+Revision ID: b52e8d41c7a3
+Revises: 7a1f3c9e4b20
+Create Date: 2026-10-19 14:03:27.551902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b52e8d41c7a3'
+down_revision = '7a1f3c9e4b20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('report_search_tokens',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('report_id', sa.Integer(), nullable=False),
+    sa.Column('field', sa.String(length=20), nullable=False),
+    sa.Column('token', sa.String(length=32), nullable=False),
+    sa.ForeignKeyConstraint(['report_id'], ['consultation_reports.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('report_search_tokens', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_report_search_tokens_report_id'), ['report_id'], unique=False)
+        batch_op.create_index('ix_report_search_tokens_field_token', ['field', 'token'], unique=False)
+
+    with op.batch_alter_table('consultation_reports', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('client_name_bidx', sa.String(length=32), nullable=True))
+        batch_op.add_column(sa.Column('phone_number_bidx', sa.String(length=32), nullable=True))
+        batch_op.create_index(batch_op.f('ix_consultation_reports_client_name_bidx'), ['client_name_bidx'], unique=False)
+        batch_op.create_index(batch_op.f('ix_consultation_reports_phone_number_bidx'), ['phone_number_bidx'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('consultation_reports', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_consultation_reports_phone_number_bidx'))
+        batch_op.drop_index(batch_op.f('ix_consultation_reports_client_name_bidx'))
+        batch_op.drop_column('phone_number_bidx')
+        batch_op.drop_column('client_name_bidx')
+
+    with op.batch_alter_table('report_search_tokens', schema=None) as batch_op:
+        batch_op.drop_index('ix_report_search_tokens_field_token')
+        batch_op.drop_index(batch_op.f('ix_report_search_tokens_report_id'))
+
+    op.drop_table('report_search_tokens')
@@ -0,0 +1,26 @@
+"""add role to users
+
+Revision ID: b9d4e6f2a813
+Revises: a4e7d2c91f36
+Create Date: 2026-10-19 23:18:42.671305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b9d4e6f2a813'
+down_revision = 'a4e7d2c91f36'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('role', sa.String(length=20), server_default='counselor', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('role')
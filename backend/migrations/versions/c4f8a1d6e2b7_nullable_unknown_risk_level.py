@@ -0,0 +1,34 @@
+"""store unknown risk level as NULL
+
+Revision ID: c4f8a1d6e2b7
+Revises: b9d4e6f2a813
+Create Date: 2026-10-20 10:12:37.284519
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4f8a1d6e2b7'
+down_revision = 'b9d4e6f2a813'
+branch_labels = None
+depends_on = None
+
+# 위험도를 예측하지 못한 분석 상태 (이전에는 위험도 0으로 저장되어 대기열 맨 뒤로 밀림)
+UNSCORED_STATUSES = "('pending_retry', 'failed', 'no_speech')"
+
+
+def upgrade():
+    with op.batch_alter_table('consultation_reports', schema=None) as batch_op:
+        batch_op.alter_column('risk_level_recorded', existing_type=sa.Integer(), nullable=True)
+
+    op.execute(f"UPDATE client_calls SET risk_level = NULL WHERE analysis_status IN {UNSCORED_STATUSES}")
+
+
+def downgrade():
+    op.execute("UPDATE client_calls SET risk_level = 0 WHERE risk_level IS NULL")
+    op.execute("UPDATE consultation_reports SET risk_level_recorded = 0 WHERE risk_level_recorded IS NULL")
+
+    with op.batch_alter_table('consultation_reports', schema=None) as batch_op:
+        batch_op.alter_column('risk_level_recorded', existing_type=sa.Integer(), nullable=False)
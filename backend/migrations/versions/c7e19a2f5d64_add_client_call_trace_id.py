@@ -0,0 +1,28 @@
+"""add trace_id to client_calls
+
+Revision ID: c7e19a2f5d64
+Revises: b52e8d41c7a3
+Create Date: 2026-10-19 16:21:08.214730
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e19a2f5d64'
+down_revision = 'b52e8d41c7a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('client_calls', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('trace_id', sa.String(length=32), nullable=True))
+        batch_op.create_index(batch_op.f('ix_client_calls_trace_id'), ['trace_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('client_calls', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_client_calls_trace_id'))
+        batch_op.drop_column('trace_id')
@@ -0,0 +1,28 @@
+"""add analysis_status and vad_removed_seconds to client_calls
+
+Revision ID: d3a8f61b9e07
+Revises: c7e19a2f5d64
+Create Date: 2026-10-19 17:42:51.603118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3a8f61b9e07'
+down_revision = 'c7e19a2f5d64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('client_calls', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('analysis_status', sa.String(length=20), nullable=True))
+        batch_op.add_column(sa.Column('vad_removed_seconds', sa.Float(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('client_calls', schema=None) as batch_op:
+        batch_op.drop_column('vad_removed_seconds')
+        batch_op.drop_column('analysis_status')
@@ -0,0 +1,26 @@
+"""add canonical_audio_path to client_calls
+
+Revision ID: e5b2c94a7d18
+Revises: d3a8f61b9e07
+Create Date: 2026-10-19 18:20:14.382905
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b2c94a7d18'
+down_revision = 'd3a8f61b9e07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('client_calls', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('canonical_audio_path', sa.String(length=255), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('client_calls', schema=None) as batch_op:
+        batch_op.drop_column('canonical_audio_path')
@@ -0,0 +1,28 @@
+"""add audio_sha256 to client_calls
+
+Revision ID: f1c6d83e2a59
+Revises: e5b2c94a7d18
+Create Date: 2026-10-19 19:05:37.214690
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1c6d83e2a59'
+down_revision = 'e5b2c94a7d18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('client_calls', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('audio_sha256', sa.String(length=64), nullable=True))
+        batch_op.create_index(batch_op.f('ix_client_calls_audio_sha256'), ['audio_sha256'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('client_calls', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_client_calls_audio_sha256'))
+        batch_op.drop_column('audio_sha256')
@@ -4,5 +4,6 @@ from app import create_app
 app = create_app()
 
 # ----------------------------- 실행 엔트리포인트 -----------------------------
+# 개발 서버 전용. 운영 환경은 gunicorn -c gunicorn.conf.py wsgi:app
 if __name__ == '__main__':
     app.run(port=5000, debug=True)
\ No newline at end of file
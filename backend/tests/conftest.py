@@ -8,6 +8,7 @@ sys.path.insert(0, BACKEND_DIR)
 
 from app import create_app, db as _db # _db로 alias하여 원래 db와 구분
 from app.config import Config
+from app.utils.sql_instrumentation import capture_queries
 
 class TestConfig(Config):
     TESTING = True
@@ -50,4 +51,33 @@ def db(app):
 @pytest.fixture
 def runner(app):
     """Flask CLI 테스트 러너를 반환합니다."""
-    return app.test_cli_runner()
\ No newline at end of file
+    return app.test_cli_runner()
+
+@pytest.fixture(scope='session')
+def hybrid(tmp_path_factory):
+    """테스트 전용 키 디렉터리의 HybridEncryption (RSA 키 생성은 세션당 한 번)"""
+    from app.utils.hybrid_encryption import HybridEncryption
+    return HybridEncryption(keys_dir=str(tmp_path_factory.mktemp('keys')))
+
+@pytest.fixture
+def key_service(hybrid, monkeypatch):
+    """테스트 키로 만든 KeyService를 전역 키 서비스로 설정합니다 (DEK 풀 없음)."""
+    from app.services import key_service as key_service_module
+    service = key_service_module.KeyService(hybrid)
+    monkeypatch.setattr(key_service_module, '_key_service', service)
+    return service
+
+@pytest.fixture
+def query_budget():
+    """블록 안에서 실행된 SQL 수가 예산을 넘으면 실패시키는 컨텍스트 매니저를 반환합니다."""
+    from contextlib import contextmanager
+
+    @contextmanager
+    def _budget(max_queries):
+        with capture_queries() as stats:
+            yield stats
+        repeated = stats.repeated()
+        assert stats.count <= max_queries, \
+            f"SQL {stats.count}개 실행 (예산 {max_queries}). 반복된 쿼리: {repeated}"
+
+    return _budget
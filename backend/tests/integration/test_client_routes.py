@@ -0,0 +1,44 @@
+# backend/tests/integration/test_client_routes.py
+import io
+from datetime import datetime, timedelta, timezone
+from flask_jwt_extended import create_access_token
+from app.models import User, ClientCall
+from app.routes import client_routes
+from app.services import admission_service
+from app.utils.rate_limiter import AdmissionStore
+
+def auth_headers(user_id):
+    return {'Authorization': f'Bearer {create_access_token(identity=user_id)}'}
+
+def test_queue_lists_unknown_risk_first(client, db):
+    """위험도 미정(재분석 대기) 통화가 위험도 0으로 밀리지 않고 대기열 맨 앞에 오는지 테스트합니다."""
+    counselor = User(username='queue', name='Queue Counselor', password_hash='test')
+    db.session.add(counselor)
+    received_at = datetime(2026, 10, 19, tzinfo=timezone.utc)
+    for offset, (risk_level, analysis_status) in enumerate(
+            [(0, 'completed'), (2, 'completed'), (None, 'pending_retry'), (1, 'completed')]):
+        db.session.add(ClientCall(phone_number=f'0100000000{offset}', status='pending', risk_level=risk_level,
+                                  analysis_status=analysis_status,
+                                  received_at=received_at + timedelta(minutes=offset)))
+    db.session.commit()
+
+    response = client.get('/api/client/queue', headers=auth_headers(counselor.id))
+    assert response.status_code == 200
+    queue = response.get_json()['clients']
+    assert [(entry['risk'], entry['analysis_status']) for entry in queue] == [
+        (None, 'pending_retry'), (2, 'completed'), (1, 'completed'), (0, 'completed')]
+
+def test_submit_rejects_oversized_upload(app, client, db, key_service, tmp_path, monkeypatch):
+    """MAX_UPLOAD_BYTES를 넘는 업로드는 413으로 거절하고 기록 중이던 파일과 통화 행을 남기지 않는지 테스트합니다."""
+    store = AdmissionStore(str(tmp_path / 'admission.sqlite'))
+    monkeypatch.setattr(admission_service, 'get_admission_store', lambda config=None: store)
+    monkeypatch.setattr(client_routes, 'UPLOAD_FOLDER', str(tmp_path / 'uploads'))
+    (tmp_path / 'uploads').mkdir()
+    monkeypatch.setitem(app.config, 'MAX_UPLOAD_BYTES', 1024)
+
+    response = client.post('/api/client/submit', data={
+        'phoneNumber': '010-1234-5678', 'audio': (io.BytesIO(b'RIFF' + b'\0' * 2048), 'call.wav'),
+    }, content_type='multipart/form-data')
+    assert response.status_code == 413
+    assert list((tmp_path / 'uploads').iterdir()) == []
+    assert ClientCall.query.count() == 0
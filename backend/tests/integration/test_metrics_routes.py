@@ -0,0 +1,20 @@
+# backend/tests/integration/test_metrics_routes.py
+from flask_jwt_extended import create_access_token
+from app.models import User
+
+def auth_headers(db, username, role):
+    user = User(username=username, password_hash='x', name=username, role=role)
+    db.session.add(user)
+    db.session.commit()
+    return {'Authorization': f"Bearer {create_access_token(identity=str(user.id))}"}
+
+def test_traces_require_admin_role(client, db):
+    """추적 조회 API는 관리자 역할의 JWT로만 접근 가능한지 테스트합니다."""
+    assert client.get('/api/admin/traces').status_code == 401
+
+    counselor = auth_headers(db, 'counselor1', 'counselor')
+    assert client.get('/api/admin/traces', headers=counselor).status_code == 403
+    assert client.get('/api/admin/traces/abc', headers=counselor).status_code == 403
+
+    admin = auth_headers(db, 'admin1', 'admin')
+    assert client.get('/api/admin/traces', headers=admin).status_code in (200, 404)  # 404: 링 버퍼 비활성화
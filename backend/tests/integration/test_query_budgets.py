@@ -0,0 +1,57 @@
+# backend/tests/integration/test_query_budgets.py
+import pytest
+from flask_jwt_extended import create_access_token
+from app.models import User, ClientCall, ConsultationReport
+from app.utils.hybrid_encryption import HybridEncryption
+
+def auth_headers(user_id):
+    return {'Authorization': f'Bearer {create_access_token(identity=user_id)}'}
+
+@pytest.fixture
+def counselor_with_reports(db):
+    """상담사 1명과 같은 전화번호의 통화/소견서 여러 건"""
+    counselor = User(username='budget', name='Budget Counselor', status='available')
+    counselor.password_hash = 'test'
+    db.session.add(counselor)
+    db.session.commit()
+
+    calls = [ClientCall(phone_number='01012345678', risk_level=i % 3, status='completed',
+                        assigned_counselor_id=counselor.id) for i in range(5)]
+    db.session.add_all(calls)
+    db.session.commit()
+    for call in calls:
+        report = ConsultationReport(client_call_id=call.id, counselor_id=counselor.id,
+                                    risk_level_recorded=call.risk_level)
+        report.client_name = '홍길동'
+        report.memo_text = 'memo'
+        report.encrypt_fields(HybridEncryption())
+        db.session.add(report)
+    db.session.commit()
+    return counselor.id, [call.id for call in calls]
+
+def test_my_reports_query_count_is_constant(client, counselor_with_reports, query_budget):
+    """소견서 수와 관계없이 목록 조회 쿼리 수가 일정한지 테스트합니다 (N+1 방지)."""
+    counselor_id, _ = counselor_with_reports
+    headers = auth_headers(counselor_id)
+    with query_budget(4):
+        response = client.get('/api/counselor/myreports', headers=headers)
+    assert response.status_code == 200
+    assert len(response.get_json()['reports']) == 5
+
+def test_previous_reports_query_count_is_constant(client, counselor_with_reports, query_budget):
+    counselor_id, call_ids = counselor_with_reports
+    headers = auth_headers(counselor_id)
+    with query_budget(4):
+        response = client.get(f'/api/client/{call_ids[0]}/previous-reports', headers=headers)
+    assert response.status_code == 200
+    assert len(response.get_json()['reports']) == 4
+
+def test_queue_reset_is_single_update(client, counselor_with_reports, query_budget, db):
+    counselor_id, _ = counselor_with_reports
+    db.session.add_all([ClientCall(phone_number=f'0100000000{i}', status='pending') for i in range(5)])
+    db.session.commit()
+    headers = auth_headers(counselor_id)
+    with query_budget(4):
+        response = client.delete('/api/client/queue/reset', headers=headers)
+    assert response.status_code == 200
+    assert ClientCall.query.filter_by(status='cancelled_by_reset').count() == 5
@@ -0,0 +1,48 @@
+# backend/tests/unit/test_audio_pipeline.py
+import numpy as np
+import soundfile
+import pytest
+from app.services.audio_pipeline import AudioPipeline
+from app.services.audio_preprocessing import encode_canonical
+from app.services.model_backends import StubBackend
+
+SR = 16000
+
+@pytest.fixture
+def recordings(tmp_path):
+    rng = np.random.default_rng(0)
+    paths = []
+    for i, seconds in enumerate([1.0, 2.0, 0.5, 1.5]):
+        path = tmp_path / f"call_{i}.wav"
+        soundfile.write(str(path), (rng.standard_normal(int(SR * seconds)) * 0.1).astype(np.float32), SR)
+        paths.append(str(path))
+    return paths
+
+def test_pipeline_preserves_order_and_returns_canonical(recordings):
+    """결과가 입력 순서대로 나오고 원본 입력에는 표준 형식 바이트가 함께 반환되는지 테스트합니다."""
+    with AudioPipeline(StubBackend(), workers=2, queue_size=2, config={'VAD_ENABLED': False}) as pipeline:
+        results = list(pipeline.run(((i, path) for i, path in enumerate(recordings)), keep_canonical=True))
+        # 중간에 소비를 멈춰도 슬롯이 반환되어 다음 실행에 재사용됨
+        partial = pipeline.run((i, path) for i, path in enumerate(recordings))
+        next(partial)
+        partial.close()
+        assert pipeline._free_slots.qsize() == 2
+        assert [key for key, _ in pipeline.run([('again', recordings[0])])] == ['again']
+    assert [key for key, _ in results] == [0, 1, 2, 3]
+    assert [r.transcription.text for _, r in results] == [
+        'stub transcript (1.0s)', 'stub transcript (2.0s)', 'stub transcript (0.5s)', 'stub transcript (1.5s)']
+    assert all(r.canonical_audio[:4] == b'fLaC' for _, r in results)
+
+def test_pipeline_handles_oversized_features_and_errors(recordings, tmp_path):
+    """슬롯보다 큰 특징은 직접 전달되고, 디코딩 실패는 해당 항목만 실패로 처리되는지 테스트합니다."""
+    broken = tmp_path / 'broken.wav'
+    broken.write_bytes(b'not audio')
+    canonical = encode_canonical(np.zeros(SR, dtype=np.float32) + 0.1)
+    items = [('big', recordings[1]), ('broken', str(broken)), ('canonical', canonical)]
+    with AudioPipeline(StubBackend(), workers=1, queue_size=1, slot_bytes=SR * 4,
+                       config={'VAD_ENABLED': False}) as pipeline:
+        results = dict(pipeline.run(items))
+    assert results['big'].transcription.text == 'stub transcript (2.0s)'
+    assert results['broken'].transcription.text is None
+    assert results['canonical'].transcription.text == 'stub transcript (1.0s)'
+    assert results['canonical'].canonical_audio is None
@@ -0,0 +1,83 @@
+# backend/tests/unit/test_audio_preprocessing.py
+import time
+import numpy as np
+import soundfile
+import pytest
+from app.services import audio_preprocessing
+from app.services.audio_preprocessing import (EnergyVad, AudioTooLongError, decode_audio, encode_canonical,
+                                              decode_canonical, is_canonical)
+from app.utils.deadline import Deadline, DeadlineExceeded
+
+SR = 16000
+
+def silence(seconds):
+    rng = np.random.default_rng(0)
+    return (rng.standard_normal(int(SR * seconds)) * 1e-4).astype(np.float32)
+
+def speech_like(seconds):
+    # 여러 배음을 가진 진폭 변조 신호 (순음 판정에 걸리지 않음)
+    t = np.arange(int(SR * seconds)) / SR
+    rng = np.random.default_rng(1)
+    voiced = sum(np.sin(2 * np.pi * 140 * k * t) / k for k in range(1, 12))
+    noise = rng.standard_normal(len(t)) * 0.05
+    envelope = 0.6 + 0.4 * np.sin(2 * np.pi * 3 * t)
+    return (0.1 * envelope * voiced + noise * 0.1).astype(np.float32)
+
+def tone(seconds, freq=440):
+    t = np.arange(int(SR * seconds)) / SR
+    return (0.3 * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+def test_trims_leading_trailing_and_long_gaps():
+    """앞뒤 무음을 제거하고 긴 내부 무음은 최대 길이만 남기는지 테스트합니다."""
+    vad = EnergyVad(max_gap_ms=500, padding_ms=100)
+    audio = np.concatenate([silence(3), speech_like(2), silence(5), speech_like(1), silence(2)])
+    result = vad.trim(audio, SR)
+    assert result.has_speech
+    # 음성 3초 + 내부 무음 최대 0.5초 + 여유(구간당 앞뒤 0.1초)
+    assert 3.0 <= result.kept_seconds <= 3.0 + 0.5 + 0.4 + 0.1
+    assert result.removed_seconds >= 9.0
+
+def test_no_speech_recording():
+    """무음/대기음만 있는 녹음은 음성 없음으로 판단하는지 테스트합니다."""
+    vad = EnergyVad()
+    result = vad.trim(np.concatenate([silence(2), tone(3), silence(2)]), SR)
+    assert result.has_speech is False
+    assert result.kept_seconds == 0.0
+    assert result.removed_seconds == 7.0
+
+def test_keeps_continuous_speech():
+    result = EnergyVad().trim(speech_like(4), SR)
+    assert result.has_speech
+    assert result.removed_seconds < 0.1
+
+def test_canonical_round_trip():
+    """표준 형식(16kHz FLAC) 인코딩 후 메모리 디코딩 결과가 16-bit 양자화 오차 이내인지 테스트합니다."""
+    audio = speech_like(1.5)
+    data = encode_canonical(audio)
+    assert is_canonical(data)
+    assert len(data) < audio.nbytes / 2
+    decoded = decode_canonical(data)
+    assert decoded.dtype == np.float32 and len(decoded) == len(audio)
+    assert np.max(np.abs(decoded - audio)) < 1e-4
+
+def test_decode_audio_enforces_max_duration(tmp_path):
+    """MAX_AUDIO_SECONDS보다 긴 녹음은 디코딩 오류로, 상한 이하는 그대로 디코딩되는지 테스트합니다."""
+    path = str(tmp_path / 'call.wav')
+    soundfile.write(path, speech_like(2), SR)
+    assert len(decode_audio(path, max_seconds=2)) == 2 * SR
+    assert len(decode_audio(path, max_seconds=0)) == 2 * SR  # 0이면 무제한
+    with pytest.raises(AudioTooLongError):
+        decode_audio(path, max_seconds=1.5)
+
+def test_decode_audio_respects_deadline(tmp_path, monkeypatch):
+    """디코딩이 통화의 남은 제한 시간 안에 끝나지 않으면 기다리지 않고 DeadlineExceeded를 발생시키는지 테스트합니다."""
+    def slow_load(path, max_seconds):
+        time.sleep(0.5)
+        return silence(1)
+
+    monkeypatch.setattr(audio_preprocessing, '_load_audio', slow_load)
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        decode_audio('slow.wav', Deadline(0.05))
+    assert time.monotonic() - started < 0.4
+    assert len(decode_audio('slow.wav', Deadline(None))) == SR
@@ -0,0 +1,40 @@
+# backend/tests/unit/test_blind_index.py
+import pytest
+from app.utils.blind_index import BlindIndex
+
+KEY = bytes(range(32))
+
+def test_normalization_makes_tokens_match():
+    """공백/대소문자/전각 문자와 전화번호 구분자가 정규화되는지 테스트합니다."""
+    index = BlindIndex(KEY)
+    assert index.exact_token('client_name', ' 홍 길동 ') == index.exact_token('client_name', '홍길동')
+    assert index.exact_token('client_name', 'ＫＩＭ') == index.exact_token('client_name', 'kim')
+    assert index.exact_token('phone_number', '010-1234-5678') == index.exact_token('phone_number', '01012345678')
+
+def test_prefix_tokens_cover_query_prefixes():
+    """저장된 접두어 토큰에 검색어 토큰이 포함되는지 테스트합니다."""
+    index = BlindIndex(KEY, phone_min_prefix=3)
+    stored = index.prefix_tokens('phone_number', '010-1234-5678')
+    assert len(stored) == len('01012345678') - 2
+    assert index.prefix_token('phone_number', '010-12') in stored
+    assert index.prefix_token('phone_number', '01') is None
+    assert index.prefix_token('phone_number', '011') not in stored
+
+def test_tokens_are_keyed_and_field_separated():
+    """키와 필드가 다르면 토큰도 달라지는지 테스트합니다."""
+    index = BlindIndex(KEY)
+    other = BlindIndex(bytes(32))
+    assert index.exact_token('client_name', '123') != other.exact_token('client_name', '123')
+    assert index.exact_token('client_name', '123') != index.exact_token('phone_number', '123')
+    assert index.exact_token('client_name', '123') != index.prefix_token('client_name', '123')
+    assert index.exact_token('client_name', '') is None
+
+def test_short_key_rejected():
+    with pytest.raises(ValueError):
+        BlindIndex(b'short')
+
+def test_single_character_name_prefix_rejected():
+    """이름 접두어 최소 길이를 1로 설정할 수 없는지 테스트합니다."""
+    with pytest.raises(ValueError):
+        BlindIndex(KEY, name_min_prefix=1)
+    assert BlindIndex(KEY).prefix_token('client_name', '홍') is None
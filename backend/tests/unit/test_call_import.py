@@ -0,0 +1,129 @@
+# backend/tests/unit/test_call_import.py
+import shutil
+import numpy as np
+import soundfile
+import pytest
+from app.models import ClientCall
+from app.services import ai_service, call_import, model_backends
+from app.services.call_import import CallImport, discover_audio_files
+from app.services.model_backends import StubBackend
+
+SR = 16000
+
+class Interrupted(Exception):
+    pass
+
+def test_discover_audio_files_is_sorted_and_recursive(tmp_path):
+    """하위 디렉토리까지 오디오 파일만 상대 경로 순서로 찾는지 테스트합니다 (체크포인트 재개 순서)."""
+    (tmp_path / '2024').mkdir()
+    for name in ['b.wav', 'a.MP3', 'notes.txt', '2024/c.m4a']:
+        (tmp_path / name).write_bytes(b'')
+    assert discover_audio_files(str(tmp_path)) == ['2024/c.m4a', 'a.MP3', 'b.wav']
+
+def test_phone_number_from_filename(tmp_path):
+    importer = CallImport(str(tmp_path), checkpoint_dir=str(tmp_path / 'ckpt'))
+    assert importer._phone_number('2024/01012345678_20240101.wav') == '01012345678'
+    assert importer._phone_number('recording.wav') == 'unknown'
+
+@pytest.fixture
+def importer_env(app, db, key_service, tmp_path, monkeypatch):
+    """StubBackend(VAD 없음)와 임시 업로드/체크포인트 디렉토리로 가져오기를 구성합니다."""
+    monkeypatch.setattr(model_backends, '_model_backend', StubBackend())
+    monkeypatch.setitem(app.config, 'MODEL_BACKEND', 'stub')
+    monkeypatch.setitem(app.config, 'VAD_ENABLED', False)
+    source_dir = tmp_path / 'archive'
+    source_dir.mkdir()
+
+    def make_importer(**kwargs):
+        kwargs.setdefault('workers', 1)
+        return CallImport(str(source_dir), checkpoint_dir=str(tmp_path / 'ckpt'),
+                          upload_folder=str(tmp_path / 'uploads'), **kwargs)
+    return source_dir, make_importer
+
+def _write_recordings(source_dir, names, seconds=0.5):
+    rng = np.random.default_rng(len(names))
+    for name in names:
+        samples = (rng.standard_normal(int(SR * seconds)) * 0.1).astype(np.float32)
+        soundfile.write(str(source_dir / name), samples, SR)
+
+def test_import_inserts_in_batches(importer_env):
+    """batch_size건마다 일괄 INSERT하고 커밋할 때마다 체크포인트를 기록하는지 테스트합니다."""
+    source_dir, make_importer = importer_env
+    _write_recordings(source_dir, ['01011112222_a.wav', 'b.wav', 'c.wav'])
+    progress = []
+    importer = make_importer(batch_size=2, progress=lambda stats: progress.append(stats['imported']))
+
+    stats = importer.run()
+    assert stats['imported'] == 3
+    assert stats['completed'] == 3
+    assert progress == [2, 3]
+    assert ClientCall.query.count() == 3
+    call = ClientCall.query.filter_by(phone_number='01011112222').one()
+    assert call.transcribed_text == 'stub transcript (0.5s)'
+    assert call.status == 'archived'
+    assert importer._load_checkpoint()['last_path'] == 'c.wav'
+
+def test_import_resumes_from_checkpoint_and_retries_failures(importer_env, monkeypatch):
+    """중단 후 다시 실행하면 체크포인트 다음 파일부터 진행하고, 실패한 파일은 다시 시도하는지 테스트합니다."""
+    source_dir, make_importer = importer_env
+    _write_recordings(source_dir, ['a.wav', 'b.wav', 'c.wav', 'd.wav'])
+    store = CallImport._store
+
+    def failing_store(self, relative_path, result):
+        if relative_path == 'a.wav':
+            raise OSError('disk full')
+        return store(self, relative_path, result)
+
+    def interrupt(stats):
+        raise Interrupted()  # 첫 배치(b.wav, c.wav) 커밋 직후 중단
+
+    monkeypatch.setattr(CallImport, '_store', failing_store)
+    with pytest.raises(Interrupted):
+        make_importer(batch_size=2, progress=interrupt).run()
+    checkpoint = make_importer()._load_checkpoint()
+    assert checkpoint['last_path'] == 'c.wav'
+    assert checkpoint['failed_paths'] == ['a.wav']
+    assert ClientCall.query.count() == 2
+
+    monkeypatch.setattr(CallImport, '_store', store)
+    stats = make_importer(batch_size=2).run()
+    assert stats['total'] == 2  # a.wav(재시도), d.wav
+    assert stats['imported'] == 2
+    assert stats['duplicates'] == 0
+    assert ClientCall.query.count() == 4
+    assert make_importer()._load_checkpoint()['failed_paths'] == []
+
+def test_import_skips_duplicate_recordings(importer_env):
+    """같은 SHA-256의 녹음은 파일명이 달라도, 처음부터 다시 실행해도 한 번만 가져오는지 테스트합니다."""
+    source_dir, make_importer = importer_env
+    _write_recordings(source_dir, ['a.wav'])
+    shutil.copy(source_dir / 'a.wav', source_dir / 'copy.wav')
+
+    stats = make_importer(batch_size=10).run()
+    assert stats['imported'] == 1
+    assert stats['duplicates'] == 1
+
+    stats = make_importer(batch_size=10).run(restart=True)
+    assert stats['imported'] == 0
+    assert stats['duplicates'] == 2
+    assert ClientCall.query.count() == 1
+
+def test_import_in_server_mode_skips_pipeline(importer_env, monkeypatch):
+    """추론 서버 모드에서는 AudioPipeline(모델 적재) 없이 서버로 인식을 요청하는지 테스트합니다."""
+    source_dir, make_importer = importer_env
+    _write_recordings(source_dir, ['a.wav'])
+
+    def no_pipeline(*args, **kwargs):
+        raise AssertionError('서버 모드에서 파이프라인 생성')
+
+    monkeypatch.setattr(call_import, 'AudioPipeline', no_pipeline)
+    monkeypatch.setattr(ai_service, 'inference_mode', lambda: 'server')
+    monkeypatch.setattr(ai_service, '_transcribe_remote',
+                        lambda audio_bytes, deadline: ai_service.TranscriptionResult('원격 전사'))
+    monkeypatch.setattr(ai_service, '_assess_risk_remote', lambda text, deadline: ai_service.RiskResult(1))
+
+    stats = make_importer().run()
+    assert stats['imported'] == 1
+    call = ClientCall.query.one()
+    assert call.transcribed_text == '원격 전사'
+    assert call.canonical_audio_path is not None
@@ -0,0 +1,104 @@
+# backend/tests/unit/test_call_service.py
+import io
+import hashlib
+import os
+import tempfile
+import numpy as np
+import soundfile
+import pytest
+from app.models import ClientCall
+from app.services import call_service
+from app.services.audio_preprocessing import decode_canonical
+from app.services.call_service import (UploadTooLargeError, receive_upload, read_encrypted_audio, write_encrypted_audio,
+                                       store_canonical_audio, load_canonical_audio, canonical_path_for)
+
+SR = 16000
+UPLOAD = os.urandom(300 * 1024)
+
+def wav_bytes(tmp_path, seconds=1.0):
+    t = np.arange(int(SR * seconds)) / SR
+    path = tmp_path / 'source.wav'
+    soundfile.write(str(path), (0.3 * np.sin(2 * np.pi * 440 * t)).astype(np.float32), SR)
+    data = path.read_bytes()
+    path.unlink()
+    return data
+
+def test_receive_upload_encrypts_digests_and_spools(app, db, key_service, tmp_path):
+    """한 번 읽은 스트림으로 암호화 원본, SHA-256/크기, 분석용 평문 임시 파일을 모두 만드는지 테스트합니다."""
+    audio_file_path = str(tmp_path / 'call.wav')
+    upload = receive_upload(io.BytesIO(UPLOAD), audio_file_path, max_bytes=len(UPLOAD), chunk_size=64 * 1024)
+
+    assert upload.audio_file_path == audio_file_path
+    assert upload.sha256 == hashlib.sha256(UPLOAD).hexdigest()
+    assert upload.size == len(UPLOAD)
+    with open(audio_file_path, 'rb') as f:
+        assert UPLOAD not in f.read()
+    assert read_encrypted_audio(audio_file_path) == UPLOAD
+    with open(upload.plaintext_path, 'rb') as f:
+        assert f.read() == UPLOAD
+    assert sorted(os.listdir(tmp_path)) == sorted(['call.wav', os.path.basename(upload.plaintext_path)])
+
+def test_receive_upload_without_spool(app, db, key_service, tmp_path):
+    """spool=False이면 평문 임시 파일 없이 암호화 원본만 남기는지 테스트합니다 (일괄 가져오기)."""
+    audio_file_path = str(tmp_path / 'call.wav')
+    upload = receive_upload(io.BytesIO(UPLOAD), audio_file_path, max_bytes=len(UPLOAD), spool=False)
+
+    assert upload.plaintext_path is None
+    assert upload.size == len(UPLOAD)
+    assert read_encrypted_audio(audio_file_path) == UPLOAD
+    assert os.listdir(tmp_path) == ['call.wav']
+
+def test_receive_upload_too_large_removes_partial_files(app, db, key_service, tmp_path):
+    """크기 제한을 넘으면 UploadTooLargeError를 발생시키고 .part/평문 임시 파일을 모두 지우는지 테스트합니다."""
+    audio_file_path = str(tmp_path / 'call.wav')
+    with pytest.raises(UploadTooLargeError):
+        receive_upload(io.BytesIO(UPLOAD), audio_file_path, max_bytes=len(UPLOAD) - 1, chunk_size=64 * 1024)
+    assert os.listdir(tmp_path) == []
+
+def test_receive_upload_stream_error_removes_partial_files(app, db, key_service, tmp_path):
+    """스트림 읽기 중 오류(연결 끊김 등)가 나도 기록 중인 파일을 남기지 않는지 테스트합니다."""
+    class BrokenStream(io.BytesIO):
+        def read(self, size=-1):
+            if self.tell() > 0:
+                raise ConnectionResetError('client disconnected')
+            return super().read(size)
+
+    with pytest.raises(ConnectionResetError):
+        receive_upload(BrokenStream(UPLOAD), str(tmp_path / 'call.wav'), max_bytes=len(UPLOAD), chunk_size=64 * 1024)
+    assert os.listdir(tmp_path) == []
+
+def test_store_and_load_canonical_audio(app, db, key_service, tmp_path):
+    """표준 형식 파일을 KEK 컨테이너로 저장하고, 경로가 기록된 통화는 다시 변환하지 않고 읽어 오는지 테스트합니다."""
+    original_path = tmp_path / 'plain.wav'
+    original_path.write_bytes(wav_bytes(tmp_path))
+    audio_file_path = str(tmp_path / 'call.wav')
+
+    canonical_path, canonical_audio, waveform = store_canonical_audio(str(original_path), audio_file_path)
+    assert canonical_path == canonical_path_for(audio_file_path) == str(tmp_path / 'call.16k.flac')
+    with open(canonical_path, 'rb') as f:
+        assert canonical_audio not in f.read()
+    assert len(decode_canonical(canonical_audio)) == len(waveform) == SR
+
+    call = ClientCall(phone_number='01012345678', audio_file_path=audio_file_path, canonical_audio_path=canonical_path)
+    assert load_canonical_audio(call) == (canonical_audio, None)
+
+def test_load_canonical_audio_backfills_missing_file(app, db, key_service, tmp_path, monkeypatch):
+    """표준 형식이 없는 기존 통화는 암호화 원본에서 변환해 경로를 기록하고, 복호화 임시 파일을 남기지 않는지 테스트합니다."""
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+    audio_file_path = str(tmp_path / 'call.wav')
+    write_encrypted_audio(audio_file_path, wav_bytes(tmp_path))
+    call = ClientCall(phone_number='01012345678', audio_file_path=audio_file_path)
+
+    canonical_audio, waveform = load_canonical_audio(call)
+    assert call.canonical_audio_path == canonical_path_for(audio_file_path)
+    assert len(decode_canonical(canonical_audio)) == len(waveform) == SR
+    assert sorted(os.listdir(tmp_path)) == ['call.16k.flac', 'call.wav']
+    # 이후 호출은 기록된 표준 형식 파일을 읽음
+    assert load_canonical_audio(call) == (canonical_audio, None)
+
+def test_read_encrypted_audio_legacy_container(app, hybrid, tmp_path, monkeypatch):
+    """레거시(RSA/PQC) 컨테이너로 저장된 원본도 복호화되는지 테스트합니다."""
+    monkeypatch.setattr(call_service, 'HybridEncryption', lambda: hybrid)
+    path = tmp_path / 'legacy.wav'
+    path.write_bytes(b''.join(hybrid.encrypt_file_hybrid(UPLOAD)))
+    assert read_encrypted_audio(str(path)) == UPLOAD
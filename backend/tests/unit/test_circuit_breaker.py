@@ -0,0 +1,101 @@
+# backend/tests/unit/test_circuit_breaker.py
+import time
+import numpy as np
+import pytest
+from app.services import ai_service, call_service
+from app.services.model_backends import StubBackend
+from app.utils.circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+from app.utils.deadline import Deadline, DeadlineExceeded
+
+def test_breaker_opens_and_recovers_after_probe():
+    """연속 실패 시 열리고, 재설정 시간 후 시험 호출 하나만 허용하여 성공하면 닫히는지 테스트합니다."""
+    breaker = CircuitBreaker('test', failure_threshold=2, reset_timeout=10)
+    breaker.record_failure('timeout', now=0.0)
+    assert breaker.state == CLOSED
+    breaker.record_failure('timeout', now=1.0)
+    assert breaker.state == OPEN
+    assert breaker.allow(now=5.0) is False
+
+    assert breaker.allow(now=11.0) is True  # 시험 호출
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow(now=11.0) is False
+    breaker.record_failure('model_error', now=12.0)
+    assert breaker.state == OPEN
+
+    assert breaker.allow(now=22.0) is True
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.stats()['consecutive_failures'] == 0
+
+class StallingBackend(StubBackend):
+    """디코딩 루프가 멈춘 모델 (제한 시간 초과)"""
+
+    def __init__(self):
+        super().__init__()
+        self.generate_kwargs = []
+
+    def transcribe_features(self, input_features, generate_kwargs=None):
+        self.generate_kwargs.append(generate_kwargs)
+        raise DeadlineExceeded('whisper_generate')
+
+@pytest.fixture
+def stalling_backend(monkeypatch):
+    backend = StallingBackend()
+    monkeypatch.setattr(ai_service, 'get_model_backend', lambda: backend)
+    monkeypatch.setattr(ai_service, 'vad_enabled', lambda: False)
+    monkeypatch.setattr(ai_service, '_breaker', CircuitBreaker('speech_to_text', failure_threshold=2, reset_timeout=60))
+    return backend
+
+def test_timeouts_degrade_ingest_to_pending_retry(stalling_backend):
+    """시간 초과는 재분석 대기로 접수되고, 반복되면 차단기가 열려 모델을 호출하지 않는지 테스트합니다."""
+    waveform = np.zeros(16000 * 5, dtype=np.float32)
+
+    for _ in range(2):
+        result = ai_service.transcribe_canonical(b'', waveform)
+        assert result.error == 'timeout'
+        analysis = call_service.analyze_transcription(result)
+        assert (analysis.analysis_status, analysis.risk_level) == ('pending_retry', None)
+    assert ai_service.get_inference_breaker().state == OPEN
+
+    result = ai_service.transcribe_canonical(b'', waveform)
+    assert result.error == 'circuit_open'
+    assert call_service.analyze_transcription(result).analysis_status == 'pending_retry'
+    assert len(stalling_backend.generate_kwargs) == 2
+
+    # 토큰 상한은 음성 길이에 비례하고 디코딩 제한 시간이 함께 전달됨
+    kwargs = stalling_backend.generate_kwargs[0]
+    assert kwargs['max_new_tokens'] == ai_service.generate_kwargs_for(5.0)['max_new_tokens'] < 440
+    assert 0 < kwargs['max_time'] <= 45
+
+class FailingRiskBackend(StubBackend):
+    """위험도 분류가 실패하는 모델"""
+
+    def __init__(self):
+        super().__init__()
+        self.risk_calls = 0
+
+    def predict_risk(self, text):
+        self.risk_calls += 1
+        raise RuntimeError('risk model crashed')
+
+def test_risk_stage_shares_deadline_and_breaker(monkeypatch):
+    """위험도 예측도 통화 분석 제한 시간과 차단기를 따르고, 시간 초과/차단기 열림은 재분석 대기가 되는지 테스트합니다."""
+    backend = FailingRiskBackend()
+    monkeypatch.setattr(ai_service, 'get_model_backend', lambda: backend)
+    monkeypatch.setattr(ai_service, '_breaker', CircuitBreaker('speech_to_text', failure_threshold=2, reset_timeout=60))
+    transcription = ai_service.TranscriptionResult('살려 주세요')
+
+    # 인식 단계에서 제한 시간을 다 쓴 통화는 위험도 모델을 호출하지 않고 재분석 대기
+    expired = Deadline(0.001)
+    time.sleep(0.01)
+    analysis = call_service.analyze_transcription(transcription, expired)
+    assert (analysis.analysis_status, analysis.transcribed_text) == ('pending_retry', '살려 주세요')
+    assert backend.risk_calls == 0
+
+    # 모델 오류는 실패로 기록되고, 앞의 시간 초과와 함께 차단기에 누적되어 차단기가 열림
+    assert call_service.analyze_transcription(transcription).analysis_status == 'failed'
+    assert ai_service.get_inference_breaker().state == OPEN
+    assert backend.risk_calls == 1
+
+    assert call_service.analyze_transcription(transcription).analysis_status == 'pending_retry'
+    assert backend.risk_calls == 1
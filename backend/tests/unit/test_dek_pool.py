@@ -0,0 +1,72 @@
+# backend/tests/unit/test_dek_pool.py
+import threading
+import time
+from app.services.dek_pool import DekPool
+
+class FakeKeyService:
+    """호출 횟수만 세는 키 서비스 (block 이벤트로 보충 스레드만 멈출 수 있음)"""
+
+    def __init__(self):
+        self.calls = 0
+        self.block = threading.Event()
+        self.block.set()
+
+    def new_wrapped_dek(self):
+        if threading.current_thread().name == 'dek-pool-refill':
+            self.block.wait()
+        self.calls += 1
+        return (b'dek-%d' % self.calls, 1, b'wrapped-%d' % self.calls)
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+def test_refill_fills_pool_to_capacity(app):
+    """시작 후 보충 스레드가 풀을 최대 깊이까지 채우는지 테스트합니다."""
+    pool = DekPool(FakeKeyService(), app, size=4, low_watermark=2)
+    pool.start()
+    try:
+        assert _wait_for(lambda: pool.stats()['depth'] == 4)
+        assert pool.stats()['refilled_total'] == 4
+        assert pool.stats()['starvation_total'] == 0
+    finally:
+        pool.stop()
+
+def test_refill_waits_for_low_watermark(app):
+    """low watermark보다 많이 남아 있으면 보충하지 않고, 그 이하로 떨어지면 다시 가득 채우는지 테스트합니다."""
+    pool = DekPool(FakeKeyService(), app, size=4, low_watermark=2)
+    pool.start()
+    try:
+        assert _wait_for(lambda: pool.stats()['depth'] == 4)
+        pool.acquire()
+        time.sleep(0.1)
+        assert pool.stats()['depth'] == 3  # 3 > low_watermark: 보충 안 함
+
+        pool.acquire()  # 2 == low_watermark: 보충 스레드 깨움
+        assert _wait_for(lambda: pool.stats()['depth'] == 4)
+        assert pool.stats()['refilled_total'] == 6
+    finally:
+        pool.stop()
+
+def test_empty_pool_falls_back_to_inline_generation(app):
+    """풀이 비어 있으면 요청 스레드에서 직접 생성하고 고갈 이벤트로 집계하는지 테스트합니다."""
+    key_service = FakeKeyService()
+    pool = DekPool(key_service, app, size=4, low_watermark=2)
+    pool.start()
+    try:
+        assert _wait_for(lambda: pool.stats()['depth'] == 4)
+        key_service.block.clear()  # 보충 스레드를 멈춰 풀을 고갈시킴
+        for _ in range(4):
+            pool.acquire()
+        dek, key_epoch_id, wrapped_dek = pool.acquire()
+        assert key_epoch_id == 1
+        stats = pool.stats()
+        assert stats['starvation_total'] == 1
+        assert stats['acquired_total'] == 5
+    finally:
+        key_service.block.set()
+        pool.stop()
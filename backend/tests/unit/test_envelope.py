@@ -0,0 +1,33 @@
+# backend/tests/unit/test_envelope.py
+import io
+import os
+import pytest
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from app.utils.envelope import EnvelopeWriter, is_envelope, pack_envelope_header, parse_envelope
+
+def test_streaming_writer_matches_aesgcm_format():
+    """청크 단위로 기록한 컨테이너가 일반 AES-GCM 복호화(decrypt_blob 경로)로 복원되는지 테스트합니다."""
+    dek = AESGCM.generate_key(bit_length=256)
+    data = os.urandom(3 * 1024 + 17)
+    buffer = io.BytesIO()
+    writer = EnvelopeWriter(buffer, 7, b'wrapped-dek', dek)
+    for offset in range(0, len(data), 1000):
+        writer.update(data[offset:offset + 1000])
+    writer.finalize()
+
+    container = buffer.getvalue()
+    assert is_envelope(container)
+    key_epoch_id, wrapped_dek, nonce, ciphertext = parse_envelope(container)
+    assert (key_epoch_id, wrapped_dek) == (7, b'wrapped-dek')
+    assert AESGCM(dek).decrypt(nonce, ciphertext, None) == data
+
+@pytest.mark.parametrize('data', [
+    b'',
+    b'CCE1\x00',  # 헤더가 잘림
+    b'GARBAGE-HEADER-0123456789abcdef',  # 매직 불일치
+    pack_envelope_header(3, b'w' * 40) + b'\x00' * 20,  # 래핑 DEK/nonce/태그보다 짧음
+])
+def test_parse_envelope_rejects_truncated_or_garbage(data):
+    """잘린 헤더나 형식이 다른 데이터는 ValueError로 거부하는지 테스트합니다."""
+    with pytest.raises(ValueError):
+        parse_envelope(data)
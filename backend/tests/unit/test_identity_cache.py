@@ -0,0 +1,68 @@
+# backend/tests/unit/test_identity_cache.py
+import pytest
+from sqlalchemy import update
+from app.models import User
+from app.utils import identity_cache as identity_cache_module
+from app.utils.identity_cache import UserIdentityCache
+
+@pytest.fixture
+def cache(app, monkeypatch):
+    """무효화 리스너가 등록된 상태에서 새 캐시를 전역 캐시로 설정합니다."""
+    identity_cache_module.get_identity_cache()
+    cache = UserIdentityCache(ttl_seconds=60)
+    monkeypatch.setattr(identity_cache_module, '_identity_cache', cache)
+    return cache
+
+@pytest.fixture
+def user_id(db):
+    user = User(username='cached', password_hash='x', name='Cached', status='available')
+    db.session.add(user)
+    db.session.commit()
+    return user.id
+
+def test_cache_hit_restores_without_select(app, db, cache, user_id, query_budget):
+    """두 번째 요청은 스냅샷을 merge(load=False)로 복원하여 SELECT 없이 사용자를 반환하는지 테스트합니다."""
+    with app.app_context():
+        assert cache.get(user_id).username == 'cached'
+
+    with app.app_context():
+        with query_budget(0):
+            user = cache.get(user_id)
+            assert user.username == 'cached'
+            assert user.name == 'Cached'
+            assert cache.get(user_id) is user  # 요청 범위 메모이즈
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+def test_status_is_always_read_from_db(app, db, cache, user_id):
+    """캐시 적중 시에도 status는 DB의 현재 값을 읽는지 테스트합니다."""
+    with app.app_context():
+        cache.get(user_id)
+
+    # 다른 프로세스의 변경처럼 ORM 이벤트 없이 갱신
+    db.session.execute(update(User).where(User.id == user_id).values(status='offline'))
+    db.session.commit()
+
+    with app.app_context():
+        user = cache.get(user_id)
+        assert cache.stats()['hits'] == 1
+        assert user.status == 'offline'
+
+def test_update_and_delete_invalidate(app, db, cache, user_id):
+    """User 행 갱신/삭제 시 캐시 항목이 무효화되는지 테스트합니다."""
+    with app.app_context():
+        cache.get(user_id)
+    assert cache.stats()['entries'] == 1
+
+    user = db.session.get(User, user_id)
+    user.name = 'Renamed'
+    db.session.commit()
+    assert cache.stats()['entries'] == 0
+    assert cache.stats()['invalidations'] == 1
+
+    with app.app_context():
+        assert cache.get(user_id).name == 'Renamed'
+    db.session.delete(db.session.get(User, user_id))
+    db.session.commit()
+    assert cache.stats()['entries'] == 0
+    assert cache.stats()['invalidations'] == 2
@@ -0,0 +1,83 @@
+# backend/tests/unit/test_inference_scheduler.py
+import threading
+import time
+import pytest
+from app.services.inference_scheduler import (InferenceScheduler, SharedLanes, inference_priority, current_priority,
+                                              get_shared_lanes)
+from app.utils.deadline import DeadlineExceeded
+from app.utils.rate_limiter import AdmissionStore
+
+def test_live_work_runs_before_waiting_batch_work():
+    """슬롯이 비면 먼저 도착한 batch보다 나중에 도착한 live가 먼저 실행되는지 테스트합니다."""
+    scheduler = InferenceScheduler(concurrency=1, batch_share=1.0)
+    order = []
+    release = threading.Event()
+
+    def run(priority, hold=None):
+        with scheduler.slot(priority):
+            order.append(priority)
+            if hold is not None:
+                hold.wait(5)
+
+    holder = threading.Thread(target=run, args=('batch', release))
+    holder.start()
+    while scheduler.stats()['free']:
+        time.sleep(0.01)
+
+    waiters = [threading.Thread(target=run, args=('batch',))]
+    waiters[0].start()
+    while not scheduler.stats()['waiting']['batch']:
+        time.sleep(0.01)
+    waiters.append(threading.Thread(target=run, args=('live',)))
+    waiters[1].start()
+    while not scheduler.stats()['waiting']['live']:
+        time.sleep(0.01)
+
+    release.set()
+    for thread in [holder] + waiters:
+        thread.join(5)
+    assert order == ['batch', 'live', 'batch']
+
+def test_batch_share_limits_duty_cycle():
+    """batch 호출 사이에 점유율에 맞는 휴지 시간이 들어가고, live는 그동안 바로 실행되는지 테스트합니다."""
+    scheduler = InferenceScheduler(concurrency=1, batch_share=0.5)
+    with scheduler.slot('batch'):
+        time.sleep(0.1)
+
+    started = time.monotonic()
+    with scheduler.slot('live'):
+        assert time.monotonic() - started < 0.05
+    with scheduler.slot('batch'):
+        assert time.monotonic() - started >= 0.09
+
+def test_priority_context():
+    assert current_priority() == 'interactive'
+    with inference_priority('batch'):
+        assert current_priority() == 'batch'
+    assert current_priority() == 'interactive'
+    with pytest.raises(ValueError):
+        with inference_priority('urgent'):
+            pass
+
+def test_batch_yields_to_live_work_in_other_process(tmp_path):
+    """로컬 모드에서 batch 호출이 다른 프로세스(같은 저장소 파일)의 live 호출이 끝날 때까지 기다리는지 테스트합니다."""
+    path = str(tmp_path / 'admission.sqlite')
+    web_worker = SharedLanes(AdmissionStore(path), lease_seconds=10)
+    batch_job = SharedLanes(AdmissionStore(path), lease_seconds=10, poll_interval=0.01)
+    assert batch_job.wait_for_foreground(timeout=0) < 0.05  # 다른 프로세스의 live 호출이 없으면 바로 진행
+
+    waited = []
+    with web_worker.foreground():
+        with pytest.raises(DeadlineExceeded):
+            batch_job.wait_for_foreground(timeout=0.05)
+        waiter = threading.Thread(target=lambda: waited.append(batch_job.wait_for_foreground(timeout=5)))
+        waiter.start()
+        time.sleep(0.1)
+        assert waited == []
+    waiter.join(5)
+    assert waited and waited[0] >= 0.09
+
+def test_shared_lanes_disabled_in_server_mode():
+    """추론 서버 모드나 INFERENCE_SHARED_LANES=0이면 프로세스 간 우선순위를 쓰지 않는지 테스트합니다."""
+    assert get_shared_lanes({'INFERENCE_MODE': 'server'}) is None
+    assert get_shared_lanes({'INFERENCE_MODE': 'local', 'INFERENCE_SHARED_LANES': False}) is None
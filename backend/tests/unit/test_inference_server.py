@@ -0,0 +1,174 @@
+# backend/tests/unit/test_inference_server.py
+import os
+import shutil
+import tempfile
+import threading
+import time
+import pytest
+from app.services import ai_service
+from app.services.inference_server import InferenceServer
+from app.services.inference_client import InferenceClient, InferenceError, InferenceTimeoutError
+from app.utils import inference_protocol as protocol
+from app.utils.deadline import DeadlineExceeded
+
+@pytest.fixture
+def socket_path():
+    # AF_UNIX 경로 길이 제한(약 108자) 때문에 짧은 임시 디렉토리 사용
+    directory = tempfile.mkdtemp(prefix='inf')
+    yield os.path.join(directory, 'inference.sock')
+    shutil.rmtree(directory, ignore_errors=True)
+
+@pytest.fixture
+def fake_models(monkeypatch):
+    deadlines = []
+
+    def transcribe_audio_local(path, deadline=None):
+        deadlines.append(deadline.remaining())
+        with open(path, 'rb') as f:
+            data = f.read()
+        if data in (b'timeout', b'decode_error'):
+            return ai_service.TranscriptionResult(None, error=data.decode())
+        if not data:
+            return ai_service.TranscriptionResult(None, has_speech=False, vad_removed_seconds=1.5)
+        return ai_service.TranscriptionResult(f"{len(data)} bytes")
+
+    def assess_risk_local(text, deadline=None):
+        if text == 'slow':
+            time.sleep(0.5)
+        if text == 'fail':
+            return ai_service.RiskResult(None, error='model_error')
+        return ai_service.RiskResult(len(text) % 3)
+
+    monkeypatch.setattr(ai_service, 'transcribe_audio_local', transcribe_audio_local)
+    monkeypatch.setattr(ai_service, 'assess_risk_local', assess_risk_local)
+    return deadlines
+
+def start_server(socket_path):
+    server = InferenceServer(socket_path, concurrency=1)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def stop_server(server):
+    server.shutdown()
+    server.server_close()
+
+def test_round_trip_and_connection_reuse(socket_path, fake_models):
+    """인식/위험도 요청이 왕복되고 연결이 재사용되는지 테스트합니다."""
+    server = start_server(socket_path)
+    client = InferenceClient(socket_path, pool_size=2)
+    try:
+        assert client.ping() is True
+        assert client.transcribe(b'\x00' * 1234) == ('1234 bytes', True, 0.0)
+        assert client.transcribe(b'') == (None, False, 1.5)
+        assert client.predict_risk('위험') == 2
+        with pytest.raises(InferenceError) as failure:
+            client.predict_risk('fail')
+        assert failure.value.kind == 'model_error'
+        assert client._idle.qsize() == 1
+    finally:
+        client.close()
+        stop_server(server)
+
+def test_unknown_op_returns_error(socket_path, fake_models):
+    """알 수 없는 연산은 오류 응답으로 처리되고 연결은 유지되는지 테스트합니다."""
+    server = start_server(socket_path)
+    client = InferenceClient(socket_path)
+    try:
+        with pytest.raises(InferenceError):
+            client._request(99)
+        assert client.ping() is True
+    finally:
+        client.close()
+        stop_server(server)
+
+def test_timeout_discards_connection(socket_path, fake_models):
+    """응답 시간 초과 시 연결을 버리고 다음 요청은 새 연결을 사용하는지 테스트합니다."""
+    server = start_server(socket_path)
+    client = InferenceClient(socket_path, timeout=0.1)
+    try:
+        with pytest.raises(InferenceTimeoutError):
+            client.predict_risk('slow')
+        assert client._idle.qsize() == 0
+        time.sleep(0.5)
+        assert client.predict_risk('ok') == 2
+    finally:
+        client.close()
+        stop_server(server)
+
+def test_reconnects_after_server_restart(socket_path, fake_models):
+    """서버 재시작으로 끊긴 풀 연결 대신 새 연결로 재시도하는지 테스트합니다."""
+    server = start_server(socket_path)
+    client = InferenceClient(socket_path)
+    try:
+        assert client.ping() is True
+        stop_server(server)
+        server = start_server(socket_path)
+        assert client.predict_risk('abc') == 0
+    finally:
+        client.close()
+        stop_server(server)
+
+def test_unavailable_server(socket_path):
+    """서버가 없으면 ping이 False를 반환하는지 테스트합니다."""
+    assert InferenceClient(socket_path, connect_timeout=0.1).ping() is False
+
+def test_error_kinds_and_deadline_reach_client(socket_path, fake_models):
+    """서버가 요청자의 남은 시간 안에서 처리하고, 오류 종류(시간 초과/디코딩 오류)가 클라이언트에 전달되는지 테스트합니다."""
+    server = start_server(socket_path)
+    client = InferenceClient(socket_path)
+    try:
+        assert client.transcribe(b'audio', timeout=5)[0] == '5 bytes'
+        assert 4 < fake_models[-1] <= 5
+        client.transcribe(b'audio')
+        assert 0 < fake_models[-1] <= client.timeout
+
+        with pytest.raises(InferenceTimeoutError):
+            client.transcribe(b'timeout')
+        with pytest.raises(InferenceError) as decode_failure:
+            client.transcribe(b'decode_error')
+        assert decode_failure.value.kind == 'decode_error'
+        assert client._idle.qsize() == 1  # 오류 응답 후에도 연결 재사용
+    finally:
+        client.close()
+        stop_server(server)
+
+def test_handler_threads_use_app_config(app, socket_path, monkeypatch):
+    """연결 처리 스레드에서도 Config 기본값이 아닌 서버를 시작한 앱의 설정을 읽는지 테스트합니다."""
+    monkeypatch.setitem(app.config, 'WHISPER_MIN_NEW_TOKENS', 7)
+    monkeypatch.setattr(ai_service, 'transcribe_audio_local', lambda path, deadline=None:
+                        ai_service.TranscriptionResult(str(ai_service._setting('WHISPER_MIN_NEW_TOKENS'))))
+    server = InferenceServer(socket_path, app=app)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = InferenceClient(socket_path)
+    try:
+        assert client.transcribe(b'audio')[0] == '7'
+    finally:
+        client.close()
+        stop_server(server)
+
+def test_dispatch_classifies_failures(socket_path, monkeypatch):
+    """슬롯 대기 시간 초과는 timeout, 그 밖의 예외는 model_error 종류로 응답하는지 테스트합니다."""
+    def assess_risk_local(text, deadline=None):
+        if text == 'late':
+            raise DeadlineExceeded('inference_slot')
+        raise RuntimeError('boom')
+
+    monkeypatch.setattr(ai_service, 'assess_risk_local', assess_risk_local)
+    server = InferenceServer(socket_path)
+    try:
+        status, body = server.dispatch(protocol.OP_PREDICT_RISK, b'late', deadline_ms=1000)
+        assert status == protocol.STATUS_ERROR
+        assert protocol.decode_error(body)[0] == 'timeout'
+        status, body = server.dispatch(protocol.OP_PREDICT_RISK, b'other')
+        assert protocol.decode_error(body) == ('model_error', 'boom')
+    finally:
+        server.server_close()
+
+def test_risk_encoding():
+    assert protocol.decode_risk(protocol.encode_risk(2)) == 2
+    assert protocol.decode_risk(protocol.encode_risk(None)) is None
+    versions = {'backend': 'torch', 'roberta': 'repo@abc'}
+    payload = protocol.encode_risk(1, versions)
+    assert protocol.decode_risk(payload) == 1
+    assert protocol.decode_model_versions(payload) == versions
+    assert protocol.decode_model_versions(protocol.encode_risk(1)) is None
@@ -0,0 +1,103 @@
+# backend/tests/unit/test_key_rotation.py
+import os
+import pytest
+from app.services import key_service as key_service_module
+from app.services.key_rotation import KeyRotation
+from app.services.key_service import KeyService
+from app.utils.hybrid_encryption import HybridEncryption, EncryptionError, read_active_pointer
+
+class Interrupted(Exception):
+    pass
+
+@pytest.fixture
+def keys_dir(tmp_path, monkeypatch):
+    """테스트 전용 키 디렉터리를 전역 키 서비스로 설정합니다."""
+    keys_dir = str(tmp_path / 'keys')
+    monkeypatch.setattr(key_service_module, '_key_service', KeyService(HybridEncryption(keys_dir=keys_dir)))
+    return keys_dir
+
+def _encrypt_blobs(app, monkeypatch, count):
+    """에폭당 레코드 1건으로 설정하여 count개의 에폭을 만듭니다."""
+    monkeypatch.setitem(app.config, 'KEK_ROTATION_RECORDS', 1)
+    key_service = key_service_module.get_key_service()
+    return [(key_service.encrypt_blob(b'blob-%d' % i), b'blob-%d' % i) for i in range(count)]
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+def test_rotate_then_decrypt(app, db, keys_dir, monkeypatch):
+    """키 교체 후 새 프로세스와 재시작 전인 프로세스 모두 기존 데이터를 복호화하는지 테스트합니다."""
+    blobs = _encrypt_blobs(app, monkeypatch, 2)
+    old_private_key = _read(os.path.join(keys_dir, 'trad_private_key.pem'))
+    stale_hybrid = key_service_module.get_key_service().hybrid_encryption
+
+    stats = KeyRotation(keys_dir=keys_dir, workers=1).run()
+    assert stats['key_epochs'] == 2
+
+    pointer = read_active_pointer(keys_dir)
+    assert pointer is not None
+    assert not os.path.exists(os.path.join(keys_dir, HybridEncryption.ROTATION_DIR_NAME))
+    assert _read(os.path.join(stats['retired_dir'], 'trad_private_key.pem')) == old_private_key
+
+    fresh = HybridEncryption(keys_dir=keys_dir)
+    assert fresh.active_keys_dir == os.path.join(keys_dir, pointer)
+    for hybrid in (fresh, stale_hybrid):
+        key_service = KeyService(hybrid)
+        for blob, data in blobs:
+            assert key_service.decrypt_blob(*blob) == data
+
+def test_resume_from_checkpoint(app, db, keys_dir, monkeypatch):
+    """중단된 교체를 다시 실행하면 체크포인트부터 이어서 진행하고 스테이징 키를 재사용하는지 테스트합니다."""
+    blobs = _encrypt_blobs(app, monkeypatch, 3)
+
+    def interrupt(table_name, processed):
+        raise Interrupted()
+
+    with pytest.raises(Interrupted):
+        KeyRotation(keys_dir=keys_dir, batch_size=1, workers=1, progress=interrupt).run()
+
+    rotation_dir = os.path.join(keys_dir, HybridEncryption.ROTATION_DIR_NAME)
+    staged_private_key = _read(os.path.join(rotation_dir, 'trad_private_key.pem'))
+    assert read_active_pointer(keys_dir) is None
+
+    # 교체 도중에도 이미 재래핑된 에폭과 아직인 에폭 모두 복호화 가능
+    in_progress = KeyService(HybridEncryption(keys_dir=keys_dir))
+    for blob, data in blobs:
+        assert in_progress.decrypt_blob(*blob) == data
+
+    stats = KeyRotation(keys_dir=keys_dir, batch_size=1, workers=1).run()
+    assert stats['key_epochs'] == 2  # 첫 배치는 중단 전에 처리됨
+
+    fresh = HybridEncryption(keys_dir=keys_dir)
+    assert _read(os.path.join(fresh.active_keys_dir, 'trad_private_key.pem')) == staged_private_key
+    for blob, data in blobs:
+        assert KeyService(fresh).decrypt_blob(*blob) == data
+
+def test_resume_refuses_to_generate_missing_keys(app, db, keys_dir, monkeypatch):
+    """체크포인트가 있는데 스테이징 키가 사라졌으면 새 키를 만들지 않고 중단하는지 테스트합니다."""
+    _encrypt_blobs(app, monkeypatch, 2)
+
+    def interrupt(table_name, processed):
+        raise Interrupted()
+
+    with pytest.raises(Interrupted):
+        KeyRotation(keys_dir=keys_dir, batch_size=1, workers=1, progress=interrupt).run()
+
+    rotation_dir = os.path.join(keys_dir, HybridEncryption.ROTATION_DIR_NAME)
+    for name in HybridEncryption.KEY_FILES:
+        os.remove(os.path.join(rotation_dir, name))
+
+    with pytest.raises(EncryptionError):
+        KeyRotation(keys_dir=keys_dir, batch_size=1, workers=1).run()
+    assert not os.path.exists(os.path.join(rotation_dir, 'trad_private_key.pem'))
+
+def test_purge_retired_keeps_recent(keys_dir):
+    """purge-retired가 최근 keep개를 남기고 보관된 이전 키를 삭제하는지 테스트합니다."""
+    retired_root = os.path.join(keys_dir, HybridEncryption.RETIRED_DIR_NAME)
+    for stamp in ('20260101T000000Z', '20260201T000000Z', '20260301T000000Z'):
+        os.makedirs(os.path.join(retired_root, stamp))
+
+    removed = KeyRotation(keys_dir=keys_dir).purge_retired(keep=1)
+    assert len(removed) == 2
+    assert os.listdir(retired_root) == ['20260301T000000Z']
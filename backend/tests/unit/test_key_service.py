@@ -0,0 +1,52 @@
+# backend/tests/unit/test_key_service.py
+from app.models import User, ClientCall, ConsultationReport
+from app.services.key_service import KeyService, migrate_legacy_rows
+
+def test_blob_round_trip_across_epoch_rollover(app, db, key_service, hybrid, monkeypatch):
+    """에폭이 교체된 뒤에도 이전 에폭으로 암호화한 데이터를 (새 프로세스에서도) 복호화할 수 있는지 테스트합니다."""
+    monkeypatch.setitem(app.config, 'KEK_ROTATION_RECORDS', 1)
+    first = key_service.encrypt_blob(b'first')
+    second = key_service.encrypt_blob(b'second')
+    assert first[0] != second[0]
+
+    fresh = KeyService(hybrid)
+    assert fresh.decrypt_blob(*first) == b'first'
+    assert fresh.decrypt_blob(*second) == b'second'
+
+def test_new_process_adopts_live_epoch(app, db, key_service, hybrid):
+    """다른 프로세스가 만든 유효한 에폭이 있으면 새 에폭을 만들지 않고 이어서 사용하는지 테스트합니다."""
+    key_epoch_id = key_service.encrypt_blob(b'data')[0]
+    other = KeyService(hybrid)
+    assert other.encrypt_blob(b'data')[0] == key_epoch_id
+
+def test_migrate_legacy_report(app, db, key_service, hybrid):
+    """레코드별 RSA/PQC로 래핑된 레거시 소견서가 재래핑 후에도 복호화되는지 테스트합니다."""
+    counselor = User(username='legacy', password_hash='x', name='Legacy')
+    call = ClientCall(phone_number='010-0000-0000')
+    db.session.add_all([counselor, call])
+    db.session.flush()
+
+    dek = hybrid._generate_dek()
+    kem_ciphertext, dek_package, secret_key = hybrid._encrypt_dek_pqc(dek)
+    nonce, ciphertext = hybrid._encrypt_file_with_dek('레거시 메모'.encode(), dek)
+    report = ConsultationReport(
+        client_call_id=call.id, counselor_id=counselor.id, risk_level_recorded=2,
+        encrypted_memo_text=nonce + ciphertext,
+        encrypted_dek_trad=hybrid._encrypt_dek_trad(dek),
+        pqc_kem_ciphertext=kem_ciphertext,
+        pqc_secret_key=secret_key,
+        nonce_for_dek_encryption=dek_package[:12],
+        encrypted_dek_by_pqc_shared_secret=dek_package[12:]
+    )
+    db.session.add(report)
+    db.session.commit()
+
+    stats = migrate_legacy_rows()
+    assert stats['reports'] == 1
+    assert stats['failed'] == 0
+
+    migrated = db.session.get(ConsultationReport, report.id)
+    assert migrated.key_epoch_id is not None
+    assert migrated.encrypted_dek_trad is None
+    migrated.decrypt_fields(hybrid)
+    assert migrated.memo_text == '레거시 메모'
@@ -0,0 +1,84 @@
+# backend/tests/unit/test_logging_pipeline.py
+import os
+import json
+import queue
+import sys
+import logging
+from logging.handlers import QueueListener
+from app.utils import logging_pipeline
+from app.utils.logging_pipeline import JsonFormatter, NonBlockingQueueHandler, LOG_RECORDS_DROPPED
+
+def make_record(msg='통화 %s 접수', args=('42',), **extra):
+    record = logging.LogRecord('app.test', logging.INFO, __file__, 10, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+def test_json_formatter_includes_extra_fields():
+    """한 줄 JSON에 메시지 인자, 기본 필드, extra 필드가 포함되는지 테스트합니다."""
+    line = JsonFormatter().format(make_record(call_id=42, _private='hidden'))
+    assert '\n' not in line
+    entry = json.loads(line)
+    assert entry['message'] == '통화 42 접수'
+    assert entry['level'] == 'INFO'
+    assert entry['logger'] == 'app.test'
+    assert entry['call_id'] == 42
+    assert '_private' not in entry
+    assert entry['ts'].endswith('+00:00')
+
+def test_json_formatter_serializes_exception():
+    """예외 정보가 exc_info 필드에 문자열로 기록되는지 테스트합니다."""
+    try:
+        raise ValueError('boom')
+    except ValueError:
+        record = logging.LogRecord('app.test', logging.ERROR, __file__, 10, 'failed', (), None)
+        record.exc_info = sys.exc_info()
+    entry = json.loads(JsonFormatter().format(record))
+    assert 'ValueError: boom' in entry['exc_info']
+
+def test_queue_handler_drops_when_full():
+    """큐가 가득 차면 기다리지 않고 레코드를 버리고 집계하는지 테스트합니다."""
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    dropped_before = LOG_RECORDS_DROPPED._unlabelled().get()
+
+    handler.emit(make_record())
+    handler.emit(make_record())
+    handler.emit(make_record())
+
+    assert handler.queue.qsize() == 1
+    assert LOG_RECORDS_DROPPED._unlabelled().get() - dropped_before == 2
+    queued = handler.queue.get_nowait()
+    assert queued.getMessage() == '통화 42 접수'
+    assert queued.args is None
+
+def test_listener_restarts_in_forked_child(tmp_path, monkeypatch):
+    """fork 이후 자식 프로세스에서 리스너가 새 큐로 다시 시작되어 로그가 기록되는지 테스트합니다."""
+    log_path = tmp_path / 'child.log'
+    target = logging.FileHandler(log_path)
+    target.setFormatter(JsonFormatter())
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=100))
+    listener = QueueListener(handler.queue, target, respect_handler_level=True)
+    monkeypatch.setattr(logging_pipeline, '_queue_handler', handler)
+    monkeypatch.setattr(logging_pipeline, '_listener', listener)
+    listener.start()
+    parent_queue = handler.queue
+    try:
+        pid = os.fork()
+        if pid == 0:
+            # 자식: configure_logging이 등록하는 at-fork 훅과 같은 함수 실행
+            code = 1
+            try:
+                logging_pipeline._restart_listener_in_child()
+                child_handler = logging_pipeline._queue_handler
+                child_handler.emit(make_record('자식 %s', ('로그',)))
+                logging_pipeline._listener.stop()
+                code = 0 if child_handler.queue is not parent_queue else 2
+            finally:
+                os._exit(code)
+        _, status = os.waitpid(pid, 0)
+        assert os.WEXITSTATUS(status) == 0
+    finally:
+        listener.stop()
+        target.close()
+
+    messages = [json.loads(line)['message'] for line in log_path.read_text(encoding='utf-8').splitlines()]
+    assert messages == ['자식 로그']
@@ -0,0 +1,111 @@
+# backend/tests/unit/test_metrics.py
+import json
+import os
+import subprocess
+import sys
+from app.utils.metrics import MetricsRegistry, MultiProcessStore, Counter, Gauge, Histogram
+
+def test_counter_and_gauge_exposition():
+    """카운터는 *_total 이름으로 HELP/TYPE과 샘플이 일치하고, 레이블 값이 이스케이프되는지 테스트합니다."""
+    registry = MetricsRegistry()
+    jobs = Counter('jobs', '처리한 작업 수', ('kind',), registry=registry)
+    depth = Gauge('queue_depth', '대기열 깊이', registry=registry)
+    jobs.labels(kind='a"b\\c').inc(2)
+    depth.set(1.5)
+
+    lines = registry.render().splitlines()
+    assert lines[:3] == [
+        '# HELP jobs_total 처리한 작업 수',
+        '# TYPE jobs_total counter',
+        'jobs_total{kind="a\\"b\\\\c"} 2',
+    ]
+    assert lines[3:] == ['# HELP queue_depth 대기열 깊이', '# TYPE queue_depth gauge', 'queue_depth 1.5']
+
+def test_histogram_buckets_are_cumulative():
+    """히스토그램 버킷이 누적값이고 +Inf 버킷, _sum, _count가 노출되는지 테스트합니다."""
+    registry = MetricsRegistry()
+    latency = Histogram('latency_seconds', '지연', buckets=(0.1, 1.0), registry=registry)
+    for value in (0.05, 0.5, 3):
+        latency.observe(value)
+
+    lines = registry.render().splitlines()
+    assert '# TYPE latency_seconds histogram' in lines
+    assert 'latency_seconds_bucket{le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{le="1"} 2' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in lines
+    assert 'latency_seconds_sum 3.55' in lines
+    assert 'latency_seconds_count 3' in lines
+
+def test_failing_collector_does_not_break_scrape():
+    """수집기가 실패해도 나머지 지표는 노출되는지 테스트합니다."""
+    registry = MetricsRegistry()
+    Gauge('up', '동작 여부', registry=registry).set(1)
+
+    def broken():
+        raise RuntimeError('boom')
+        yield
+
+    registry.register_collector(broken)
+    registry.register_collector(lambda: [('pool_acquired_total', 'counter', '꺼낸 수', [({}, 3)])])
+    lines = registry.render().splitlines()
+    assert 'up 1' in lines
+    assert '# TYPE pool_acquired_total counter' in lines
+    assert 'pool_acquired_total 3' in lines
+
+def _worker_snapshot(pid, requests, in_flight, latency_count):
+    """다른 워커가 기록한 것과 같은 형식의 스냅샷"""
+    return {'pid': pid, 'families': [
+        ['requests_total', 'counter', '요청 수', [['requests_total', {'route': '/a'}, requests]]],
+        ['in_flight', 'gauge', '처리 중', [['in_flight', {}, in_flight]]],
+        ['latency_seconds', 'histogram', '지연', [
+            ['latency_seconds_bucket', {'le': '1'}, latency_count],
+            ['latency_seconds_bucket', {'le': '+Inf'}, latency_count],
+            ['latency_seconds_sum', {}, 0.5 * latency_count],
+            ['latency_seconds_count', {}, latency_count],
+        ]],
+    ]}
+
+def test_multiprocess_store_merges_worker_files(tmp_path):
+    """워커별 파일을 합산하고(게이지는 pid별), 종료된 워커의 카운터는 보관 파일로 옮겨 값이 줄지 않는지 테스트합니다."""
+    registry = MetricsRegistry()
+    requests = Counter('requests', '요청 수', ('route',), registry=registry)
+    in_flight = Gauge('in_flight', '처리 중', registry=registry)
+    latency = Histogram('latency_seconds', '지연', buckets=(1.0,), registry=registry)
+    requests.labels(route='/a').inc(2)
+    in_flight.set(1)
+    latency.observe(0.5)
+
+    directory = tmp_path / 'metrics'
+    store = MultiProcessStore(str(directory), registry)
+    registry.multiprocess = store
+    dead_pid = subprocess.Popen([sys.executable, '-c', 'pass'])
+    dead_pid.wait()
+    other_pid = os.getppid()
+    (directory / f'{other_pid}.json').write_text(json.dumps(_worker_snapshot(other_pid, 3, 4, 1)))
+    (directory / f'{dead_pid.pid}.json').write_text(json.dumps(_worker_snapshot(dead_pid.pid, 5, 9, 2)))
+
+    for _ in range(2):  # 보관 후에도 같은 값 (중복 합산 없음)
+        lines = registry.render().splitlines()
+        assert 'requests_total{route="/a"} 10' in lines
+        assert f'in_flight{{pid="{os.getpid()}"}} 1' in lines
+        assert f'in_flight{{pid="{other_pid}"}} 4' in lines
+        assert not any(f'pid="{dead_pid.pid}"' in line for line in lines)
+        assert 'latency_seconds_bucket{le="+Inf"} 4' in lines
+        assert 'latency_seconds_sum 2' in lines
+        assert lines.count('# TYPE requests_total counter') == 1
+    assert not (directory / f'{dead_pid.pid}.json').exists()
+    assert (directory / MultiProcessStore.ARCHIVE_FILE).exists()
+
+def test_metrics_endpoint_requires_token(app, client, db, monkeypatch):
+    """/metrics는 METRICS_TOKEN Bearer 토큰이 있어야 노출되고, 서비스 누적값은 카운터로 노출되는지 테스트합니다."""
+    monkeypatch.setitem(app.config, 'METRICS_TOKEN', 'scrape-token')
+    assert client.get('/metrics').status_code == 404
+    assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 404
+
+    response = client.get('/metrics', headers={'Authorization': 'Bearer scrape-token'})
+    assert response.status_code == 200
+    lines = response.get_data(as_text=True).splitlines()
+    assert '# TYPE argon2_executor_rejected_total counter' in lines
+    assert '# TYPE argon2_executor_in_flight gauge' in lines
+    assert '# TYPE user_identity_cache_hits_total counter' in lines
+    assert not any('stat=' in line for line in lines)
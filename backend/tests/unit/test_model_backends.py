@@ -0,0 +1,93 @@
+# backend/tests/unit/test_model_backends.py
+import numpy as np
+import pytest
+from app.services.model_backends import StubBackend, create_backend
+from app.services.model_benchmark import run_benchmark
+
+def test_create_backend():
+    """설정 이름으로 백엔드를 생성하고 알 수 없는 이름은 거부하는지 테스트합니다."""
+    assert create_backend('stub', {}).name == 'stub'
+    assert create_backend('onnx', {'ONNX_MODEL_DIR': '/tmp/onnx'}).model_dir == '/tmp/onnx'
+    with pytest.raises(ValueError):
+        create_backend('tensorrt', {})
+
+def test_stub_backend():
+    backend = StubBackend(risk_level=2)
+    backend.load()
+    assert backend.transcribe(np.zeros(32000, dtype=np.float32)) == 'stub transcript (2.0s)'
+    assert backend.predict_risk('아무 텍스트') == 2
+
+def test_benchmark_parity():
+    """첫 번째 백엔드를 기준으로 레이블 일치율을 계산하는지 테스트합니다."""
+    texts = ['첫 번째 문장', '두 번째 문장']
+    report = run_benchmark([StubBackend(0), StubBackend(0), StubBackend(1)], texts=texts, runs=2)
+    assert [r['text_labels'] for r in report['results']] == [[0, 0], [0, 0], [1, 1]]
+    assert report['results'][0]['predict_risk']['count'] == 4
+    assert [p['text_label_agreement'] for p in report['parity']] == [1.0, 0.0]
+    assert report['parity'][0]['audio_label_agreement'] is None
+
+def test_decoding_profiles():
+    """프로필마다 언어/작업이 고정되고 빔 크기와 토큰 상한이 달라지는지 테스트합니다."""
+    from app.services import ai_service
+
+    fast = ai_service.generate_kwargs_for(10.0, profile='fast-triage')
+    accurate = ai_service.generate_kwargs_for(10.0, profile='accurate')
+    assert (fast['language'], fast['task'], fast['use_cache']) == ('ko', 'transcribe', True)
+    assert (fast['num_beams'], accurate['num_beams']) == (1, 4)
+    assert fast['max_new_tokens'] < accurate['max_new_tokens'] <= 440
+    with ai_service.decoding_profile('accurate'):
+        assert ai_service.generate_kwargs_for(10.0)['num_beams'] == 4
+    assert ai_service.generate_kwargs_for(10.0)['num_beams'] == 1
+    with pytest.raises(ValueError):
+        with ai_service.decoding_profile('slow'):
+            pass
+
+def test_decoding_benchmark(tmp_path):
+    """정답 전사(.txt)가 있는 파일만 WER/CER에 반영되는지 테스트합니다."""
+    import soundfile
+    from app.services.model_benchmark import benchmark_decoding_profiles, error_rate, load_fixtures
+
+    for name in ('a', 'b'):
+        soundfile.write(str(tmp_path / f'{name}.wav'), np.zeros(16000, dtype=np.float32), 16000)
+    (tmp_path / 'a.txt').write_text('stub transcript (1.0s)', encoding='utf-8')
+    report = benchmark_decoding_profiles(StubBackend(), load_fixtures([str(tmp_path)]), ['fast-triage', 'accurate'])
+    assert (report['files'], report['scored_files']) == (2, 1)
+    assert [(r['profile'], r['num_beams'], r['wer']) for r in report['results']] == [('fast-triage', 1, 0.0), ('accurate', 4, 0.0)]
+
+    assert error_rate(['나는 오늘 학교에 갔다'], ['나는 오늘 학교 갔다']) == 0.25
+    assert error_rate(['학교에'], ['학교'], unit='char') == round(1 / 3, 4)
+    assert error_rate([], []) is None
+
+def test_assisted_decoding(tmp_path):
+    """보조 디코딩이 설정된 탐욕 프로필에만 적용되고, 벤치마크가 두 방식을 비교하는지 테스트합니다."""
+    import soundfile
+    from flask import Flask
+    from app.services import ai_service
+    from app.services.model_benchmark import benchmark_assisted_decoding, load_fixtures
+
+    app = Flask(__name__)
+    app.config['WHISPER_ASSISTED_PROFILES'] = ('fast-triage', 'accurate')
+    with app.app_context():
+        assert ai_service.generate_kwargs_for(5.0, profile='fast-triage')['assisted'] is True
+        assert 'assisted' not in ai_service.generate_kwargs_for(5.0, profile='accurate')  # 빔 서치는 제외
+    assert 'assisted' not in ai_service.generate_kwargs_for(5.0, profile='fast-triage')
+
+    class DraftBackend(StubBackend):
+        draft_model = object()
+
+        def __init__(self):
+            super().__init__()
+            self.calls = []
+
+        def transcribe_features(self, input_features, generate_kwargs=None):
+            self.calls.append(generate_kwargs['assisted'])
+            return super().transcribe_features(input_features, generate_kwargs)
+
+    soundfile.write(str(tmp_path / 'a.wav'), np.zeros(16000, dtype=np.float32), 16000)
+    backend = DraftBackend()
+    report = benchmark_assisted_decoding(backend, load_fixtures([str(tmp_path)]), runs=2)
+    assert backend.calls == [False, False, False, True, True, True]
+    assert report['transcript_exact_match'] == 1.0
+    assert report['baseline']['tokens'] == report['assisted']['tokens'] == 3
+    with pytest.raises(ValueError):
+        benchmark_assisted_decoding(StubBackend(), [])
@@ -0,0 +1,125 @@
+# backend/tests/unit/test_model_registry.py
+import hashlib
+import os
+import threading
+import pytest
+from app.services import model_registry
+from app.services.model_registry import ModelRegistry, ModelRegistryError, ModelSnapshot, registry_from_config
+
+REVISION = '0123456789abcdef0123456789abcdef01234567'
+
+@pytest.fixture
+def registry(tmp_path):
+    snapshot_dir = tmp_path / 'roberta' / REVISION
+    snapshot_dir.mkdir(parents=True)
+    files = {}
+    for name, content in (('config.json', b'{}'), ('model.safetensors', b'weights')):
+        (snapshot_dir / name).write_bytes(content)
+        files[name] = hashlib.sha256(content).hexdigest()
+    registry = ModelRegistry(str(tmp_path), str(tmp_path / 'state'))
+    registry._write_manifest({'roberta': ModelSnapshot('roberta', 'org/roberta', REVISION,
+                                                       os.path.join('roberta', REVISION), files)})
+    return ModelRegistry(str(tmp_path), str(tmp_path / 'state'))
+
+def _tamper_same_size(path):
+    """크기와 수정 시각을 그대로 둔 채 내용만 바꿉니다."""
+    stat = os.stat(path)
+    with open(path, 'r+b') as f:
+        f.write(f.read().upper())
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+def test_versions_and_paths(registry, tmp_path):
+    assert registry.versions() == {'roberta': 'org/roberta@0123456789ab'}
+    assert registry.path('roberta') == str(tmp_path / 'roberta' / REVISION)
+    with pytest.raises(ModelRegistryError):
+        registry.get('whisper')
+
+def test_verify_detects_tampering(registry):
+    """크기/수정 시각을 유지한 변조도 검증에 실패하는지 테스트합니다 (변경 시각이 바뀌면 스탬프를 쓰지 않음)."""
+    registry.verify('roberta')
+    weights = os.path.join(registry.path('roberta'), 'model.safetensors')
+    _tamper_same_size(weights)
+    with pytest.raises(ModelRegistryError):
+        registry.verify('roberta')
+    os.remove(weights)
+    with pytest.raises(ModelRegistryError):
+        registry.verify('roberta')
+
+def test_stamp_skipped_files_are_rehashed_in_background(registry, tmp_path):
+    """스탬프가 일치해 적재 시 건너뛴 파일도 백그라운드에서 다시 해시되어 변조가 발견되는지 테스트합니다."""
+    registry.verify('roberta')
+    registry.wait_verified()
+    weights = os.path.join(registry.path('roberta'), 'model.safetensors')
+    _tamper_same_size(weights)
+    # 스탬프를 변조된 파일의 현재 상태로 위조
+    stamp_path = registry._stamp_path(registry.get('roberta'))
+    stamps = registry._read_stamps(stamp_path)
+    stat = os.stat(weights)
+    stamps['model.safetensors'][:3] = [stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns]
+    registry._write_stamps(stamp_path, stamps)
+
+    registry.verify('roberta')
+    with pytest.raises(ModelRegistryError):
+        registry.wait_verified()
+    with pytest.raises(ModelRegistryError):
+        registry.check()
+    with pytest.raises(ModelRegistryError):
+        registry.verify('roberta', force=True)
+
+def test_background_check_resumes_in_forked_child(registry, monkeypatch):
+    """fork 시점에 끝나지 않은 백그라운드 검증이 자식 프로세스에서 다시 실행되어 변조가 발견되는지 테스트합니다."""
+    registry.verify('roberta')
+    weights = os.path.join(registry.path('roberta'), 'model.safetensors')
+    _tamper_same_size(weights)
+    stamp_path = registry._stamp_path(registry.get('roberta'))
+    stamps = registry._read_stamps(stamp_path)
+    stat = os.stat(weights)
+    stamps['model.safetensors'][:3] = [stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns]
+    registry._write_stamps(stamp_path, stamps)
+
+    # 부모의 검증 스레드는 fork 이후까지 멈춰 둠 (preload 마스터에서 적재 직후 fork되는 상황)
+    parent_pid = os.getpid()
+    release = threading.Event()
+    sha256_file = model_registry._sha256_file
+
+    def slow_sha256_file(path):
+        if os.getpid() == parent_pid:
+            release.wait(5)
+        return sha256_file(path)
+
+    monkeypatch.setattr(model_registry, '_sha256_file', slow_sha256_file)
+    registry.verify('roberta')
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            try:
+                registry.wait_verified()
+            except ModelRegistryError:
+                code = 0
+        finally:
+            os._exit(code)
+    release.set()
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+    with pytest.raises(ModelRegistryError):
+        registry.wait_verified()
+
+def test_verify_keeps_stamps_outside_registry(registry, tmp_path):
+    """스탬프는 상태 디렉토리에만 기록하고, 기록할 수 없어도 검증은 성공하는지 테스트합니다."""
+    registry.verify('roberta')
+    assert sorted(os.listdir(registry.path('roberta'))) == ['config.json', 'model.safetensors']
+    assert len(os.listdir(tmp_path / 'state')) == 1
+
+    blocker = tmp_path / 'blocker'
+    blocker.write_bytes(b'')  # 파일 아래에는 디렉토리를 만들 수 없음
+    unwritable = ModelRegistry(str(tmp_path), str(blocker / 'state'))
+    unwritable.verify('roberta')
+    unwritable.wait_verified()
+
+def test_registry_from_config(registry, tmp_path):
+    assert registry_from_config({'MODEL_REGISTRY_DIR': str(tmp_path)}).versions() == registry.versions()
+    missing = str(tmp_path / 'missing')
+    assert registry_from_config({'MODEL_REGISTRY_DIR': missing, 'MODEL_REGISTRY_REQUIRED': False}) is None
+    with pytest.raises(ModelRegistryError):
+        registry_from_config({'MODEL_REGISTRY_DIR': missing, 'MODEL_REGISTRY_REQUIRED': True})
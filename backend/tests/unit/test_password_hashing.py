@@ -0,0 +1,69 @@
+# backend/tests/unit/test_password_hashing.py
+import threading
+import pytest
+from app.utils.password_hashing import PasswordHashingExecutor, HasherBusyError
+
+def make_executor(**kwargs):
+    # 테스트 속도를 위해 가벼운 파라미터 사용
+    params = dict(time_cost=1, memory_cost=1024, parallelism=1)
+    params.update(kwargs)
+    return PasswordHashingExecutor(**params)
+
+def test_hash_and_verify():
+    """해시/검증과 지표 집계를 테스트합니다."""
+    executor = make_executor()
+    password_hash = executor.hash('password123')
+    assert executor.verify(password_hash, 'password123') is True
+    assert executor.verify(password_hash, 'wrong') is False
+    assert executor.verify('not-a-hash', 'password123') is False
+    stats = executor.stats()
+    assert stats['hash_total'] == 1
+    assert stats['verify_total'] == 3
+
+def test_needs_rehash_when_parameters_change():
+    """파라미터가 바뀌면 기존 해시가 재해시 대상이 되는지 테스트합니다."""
+    old_hash = make_executor().hash('password123')
+    assert make_executor().needs_rehash(old_hash) is False
+    assert make_executor(time_cost=2).needs_rehash(old_hash) is True
+
+def test_rejects_when_queue_full():
+    """동시 수 + 대기열을 넘는 요청은 즉시 거절되는지 테스트합니다."""
+    executor = make_executor(max_concurrency=1, max_queue=0)
+    release = threading.Event()
+    started = threading.Event()
+
+    def slow_hash(password):
+        started.set()
+        release.wait(5)
+        return password
+
+    worker = threading.Thread(target=executor._run, args=('hash', slow_hash, 'password123'))
+    worker.start()
+    started.wait(5)
+    try:
+        with pytest.raises(HasherBusyError):
+            executor.hash('password123')
+        assert executor.stats()['rejected_total'] == 1
+    finally:
+        release.set()
+        worker.join()
+
+def test_caller_stops_waiting_after_budget():
+    """해시가 queue_timeout + hash_budget을 넘기면 요청 스레드가 HasherBusyError로 돌아오는지 테스트합니다."""
+    executor = make_executor(max_concurrency=1, max_queue=1, queue_timeout=0.05, hash_budget=0.05)
+    release = threading.Event()
+
+    def stuck_hash(password):
+        release.wait(5)
+        return password
+
+    try:
+        with pytest.raises(HasherBusyError):
+            executor._run('hash', stuck_hash, 'password123')
+        assert executor.stats()['queue_timeout_total'] == 1
+        # 실행 중인 해시가 대기열 자리를 계속 차지하므로 동시 수 + 대기열 상한이 유지됨
+        assert executor._admission.acquire(timeout=0)
+        assert not executor._admission.acquire(timeout=0)
+        executor._admission.release()
+    finally:
+        release.set()
@@ -0,0 +1,108 @@
+# backend/tests/unit/test_rate_limiter.py
+import io
+import sqlite3
+import pytest
+from app.utils.rate_limiter import AdmissionStore
+from app import create_app
+from app.config import Config
+from app.routes import client_routes
+from app.services import admission_service
+
+def test_token_bucket_refills_over_time(tmp_path):
+    """버킷이 비면 거절하고, 시간이 지나 토큰이 채워지면 다시 허용하는지 테스트합니다."""
+    store = AdmissionStore(str(tmp_path / 'admission.sqlite'))
+    assert store.consume('ip:1.2.3.4', capacity=2, refill_rate=1.0, now=100.0) == (True, 0.0)
+    assert store.consume('ip:1.2.3.4', capacity=2, refill_rate=1.0, now=100.0) == (True, 0.0)
+    allowed, retry_after = store.consume('ip:1.2.3.4', capacity=2, refill_rate=1.0, now=100.5)
+    assert allowed is False
+    assert retry_after == pytest.approx(0.5)
+    # 다른 키와 다른 연결(다른 워커)도 같은 파일의 상태를 공유
+    other_worker = AdmissionStore(str(tmp_path / 'admission.sqlite'))
+    assert other_worker.consume('ip:5.6.7.8', capacity=2, refill_rate=1.0, now=100.5)[0] is True
+    assert other_worker.consume('ip:1.2.3.4', capacity=2, refill_rate=1.0, now=101.0)[0] is True
+
+def test_analysis_slot_rejects_when_backlog_full(tmp_path, monkeypatch):
+    """분석 중인 제출 수가 한도에 도달하면 503으로 거절하고, 끝나면 자리를 반환하는지 테스트합니다."""
+    store = AdmissionStore(str(tmp_path / 'admission.sqlite'))
+    monkeypatch.setattr(admission_service, 'get_admission_store', lambda config=None: store)
+    config = {'SUBMIT_MAX_ANALYSIS_BACKLOG': 1, 'SUBMIT_RETRY_AFTER_SECONDS': 7}
+
+    with admission_service.analysis_slot(config):
+        assert admission_service.analysis_backlog(config) == 1
+        with pytest.raises(admission_service.AdmissionRejected) as rejected:
+            with admission_service.analysis_slot(config):
+                pass
+        assert rejected.value.status_code == 503
+        assert rejected.value.retry_after == 7
+    assert admission_service.analysis_backlog(config) == 0
+
+    # 비정상 종료한 워커의 자리는 임대 만료 후 회수
+    assert store.acquire_lease('pool', limit=1, lease_seconds=10, now=0.0) is not None
+    assert store.acquire_lease('pool', limit=1, lease_seconds=10, now=5.0) is None
+    assert store.acquire_lease('pool', limit=1, lease_seconds=10, now=11.0) is not None
+
+def test_busy_store_rejects_with_503(tmp_path, monkeypatch):
+    """다른 워커가 저장소를 잠가 busy timeout이 나면 500이 아닌 503(Retry-After)으로 거절하는지 테스트합니다."""
+    store = AdmissionStore(str(tmp_path / 'admission.sqlite'))
+    monkeypatch.setattr(admission_service, 'get_admission_store', lambda config=None: store)
+    config = {'SUBMIT_RETRY_AFTER_SECONDS': 7}
+
+    def locked(*args, **kwargs):
+        raise sqlite3.OperationalError('database is locked')
+
+    monkeypatch.setattr(store, 'consume', locked)
+    monkeypatch.setattr(store, 'acquire_lease', locked)
+    for check in (lambda: admission_service.check_client_rate('1.2.3.4', config),
+                  lambda: admission_service.analysis_slot(config).__enter__()):
+        with pytest.raises(admission_service.AdmissionRejected) as rejected:
+            check()
+        assert rejected.value.status_code == 503
+        assert rejected.value.retry_after == 7
+
+def test_submit_takes_analysis_slot_after_upload(app, client, db, key_service, tmp_path, monkeypatch):
+    """분석 대기열 자리는 업로드를 받은 뒤 확보하고, 거절되면 저장한 업로드를 지우고 503을 반환하는지 테스트합니다."""
+    store = AdmissionStore(str(tmp_path / 'admission.sqlite'))
+    monkeypatch.setattr(admission_service, 'get_admission_store', lambda config=None: store)
+    monkeypatch.setattr(client_routes, 'UPLOAD_FOLDER', str(tmp_path / 'uploads'))
+    (tmp_path / 'uploads').mkdir()
+    monkeypatch.setitem(app.config, 'SUBMIT_MAX_ANALYSIS_BACKLOG', 1)
+    received = []
+    receive_upload = client_routes.call_service.receive_upload
+
+    def recording_receive_upload(*args, **kwargs):
+        received.append(admission_service.analysis_backlog())
+        return receive_upload(*args, **kwargs)
+
+    monkeypatch.setattr(client_routes.call_service, 'receive_upload', recording_receive_upload)
+    store.acquire_lease(admission_service.ANALYSIS_POOL, limit=1, lease_seconds=60)  # 다른 워커가 분석 중
+
+    response = client.post('/api/client/submit', data={
+        'phoneNumber': '010-1234-5678', 'audio': (io.BytesIO(b'RIFF....WAVE'), 'call.wav'),
+    }, content_type='multipart/form-data')
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == str(int(app.config['SUBMIT_RETRY_AFTER_SECONDS']))
+    assert received == [1]  # 업로드를 받는 동안에는 이 요청이 자리를 점유하지 않음
+    assert list((tmp_path / 'uploads').iterdir()) == []
+
+class ProxyTestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    JWT_SECRET_KEY = 'test-jwt-secret-key'
+    TRUSTED_PROXY_COUNT = 1  # 리버스 프록시 하나 뒤에서 실행
+
+def test_submit_rate_keyed_on_forwarded_client_address(app, monkeypatch):
+    """TRUSTED_PROXY_COUNT만큼의 프록시 홉을 신뢰하여 IP 한도가 프록시가 아닌 클라이언트 주소로 적용되는지 테스트합니다."""
+    seen = []
+
+    def check_client_rate(remote_addr, config=None):
+        seen.append(remote_addr)
+        raise admission_service.AdmissionRejected(429, 1, 'Too many submissions')
+
+    monkeypatch.setattr(admission_service, 'check_client_rate', check_client_rate)
+    proxied = create_app(ProxyTestConfig)
+    forwarded = {'X-Forwarded-For': '198.51.100.7, 203.0.113.9'}
+    for test_app, expected in ((app, '10.0.0.1'), (proxied, '203.0.113.9')):
+        response = test_app.test_client().post('/api/client/submit', headers=forwarded,
+                                               environ_base={'REMOTE_ADDR': '10.0.0.1'})
+        assert response.status_code == 429
+        assert seen.pop() == expected
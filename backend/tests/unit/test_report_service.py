@@ -0,0 +1,69 @@
+# backend/tests/unit/test_report_service.py
+import pytest
+from app.models import User, ClientCall, ConsultationReport, ReportSearchToken
+from app.services import report_service as report_service_module
+from app.services.report_service import ReportService
+
+@pytest.fixture
+def report(db, key_service, hybrid):
+    counselor = User(username='reporter', password_hash='x', name='Reporter')
+    call = ClientCall(phone_number='010-1234-5678')
+    db.session.add_all([counselor, call])
+    db.session.flush()
+    report = ConsultationReport(
+        client_call_id=call.id, counselor_id=counselor.id, risk_level_recorded=1,
+        client_name='홍길동', client_age=30, memo_text='첫 메모', transcribed_text='녹취'
+    )
+    report.encrypt_fields(hybrid)
+    db.session.add(report)
+    db.session.commit()
+    return report
+
+def test_update_encrypted_fields_keeps_unchanged_ciphertext(db, report, hybrid):
+    """변경된 필드만 재암호화되고 나머지 암호문 컬럼과 DEK 래핑은 바이트 단위로 유지되는지 테스트합니다."""
+    before = {column: getattr(report, column) for column in ConsultationReport.ENCRYPTED_FIELDS.values()}
+    wrapped_dek = report.wrapped_dek
+
+    report.update_encrypted_fields(hybrid, {'memo_text': '수정된 메모'})
+    db.session.commit()
+
+    assert report.encrypted_memo_text != before['encrypted_memo_text']
+    for column in ('encrypted_client_name', 'encrypted_client_age', 'encrypted_transcribed_text'):
+        assert getattr(report, column) == before[column]
+    assert report.wrapped_dek == wrapped_dek
+
+    reloaded = db.session.get(ConsultationReport, report.id)
+    reloaded.decrypt_fields(hybrid)
+    assert reloaded.memo_text == '수정된 메모'
+    assert reloaded.client_name == '홍길동'
+
+def test_update_report_skips_fields_with_same_value(db, report, hybrid, monkeypatch):
+    """수정 요청에 기존과 같은 값이 들어 있으면 해당 암호문을 다시 만들지 않는지 테스트합니다."""
+    monkeypatch.setattr(report_service_module, 'HybridEncryption', lambda: hybrid)
+    before_name = report.encrypted_client_name
+    before_age = report.encrypted_client_age
+
+    updated = ReportService().update_report(db.session, report.id, {
+        'client_name': '홍길동', 'client_age': '30', 'memo_text': '새 메모', 'client_gender': 'F'
+    })
+
+    assert updated.encrypted_client_name == before_name
+    assert updated.encrypted_client_age == before_age
+    assert updated.client_gender == 'F'
+    updated.decrypt_fields(hybrid)
+    assert updated.memo_text == '새 메모'
+
+def test_backfill_skips_report_without_recoverable_dek(db, report, hybrid, monkeypatch):
+    """DEK를 복구할 수 없는 소견서는 기존 검색 토큰을 지우지 않고 건너뛰는지 테스트합니다."""
+    monkeypatch.setattr(report_service_module, 'HybridEncryption', lambda: hybrid)
+    report.refresh_search_index()
+    db.session.commit()
+    report_id = report.id
+    tokens_before = ReportSearchToken.query.filter_by(report_id=report_id).count()
+    assert tokens_before > 0
+
+    report.wrapped_dek = bytes(len(report.wrapped_dek))  # 손상된 래핑
+    db.session.commit()
+
+    assert ReportService().backfill_search_index(db.session) == 0
+    assert ReportSearchToken.query.filter_by(report_id=report_id).count() == tokens_before
@@ -0,0 +1,92 @@
+# backend/tests/unit/test_tracing.py
+import json
+import time
+import pytest
+from app.utils import tracing
+from app.utils.metrics import stage_timer, STAGE_DURATION
+
+@pytest.fixture
+def memory_tracer():
+    tracing.tracer.configure(enabled=True, export='memory', buffer_size=100)
+    yield tracing.tracer
+    tracing.tracer.configure()
+
+def test_nested_spans_share_trace_id(memory_tracer):
+    """하위 스팬이 같은 trace_id와 부모 ID로 기록되는지 테스트합니다."""
+    with tracing.start_trace('call_ingest') as root:
+        with tracing.span('encrypt') as child:
+            assert tracing.current_trace_id() == root.trace_id
+    assert tracing.current_trace_id() is None
+
+    spans = {s['name']: s for s in memory_tracer.ring_buffer.find(root.trace_id)}
+    assert spans['encrypt']['parent_id'] == root.span_id
+    assert spans['call_ingest']['parent_id'] is None
+    assert spans['encrypt']['duration_ms'] >= 0
+    assert memory_tracer.ring_buffer.recent_traces()[0]['trace_id'] == root.trace_id
+
+def test_span_without_trace_is_noop(memory_tracer):
+    """활성 추적이 없으면 스팬을 기록하지 않는지 테스트합니다."""
+    with tracing.span('orphan') as orphan:
+        assert orphan is None
+    assert memory_tracer.ring_buffer.find() == []
+
+def test_span_records_error(memory_tracer):
+    """예외가 발생한 스팬에 오류가 기록되는지 테스트합니다."""
+    with pytest.raises(ValueError):
+        with tracing.start_trace('call_ingest') as root:
+            with tracing.span('decrypt'):
+                raise ValueError('bad tag')
+    errors = {s['name']: s['error'] for s in memory_tracer.ring_buffer.find(root.trace_id)}
+    assert errors['decrypt'] == 'ValueError: bad tag'
+
+def test_stage_timer_emits_span_and_metric(memory_tracer):
+    """stage_timer가 스팬과 단계 지표를 함께 남기는지 테스트합니다."""
+    _, before = STAGE_DURATION.labels(stage='unit_test_stage').snapshot()
+    with tracing.start_trace('call_ingest') as root:
+        with stage_timer('unit_test_stage'):
+            time.sleep(0.001)
+    _, after = STAGE_DURATION.labels(stage='unit_test_stage').snapshot()
+    assert after > before
+    assert 'unit_test_stage' in {s['name'] for s in memory_tracer.ring_buffer.find(root.trace_id)}
+
+def test_jsonl_exporter_writes_spans(tmp_path):
+    """JSONL 내보내기가 백그라운드 스레드에서 파일에 기록하는지 테스트합니다."""
+    path = tmp_path / 'traces.jsonl'
+    tracing.tracer.configure(enabled=True, export='jsonl', jsonl_path=str(path))
+    try:
+        with tracing.start_trace('call_ingest') as root:
+            with tracing.span('db_commit'):
+                pass
+        deadline = time.monotonic() + 5
+        lines = []
+        while time.monotonic() < deadline:
+            if path.exists():
+                lines = path.read_text(encoding='utf-8').splitlines()
+                if len(lines) >= 2:
+                    break
+            time.sleep(0.01)
+        records = [json.loads(line) for line in lines]
+        assert {r['name'] for r in records} == {'call_ingest', 'db_commit'}
+        assert all(r['trace_id'] == root.trace_id for r in records)
+    finally:
+        tracing.tracer.configure()
+
+def test_jsonl_store_serves_trace_lookups(tmp_path):
+    """JSONL 내보내기를 쓰면 관리자 조회가 (워커 간 공유되는) 파일에서 추적을 찾는지 테스트합니다."""
+    path = tmp_path / 'traces.jsonl'
+    tracing.tracer.configure(enabled=True, export='jsonl', jsonl_path=str(path))
+    try:
+        assert tracing.tracer.store.find('unknown') == []
+        with tracing.start_trace('call_ingest') as root:
+            with tracing.span('encrypt'):
+                pass
+        store = tracing.tracer.store
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and len(store.find(root.trace_id)) < 2:
+            time.sleep(0.01)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{"trace_id": "partial')  # 다른 워커가 기록 중인 줄
+        assert {s['name'] for s in store.find(root.trace_id)} == {'call_ingest', 'encrypt'}
+        assert [s['trace_id'] for s in store.recent_traces()] == [root.trace_id]
+    finally:
+        tracing.tracer.configure()
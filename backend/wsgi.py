@@ -0,0 +1,6 @@
+# backend/wsgi.py
+# 운영용 WSGI 엔트리포인트: gunicorn -c gunicorn.conf.py wsgi:app
+# (개발 서버는 run.py 사용)
+from app import create_app
+
+app = create_app()
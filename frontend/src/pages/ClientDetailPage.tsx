@@ -11,7 +11,7 @@ axios.defaults.baseURL = 'http://localhost:5000';
 interface Client {
   id: number;
   phone: string;
-  risk: 0 | 1 | 2;  // 자살 위험도 (0: 낮음, 1: 중간, 2: 높음)
+  risk: 0 | 1 | 2 | null;  // 자살 위험도 (0: 낮음, 1: 중간, 2: 높음, null: 미정)
   transcribed_text: string;
 }
 
@@ -22,7 +22,7 @@ interface PreviousReport {
   age: number;
   gender: string;
   phone: string;
-  risk: number;
+  risk: number | null;
   memo: string;
   transcribed_text: string;
   created_at: string;
@@ -47,6 +47,7 @@ const riskColors = {
   0: 'bg-green-500',
   1: 'bg-yellow-400',
   2: 'bg-red-500',
+  unknown: 'bg-purple-500',
 };
 
 // 자살 위험도 라벨
@@ -54,6 +55,7 @@ const riskLabels = {
   0: '자살위험도 낮음',
   1: '자살위험도 중간',
   2: '자살위험도 높음',
+  unknown: '자살위험도 미정 (분석 대기)',
 };
 
 const ClientDetailPage = () => {
@@ -214,10 +216,12 @@ const ClientDetailPage = () => {
                     <span className={`px-2 py-1 rounded-full text-xs font-medium ${
                       report.risk === 0 ? 'bg-green-100 text-green-800' :
                       report.risk === 1 ? 'bg-yellow-100 text-yellow-800' :
+                      report.risk === null ? 'bg-purple-100 text-purple-800' :
                       'bg-red-100 text-red-800'
                     }`}>
                       {report.risk === 0 ? '자살위험도 낮음' :
                        report.risk === 1 ? '자살위험도 중간' :
+                       report.risk === null ? '자살위험도 미정' :
                        '자살위험도 높음'}
                     </span>
                   </div>
@@ -298,8 +302,8 @@ const ClientDetailPage = () => {
           <div>
             <label className="block text-sm font-semibold text-blue-800 mb-1">자살위험도</label>
             <div className="flex items-center space-x-3 px-4 py-3 border border-blue-100 rounded-xl bg-gray-100">
-              <span className={`w-4 h-4 rounded-full ${riskColors[client.risk]}`} />
-              <span className="text-sm text-gray-700">{riskLabels[client.risk]}</span>
+              <span className={`w-4 h-4 rounded-full ${riskColors[client.risk ?? 'unknown']}`} />
+              <span className="text-sm text-gray-700">{riskLabels[client.risk ?? 'unknown']}</span>
             </div>
           </div>
 
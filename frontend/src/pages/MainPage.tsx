@@ -16,7 +16,7 @@ interface DecodedToken {
 interface Client {
   id: number;
   phone: string;
-  risk: 0 | 1 | 2;
+  risk: 0 | 1 | 2 | null;  // null: 위험도 미정 (AI 분석 지연/실패)
 }
 
 // 위험도 라벨 매핑
@@ -24,6 +24,7 @@ const riskLabels = {
   0: '자살위험도 낮음',
   1: '자살위험도 중간',
   2: '자살위험도 높음',
+  unknown: '자살위험도 미정 (분석 대기)',
 };
 
 // 위험도 색상 매핑 (테두리 색)
@@ -31,8 +32,12 @@ const riskColors = {
   0: 'border-green-500',
   1: 'border-yellow-400',
   2: 'border-red-500',
+  unknown: 'border-purple-500',
 };
 
+// 위험도 미정 통화는 높음보다 먼저 표시 (서버 대기열 정렬과 동일)
+const riskRank = (risk: Client['risk']) => (risk === null ? 3 : risk);
+
 // 로깅 함수 추가
 const logEvent = (event: string, data?: any) => {
   console.log(`[MainPage] ${event}`, data ? data : '');
@@ -61,7 +66,7 @@ const MainPage = () => {
       const res = await axios.get('/api/client/queue', {
         headers: { Authorization: `Bearer ${token}` },
       });
-      const sorted = res.data.clients.sort((a: Client, b: Client) => b.risk - a.risk);
+      const sorted = res.data.clients.sort((a: Client, b: Client) => riskRank(b.risk) - riskRank(a.risk));
       logEvent('대기열 조회 성공', { count: sorted.length });
       setClients(sorted);
     } catch (err) {
@@ -312,9 +317,9 @@ const MainPage = () => {
                 <div
                   key={client.id}
                   onClick={() => handleClientCardClick(client.id)}
-                  className={`min-w-[240px] bg-blue-50 border-t-4 ${riskColors[client.risk]} rounded-xl shadow-md p-5 cursor-pointer hover:shadow-lg hover:scale-105 transition`}
+                  className={`min-w-[240px] bg-blue-50 border-t-4 ${riskColors[client.risk ?? 'unknown']} rounded-xl shadow-md p-5 cursor-pointer hover:shadow-lg hover:scale-105 transition`}
                 >
-                  <div className="font-semibold text-blue-800 mb-1">{riskLabels[client.risk]}</div>
+                  <div className="font-semibold text-blue-800 mb-1">{riskLabels[client.risk ?? 'unknown']}</div>
                   <div className="text-sm text-gray-600">📞 {client.phone}</div>
                 </div>
               ))}
@@ -5,7 +5,7 @@ import axiosInstance, { ApiResponse } from '../api/axiosInstance'; // 경로 확
 export interface QueueItem {
   call_id: number;
   phone_number: string;
-  risk_level: number; // 0, 1, 2
+  risk_level: number | null; // 0, 1, 2 (null: 미정)
   received_at: string; // ISO 문자열 형태
   status: string;
   // 필요시 백엔드 응답에 따라 다른 필드 추가